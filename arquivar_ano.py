@@ -0,0 +1,85 @@
+"""
+Script para arquivar as transações de anos encerrados.
+As transações do ano saem da tabela transacoes e vão para transacoes_arquivo; as
+consultas da aplicação só leem o arquivo quando o período pedido começa antes do
+ano corrente. Sem argumentos, lista os anos já arquivados.
+
+Uso:
+    python arquivar_ano.py [ANO ...]
+    python arquivar_ano.py --restaurar ANO
+"""
+
+import os
+import sys
+
+# Adicionar o diretório raiz do projeto ao caminho de busca do Python
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from src.config import Configuracao
+from src.models.arquivo_transacoes import ArquivoTransacoes
+
+def print_header(title):
+    """Imprime um cabeçalho formatado."""
+    print("\n" + "=" * 50)
+    print(f"{title.center(50)}")
+    print("=" * 50)
+
+def listar_anos():
+    """Mostra os anos arquivados."""
+    print_header("ANOS ARQUIVADOS")
+
+    anos = ArquivoTransacoes.listar_anos()
+    if not anos:
+        print("\nNenhum ano arquivado.")
+    for ano in anos:
+        print(f"  {ano['ano']}: {ano['quantidade']} transações (em {ano['data_arquivamento']:%d/%m/%Y})")
+
+def arquivar_anos(anos):
+    """Arquiva cada ano em uma transação própria."""
+    print_header("ARQUIVANDO TRANSAÇÕES")
+
+    for ano in sorted(anos):
+        try:
+            total = ArquivoTransacoes.arquivar_ano(ano)
+            print(f"\n{ano}: {total} transações arquivadas.")
+        except Exception as e:
+            print(f"Erro ao arquivar {ano}: {e}")
+            sys.exit(1)
+
+def restaurar_ano(ano):
+    """Devolve as transações arquivadas do ano para a tabela transacoes."""
+    print_header("RESTAURANDO TRANSAÇÕES ARQUIVADAS")
+
+    try:
+        total = ArquivoTransacoes.restaurar_ano(ano)
+        print(f"\n{ano}: {total} transações restauradas.")
+    except Exception as e:
+        print(f"Erro ao restaurar {ano}: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    # Carregar a configuração (a mesma usada pela aplicação)
+    config = Configuracao.carregar()
+
+    # Verificar se as variáveis necessárias estão definidas
+    missing_vars = config.variaveis_ausentes()
+
+    if missing_vars:
+        print("ERRO: As seguintes variáveis de ambiente estão faltando:")
+        for var in missing_vars:
+            print(f"- {var}")
+        print("Por favor, configure o arquivo .env com as credenciais do banco de dados.")
+        sys.exit(1)
+
+    argumentos = sys.argv[1:]
+    try:
+        if argumentos[:1] == ['--restaurar'] and len(argumentos) == 2:
+            restaurar_ano(int(argumentos[1]))
+        elif argumentos:
+            arquivar_anos([int(ano) for ano in argumentos])
+        else:
+            listar_anos()
+    except ValueError:
+        print(__doc__)
+        sys.exit(1)
@@ -1,9 +1,8 @@
 """
 Script para limpar os dados dos ambientes de produção e desenvolvimento.
 """
-import os
 import pyodbc
-from dotenv import load_dotenv
+from src.config import Configuracao
 
 def clean_data(environment="both"):
     """Limpa os dados do ambiente especificado sem excluir as tabelas.
@@ -11,15 +10,8 @@ def clean_data(environment="both"):
     Args:
         environment: "prod", "dev" ou "both" para limpar ambos
     """
-    # Carregar variáveis de ambiente
-    load_dotenv()
-    
-    # Configurações de conexão
-    server = os.getenv('DB_SERVER')
-    database = os.getenv('DB_DATABASE')
-    username = os.getenv('DB_USERNAME')
-    password = os.getenv('DB_PASSWORD')
-    driver = os.getenv('DB_DRIVER', 'ODBC Driver 17 for SQL Server')
+    # Configurações de conexão (as mesmas da aplicação)
+    config = Configuracao.carregar()
     
     # Esquemas
     schemas = []
@@ -38,8 +30,7 @@ def clean_data(environment="both"):
     ]
     
     # Conectar ao banco de dados
-    connection_string = f'DRIVER={{{driver}}};SERVER={server};DATABASE={database};UID={username};PWD={password}'
-    conn = pyodbc.connect(connection_string)
+    conn = pyodbc.connect(config.string_conexao())
     cursor = conn.cursor()
     
     try:
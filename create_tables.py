@@ -1,9 +1,8 @@
 """
 Script para recriar as tabelas nos ambientes de produção e desenvolvimento.
 """
-import os
 import pyodbc
-from dotenv import load_dotenv
+from src.config import Configuracao
 
 def create_tables(environment="both"):
     """Recria as tabelas no ambiente especificado.
@@ -11,15 +10,8 @@ def create_tables(environment="both"):
     Args:
         environment: "prod", "dev" ou "both" para ambos
     """
-    # Carregar variáveis de ambiente
-    load_dotenv()
-    
-    # Configurações de conexão
-    server = os.getenv('DB_SERVER')
-    database = os.getenv('DB_DATABASE')
-    username = os.getenv('DB_USERNAME')
-    password = os.getenv('DB_PASSWORD')
-    driver = os.getenv('DB_DRIVER', 'ODBC Driver 17 for SQL Server')
+    # Configurações de conexão (as mesmas da aplicação)
+    config = Configuracao.carregar()
     
     # Esquemas
     schemas = []
@@ -29,8 +21,7 @@ def create_tables(environment="both"):
         schemas.append("financas_pessoais_dev")
     
     # Conectar ao banco de dados
-    connection_string = f'DRIVER={{{driver}}};SERVER={server};DATABASE={database};UID={username};PWD={password}'
-    conn = pyodbc.connect(connection_string)
+    conn = pyodbc.connect(config.string_conexao())
     cursor = conn.cursor()
     
     try:
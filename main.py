@@ -2,9 +2,8 @@ import sys
 import os
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtGui import QIcon
-from dotenv import load_dotenv
+from src.config import Configuracao
 from src.views.main_window import MainWindow
-from src.database.setup import DatabaseSetup
 
 def select_environment():
     """Permite ao usuário selecionar o ambiente."""
@@ -18,25 +17,12 @@ def select_environment():
     return 'dev' if reply == QMessageBox.Yes else 'prod'
 
 def load_env():
-    """Carrega variáveis de ambiente considerando se está em desenvolvimento ou executável."""
-    if getattr(sys, 'frozen', False):
-        # Executando como executável
-        base_path = sys._MEIPASS
-    else:
-        # Executando em desenvolvimento
-        base_path = os.path.dirname(os.path.abspath(__file__))
-    
-    env_path = os.path.join(base_path, '.env')
-    load_dotenv(env_path)
+    """Carrega a configuração (.env) da aplicação, em desenvolvimento ou no executável."""
+    Configuracao.carregar()
 
 def get_icon_path():
     """Retorna o caminho do ícone considerando se está em desenvolvimento ou executável."""
-    if getattr(sys, 'frozen', False):
-        # Executando como executável
-        base_path = sys._MEIPASS
-    else:
-        # Executando em desenvolvimento
-        base_path = os.path.dirname(os.path.abspath(__file__))
+    base_path = Configuracao.obter_caminho_base()
     
     # Procurar por arquivos de ícone
     icon_files = ['icon.ico', 'icon.png', 'app.ico', 'app.png']
@@ -74,16 +60,7 @@ def main():
     else:
         print("Nenhum ícone encontrado na pasta assets/")
     
-    # Configurar o banco de dados
-    try:
-        db_setup = DatabaseSetup(environment=environment)
-        db_setup.create_tables()
-        print("Banco de dados configurado com sucesso.")
-    except Exception as e:
-        print(f"Erro ao configurar o banco de dados: {e}")
-        print("Continuando mesmo com erro, pois o usuário pode configurar depois")
-    
-    # Criar e mostrar a janela principal
+    # Criar e mostrar a janela principal (o banco de dados é configurado por ela, em segundo plano)
     window = MainWindow(environment=environment)
     window.show()
     
@@ -0,0 +1,111 @@
+"""
+Script para medir o tempo de importação dos módulos carregados na inicialização.
+Usa `python -X importtime` em um processo separado e falha (código 1) se o
+tempo total passar do orçamento ou se algum módulo pesado, que deveria ser
+carregado apenas no primeiro uso, for importado na inicialização.
+
+Uso:
+    python medir_tempo_importacao.py [orçamento em ms] [módulo]
+"""
+
+import os
+import subprocess
+import sys
+
+# Diretório raiz do projeto, de onde os módulos são importados
+project_root = os.path.abspath(os.path.dirname(__file__))
+
+# Orçamento padrão para importar a janela principal, em milissegundos
+ORCAMENTO_PADRAO_MS = 1500
+
+# Módulo importado na inicialização do aplicativo
+MODULO_PADRAO = 'src.views.main_window'
+
+# Bibliotecas que só devem ser carregadas quando um relatório ou gráfico for usado
+MODULOS_SOB_DEMANDA = ['pandas', 'matplotlib', 'numpy', 'pyarrow']
+
+def print_header(title):
+    """Imprime um cabeçalho formatado."""
+    print("\n" + "=" * 50)
+    print(f"{title.center(50)}")
+    print("=" * 50)
+
+def medir_importacao(modulo):
+    """Importa o módulo em um processo novo e retorna as linhas do -X importtime.
+
+    Returns:
+        Lista de tuplas (modulo, proprio_us, acumulado_us, nivel), onde nivel 0
+        indica um módulo importado diretamente pelo processo
+    """
+    resultado = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {modulo}'],
+        cwd=project_root,
+        capture_output=True,
+        text=True
+    )
+    if resultado.returncode != 0:
+        erro = resultado.stderr.strip().splitlines()
+        raise RuntimeError(erro[-1] if erro else f"Falha ao importar {modulo}")
+
+    medicoes = []
+    for linha in resultado.stderr.splitlines():
+        # Formato: "import time:      self [us] |  cumulative | imported package"
+        if not linha.startswith('import time:'):
+            continue
+        partes = linha[len('import time:'):].split('|')
+        if len(partes) != 3 or not partes[0].strip().isdigit():
+            continue
+        nome = partes[2].rstrip()
+        nivel = (len(nome) - len(nome.lstrip())) // 2
+        medicoes.append((nome.strip(), int(partes[0]), int(partes[1]), nivel))
+    return medicoes
+
+def verificar_orcamento(orcamento_ms=ORCAMENTO_PADRAO_MS, modulo=MODULO_PADRAO):
+    """Mede a importação do módulo e verifica o orçamento e as importações sob demanda.
+
+    Returns:
+        True se a importação respeitou o orçamento e não carregou módulos sob demanda
+    """
+    print_header("TEMPO DE IMPORTAÇÃO")
+
+    medicoes = medir_importacao(modulo)
+    # O tempo acumulado dos módulos de nível 0 já inclui o de seus submódulos
+    total_ms = sum(acumulado for _, _, acumulado, nivel in medicoes if nivel == 0) / 1000
+
+    print(f"\nMódulo: {modulo}")
+    print(f"Tempo total: {total_ms:.1f} ms (orçamento: {orcamento_ms} ms)")
+
+    print("\nMódulos mais lentos (tempo próprio):")
+    for nome, proprio, _, _ in sorted(medicoes, key=lambda m: m[1], reverse=True)[:10]:
+        print(f"- {nome}: {proprio / 1000:.1f} ms")
+
+    carregados = sorted({
+        nome.split('.')[0] for nome, _, _, _ in medicoes
+        if nome.split('.')[0] in MODULOS_SOB_DEMANDA
+    })
+
+    ok = True
+    if total_ms > orcamento_ms:
+        print(f"\nERRO: importação levou {total_ms:.1f} ms, acima do orçamento de {orcamento_ms} ms.")
+        ok = False
+    if carregados:
+        print("\nERRO: módulos que deveriam ser carregados sob demanda foram importados na inicialização:")
+        for nome in carregados:
+            print(f"- {nome}")
+        ok = False
+
+    if ok:
+        print("\nImportação dentro do orçamento.")
+    return ok
+
+if __name__ == "__main__":
+    orcamento = int(sys.argv[1]) if len(sys.argv) > 1 else ORCAMENTO_PADRAO_MS
+    modulo = sys.argv[2] if len(sys.argv) > 2 else MODULO_PADRAO
+
+    try:
+        sucesso = verificar_orcamento(orcamento, modulo)
+    except Exception as e:
+        print(f"Erro ao medir tempo de importação: {e}")
+        sys.exit(1)
+
+    sys.exit(0 if sucesso else 1)
@@ -0,0 +1,52 @@
+"""
+Script para calcular a impressão digital (detecção de duplicatas) das transações já gravadas.
+Use após criar a coluna impressao_digital ou após alterações feitas diretamente no
+banco de dados. Com --todas, recalcula também as transações que já têm impressão.
+
+Uso:
+    python preencher_impressoes.py [--todas]
+"""
+
+import os
+import sys
+
+# Adicionar o diretório raiz do projeto ao caminho de busca do Python
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from src.config import Configuracao
+from src.models.impressao_transacao import ImpressaoTransacao
+
+def print_header(title):
+    """Imprime um cabeçalho formatado."""
+    print("\n" + "=" * 50)
+    print(f"{title.center(50)}")
+    print("=" * 50)
+
+def preencher_impressoes(apenas_pendentes=True):
+    """Calcula as impressões em lotes, com um commit por lote."""
+    print_header("CALCULANDO IMPRESSÕES DAS TRANSAÇÕES")
+
+    try:
+        total = ImpressaoTransacao.preencher(apenas_pendentes=apenas_pendentes)
+        print(f"\nImpressão digital calculada para {total} transações.")
+    except Exception as e:
+        print(f"Erro ao calcular impressões: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    # Carregar a configuração (a mesma usada pela aplicação)
+    config = Configuracao.carregar()
+
+    # Verificar se as variáveis necessárias estão definidas
+    missing_vars = config.variaveis_ausentes()
+
+    if missing_vars:
+        print("ERRO: As seguintes variáveis de ambiente estão faltando:")
+        for var in missing_vars:
+            print(f"- {var}")
+        print("Por favor, configure o arquivo .env com as credenciais do banco de dados.")
+        sys.exit(1)
+
+    # Executar o cálculo
+    preencher_impressoes(apenas_pendentes='--todas' not in sys.argv[1:])
@@ -1,20 +1,21 @@
 """
 Script para recalcular e equalizar os saldos das contas.
 Este script recalcula o saldo atual de cada conta com base no saldo inicial
-e todas as transações registradas no banco de dados.
+e todas as transações registradas no banco de dados, inclusive as arquivadas.
 """
 
 import os
 import sys
 from decimal import Decimal
-from dotenv import load_dotenv, dotenv_values
 
 # Adicionar o diretório raiz do projeto ao caminho de busca do Python
 project_root = os.path.abspath(os.path.dirname(__file__))
 sys.path.insert(0, project_root)
 
+from src.config import Configuracao
 from src.database.connection import DatabaseConnection
 from src.models.conta import Conta
+from src.models.arquivo_transacoes import ArquivoTransacoes
 
 def print_header(title):
     """Imprime um cabeçalho formatado."""
@@ -62,10 +63,10 @@ def recalcular_saldos():
             print(f"  Saldo inicial: R$ {float(saldo_inicial):.2f}")
             print(f"  Saldo atual registrado: R$ {float(saldo_atual_antigo):.2f}")
             
-            # Buscar todas as transações da conta
-            cursor.execute("""
+            # Buscar todas as transações da conta (inclusive as de anos arquivados)
+            cursor.execute(f"""
                 SELECT tipo, valor 
-                FROM financas_pessoais.transacoes 
+                FROM {ArquivoTransacoes.fonte('financas_pessoais')} t 
                 WHERE conta_id = ?
                 ORDER BY data_transacao, id
             """, (conta_id,))
@@ -110,16 +111,11 @@ def recalcular_saldos():
         db.close()
 
 if __name__ == "__main__":
-    # Carregar variáveis de ambiente
-    load_dotenv(override=True)
+    # Carregar a configuração (a mesma usada pela aplicação)
+    config = Configuracao.carregar()
     
     # Verificar se as variáveis necessárias estão definidas
-    required_vars = ['DB_SERVER', 'DB_DATABASE', 'DB_USERNAME', 'DB_PASSWORD']
-    missing_vars = []
-    
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
+    missing_vars = config.variaveis_ausentes()
     
     if missing_vars:
         print("ERRO: As seguintes variáveis de ambiente estão faltando:")
@@ -0,0 +1,48 @@
+"""
+Script para reconstruir a tabela de resumo mensal a partir das transações.
+Use após cargas retroativas ou alterações feitas diretamente no banco de dados.
+"""
+
+import os
+import sys
+
+# Adicionar o diretório raiz do projeto ao caminho de busca do Python
+project_root = os.path.abspath(os.path.dirname(__file__))
+sys.path.insert(0, project_root)
+
+from src.config import Configuracao
+from src.models.resumo_mensal import ResumoMensal
+
+def print_header(title):
+    """Imprime um cabeçalho formatado."""
+    print("\n" + "=" * 50)
+    print(f"{title.center(50)}")
+    print("=" * 50)
+
+def reconstruir_resumo_mensal():
+    """Apaga e recalcula o resumo mensal em uma única transação."""
+    print_header("RECONSTRUINDO RESUMO MENSAL")
+    
+    try:
+        total = ResumoMensal.reconstruir()
+        print(f"\nResumo mensal reconstruído com {total} linhas.")
+    except Exception as e:
+        print(f"Erro ao reconstruir resumo mensal: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    # Carregar a configuração (a mesma usada pela aplicação)
+    config = Configuracao.carregar()
+    
+    # Verificar se as variáveis necessárias estão definidas
+    missing_vars = config.variaveis_ausentes()
+    
+    if missing_vars:
+        print("ERRO: As seguintes variáveis de ambiente estão faltando:")
+        for var in missing_vars:
+            print(f"- {var}")
+        print("Por favor, configure o arquivo .env com as credenciais do banco de dados.")
+        sys.exit(1)
+    
+    # Executar a reconstrução
+    reconstruir_resumo_mensal()
@@ -0,0 +1,66 @@
+-- Script para adicionar o id da operação do diário local que inseriu cada linha
+-- O reenvio de uma inclusão sem confirmação procura a linha por esse id, em vez de compará-la por valores.
+
+-- Esquema de produção
+IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('financas_pessoais.transacoes') AND name = 'id_diario')
+BEGIN
+    ALTER TABLE financas_pessoais.transacoes ADD id_diario UNIQUEIDENTIFIER NULL
+    PRINT 'Coluna id_diario adicionada em transacoes no esquema de produção.'
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_id_diario' AND object_id = OBJECT_ID('financas_pessoais.transacoes'))
+BEGIN
+    CREATE INDEX IX_transacoes_id_diario ON financas_pessoais.transacoes (id_diario)
+        WHERE id_diario IS NOT NULL
+    PRINT 'Índice IX_transacoes_id_diario criado no esquema de produção.'
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('financas_pessoais.gastos_recorrentes') AND name = 'id_diario')
+BEGIN
+    ALTER TABLE financas_pessoais.gastos_recorrentes ADD id_diario UNIQUEIDENTIFIER NULL
+    PRINT 'Coluna id_diario adicionada em gastos_recorrentes no esquema de produção.'
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_gastos_recorrentes_id_diario' AND object_id = OBJECT_ID('financas_pessoais.gastos_recorrentes'))
+BEGIN
+    CREATE INDEX IX_gastos_recorrentes_id_diario ON financas_pessoais.gastos_recorrentes (id_diario)
+        WHERE id_diario IS NOT NULL
+    PRINT 'Índice IX_gastos_recorrentes_id_diario criado no esquema de produção.'
+END
+GO
+
+-- Esquema de desenvolvimento
+IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('financas_pessoais_dev.transacoes') AND name = 'id_diario')
+BEGIN
+    ALTER TABLE financas_pessoais_dev.transacoes ADD id_diario UNIQUEIDENTIFIER NULL
+    PRINT 'Coluna id_diario adicionada em transacoes no esquema de desenvolvimento.'
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_id_diario' AND object_id = OBJECT_ID('financas_pessoais_dev.transacoes'))
+BEGIN
+    CREATE INDEX IX_transacoes_id_diario ON financas_pessoais_dev.transacoes (id_diario)
+        WHERE id_diario IS NOT NULL
+    PRINT 'Índice IX_transacoes_id_diario criado no esquema de desenvolvimento.'
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('financas_pessoais_dev.gastos_recorrentes') AND name = 'id_diario')
+BEGIN
+    ALTER TABLE financas_pessoais_dev.gastos_recorrentes ADD id_diario UNIQUEIDENTIFIER NULL
+    PRINT 'Coluna id_diario adicionada em gastos_recorrentes no esquema de desenvolvimento.'
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_gastos_recorrentes_id_diario' AND object_id = OBJECT_ID('financas_pessoais_dev.gastos_recorrentes'))
+BEGIN
+    CREATE INDEX IX_gastos_recorrentes_id_diario ON financas_pessoais_dev.gastos_recorrentes (id_diario)
+        WHERE id_diario IS NOT NULL
+    PRINT 'Índice IX_gastos_recorrentes_id_diario criado no esquema de desenvolvimento.'
+END
+GO
+
+PRINT 'Id do diário local configurado com sucesso!'
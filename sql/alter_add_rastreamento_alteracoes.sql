@@ -0,0 +1,231 @@
+-- Script para rastrear alterações: coluna versao (ROWVERSION) nas tabelas, tabela de exclusões e triggers
+-- Usado pelas consultas incrementais ("alterações desde a versão X") dos modelos e telas.
+-- A coluna ROWVERSION é preenchida pelo servidor; não precisa ser incluída em INSERTs/UPDATEs.
+
+-- Esquema de produção
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'exclusoes' AND schema_id = SCHEMA_ID('financas_pessoais'))
+BEGIN
+    CREATE TABLE financas_pessoais.exclusoes (
+        id INT IDENTITY(1,1) PRIMARY KEY,
+        tabela NVARCHAR(128) NOT NULL,
+        registro_id INT NOT NULL,
+        versao ROWVERSION,
+        data_exclusao DATETIME DEFAULT GETDATE()
+    )
+    CREATE INDEX IX_exclusoes_tabela_versao ON financas_pessoais.exclusoes (tabela, versao) INCLUDE (registro_id)
+    PRINT 'Tabela exclusoes criada no esquema de produção.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais.transacoes') IS NOT NULL AND COL_LENGTH('financas_pessoais.transacoes', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais.transacoes ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em transacoes no esquema de produção.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais.transacoes') IS NOT NULL AND OBJECT_ID('financas_pessoais.TR_transacoes_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais.TR_transacoes_exclusao ON financas_pessoais.transacoes AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais.exclusoes (tabela, registro_id) SELECT ''transacoes'', id FROM deleted')
+GO
+
+IF OBJECT_ID('financas_pessoais.conta_dimensao') IS NOT NULL AND COL_LENGTH('financas_pessoais.conta_dimensao', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais.conta_dimensao ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em conta_dimensao no esquema de produção.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais.conta_dimensao') IS NOT NULL AND OBJECT_ID('financas_pessoais.TR_conta_dimensao_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais.TR_conta_dimensao_exclusao ON financas_pessoais.conta_dimensao AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais.exclusoes (tabela, registro_id) SELECT ''conta_dimensao'', id FROM deleted')
+GO
+
+IF OBJECT_ID('financas_pessoais.conta_saldos') IS NOT NULL AND COL_LENGTH('financas_pessoais.conta_saldos', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais.conta_saldos ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em conta_saldos no esquema de produção.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais.conta_saldos') IS NOT NULL AND OBJECT_ID('financas_pessoais.TR_conta_saldos_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais.TR_conta_saldos_exclusao ON financas_pessoais.conta_saldos AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais.exclusoes (tabela, registro_id) SELECT ''conta_saldos'', id FROM deleted')
+GO
+
+IF OBJECT_ID('financas_pessoais.categorias') IS NOT NULL AND COL_LENGTH('financas_pessoais.categorias', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais.categorias ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em categorias no esquema de produção.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais.categorias') IS NOT NULL AND OBJECT_ID('financas_pessoais.TR_categorias_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais.TR_categorias_exclusao ON financas_pessoais.categorias AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais.exclusoes (tabela, registro_id) SELECT ''categorias'', id FROM deleted')
+GO
+
+IF OBJECT_ID('financas_pessoais.meios_pagamento') IS NOT NULL AND COL_LENGTH('financas_pessoais.meios_pagamento', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais.meios_pagamento ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em meios_pagamento no esquema de produção.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais.meios_pagamento') IS NOT NULL AND OBJECT_ID('financas_pessoais.TR_meios_pagamento_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais.TR_meios_pagamento_exclusao ON financas_pessoais.meios_pagamento AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais.exclusoes (tabela, registro_id) SELECT ''meios_pagamento'', id FROM deleted')
+GO
+
+IF OBJECT_ID('financas_pessoais.gastos_recorrentes') IS NOT NULL AND COL_LENGTH('financas_pessoais.gastos_recorrentes', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais.gastos_recorrentes ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em gastos_recorrentes no esquema de produção.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais.gastos_recorrentes') IS NOT NULL AND OBJECT_ID('financas_pessoais.TR_gastos_recorrentes_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais.TR_gastos_recorrentes_exclusao ON financas_pessoais.gastos_recorrentes AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais.exclusoes (tabela, registro_id) SELECT ''gastos_recorrentes'', id FROM deleted')
+GO
+
+IF OBJECT_ID('financas_pessoais.pagamentos_recorrentes') IS NOT NULL AND COL_LENGTH('financas_pessoais.pagamentos_recorrentes', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais.pagamentos_recorrentes ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em pagamentos_recorrentes no esquema de produção.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais.pagamentos_recorrentes') IS NOT NULL AND OBJECT_ID('financas_pessoais.TR_pagamentos_recorrentes_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais.TR_pagamentos_recorrentes_exclusao ON financas_pessoais.pagamentos_recorrentes AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais.exclusoes (tabela, registro_id) SELECT ''pagamentos_recorrentes'', id FROM deleted')
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_versao' AND object_id = OBJECT_ID('financas_pessoais.transacoes'))
+BEGIN
+    CREATE INDEX IX_transacoes_versao ON financas_pessoais.transacoes (versao)
+    PRINT 'Índice IX_transacoes_versao criado no esquema de produção.'
+END
+GO
+
+-- Esquema de desenvolvimento
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'exclusoes' AND schema_id = SCHEMA_ID('financas_pessoais_dev'))
+BEGIN
+    CREATE TABLE financas_pessoais_dev.exclusoes (
+        id INT IDENTITY(1,1) PRIMARY KEY,
+        tabela NVARCHAR(128) NOT NULL,
+        registro_id INT NOT NULL,
+        versao ROWVERSION,
+        data_exclusao DATETIME DEFAULT GETDATE()
+    )
+    CREATE INDEX IX_exclusoes_tabela_versao ON financas_pessoais_dev.exclusoes (tabela, versao) INCLUDE (registro_id)
+    PRINT 'Tabela exclusoes criada no esquema de desenvolvimento.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.transacoes') IS NOT NULL AND COL_LENGTH('financas_pessoais_dev.transacoes', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais_dev.transacoes ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em transacoes no esquema de desenvolvimento.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.transacoes') IS NOT NULL AND OBJECT_ID('financas_pessoais_dev.TR_transacoes_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais_dev.TR_transacoes_exclusao ON financas_pessoais_dev.transacoes AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais_dev.exclusoes (tabela, registro_id) SELECT ''transacoes'', id FROM deleted')
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.conta_dimensao') IS NOT NULL AND COL_LENGTH('financas_pessoais_dev.conta_dimensao', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais_dev.conta_dimensao ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em conta_dimensao no esquema de desenvolvimento.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.conta_dimensao') IS NOT NULL AND OBJECT_ID('financas_pessoais_dev.TR_conta_dimensao_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais_dev.TR_conta_dimensao_exclusao ON financas_pessoais_dev.conta_dimensao AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais_dev.exclusoes (tabela, registro_id) SELECT ''conta_dimensao'', id FROM deleted')
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.conta_saldos') IS NOT NULL AND COL_LENGTH('financas_pessoais_dev.conta_saldos', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais_dev.conta_saldos ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em conta_saldos no esquema de desenvolvimento.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.conta_saldos') IS NOT NULL AND OBJECT_ID('financas_pessoais_dev.TR_conta_saldos_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais_dev.TR_conta_saldos_exclusao ON financas_pessoais_dev.conta_saldos AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais_dev.exclusoes (tabela, registro_id) SELECT ''conta_saldos'', id FROM deleted')
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.categorias') IS NOT NULL AND COL_LENGTH('financas_pessoais_dev.categorias', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais_dev.categorias ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em categorias no esquema de desenvolvimento.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.categorias') IS NOT NULL AND OBJECT_ID('financas_pessoais_dev.TR_categorias_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais_dev.TR_categorias_exclusao ON financas_pessoais_dev.categorias AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais_dev.exclusoes (tabela, registro_id) SELECT ''categorias'', id FROM deleted')
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.meios_pagamento') IS NOT NULL AND COL_LENGTH('financas_pessoais_dev.meios_pagamento', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais_dev.meios_pagamento ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em meios_pagamento no esquema de desenvolvimento.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.meios_pagamento') IS NOT NULL AND OBJECT_ID('financas_pessoais_dev.TR_meios_pagamento_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais_dev.TR_meios_pagamento_exclusao ON financas_pessoais_dev.meios_pagamento AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais_dev.exclusoes (tabela, registro_id) SELECT ''meios_pagamento'', id FROM deleted')
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.gastos_recorrentes') IS NOT NULL AND COL_LENGTH('financas_pessoais_dev.gastos_recorrentes', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais_dev.gastos_recorrentes ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em gastos_recorrentes no esquema de desenvolvimento.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.gastos_recorrentes') IS NOT NULL AND OBJECT_ID('financas_pessoais_dev.TR_gastos_recorrentes_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais_dev.TR_gastos_recorrentes_exclusao ON financas_pessoais_dev.gastos_recorrentes AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais_dev.exclusoes (tabela, registro_id) SELECT ''gastos_recorrentes'', id FROM deleted')
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.pagamentos_recorrentes') IS NOT NULL AND COL_LENGTH('financas_pessoais_dev.pagamentos_recorrentes', 'versao') IS NULL
+BEGIN
+    ALTER TABLE financas_pessoais_dev.pagamentos_recorrentes ADD versao ROWVERSION
+    PRINT 'Coluna versao adicionada em pagamentos_recorrentes no esquema de desenvolvimento.'
+END
+GO
+
+IF OBJECT_ID('financas_pessoais_dev.pagamentos_recorrentes') IS NOT NULL AND OBJECT_ID('financas_pessoais_dev.TR_pagamentos_recorrentes_exclusao') IS NULL
+    EXEC('CREATE TRIGGER financas_pessoais_dev.TR_pagamentos_recorrentes_exclusao ON financas_pessoais_dev.pagamentos_recorrentes AFTER DELETE AS
+          SET NOCOUNT ON;
+          INSERT INTO financas_pessoais_dev.exclusoes (tabela, registro_id) SELECT ''pagamentos_recorrentes'', id FROM deleted')
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_versao' AND object_id = OBJECT_ID('financas_pessoais_dev.transacoes'))
+BEGIN
+    CREATE INDEX IX_transacoes_versao ON financas_pessoais_dev.transacoes (versao)
+    PRINT 'Índice IX_transacoes_versao criado no esquema de desenvolvimento.'
+END
+GO
+
+PRINT 'Rastreamento de alterações configurado com sucesso!'
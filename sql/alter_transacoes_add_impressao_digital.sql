@@ -0,0 +1,37 @@
+-- Script para adicionar a impressão digital usada na detecção de transações duplicadas
+-- A coluna é calculada pela aplicação (conta, faixa de datas, tipo, valor e descrição normalizada).
+-- Para preencher as transações já existentes, use preencher_impressoes.py
+
+-- Esquema de produção
+IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('financas_pessoais.transacoes') AND name = 'impressao_digital')
+BEGIN
+    ALTER TABLE financas_pessoais.transacoes ADD impressao_digital BIGINT NULL
+    PRINT 'Coluna impressao_digital adicionada no esquema de produção.'
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_impressao_digital' AND object_id = OBJECT_ID('financas_pessoais.transacoes'))
+BEGIN
+    CREATE INDEX IX_transacoes_impressao_digital ON financas_pessoais.transacoes (impressao_digital)
+        INCLUDE (data_transacao)
+    PRINT 'Índice IX_transacoes_impressao_digital criado no esquema de produção.'
+END
+GO
+
+-- Esquema de desenvolvimento
+IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('financas_pessoais_dev.transacoes') AND name = 'impressao_digital')
+BEGIN
+    ALTER TABLE financas_pessoais_dev.transacoes ADD impressao_digital BIGINT NULL
+    PRINT 'Coluna impressao_digital adicionada no esquema de desenvolvimento.'
+END
+GO
+
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_impressao_digital' AND object_id = OBJECT_ID('financas_pessoais_dev.transacoes'))
+BEGIN
+    CREATE INDEX IX_transacoes_impressao_digital ON financas_pessoais_dev.transacoes (impressao_digital)
+        INCLUDE (data_transacao)
+    PRINT 'Índice IX_transacoes_impressao_digital criado no esquema de desenvolvimento.'
+END
+GO
+
+PRINT 'Impressão digital das transações configurada com sucesso!'
@@ -0,0 +1,68 @@
+-- Script para adicionar o ciclo de fatura aos meios de pagamento e criar a view indexada
+-- faturas_cartao, que mantém o total de cada fatura (meio de pagamento x competência).
+-- competencia = ano * 12 + (mes - 1) do mês de fechamento da fatura. Compras feitas
+-- após o dia de fechamento entram na fatura do mês seguinte.
+
+-- Adicionar campos de fechamento e vencimento no esquema de produção
+IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('financas_pessoais.meios_pagamento') AND name = 'dia_fechamento')
+BEGIN
+    ALTER TABLE financas_pessoais.meios_pagamento ADD dia_fechamento INT NULL, dia_vencimento INT NULL
+    PRINT 'Campos dia_fechamento e dia_vencimento adicionados ao esquema de produção.'
+END
+GO
+
+-- Adicionar campos de fechamento e vencimento no esquema de desenvolvimento
+IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('financas_pessoais_dev.meios_pagamento') AND name = 'dia_fechamento')
+BEGIN
+    ALTER TABLE financas_pessoais_dev.meios_pagamento ADD dia_fechamento INT NULL, dia_vencimento INT NULL
+    PRINT 'Campos dia_fechamento e dia_vencimento adicionados ao esquema de desenvolvimento.'
+END
+GO
+
+-- Views indexadas exigem estas opções na sessão que cria a view e o índice
+SET ANSI_NULLS ON
+SET QUOTED_IDENTIFIER ON
+SET ARITHABORT ON
+GO
+
+-- Criar view indexada no esquema de produção
+IF OBJECT_ID('financas_pessoais.faturas_cartao', 'V') IS NULL
+BEGIN
+    EXEC('CREATE VIEW financas_pessoais.faturas_cartao WITH SCHEMABINDING AS
+          SELECT t.meio_pagamento_id,
+                 YEAR(t.data_transacao) * 12 + MONTH(t.data_transacao) - 1
+                     + CASE WHEN DAY(t.data_transacao) > mp.dia_fechamento THEN 1 ELSE 0 END AS competencia,
+                 SUM(ISNULL(CASE WHEN t.tipo = ''R'' THEN -t.valor ELSE t.valor END, 0)) AS total,
+                 COUNT_BIG(*) AS quantidade
+          FROM financas_pessoais.transacoes t
+          INNER JOIN financas_pessoais.meios_pagamento mp ON mp.id = t.meio_pagamento_id
+          WHERE mp.dia_fechamento IS NOT NULL AND t.tipo IN (''R'', ''D'')
+          GROUP BY t.meio_pagamento_id,
+                   YEAR(t.data_transacao) * 12 + MONTH(t.data_transacao) - 1
+                       + CASE WHEN DAY(t.data_transacao) > mp.dia_fechamento THEN 1 ELSE 0 END')
+    EXEC('CREATE UNIQUE CLUSTERED INDEX IX_faturas_cartao ON financas_pessoais.faturas_cartao (meio_pagamento_id, competencia)')
+    PRINT 'View faturas_cartao criada no esquema de produção.'
+END
+GO
+
+-- Criar view indexada no esquema de desenvolvimento
+IF OBJECT_ID('financas_pessoais_dev.faturas_cartao', 'V') IS NULL
+BEGIN
+    EXEC('CREATE VIEW financas_pessoais_dev.faturas_cartao WITH SCHEMABINDING AS
+          SELECT t.meio_pagamento_id,
+                 YEAR(t.data_transacao) * 12 + MONTH(t.data_transacao) - 1
+                     + CASE WHEN DAY(t.data_transacao) > mp.dia_fechamento THEN 1 ELSE 0 END AS competencia,
+                 SUM(ISNULL(CASE WHEN t.tipo = ''R'' THEN -t.valor ELSE t.valor END, 0)) AS total,
+                 COUNT_BIG(*) AS quantidade
+          FROM financas_pessoais_dev.transacoes t
+          INNER JOIN financas_pessoais_dev.meios_pagamento mp ON mp.id = t.meio_pagamento_id
+          WHERE mp.dia_fechamento IS NOT NULL AND t.tipo IN (''R'', ''D'')
+          GROUP BY t.meio_pagamento_id,
+                   YEAR(t.data_transacao) * 12 + MONTH(t.data_transacao) - 1
+                       + CASE WHEN DAY(t.data_transacao) > mp.dia_fechamento THEN 1 ELSE 0 END')
+    EXEC('CREATE UNIQUE CLUSTERED INDEX IX_faturas_cartao ON financas_pessoais_dev.faturas_cartao (meio_pagamento_id, competencia)')
+    PRINT 'View faturas_cartao criada no esquema de desenvolvimento.'
+END
+GO
+
+PRINT 'Criação da view de faturas concluída com sucesso!'
@@ -0,0 +1,37 @@
+-- Script para criar o índice de texto completo usado na busca de transações
+-- Indexa descricao, local_transacao e observacao (idioma: português do Brasil)
+-- Observação: comandos FULLTEXT não podem rodar dentro de uma transação explícita
+
+-- Criar índice no esquema de produção
+IF FULLTEXTSERVERPROPERTY('IsFullTextInstalled') = 1
+   AND NOT EXISTS (SELECT * FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('financas_pessoais.transacoes'))
+BEGIN
+    IF NOT EXISTS (SELECT * FROM sys.fulltext_catalogs WHERE name = 'ftc_financas_pessoais')
+        EXEC('CREATE FULLTEXT CATALOG ftc_financas_pessoais')
+
+    DECLARE @pk_prod SYSNAME = (SELECT name FROM sys.indexes
+                                WHERE object_id = OBJECT_ID('financas_pessoais.transacoes') AND is_primary_key = 1)
+
+    EXEC('CREATE FULLTEXT INDEX ON financas_pessoais.transacoes
+          (descricao LANGUAGE 1046, local_transacao LANGUAGE 1046, observacao LANGUAGE 1046)
+          KEY INDEX ' + @pk_prod + ' ON ftc_financas_pessoais WITH CHANGE_TRACKING AUTO')
+    PRINT 'Índice de texto completo criado no esquema de produção.'
+END
+
+-- Criar índice no esquema de desenvolvimento
+IF FULLTEXTSERVERPROPERTY('IsFullTextInstalled') = 1
+   AND NOT EXISTS (SELECT * FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('financas_pessoais_dev.transacoes'))
+BEGIN
+    IF NOT EXISTS (SELECT * FROM sys.fulltext_catalogs WHERE name = 'ftc_financas_pessoais_dev')
+        EXEC('CREATE FULLTEXT CATALOG ftc_financas_pessoais_dev')
+
+    DECLARE @pk_dev SYSNAME = (SELECT name FROM sys.indexes
+                               WHERE object_id = OBJECT_ID('financas_pessoais_dev.transacoes') AND is_primary_key = 1)
+
+    EXEC('CREATE FULLTEXT INDEX ON financas_pessoais_dev.transacoes
+          (descricao LANGUAGE 1046, local_transacao LANGUAGE 1046, observacao LANGUAGE 1046)
+          KEY INDEX ' + @pk_dev + ' ON ftc_financas_pessoais_dev WITH CHANGE_TRACKING AUTO')
+    PRINT 'Índice de texto completo criado no esquema de desenvolvimento.'
+END
+
+PRINT 'Configuração da busca de texto completo concluída!'
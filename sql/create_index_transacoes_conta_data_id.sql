@@ -0,0 +1,20 @@
+-- Script para criar o índice usado no extrato por conta (conta_id, data_transacao, id)
+-- As colunas incluídas cobrem o cálculo do saldo de abertura sem acessar a tabela.
+
+-- Criar índice no esquema de produção
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_conta_data_id' AND object_id = OBJECT_ID('financas_pessoais.transacoes'))
+BEGIN
+    CREATE INDEX IX_transacoes_conta_data_id ON financas_pessoais.transacoes (conta_id, data_transacao, id)
+        INCLUDE (tipo, valor, descricao)
+    PRINT 'Índice IX_transacoes_conta_data_id criado no esquema de produção.'
+END
+
+-- Criar índice no esquema de desenvolvimento
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_conta_data_id' AND object_id = OBJECT_ID('financas_pessoais_dev.transacoes'))
+BEGIN
+    CREATE INDEX IX_transacoes_conta_data_id ON financas_pessoais_dev.transacoes (conta_id, data_transacao, id)
+        INCLUDE (tipo, valor, descricao)
+    PRINT 'Índice IX_transacoes_conta_data_id criado no esquema de desenvolvimento.'
+END
+
+PRINT 'Criação de índices concluída com sucesso!'
@@ -0,0 +1,17 @@
+-- Script para criar o índice usado na paginação por chave (data_transacao, id)
+
+-- Criar índice no esquema de produção
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_data_id' AND object_id = OBJECT_ID('financas_pessoais.transacoes'))
+BEGIN
+    CREATE INDEX IX_transacoes_data_id ON financas_pessoais.transacoes (data_transacao DESC, id DESC)
+    PRINT 'Índice IX_transacoes_data_id criado no esquema de produção.'
+END
+
+-- Criar índice no esquema de desenvolvimento
+IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_data_id' AND object_id = OBJECT_ID('financas_pessoais_dev.transacoes'))
+BEGIN
+    CREATE INDEX IX_transacoes_data_id ON financas_pessoais_dev.transacoes (data_transacao DESC, id DESC)
+    PRINT 'Índice IX_transacoes_data_id criado no esquema de desenvolvimento.'
+END
+
+PRINT 'Criação de índices concluída com sucesso!'
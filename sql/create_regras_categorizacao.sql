@@ -0,0 +1,62 @@
+-- Script para criar a tabela de regras de categorização automática
+-- Cada regra associa um padrão na descrição ou no local da transação a categoria,
+-- meio de pagamento e/ou conta. As regras são avaliadas em ordem de prioridade
+-- (menor primeiro) e acertos conta quantas transações cada regra classificou.
+
+-- Criar tabela no esquema de produção
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'regras_categorizacao' AND schema_id = SCHEMA_ID('financas_pessoais'))
+BEGIN
+    CREATE TABLE financas_pessoais.regras_categorizacao (
+        id INT IDENTITY(1,1) PRIMARY KEY,
+        nome NVARCHAR(100) NOT NULL,
+        padrao NVARCHAR(255) NOT NULL,
+        campo VARCHAR(20) NOT NULL DEFAULT 'descricao',
+        expressao_regular BIT NOT NULL DEFAULT 0,
+        categoria_id INT NULL,
+        meio_pagamento_id INT NULL,
+        conta_id INT NULL,
+        prioridade INT NOT NULL DEFAULT 100,
+        acertos INT NOT NULL DEFAULT 0,
+        ultimo_acerto DATETIME NULL,
+        data_criacao DATETIME DEFAULT GETDATE(),
+        ativo BIT DEFAULT 1,
+        CONSTRAINT FK_financas_pessoais_regras_categoria FOREIGN KEY (categoria_id)
+            REFERENCES financas_pessoais.categorias(id),
+        CONSTRAINT FK_financas_pessoais_regras_meio_pagamento FOREIGN KEY (meio_pagamento_id)
+            REFERENCES financas_pessoais.meios_pagamento(id),
+        CONSTRAINT FK_financas_pessoais_regras_conta FOREIGN KEY (conta_id)
+            REFERENCES financas_pessoais.conta_dimensao(id)
+    )
+
+    PRINT 'Tabela regras_categorizacao criada no esquema de produção.'
+END
+
+-- Criar tabela no esquema de desenvolvimento
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'regras_categorizacao' AND schema_id = SCHEMA_ID('financas_pessoais_dev'))
+BEGIN
+    CREATE TABLE financas_pessoais_dev.regras_categorizacao (
+        id INT IDENTITY(1,1) PRIMARY KEY,
+        nome NVARCHAR(100) NOT NULL,
+        padrao NVARCHAR(255) NOT NULL,
+        campo VARCHAR(20) NOT NULL DEFAULT 'descricao',
+        expressao_regular BIT NOT NULL DEFAULT 0,
+        categoria_id INT NULL,
+        meio_pagamento_id INT NULL,
+        conta_id INT NULL,
+        prioridade INT NOT NULL DEFAULT 100,
+        acertos INT NOT NULL DEFAULT 0,
+        ultimo_acerto DATETIME NULL,
+        data_criacao DATETIME DEFAULT GETDATE(),
+        ativo BIT DEFAULT 1,
+        CONSTRAINT FK_financas_pessoais_dev_regras_categoria FOREIGN KEY (categoria_id)
+            REFERENCES financas_pessoais_dev.categorias(id),
+        CONSTRAINT FK_financas_pessoais_dev_regras_meio_pagamento FOREIGN KEY (meio_pagamento_id)
+            REFERENCES financas_pessoais_dev.meios_pagamento(id),
+        CONSTRAINT FK_financas_pessoais_dev_regras_conta FOREIGN KEY (conta_id)
+            REFERENCES financas_pessoais_dev.conta_dimensao(id)
+    )
+
+    PRINT 'Tabela regras_categorizacao criada no esquema de desenvolvimento.'
+END
+
+PRINT 'Criação da tabela de regras de categorização concluída com sucesso!'
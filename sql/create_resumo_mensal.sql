@@ -0,0 +1,51 @@
+-- Script para criar a tabela de resumo mensal (conta x categoria x tipo x mês)
+-- A tabela é mantida pela aplicação na mesma transação das gravações em transacoes.
+-- Para recalcular a partir do histórico, use reconstruir_resumo_mensal.py
+
+-- Criar tabela no esquema de produção
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'resumo_mensal' AND schema_id = SCHEMA_ID('financas_pessoais'))
+BEGIN
+    CREATE TABLE financas_pessoais.resumo_mensal (
+        ano INT NOT NULL,
+        mes INT NOT NULL,
+        conta_id INT NOT NULL,
+        categoria_id INT NOT NULL,
+        tipo CHAR(1) NOT NULL,
+        total DECIMAL(15, 2) NOT NULL,
+        quantidade INT NOT NULL,
+        CONSTRAINT PK_financas_pessoais_resumo_mensal PRIMARY KEY (ano, mes, conta_id, categoria_id, tipo)
+    )
+
+    INSERT INTO financas_pessoais.resumo_mensal (ano, mes, conta_id, categoria_id, tipo, total, quantidade)
+    SELECT YEAR(data_transacao), MONTH(data_transacao), ISNULL(conta_id, 0), ISNULL(categoria_id, 0),
+           tipo, SUM(valor), COUNT(*)
+    FROM financas_pessoais.transacoes
+    GROUP BY YEAR(data_transacao), MONTH(data_transacao), ISNULL(conta_id, 0), ISNULL(categoria_id, 0), tipo
+
+    PRINT 'Tabela resumo_mensal criada no esquema de produção.'
+END
+
+-- Criar tabela no esquema de desenvolvimento
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'resumo_mensal' AND schema_id = SCHEMA_ID('financas_pessoais_dev'))
+BEGIN
+    CREATE TABLE financas_pessoais_dev.resumo_mensal (
+        ano INT NOT NULL,
+        mes INT NOT NULL,
+        conta_id INT NOT NULL,
+        categoria_id INT NOT NULL,
+        tipo CHAR(1) NOT NULL,
+        total DECIMAL(15, 2) NOT NULL,
+        quantidade INT NOT NULL,
+        CONSTRAINT PK_financas_pessoais_dev_resumo_mensal PRIMARY KEY (ano, mes, conta_id, categoria_id, tipo)
+    )
+
+    INSERT INTO financas_pessoais_dev.resumo_mensal (ano, mes, conta_id, categoria_id, tipo, total, quantidade)
+    SELECT YEAR(data_transacao), MONTH(data_transacao), ISNULL(conta_id, 0), ISNULL(categoria_id, 0),
+           tipo, SUM(valor), COUNT(*)
+    FROM financas_pessoais_dev.transacoes
+    GROUP BY YEAR(data_transacao), MONTH(data_transacao), ISNULL(conta_id, 0), ISNULL(categoria_id, 0), tipo
+
+    PRINT 'Tabela resumo_mensal criada no esquema de desenvolvimento.'
+END
+
+PRINT 'Criação da tabela de resumo mensal concluída com sucesso!'
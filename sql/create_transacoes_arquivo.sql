@@ -0,0 +1,140 @@
+-- Script para criar o arquivo de transações por ano e a view indexada resumo_anual.
+-- transacoes_arquivo recebe, com os ids originais, as transações dos anos encerrados
+-- (arquivar_ano.py); arquivamentos registra os anos arquivados. resumo_anual soma
+-- resumo_mensal por ano e é mantida pelo servidor, inclusive para os anos arquivados.
+
+-- Criar tabelas de arquivo no esquema de produção
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'transacoes_arquivo' AND schema_id = SCHEMA_ID('financas_pessoais'))
+BEGIN
+    CREATE TABLE financas_pessoais.transacoes_arquivo (
+        id INT NOT NULL PRIMARY KEY,
+        descricao NVARCHAR(255) NOT NULL,
+        valor DECIMAL(15, 2) NOT NULL,
+        data_transacao DATE NOT NULL,
+        tipo CHAR(1) NOT NULL,
+        categoria_id INT NULL,
+        conta_id INT NULL,
+        meio_pagamento_id INT NULL,
+        descricao_pagamento NVARCHAR(255) NULL,
+        local_transacao NVARCHAR(255) NULL,
+        observacao NVARCHAR(MAX) NULL,
+        data_criacao DATETIME NULL,
+        ativo BIT NULL,
+        transferencia_id INT NULL,
+        conta_destino_id INT NULL,
+        impressao_digital BIGINT NULL,
+        CONSTRAINT FK_financas_pessoais_transacoes_arquivo_categoria FOREIGN KEY (categoria_id)
+            REFERENCES financas_pessoais.categorias(id),
+        CONSTRAINT FK_financas_pessoais_transacoes_arquivo_conta FOREIGN KEY (conta_id)
+            REFERENCES financas_pessoais.conta_dimensao(id),
+        CONSTRAINT FK_financas_pessoais_transacoes_arquivo_conta_destino FOREIGN KEY (conta_destino_id)
+            REFERENCES financas_pessoais.conta_dimensao(id),
+        CONSTRAINT FK_financas_pessoais_transacoes_arquivo_meio_pagamento FOREIGN KEY (meio_pagamento_id)
+            REFERENCES financas_pessoais.meios_pagamento(id)
+    )
+
+    CREATE INDEX IX_transacoes_arquivo_data_id ON financas_pessoais.transacoes_arquivo (data_transacao DESC, id DESC)
+    CREATE INDEX IX_transacoes_arquivo_conta_data_id ON financas_pessoais.transacoes_arquivo (conta_id, data_transacao, id)
+        INCLUDE (tipo, valor, descricao)
+    CREATE INDEX IX_transacoes_arquivo_meio_data ON financas_pessoais.transacoes_arquivo (meio_pagamento_id, data_transacao)
+        INCLUDE (tipo, valor)
+    CREATE INDEX IX_transacoes_arquivo_impressao_digital ON financas_pessoais.transacoes_arquivo (impressao_digital)
+        INCLUDE (data_transacao)
+    PRINT 'Tabela transacoes_arquivo criada no esquema de produção.'
+END
+
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'arquivamentos' AND schema_id = SCHEMA_ID('financas_pessoais'))
+BEGIN
+    CREATE TABLE financas_pessoais.arquivamentos (
+        ano INT NOT NULL PRIMARY KEY,
+        quantidade INT NOT NULL,
+        data_arquivamento DATETIME DEFAULT GETDATE()
+    )
+    PRINT 'Tabela arquivamentos criada no esquema de produção.'
+END
+GO
+
+-- Criar tabelas de arquivo no esquema de desenvolvimento
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'transacoes_arquivo' AND schema_id = SCHEMA_ID('financas_pessoais_dev'))
+BEGIN
+    CREATE TABLE financas_pessoais_dev.transacoes_arquivo (
+        id INT NOT NULL PRIMARY KEY,
+        descricao NVARCHAR(255) NOT NULL,
+        valor DECIMAL(15, 2) NOT NULL,
+        data_transacao DATE NOT NULL,
+        tipo CHAR(1) NOT NULL,
+        categoria_id INT NULL,
+        conta_id INT NULL,
+        meio_pagamento_id INT NULL,
+        descricao_pagamento NVARCHAR(255) NULL,
+        local_transacao NVARCHAR(255) NULL,
+        observacao NVARCHAR(MAX) NULL,
+        data_criacao DATETIME NULL,
+        ativo BIT NULL,
+        transferencia_id INT NULL,
+        conta_destino_id INT NULL,
+        impressao_digital BIGINT NULL,
+        CONSTRAINT FK_financas_pessoais_dev_transacoes_arquivo_categoria FOREIGN KEY (categoria_id)
+            REFERENCES financas_pessoais_dev.categorias(id),
+        CONSTRAINT FK_financas_pessoais_dev_transacoes_arquivo_conta FOREIGN KEY (conta_id)
+            REFERENCES financas_pessoais_dev.conta_dimensao(id),
+        CONSTRAINT FK_financas_pessoais_dev_transacoes_arquivo_conta_destino FOREIGN KEY (conta_destino_id)
+            REFERENCES financas_pessoais_dev.conta_dimensao(id),
+        CONSTRAINT FK_financas_pessoais_dev_transacoes_arquivo_meio_pagamento FOREIGN KEY (meio_pagamento_id)
+            REFERENCES financas_pessoais_dev.meios_pagamento(id)
+    )
+
+    CREATE INDEX IX_transacoes_arquivo_data_id ON financas_pessoais_dev.transacoes_arquivo (data_transacao DESC, id DESC)
+    CREATE INDEX IX_transacoes_arquivo_conta_data_id ON financas_pessoais_dev.transacoes_arquivo (conta_id, data_transacao, id)
+        INCLUDE (tipo, valor, descricao)
+    CREATE INDEX IX_transacoes_arquivo_meio_data ON financas_pessoais_dev.transacoes_arquivo (meio_pagamento_id, data_transacao)
+        INCLUDE (tipo, valor)
+    CREATE INDEX IX_transacoes_arquivo_impressao_digital ON financas_pessoais_dev.transacoes_arquivo (impressao_digital)
+        INCLUDE (data_transacao)
+    PRINT 'Tabela transacoes_arquivo criada no esquema de desenvolvimento.'
+END
+
+IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'arquivamentos' AND schema_id = SCHEMA_ID('financas_pessoais_dev'))
+BEGIN
+    CREATE TABLE financas_pessoais_dev.arquivamentos (
+        ano INT NOT NULL PRIMARY KEY,
+        quantidade INT NOT NULL,
+        data_arquivamento DATETIME DEFAULT GETDATE()
+    )
+    PRINT 'Tabela arquivamentos criada no esquema de desenvolvimento.'
+END
+GO
+
+-- Views indexadas exigem estas opções na sessão que cria a view e o índice
+SET ANSI_NULLS ON
+SET QUOTED_IDENTIFIER ON
+SET ARITHABORT ON
+GO
+
+-- Criar view indexada no esquema de produção
+IF OBJECT_ID('financas_pessoais.resumo_anual', 'V') IS NULL
+BEGIN
+    EXEC('CREATE VIEW financas_pessoais.resumo_anual WITH SCHEMABINDING AS
+          SELECT ano, conta_id, categoria_id, tipo,
+                 SUM(total) AS total, SUM(quantidade) AS quantidade, COUNT_BIG(*) AS meses
+          FROM financas_pessoais.resumo_mensal
+          GROUP BY ano, conta_id, categoria_id, tipo')
+    EXEC('CREATE UNIQUE CLUSTERED INDEX IX_resumo_anual ON financas_pessoais.resumo_anual (ano, conta_id, categoria_id, tipo)')
+    PRINT 'View resumo_anual criada no esquema de produção.'
+END
+GO
+
+-- Criar view indexada no esquema de desenvolvimento
+IF OBJECT_ID('financas_pessoais_dev.resumo_anual', 'V') IS NULL
+BEGIN
+    EXEC('CREATE VIEW financas_pessoais_dev.resumo_anual WITH SCHEMABINDING AS
+          SELECT ano, conta_id, categoria_id, tipo,
+                 SUM(total) AS total, SUM(quantidade) AS quantidade, COUNT_BIG(*) AS meses
+          FROM financas_pessoais_dev.resumo_mensal
+          GROUP BY ano, conta_id, categoria_id, tipo')
+    EXEC('CREATE UNIQUE CLUSTERED INDEX IX_resumo_anual ON financas_pessoais_dev.resumo_anual (ano, conta_id, categoria_id, tipo)')
+    PRINT 'View resumo_anual criada no esquema de desenvolvimento.'
+END
+GO
+
+PRINT 'Criação do arquivo de transações concluída com sucesso!'
@@ -0,0 +1,93 @@
+"""
+Configuração da aplicação, lida uma única vez do arquivo .env.
+"""
+import os
+import sys
+import threading
+from dotenv import dotenv_values
+
+class Configuracao:
+    """Valores do .env e das variáveis de ambiente, carregados uma vez por processo.
+
+    O .env é procurado na pasta da aplicação (sys._MEIPASS no executável,
+    a raiz do projeto em desenvolvimento) e, se não existir lá, na pasta
+    atual. Os valores do arquivo têm precedência sobre as variáveis de
+    ambiente e são copiados para os.environ quando ainda não estão definidos
+    lá. Toda conexão com o banco usa string_conexao(), então a aplicação, os
+    utilitários e os scripts abrem conexões com a mesma string (e o mesmo
+    pool do driver).
+    """
+
+    DRIVER_PADRAO = 'ODBC Driver 17 for SQL Server'
+    PORTA_PADRAO = '1433'
+
+    # Variáveis exigidas quando não há SQL_CONNECTION_STRING
+    VARIAVEIS_OBRIGATORIAS = ('DB_SERVER', 'DB_DATABASE', 'DB_USERNAME', 'DB_PASSWORD')
+
+    _instancia = None
+    _trava = threading.Lock()
+
+    def __init__(self, valores, caminho_base, caminho_env=None):
+        self.caminho_base = caminho_base
+        self.caminho_env = caminho_env
+        self._valores = valores
+
+        self.servidor = valores.get('DB_SERVER')
+        self.porta = valores.get('DB_PORT') or self.PORTA_PADRAO
+        self.banco = valores.get('DB_DATABASE')
+        self.usuario = valores.get('DB_USERNAME')
+        self.senha = valores.get('DB_PASSWORD')
+        self.driver = valores.get('DB_DRIVER') or self.DRIVER_PADRAO
+        self.string_conexao_completa = valores.get('SQL_CONNECTION_STRING')
+
+        self.notion_token = valores.get('NOTION_TOKEN')
+        self.notion_cartao_database_id = valores.get('NOTION_CARTAO_DATABASE_ID')
+
+        self.diretorio_diario = (valores.get('DIARIO_LOCAL_DIR') or
+                                 os.path.join(os.path.expanduser('~'), '.financas_pessoais'))
+
+    @classmethod
+    def carregar(cls, recarregar=False):
+        """Retorna a configuração do processo, lendo o .env só na primeira chamada."""
+        with cls._trava:
+            if cls._instancia is None or recarregar:
+                caminho_base = cls.obter_caminho_base()
+                caminho_env = next((caminho for caminho in (os.path.join(caminho_base, '.env'),
+                                                             os.path.abspath('.env'))
+                                    if os.path.exists(caminho)), None)
+
+                arquivo = {chave: valor for chave, valor in dotenv_values(caminho_env).items()
+                           if valor is not None} if caminho_env else {}
+                # Disponibilizar em os.environ, sem sobrescrever (ex.: ENVIRONMENT escolhido na abertura)
+                for chave, valor in arquivo.items():
+                    os.environ.setdefault(chave, valor)
+
+                valores = dict(os.environ)
+                valores.update(arquivo)
+                cls._instancia = cls(valores, caminho_base, caminho_env)
+            return cls._instancia
+
+    @staticmethod
+    def obter_caminho_base():
+        """Pasta da aplicação: sys._MEIPASS no executável, a raiz do projeto em desenvolvimento."""
+        if getattr(sys, 'frozen', False):
+            return sys._MEIPASS
+        return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    def variaveis_ausentes(self):
+        """Variáveis de conexão que faltam (vazio se SQL_CONNECTION_STRING estiver definida)."""
+        if self.string_conexao_completa:
+            return []
+        return [variavel for variavel in self.VARIAVEIS_OBRIGATORIAS if not self._valores.get(variavel)]
+
+    def string_conexao(self):
+        """String de conexão ODBC usada por todas as conexões com o banco."""
+        if self.string_conexao_completa:
+            return self.string_conexao_completa
+
+        driver = self.driver if self.driver.startswith('{') else '{' + self.driver + '}'
+        return (
+            f'DRIVER={driver};SERVER={self.servidor};PORT={self.porta};DATABASE={self.banco};'
+            f'UID={self.usuario};PWD={self.senha};'
+            f'Connection Timeout=30;Connection Retry Count=3;'
+        )
@@ -1,3 +1,4 @@
+from src.config import Configuracao
 from src.services.notion_service import NotionService
 from src.models.conta import Conta
 
@@ -28,8 +29,7 @@ class NotionController:
             
             # Usar database_id do .env se não fornecido
             if not database_id:
-                import os
-                database_id = os.getenv('NOTION_CARTAO_DATABASE_ID')
+                database_id = Configuracao.carregar().notion_cartao_database_id
                 if not database_id:
                     return False, "ID do banco de dados do Notion não fornecido e não encontrado no .env", 0
             
@@ -1,4 +1,5 @@
 from .connection import DatabaseConnection
 from .setup import DatabaseSetup
+from .diario_local import DiarioLocal
 
-__all__ = ['DatabaseConnection', 'DatabaseSetup']
\ No newline at end of file
+__all__ = ['DatabaseConnection', 'DatabaseSetup', 'DiarioLocal']
\ No newline at end of file
@@ -1,13 +1,17 @@
 import os
 import pyodbc
-import time
-from dotenv import load_dotenv, dotenv_values
+import threading
+from src.config import Configuracao
+from src.database.estado_conexao import EstadoConexao
 
 class DatabaseConnection:
     """Classe para gerenciar a conexão com o banco de dados SQL Server na Azure."""
     
     _instances = {}  # Dicionário para armazenar instâncias por ambiente
     
+    # Tempo máximo (segundos) de uma tentativa de conexão
+    TEMPO_LIMITE_CONEXAO = 15
+    
     def __new__(cls, environment=None):
         """Implementação do padrão Singleton por ambiente."""
         environment = environment or os.getenv('ENVIRONMENT', 'prod')
@@ -15,108 +19,101 @@ class DatabaseConnection:
         # Criar uma instância separada para cada ambiente
         if environment not in cls._instances:
             instance = super(DatabaseConnection, cls).__new__(cls)
+            # Uma conexão por thread: conexões pyodbc não podem ser compartilhadas entre threads
+            instance._local = threading.local()
             instance._connection = None
             instance.environment = environment
             instance.schema = f"financas_pessoais{'_dev' if environment == 'dev' else ''}"
             
-            # Carregar variáveis de ambiente
-            load_dotenv(override=True)
+            # Configuração compartilhada (o .env é lido uma única vez por processo)
+            instance.config = Configuracao.carregar()
             
-            # Carregar diretamente do arquivo para garantir
-            instance.env_values = dotenv_values(".env")
+            # Saúde da conexão e disjuntor, compartilhados pelas threads
+            instance.estado = EstadoConexao()
             
             cls._instances[environment] = instance
             
         return cls._instances[environment]
     
+    @property
+    def _connection(self):
+        """Conexão da thread atual."""
+        return getattr(self._local, 'connection', None)
+    
+    @_connection.setter
+    def _connection(self, value):
+        self._local.connection = value
+    
     def connect(self):
-        """Estabelece uma conexão com o banco de dados."""
+        """Estabelece uma conexão com o banco de dados.
+
+        Uma única tentativa, limitada a TEMPO_LIMITE_CONEXAO segundos: as novas
+        tentativas ficam com o disjuntor (self.estado) e com o monitor de
+        conexão da interface, em vez de bloquear quem chamou.
+        """
         if self._connection is None:
-            max_retries = 3
-            retry_count = 0
-            
-            while retry_count < max_retries:
-                try:
-                    # Tentar usar a string de conexão completa se disponível
-                    conn_str_full = self.env_values.get('SQL_CONNECTION_STRING') or os.getenv('SQL_CONNECTION_STRING')
-                    
-                    if conn_str_full:
-                        connection_string = conn_str_full
-                    else:
-                        # Preferir valores do arquivo diretamente
-                        server = self.env_values.get('DB_SERVER') or os.getenv('DB_SERVER')
-                        port = self.env_values.get('DB_PORT') or os.getenv('DB_PORT', '1433')
-                        database = self.env_values.get('DB_DATABASE') or os.getenv('DB_DATABASE')
-                        username = self.env_values.get('DB_USERNAME') or os.getenv('DB_USERNAME')
-                        password = self.env_values.get('DB_PASSWORD') or os.getenv('DB_PASSWORD')
-                        driver = self.env_values.get('DB_DRIVER') or os.getenv('DB_DRIVER', 'ODBC Driver 17 for SQL Server')
-                        
-                        # Tratar o driver corretamente
-                        if not driver.startswith('{'):
-                            driver = '{' + driver + '}'
-                        
-                        # Adicionar parâmetros de timeout e conexão
-                        connection_string = (
-                            f'DRIVER={driver};SERVER={server};PORT={port};DATABASE={database};'
-                            f'UID={username};PWD={password};'
-                            f'Connection Timeout=30;Connection Retry Count=3;'
-                        )
-                    
-                    self._connection = pyodbc.connect(connection_string)
-                    print(f"Conexão com o banco de dados estabelecida com sucesso. Usando esquema: {self.schema}")
-                    
-                    # Criar o esquema se não existir
-                    self._ensure_schema_exists()
-                    
-                    # Conexão bem-sucedida, sair do loop
-                    break
-                    
-                except pyodbc.Error as e:
-                    retry_count += 1
-                    print(f"Erro ao conectar ao banco de dados (tentativa {retry_count}/{max_retries}): {e}")
-                    
-                    if retry_count >= max_retries:
-                        print("Número máximo de tentativas excedido.")
-                        raise
-                    
-                    # Esperar antes de tentar novamente (backoff exponencial)
-                    wait_time = 2 ** retry_count  # 2, 4, 8 segundos...
-                    print(f"Aguardando {wait_time} segundos antes de tentar novamente...")
-                    time.sleep(wait_time)
-                    
+            self.estado.verificar()
+            self._connection = self._abrir()
         return self._connection
     
-    def _ensure_schema_exists(self):
-        """Garante que o esquema exista."""
+    def _abrir(self):
+        """Abre uma conexão nova, registrando o resultado no estado da conexão."""
         try:
-            cursor = self._connection.cursor()
-            cursor.execute(f"""
-            IF NOT EXISTS (SELECT * FROM sys.schemas WHERE name = '{self.schema}')
-            BEGIN
-                EXEC('CREATE SCHEMA {self.schema}')
-            END
-            """)
-            self._connection.commit()
-        except Exception as e:
-            print(f"Aviso: Não foi possível verificar/criar o esquema: {e}")
+            connection = pyodbc.connect(self.config.string_conexao(), timeout=self.TEMPO_LIMITE_CONEXAO)
+        except pyodbc.Error as e:
+            print(f"Erro ao conectar ao banco de dados: {e}")
+            self.estado.registrar_falha(e)
+            raise
+        print(f"Conexão com o banco de dados estabelecida com sucesso. Usando esquema: {self.schema}")
+        self.estado.registrar_sucesso()
+        return connection
     
     def get_cursor(self):
-        """Retorna um cursor para executar consultas SQL."""
+        """Retorna um cursor para executar consultas SQL.
+
+        Levanta ServidorIndisponivel, sem tocar na rede, enquanto o disjuntor
+        estiver aberto.
+        """
+        reaproveitada = self._connection is not None
+        connection = self.connect()
         try:
-            connection = self.connect()
-            cursor = connection.cursor()
-            
-            # Configurar timeout para consultas
-            cursor.execute("SET QUERY_GOVERNOR_COST_LIMIT 0")  # Desativar limite de custo
-            cursor.execute("SET LOCK_TIMEOUT 30000")  # 30 segundos de timeout para locks
-            
-            return cursor
+            return self._novo_cursor(connection)
         except pyodbc.Error as e:
             print(f"Erro ao obter cursor: {e}")
-            # Tentar reconectar
+            if not reaproveitada:
+                # A conexão acabou de ser aberta: não é uma conexão velha que caiu
+                raise
+            # A conexão da thread pode ter caído sozinha: tentar uma conexão nova
             self._connection = None
-            connection = self.connect()
-            return connection.cursor()
+            return self._novo_cursor(self.connect())
+    
+    def _novo_cursor(self, connection):
+        """Cria um cursor na conexão com as configurações de sessão da aplicação."""
+        cursor = connection.cursor()
+        
+        # Configurar timeout para consultas
+        cursor.execute("SET QUERY_GOVERNOR_COST_LIMIT 0")  # Desativar limite de custo
+        cursor.execute("SET LOCK_TIMEOUT 30000")  # 30 segundos de timeout para locks
+        
+        return cursor
+    
+    def testar(self):
+        """Verifica se o servidor responde, ignorando o disjuntor.
+
+        Usado pela sondagem de reconexão; retorna True se o servidor respondeu.
+        """
+        try:
+            if self._connection is not None:
+                try:
+                    self._connection.cursor().execute("SELECT 1").fetchone()
+                    self.estado.registrar_sucesso()
+                    return True
+                except pyodbc.Error:
+                    self._connection = None
+            self._connection = self._abrir()
+            return True
+        except pyodbc.Error:
+            return False
     
     def close(self):
         """Fecha a conexão com o banco de dados."""
@@ -3,8 +3,14 @@ Funções auxiliares para acesso ao banco de dados.
 """
 import os
 from src.database.connection import DatabaseConnection
+from src.database.diario_local import DiarioLocal
 
 def get_db_connection():
     """Retorna uma conexão com o banco de dados usando o ambiente atual."""
     environment = os.getenv('ENVIRONMENT', 'prod')
-    return DatabaseConnection(environment=environment)
\ No newline at end of file
+    return DatabaseConnection(environment=environment)
+
+def get_diario_local():
+    """Retorna o diário local de gravações pendentes do ambiente atual."""
+    environment = os.getenv('ENVIRONMENT', 'prod')
+    return DiarioLocal(environment=environment)
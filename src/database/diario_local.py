@@ -0,0 +1,285 @@
+"""
+Diário local das gravações ainda não enviadas ao servidor.
+"""
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from src.config import Configuracao
+
+class DiarioLocal:
+    """Fila persistente (arquivo SQLite local) de gravações a enviar ao SQL Server.
+
+    As gravações são aceitas imediatamente, na velocidade do disco local, e
+    enviadas depois por SincronizacaoService. Cada operação guarda os dados
+    gravados e, nas alterações, os valores originais lidos do servidor, usados
+    para detectar conflitos. Registros criados localmente recebem um id
+    provisório negativo (o oposto do id da operação), trocado pelo id do
+    servidor quando a operação é enviada. Cada operação tem também um
+    identificador global (id_diario), gravado junto com os registros que ela
+    insere no servidor, para que o reenvio de uma inclusão sem confirmação
+    encontre exatamente o registro já inserido.
+    """
+
+    # Situações de uma operação
+    PENDENTE = 'pendente'
+    ENVIANDO = 'enviando'   # enviada ao servidor, sem confirmação gravada no diário
+    CONFLITO = 'conflito'   # o registro foi alterado no servidor depois de lido
+    ERRO = 'erro'           # falhou MAX_TENTATIVAS vezes
+
+    # Falhas seguidas antes de a operação deixar de ser reenviada automaticamente
+    MAX_TENTATIVAS = 5
+
+    _instances = {}
+    _lock = threading.Lock()
+
+    def __new__(cls, environment=None):
+        """Uma instância (e um arquivo) por ambiente."""
+        environment = environment or os.getenv('ENVIRONMENT', 'prod')
+        with cls._lock:
+            if environment not in cls._instances:
+                instance = super(DiarioLocal, cls).__new__(cls)
+                instance.environment = environment
+                instance.caminho = os.path.join(Configuracao.carregar().diretorio_diario,
+                                                f"diario_{environment}.sqlite3")
+                instance._criado = False
+                cls._instances[environment] = instance
+        return cls._instances[environment]
+
+    def _conectar(self):
+        """Abre uma conexão com o arquivo do diário (uma por chamada: o SQLite é usado por várias threads)."""
+        if not self._criado:
+            os.makedirs(os.path.dirname(self.caminho), exist_ok=True)
+        conexao = sqlite3.connect(self.caminho, timeout=30)
+        conexao.row_factory = sqlite3.Row
+        if not self._criado:
+            conexao.execute("PRAGMA journal_mode=WAL")
+            conexao.executescript("""
+                CREATE TABLE IF NOT EXISTS operacoes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    entidade TEXT NOT NULL,
+                    operacao TEXT NOT NULL,
+                    registro_id INTEGER,
+                    id_diario TEXT NOT NULL,
+                    dados TEXT NOT NULL,
+                    original TEXT,
+                    situacao TEXT NOT NULL DEFAULT 'pendente',
+                    tentativas INTEGER NOT NULL DEFAULT 0,
+                    erro TEXT,
+                    data_criacao TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS ids_servidor (
+                    entidade TEXT NOT NULL,
+                    id_provisorio INTEGER NOT NULL,
+                    id_servidor INTEGER NOT NULL,
+                    PRIMARY KEY (entidade, id_provisorio)
+                );
+            """)
+            self._criado = True
+        return conexao
+
+    def enfileirar(self, entidade, operacao, dados, original=None, registro_id=None):
+        """Grava uma operação no diário.
+
+        Args:
+            entidade: 'transacao', 'gasto_recorrente' ou 'pagamento'
+            operacao: 'inserir', 'atualizar', 'atualizar_lote', 'excluir' ou 'pagar'
+            dados: Dicionário com os campos gravados
+            original: Campos lidos do servidor antes da alteração (para detectar conflitos)
+            registro_id: Id do registro alterado; None para inserções
+
+        Returns:
+            int: Id do registro (provisório e negativo nas inserções)
+        """
+        conexao = self._conectar()
+        try:
+            with conexao:
+                cursor = conexao.execute("""
+                    INSERT INTO operacoes (entidade, operacao, registro_id, id_diario, dados, original, data_criacao)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (entidade, operacao, registro_id, str(uuid.uuid4()), self.codificar(dados),
+                      self.codificar(original) if original is not None else None,
+                      datetime.now().isoformat(timespec='seconds')))
+                if registro_id is None:
+                    registro_id = -cursor.lastrowid
+                    conexao.execute("UPDATE operacoes SET registro_id = ? WHERE id = ?",
+                                    (registro_id, cursor.lastrowid))
+            return registro_id
+        finally:
+            conexao.close()
+
+    def pendentes(self, limite):
+        """Retorna, em ordem de gravação, as próximas operações a enviar."""
+        conexao = self._conectar()
+        try:
+            rows = conexao.execute("""
+                SELECT * FROM operacoes WHERE situacao IN (?, ?) ORDER BY id LIMIT ?
+            """, (self.PENDENTE, self.ENVIANDO, limite)).fetchall()
+            return [self._de_row(row) for row in rows]
+        finally:
+            conexao.close()
+
+    def ultima_pendente(self, entidade, registro_id):
+        """Retorna a última operação ainda não enviada sobre um registro (ou None).
+
+        Inclui as operações gravadas com o id provisório de um registro que já
+        foi inserido no servidor com o id registro_id.
+        """
+        conexao = self._conectar()
+        try:
+            row = conexao.execute("""
+                SELECT * FROM operacoes
+                WHERE entidade = ? AND situacao IN (?, ?)
+                  AND (registro_id = ? OR registro_id IN (
+                      SELECT id_provisorio FROM ids_servidor WHERE entidade = ? AND id_servidor = ?))
+                ORDER BY id DESC LIMIT 1
+            """, (entidade, self.PENDENTE, self.ENVIANDO, registro_id, entidade, registro_id)).fetchone()
+            return self._de_row(row) if row else None
+        finally:
+            conexao.close()
+
+    def lotes_pendentes(self, entidade, depois_de=0):
+        """Retorna as alterações em lote ainda não enviadas, gravadas depois da operação depois_de."""
+        conexao = self._conectar()
+        try:
+            rows = conexao.execute("""
+                SELECT * FROM operacoes
+                WHERE entidade = ? AND operacao = 'atualizar_lote' AND situacao IN (?, ?) AND id > ?
+                ORDER BY id
+            """, (entidade, self.PENDENTE, self.ENVIANDO, depois_de)).fetchall()
+            return [self._de_row(row) for row in rows]
+        finally:
+            conexao.close()
+
+    def problemas(self):
+        """Retorna as operações em conflito ou com erro, que aguardam decisão do usuário."""
+        conexao = self._conectar()
+        try:
+            rows = conexao.execute("SELECT * FROM operacoes WHERE situacao IN (?, ?) ORDER BY id",
+                                   (self.CONFLITO, self.ERRO)).fetchall()
+            return [self._de_row(row) for row in rows]
+        finally:
+            conexao.close()
+
+    def contar(self):
+        """Retorna (operações a enviar, operações em conflito ou com erro)."""
+        conexao = self._conectar()
+        try:
+            row = conexao.execute("""
+                SELECT COALESCE(SUM(situacao IN (?, ?)), 0), COALESCE(SUM(situacao IN (?, ?)), 0)
+                FROM operacoes
+            """, (self.PENDENTE, self.ENVIANDO, self.CONFLITO, self.ERRO)).fetchone()
+            return row[0], row[1]
+        finally:
+            conexao.close()
+
+    def marcar(self, operacao_ids, situacao, erro=None):
+        """Altera a situação de operações."""
+        if not operacao_ids:
+            return
+        conexao = self._conectar()
+        try:
+            with conexao:
+                conexao.executemany("UPDATE operacoes SET situacao = ?, erro = ? WHERE id = ?",
+                                    [(situacao, erro, operacao_id) for operacao_id in operacao_ids])
+        finally:
+            conexao.close()
+
+    def registrar_falha(self, operacao_id, erro):
+        """Conta uma falha de envio; após MAX_TENTATIVAS a operação passa a ERRO."""
+        conexao = self._conectar()
+        try:
+            with conexao:
+                conexao.execute("""
+                    UPDATE operacoes
+                    SET tentativas = tentativas + 1, erro = ?,
+                        situacao = CASE WHEN tentativas + 1 >= ? THEN ? ELSE situacao END
+                    WHERE id = ?
+                """, (erro, self.MAX_TENTATIVAS, self.ERRO, operacao_id))
+        finally:
+            conexao.close()
+
+    def concluir(self, operacao_ids, ids_servidor=None):
+        """Remove operações enviadas e grava os ids definitivos dos registros inseridos.
+
+        Args:
+            ids_servidor: Dicionário {(entidade, id_provisorio): id_servidor}
+        """
+        conexao = self._conectar()
+        try:
+            with conexao:
+                if ids_servidor:
+                    conexao.executemany("""
+                        INSERT OR REPLACE INTO ids_servidor (entidade, id_provisorio, id_servidor)
+                        VALUES (?, ?, ?)
+                    """, [(entidade, provisorio, servidor)
+                          for (entidade, provisorio), servidor in ids_servidor.items()])
+                conexao.executemany("DELETE FROM operacoes WHERE id = ?",
+                                    [(operacao_id,) for operacao_id in operacao_ids])
+        finally:
+            conexao.close()
+
+    def reenviar(self, operacao_id):
+        """Volta uma operação à fila, sem verificar conflito (o usuário decidiu sobrescrever)."""
+        conexao = self._conectar()
+        try:
+            with conexao:
+                conexao.execute("""
+                    UPDATE operacoes SET situacao = ?, original = NULL, tentativas = 0, erro = NULL
+                    WHERE id = ?
+                """, (self.PENDENTE, operacao_id))
+        finally:
+            conexao.close()
+
+    def descartar(self, operacao_id):
+        """Remove uma operação sem enviá-la."""
+        self.concluir([operacao_id])
+
+    def resolver(self, entidade, registro_id):
+        """Converte um id provisório no id do servidor (None se ainda não enviado)."""
+        if registro_id is None or registro_id > 0:
+            return registro_id
+        conexao = self._conectar()
+        try:
+            row = conexao.execute("""
+                SELECT id_servidor FROM ids_servidor WHERE entidade = ? AND id_provisorio = ?
+            """, (entidade, registro_id)).fetchone()
+            return row[0] if row else None
+        finally:
+            conexao.close()
+
+    def _de_row(self, row):
+        """Converte uma linha de operacoes em dicionário, com dados e original decodificados."""
+        operacao = dict(row)
+        operacao['dados'] = self.decodificar(row['dados'])
+        operacao['original'] = self.decodificar(row['original']) if row['original'] else None
+        return operacao
+
+    @staticmethod
+    def codificar(dados):
+        """Serializa em JSON, preservando datas e valores decimais."""
+        def converter(valor):
+            if isinstance(valor, datetime):
+                return {'$datetime': valor.isoformat()}
+            if isinstance(valor, date):
+                return {'$date': valor.isoformat()}
+            if isinstance(valor, Decimal):
+                return {'$decimal': str(valor)}
+            raise TypeError(f"Tipo não suportado no diário: {type(valor).__name__}")
+        return json.dumps(dados, default=converter)
+
+    @staticmethod
+    def decodificar(texto):
+        """Desfaz codificar()."""
+        def converter(objeto):
+            if '$datetime' in objeto:
+                return datetime.fromisoformat(objeto['$datetime'])
+            if '$date' in objeto:
+                return date.fromisoformat(objeto['$date'])
+            if '$decimal' in objeto:
+                return Decimal(objeto['$decimal'])
+            return objeto
+        return json.loads(texto, object_hook=converter)
@@ -0,0 +1,101 @@
+"""
+Estado de saúde da conexão com o servidor e disjuntor (circuit breaker) das chamadas.
+"""
+import threading
+import time
+
+class ServidorIndisponivel(Exception):
+    """O servidor está fora do ar e o disjuntor está aberto; a chamada nem foi tentada."""
+
+class EstadoConexao:
+    """Acompanha as falhas de conexão e faz as chamadas falharem na hora enquanto o servidor estiver fora.
+
+    Situações:
+        CONECTADO: a última tentativa funcionou
+        INSTAVEL: houve falha, mas ainda abaixo de LIMITE_FALHAS (ou uma nova tentativa está em curso)
+        OFFLINE: LIMITE_FALHAS falhas seguidas; o disjuntor fica aberto por `espera` segundos,
+                 dobrando a cada nova falha até ESPERA_MAXIMA
+
+    Com o disjuntor aberto, verificar() levanta ServidorIndisponivel sem tocar
+    na rede. Vencida a espera, uma única chamada passa para testar o servidor
+    (as demais continuam falhando até ela terminar).
+    """
+
+    CONECTADO = 'conectado'
+    INSTAVEL = 'instavel'
+    OFFLINE = 'offline'
+
+    LIMITE_FALHAS = 2
+    ESPERA_INICIAL = 5
+    ESPERA_MAXIMA = 120
+
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._ouvintes = []
+        self.situacao = None
+        self.falhas = 0
+        self.espera = self.ESPERA_INICIAL
+        self.proxima_tentativa = 0
+        self.ultimo_erro = None
+        self._em_teste = False
+
+    def ao_mudar(self, funcao):
+        """Registra funcao(situacao), chamada (na thread que detectou a mudança) quando a situação muda."""
+        self._ouvintes.append(funcao)
+
+    def verificar(self):
+        """Levanta ServidorIndisponivel se o disjuntor estiver aberto."""
+        with self._trava:
+            if self._em_teste:
+                raise ServidorIndisponivel(f"Servidor indisponível: {self.ultimo_erro}")
+            if self.situacao != self.OFFLINE:
+                return
+            agora = time.monotonic()
+            if agora < self.proxima_tentativa:
+                raise ServidorIndisponivel(f"Servidor indisponível: {self.ultimo_erro}")
+            # Deixar passar só esta chamada; as outras esperam o resultado dela
+            self.proxima_tentativa = agora + self.espera
+            self._em_teste = True
+        self._mudar(self.INSTAVEL)
+
+    def registrar_sucesso(self):
+        """Fecha o disjuntor após uma chamada bem-sucedida."""
+        with self._trava:
+            self.falhas = 0
+            self.espera = self.ESPERA_INICIAL
+            self.ultimo_erro = None
+            self._em_teste = False
+        self._mudar(self.CONECTADO)
+
+    def registrar_falha(self, erro):
+        """Conta uma falha de conexão e abre o disjuntor ao atingir LIMITE_FALHAS."""
+        with self._trava:
+            self.falhas += 1
+            self.ultimo_erro = erro
+            self._em_teste = False
+            if self.situacao == self.OFFLINE and time.monotonic() < self.proxima_tentativa:
+                # Chamada que já estava em curso quando o disjuntor abriu: não prolonga a espera
+                return
+            if self.falhas < self.LIMITE_FALHAS:
+                situacao = self.INSTAVEL
+            else:
+                situacao = self.OFFLINE
+                self.proxima_tentativa = time.monotonic() + self.espera
+                self.espera = min(self.espera * 2, self.ESPERA_MAXIMA)
+        self._mudar(situacao)
+
+    def segundos_para_tentar(self):
+        """Segundos até o disjuntor deixar passar uma nova tentativa (0 se já pode)."""
+        return max(0, self.proxima_tentativa - time.monotonic())
+
+    def _mudar(self, situacao):
+        """Atualiza a situação e avisa os ouvintes se ela mudou."""
+        with self._trava:
+            if situacao == self.situacao:
+                return
+            self.situacao = situacao
+        for funcao in list(self._ouvintes):
+            try:
+                funcao(situacao)
+            except Exception as e:
+                print(f"Erro ao notificar mudança de conexão: {e}")
@@ -9,27 +9,90 @@ class DatabaseSetup:
         self.schema = f"financas_pessoais{'_dev' if self.environment == 'dev' else ''}"
         self.db = DatabaseConnection(environment=self.environment)
     
+    # Migrações do esquema, na ordem de aplicação: (versão, descrição, método).
+    # Uma migração aplicada não deve mudar; alterações novas entram no fim com a próxima versão.
+    # Os métodos são idempotentes, então bancos criados antes do controle de versão
+    # passam por todos uma única vez.
+    MIGRACOES = (
+        (1, "Tabela categorias", '_create_categorias_table'),
+        (2, "Tabela conta_dimensao", '_create_conta_dimensao_table'),
+        (3, "Tabela conta_saldos", '_create_conta_saldos_table'),
+        (4, "Tabela meios_pagamento", '_create_meios_pagamento_table'),
+        (5, "Tabela transacoes", '_create_transacoes_table'),
+        (6, "Campos de transferência em transacoes", '_create_transacoes_transferencias'),
+        (7, "Índices de transacoes", '_create_transacoes_indexes'),
+        (8, "Tabela resumo_mensal", '_create_resumo_mensal_table'),
+        (9, "Faturas de cartão", '_create_faturas_cartao_view'),
+        (10, "Tabela regras_categorizacao", '_create_regras_categorizacao_table'),
+        (11, "Impressão digital de transacoes", '_create_transacoes_impressao_digital'),
+        (12, "Tabelas de gastos recorrentes", '_create_gastos_recorrentes_tables'),
+        (13, "Rastreamento de alterações", '_create_rastreamento_alteracoes'),
+        (14, "Índice de texto completo de transacoes", '_create_transacoes_fulltext_index'),
+        (15, "Id do diário local em transacoes e gastos_recorrentes", '_create_id_diario_columns'),
+        (16, "Arquivo de transações e resumo anual", '_create_transacoes_arquivo'),
+        (17, "Índices de transferencia_id", '_create_transferencia_indexes'),
+    )
+    
     def create_tables(self):
-        """Cria as tabelas no banco de dados se não existirem."""
+        """Aplica as migrações pendentes do esquema.
+        
+        Uma única consulta lê a versão do esquema e se falta o índice de texto
+        completo; se ele estiver atualizado, nada mais é executado. Cada
+        migração é confirmada junto com o registro da sua versão, então uma
+        falha interrompe a atualização sem perder as migrações anteriores.
+        A migração 14 é registrada mesmo se o índice de texto completo não
+        puder ser criado; a criação é tentada de novo a cada início.
+        """
         try:
-            # Criar o esquema se não existir
-            self._create_schema()
+            versao, sem_texto_completo = self._obter_situacao()
+            if sem_texto_completo and versao >= 14:
+                self._create_transacoes_fulltext_index()
             
-            # Criar tabelas usando o esquema correto
-            self._create_categorias_table()
-            self._create_conta_dimensao_table()
-            self._create_conta_saldos_table()
-            self._create_meios_pagamento_table()
-            self._create_transacoes_table()
+            pendentes = [migracao for migracao in self.MIGRACOES if migracao[0] > versao]
+            if not pendentes:
+                print(f"Esquema {self.schema} atualizado (versão {versao})")
+                return True
             
+            self._create_schema()
+            self._create_versao_esquema_table()
             self.db.commit()
-            print(f"Tabelas criadas com sucesso no esquema {self.schema}")
+            
+            for numero, descricao, metodo in pendentes:
+                print(f"Aplicando migração {numero}: {descricao}")
+                getattr(self, metodo)()
+                self.db.execute_query(f"""
+                    INSERT INTO {self.schema}.versao_esquema (versao, descricao) VALUES (?, ?)
+                """, (numero, descricao))
+                self.db.commit()
+            
+            print(f"Esquema {self.schema} atualizado para a versão {pendentes[-1][0]}")
             return True
         except Exception as e:
             self.db.rollback()
             print(f"Erro ao criar tabelas: {e}")
             return False
     
+    def obter_versao(self):
+        """Retorna a última migração aplicada (0 se o esquema ainda não tem controle de versão)."""
+        return self._obter_situacao()[0]
+    
+    def _obter_situacao(self):
+        """Retorna a última migração aplicada e se o servidor suporta, mas não tem, o índice de texto completo."""
+        cursor = self.db.execute_query(f"""
+        IF OBJECT_ID('{self.schema}.versao_esquema', 'U') IS NULL
+            SELECT 0, 0
+        ELSE
+            SELECT ISNULL(MAX(versao), 0),
+                   CASE WHEN FULLTEXTSERVERPROPERTY('IsFullTextInstalled') = 1
+                             AND OBJECT_ID('{self.schema}.transacoes', 'U') IS NOT NULL
+                             AND NOT EXISTS (SELECT * FROM sys.fulltext_indexes
+                                             WHERE object_id = OBJECT_ID('{self.schema}.transacoes'))
+                        THEN 1 ELSE 0 END
+            FROM {self.schema}.versao_esquema
+        """)
+        row = cursor.fetchone()
+        return row[0], bool(row[1])
+    
     def _create_schema(self):
         """Cria o esquema se não existir."""
         query = f"""
@@ -40,6 +103,20 @@ class DatabaseSetup:
         """
         self.db.execute_query(query)
     
+    def _create_versao_esquema_table(self):
+        """Cria a tabela com as migrações já aplicadas."""
+        query = f"""
+        IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'versao_esquema' AND schema_id = SCHEMA_ID('{self.schema}'))
+        BEGIN
+            CREATE TABLE {self.schema}.versao_esquema (
+                versao INT PRIMARY KEY,
+                descricao NVARCHAR(200) NOT NULL,
+                data_aplicacao DATETIME DEFAULT GETDATE()
+            )
+        END
+        """
+        self.db.execute_query(query)
+    
     def _create_categorias_table(self):
         """Cria a tabela de categorias."""
         query = f"""
@@ -151,4 +228,406 @@ class DatabaseSetup:
             )
         END
         """
-        self.db.execute_query(query)
\ No newline at end of file
+        self.db.execute_query(query)
+    
+    def _create_transacoes_transferencias(self):
+        """Adiciona os campos que ligam as duas pernas de uma transferência."""
+        self.db.execute_query(f"""
+        IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('{self.schema}.transacoes')
+                       AND name = 'transferencia_id')
+        BEGIN
+            ALTER TABLE {self.schema}.transacoes ADD transferencia_id INT NULL
+        END
+        
+        IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('{self.schema}.transacoes')
+                       AND name = 'conta_destino_id')
+        BEGIN
+            ALTER TABLE {self.schema}.transacoes ADD conta_destino_id INT NULL
+            ALTER TABLE {self.schema}.transacoes ADD CONSTRAINT FK_{self.schema}_transacoes_conta_destino
+                FOREIGN KEY (conta_destino_id) REFERENCES {self.schema}.conta_dimensao(id)
+        END
+        """)
+    
+    def _create_transacoes_indexes(self):
+        """Cria os índices de apoio às consultas de transações."""
+        query = f"""
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_data_id'
+                       AND object_id = OBJECT_ID('{self.schema}.transacoes'))
+        BEGIN
+            CREATE INDEX IX_transacoes_data_id ON {self.schema}.transacoes (data_transacao DESC, id DESC)
+        END
+        
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_conta_data_id'
+                       AND object_id = OBJECT_ID('{self.schema}.transacoes'))
+        BEGIN
+            CREATE INDEX IX_transacoes_conta_data_id ON {self.schema}.transacoes (conta_id, data_transacao, id)
+                INCLUDE (tipo, valor, descricao)
+        END
+        """
+        self.db.execute_query(query)
+    
+    def _create_resumo_mensal_table(self):
+        """Cria a tabela de resumo mensal, preenchendo-a a partir das transações existentes."""
+        query = f"""
+        IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'resumo_mensal' AND schema_id = SCHEMA_ID('{self.schema}'))
+        BEGIN
+            CREATE TABLE {self.schema}.resumo_mensal (
+                ano INT NOT NULL,
+                mes INT NOT NULL,
+                conta_id INT NOT NULL,
+                categoria_id INT NOT NULL,
+                tipo CHAR(1) NOT NULL,
+                total DECIMAL(15, 2) NOT NULL,
+                quantidade INT NOT NULL,
+                CONSTRAINT PK_{self.schema}_resumo_mensal PRIMARY KEY (ano, mes, conta_id, categoria_id, tipo)
+            )
+            
+            INSERT INTO {self.schema}.resumo_mensal (ano, mes, conta_id, categoria_id, tipo, total, quantidade)
+            SELECT YEAR(data_transacao), MONTH(data_transacao), ISNULL(conta_id, 0), ISNULL(categoria_id, 0),
+                   tipo, SUM(valor), COUNT(*)
+            FROM {self.schema}.transacoes
+            GROUP BY YEAR(data_transacao), MONTH(data_transacao), ISNULL(conta_id, 0), ISNULL(categoria_id, 0), tipo
+        END
+        """
+        self.db.execute_query(query)
+    
+    def _create_faturas_cartao_view(self):
+        """Adiciona o ciclo de fatura aos meios de pagamento e cria a view indexada de faturas.
+        
+        A view mantém total e quantidade por meio de pagamento e competência
+        (ano * 12 + mes - 1 do mês de fechamento); compras após o dia de
+        fechamento entram na fatura seguinte.
+        """
+        self.db.execute_query(f"""
+        IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('{self.schema}.meios_pagamento')
+                       AND name = 'dia_fechamento')
+        BEGIN
+            ALTER TABLE {self.schema}.meios_pagamento ADD dia_fechamento INT NULL, dia_vencimento INT NULL
+        END
+        """)
+        
+        competencia = """YEAR(t.data_transacao) * 12 + MONTH(t.data_transacao) - 1
+                         + CASE WHEN DAY(t.data_transacao) > mp.dia_fechamento THEN 1 ELSE 0 END"""
+        query = f"""
+        SET ARITHABORT ON
+        IF OBJECT_ID('{self.schema}.faturas_cartao', 'V') IS NULL
+        BEGIN
+            EXEC('CREATE VIEW {self.schema}.faturas_cartao WITH SCHEMABINDING AS
+                  SELECT t.meio_pagamento_id,
+                         {competencia} AS competencia,
+                         SUM(ISNULL(CASE WHEN t.tipo = ''R'' THEN -t.valor ELSE t.valor END, 0)) AS total,
+                         COUNT_BIG(*) AS quantidade
+                  FROM {self.schema}.transacoes t
+                  INNER JOIN {self.schema}.meios_pagamento mp ON mp.id = t.meio_pagamento_id
+                  WHERE mp.dia_fechamento IS NOT NULL AND t.tipo IN (''R'', ''D'')
+                  GROUP BY t.meio_pagamento_id, {competencia}')
+            
+            EXEC('CREATE UNIQUE CLUSTERED INDEX IX_faturas_cartao
+                  ON {self.schema}.faturas_cartao (meio_pagamento_id, competencia)')
+        END
+        """
+        self.db.execute_query(query)
+    
+    def _create_regras_categorizacao_table(self):
+        """Cria a tabela de regras de categorização automática."""
+        query = f"""
+        IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'regras_categorizacao' AND schema_id = SCHEMA_ID('{self.schema}'))
+        BEGIN
+            CREATE TABLE {self.schema}.regras_categorizacao (
+                id INT IDENTITY(1,1) PRIMARY KEY,
+                nome NVARCHAR(100) NOT NULL,
+                padrao NVARCHAR(255) NOT NULL,
+                campo VARCHAR(20) NOT NULL DEFAULT 'descricao',
+                expressao_regular BIT NOT NULL DEFAULT 0,
+                categoria_id INT NULL,
+                meio_pagamento_id INT NULL,
+                conta_id INT NULL,
+                prioridade INT NOT NULL DEFAULT 100,
+                acertos INT NOT NULL DEFAULT 0,
+                ultimo_acerto DATETIME NULL,
+                data_criacao DATETIME DEFAULT GETDATE(),
+                ativo BIT DEFAULT 1,
+                CONSTRAINT FK_{self.schema}_regras_categoria FOREIGN KEY (categoria_id) 
+                    REFERENCES {self.schema}.categorias(id),
+                CONSTRAINT FK_{self.schema}_regras_meio_pagamento FOREIGN KEY (meio_pagamento_id) 
+                    REFERENCES {self.schema}.meios_pagamento(id),
+                CONSTRAINT FK_{self.schema}_regras_conta FOREIGN KEY (conta_id) 
+                    REFERENCES {self.schema}.conta_dimensao(id)
+            )
+        END
+        """
+        self.db.execute_query(query)
+    
+    def _create_transacoes_impressao_digital(self):
+        """Adiciona a impressão digital usada na detecção de duplicatas e o seu índice.
+        
+        A coluna é preenchida pela aplicação; para as transações já existentes,
+        use preencher_impressoes.py.
+        """
+        self.db.execute_query(f"""
+        IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('{self.schema}.transacoes')
+                       AND name = 'impressao_digital')
+        BEGIN
+            ALTER TABLE {self.schema}.transacoes ADD impressao_digital BIGINT NULL
+        END
+        """)
+        
+        self.db.execute_query(f"""
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_impressao_digital'
+                       AND object_id = OBJECT_ID('{self.schema}.transacoes'))
+        BEGIN
+            CREATE INDEX IX_transacoes_impressao_digital ON {self.schema}.transacoes (impressao_digital)
+                INCLUDE (data_transacao)
+        END
+        """)
+    
+    def _create_gastos_recorrentes_tables(self):
+        """Cria as tabelas de gastos recorrentes e dos seus pagamentos mensais."""
+        self.db.execute_query(f"""
+        IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'gastos_recorrentes' AND schema_id = SCHEMA_ID('{self.schema}'))
+        BEGIN
+            CREATE TABLE {self.schema}.gastos_recorrentes (
+                id INT IDENTITY(1,1) PRIMARY KEY,
+                nome NVARCHAR(100) NOT NULL,
+                valor DECIMAL(15, 2) NOT NULL,
+                dia_vencimento INT NOT NULL,
+                periodicidade NVARCHAR(20) NOT NULL,
+                categoria_id INT NULL,
+                conta_id INT NULL,
+                meio_pagamento_id INT NULL,
+                data_inicio DATE NOT NULL,
+                data_fim DATE NULL,
+                gerar_transacao BIT DEFAULT 0,
+                observacao NVARCHAR(MAX) NULL,
+                ativo BIT DEFAULT 1,
+                data_criacao DATETIME DEFAULT GETDATE(),
+                CONSTRAINT FK_{self.schema}_gastos_recorrentes_categoria FOREIGN KEY (categoria_id) 
+                    REFERENCES {self.schema}.categorias(id),
+                CONSTRAINT FK_{self.schema}_gastos_recorrentes_conta FOREIGN KEY (conta_id) 
+                    REFERENCES {self.schema}.conta_dimensao(id),
+                CONSTRAINT FK_{self.schema}_gastos_recorrentes_meio_pagamento FOREIGN KEY (meio_pagamento_id) 
+                    REFERENCES {self.schema}.meios_pagamento(id)
+            )
+        END
+        
+        IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('{self.schema}.gastos_recorrentes')
+                       AND name = 'tipo')
+        BEGIN
+            ALTER TABLE {self.schema}.gastos_recorrentes ADD tipo CHAR(1) NOT NULL DEFAULT 'D'
+        END
+        
+        IF NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('{self.schema}.gastos_recorrentes')
+                       AND name = 'descricao_pagamento')
+        BEGIN
+            ALTER TABLE {self.schema}.gastos_recorrentes ADD descricao_pagamento NVARCHAR(255) NULL
+        END
+        
+        IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'pagamentos_recorrentes' AND schema_id = SCHEMA_ID('{self.schema}'))
+        BEGIN
+            CREATE TABLE {self.schema}.pagamentos_recorrentes (
+                id INT IDENTITY(1,1) PRIMARY KEY,
+                gasto_recorrente_id INT NOT NULL,
+                ano INT NOT NULL,
+                mes INT NOT NULL,
+                data_pagamento DATE NULL,
+                valor_pago DECIMAL(15, 2) NULL,
+                transacao_id INT NULL,
+                observacao NVARCHAR(MAX) NULL,
+                data_criacao DATETIME DEFAULT GETDATE(),
+                CONSTRAINT FK_{self.schema}_pagamentos_recorrentes_gasto FOREIGN KEY (gasto_recorrente_id) 
+                    REFERENCES {self.schema}.gastos_recorrentes(id),
+                CONSTRAINT FK_{self.schema}_pagamentos_recorrentes_transacao FOREIGN KEY (transacao_id) 
+                    REFERENCES {self.schema}.transacoes(id),
+                CONSTRAINT UQ_{self.schema}_pagamentos_recorrentes_periodo UNIQUE (gasto_recorrente_id, ano, mes)
+            )
+        END
+        """)
+    
+    def _create_rastreamento_alteracoes(self):
+        """Cria as colunas de versão, a tabela de exclusões e os triggers usados nas consultas incrementais."""
+        from src.models.alteracoes import Alteracoes
+        
+        self.db.execute_query(f"""
+        IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'exclusoes' AND schema_id = SCHEMA_ID('{self.schema}'))
+        BEGIN
+            CREATE TABLE {self.schema}.exclusoes (
+                id INT IDENTITY(1,1) PRIMARY KEY,
+                tabela NVARCHAR(128) NOT NULL,
+                registro_id INT NOT NULL,
+                versao ROWVERSION,
+                data_exclusao DATETIME DEFAULT GETDATE()
+            )
+            CREATE INDEX IX_exclusoes_tabela_versao ON {self.schema}.exclusoes (tabela, versao) INCLUDE (registro_id)
+        END
+        """)
+        
+        for tabela in Alteracoes.TABELAS:
+            self.db.execute_query(f"""
+            IF OBJECT_ID('{self.schema}.{tabela}') IS NOT NULL
+               AND COL_LENGTH('{self.schema}.{tabela}', 'versao') IS NULL
+            BEGIN
+                ALTER TABLE {self.schema}.{tabela} ADD versao ROWVERSION
+            END
+            
+            IF OBJECT_ID('{self.schema}.{tabela}') IS NOT NULL
+               AND OBJECT_ID('{self.schema}.TR_{tabela}_exclusao') IS NULL
+            BEGIN
+                EXEC('CREATE TRIGGER {self.schema}.TR_{tabela}_exclusao ON {self.schema}.{tabela} AFTER DELETE AS
+                      SET NOCOUNT ON;
+                      INSERT INTO {self.schema}.exclusoes (tabela, registro_id) SELECT ''{tabela}'', id FROM deleted')
+            END
+            """)
+        
+        self.db.execute_query(f"""
+        IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_transacoes_versao'
+                       AND object_id = OBJECT_ID('{self.schema}.transacoes'))
+        BEGIN
+            CREATE INDEX IX_transacoes_versao ON {self.schema}.transacoes (versao)
+        END
+        """)
+    
+    def _create_id_diario_columns(self):
+        """Adiciona a transacoes e gastos_recorrentes o id da operação do diário local que inseriu a linha.
+        
+        O reenvio de uma inclusão sem confirmação procura a linha por esse id
+        (SincronizacaoService), em vez de compará-la por valores.
+        """
+        for tabela in ('transacoes', 'gastos_recorrentes'):
+            self.db.execute_query(f"""
+            IF OBJECT_ID('{self.schema}.{tabela}', 'U') IS NOT NULL
+               AND NOT EXISTS (SELECT * FROM sys.columns WHERE object_id = OBJECT_ID('{self.schema}.{tabela}')
+                               AND name = 'id_diario')
+            BEGIN
+                ALTER TABLE {self.schema}.{tabela} ADD id_diario UNIQUEIDENTIFIER NULL
+            END
+            """)
+            
+            self.db.execute_query(f"""
+            IF OBJECT_ID('{self.schema}.{tabela}', 'U') IS NOT NULL
+               AND NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_{tabela}_id_diario'
+                               AND object_id = OBJECT_ID('{self.schema}.{tabela}'))
+            BEGIN
+                CREATE INDEX IX_{tabela}_id_diario ON {self.schema}.{tabela} (id_diario)
+                    WHERE id_diario IS NOT NULL
+            END
+            """)
+    
+    def _create_transacoes_arquivo(self):
+        """Cria o arquivo de transações por ano e a view indexada resumo_anual.
+        
+        transacoes_arquivo tem as colunas de transacoes, exceto versao e id_diario, e
+        mantém os ids originais. resumo_anual soma resumo_mensal por ano e é
+        mantida pelo servidor, então vale também para os anos arquivados.
+        """
+        self.db.execute_query(f"""
+        IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'transacoes_arquivo' AND schema_id = SCHEMA_ID('{self.schema}'))
+        BEGIN
+            CREATE TABLE {self.schema}.transacoes_arquivo (
+                id INT NOT NULL PRIMARY KEY,
+                descricao NVARCHAR(255) NOT NULL,
+                valor DECIMAL(15, 2) NOT NULL,
+                data_transacao DATE NOT NULL,
+                tipo CHAR(1) NOT NULL,
+                categoria_id INT NULL,
+                conta_id INT NULL,
+                meio_pagamento_id INT NULL,
+                descricao_pagamento NVARCHAR(255) NULL,
+                local_transacao NVARCHAR(255) NULL,
+                observacao NVARCHAR(MAX) NULL,
+                data_criacao DATETIME NULL,
+                ativo BIT NULL,
+                transferencia_id INT NULL,
+                conta_destino_id INT NULL,
+                impressao_digital BIGINT NULL,
+                CONSTRAINT FK_{self.schema}_transacoes_arquivo_categoria FOREIGN KEY (categoria_id) 
+                    REFERENCES {self.schema}.categorias(id),
+                CONSTRAINT FK_{self.schema}_transacoes_arquivo_conta FOREIGN KEY (conta_id) 
+                    REFERENCES {self.schema}.conta_dimensao(id),
+                CONSTRAINT FK_{self.schema}_transacoes_arquivo_conta_destino FOREIGN KEY (conta_destino_id) 
+                    REFERENCES {self.schema}.conta_dimensao(id),
+                CONSTRAINT FK_{self.schema}_transacoes_arquivo_meio_pagamento FOREIGN KEY (meio_pagamento_id) 
+                    REFERENCES {self.schema}.meios_pagamento(id)
+            )
+            
+            CREATE INDEX IX_transacoes_arquivo_data_id ON {self.schema}.transacoes_arquivo (data_transacao DESC, id DESC)
+            CREATE INDEX IX_transacoes_arquivo_conta_data_id ON {self.schema}.transacoes_arquivo (conta_id, data_transacao, id)
+                INCLUDE (tipo, valor, descricao)
+            CREATE INDEX IX_transacoes_arquivo_meio_data ON {self.schema}.transacoes_arquivo (meio_pagamento_id, data_transacao)
+                INCLUDE (tipo, valor)
+            CREATE INDEX IX_transacoes_arquivo_impressao_digital ON {self.schema}.transacoes_arquivo (impressao_digital)
+                INCLUDE (data_transacao)
+        END
+        
+        IF NOT EXISTS (SELECT * FROM sys.tables WHERE name = 'arquivamentos' AND schema_id = SCHEMA_ID('{self.schema}'))
+        BEGIN
+            CREATE TABLE {self.schema}.arquivamentos (
+                ano INT NOT NULL PRIMARY KEY,
+                quantidade INT NOT NULL,
+                data_arquivamento DATETIME DEFAULT GETDATE()
+            )
+        END
+        """)
+        
+        self.db.execute_query(f"""
+        SET ARITHABORT ON
+        IF OBJECT_ID('{self.schema}.resumo_anual', 'V') IS NULL
+        BEGIN
+            EXEC('CREATE VIEW {self.schema}.resumo_anual WITH SCHEMABINDING AS
+                  SELECT ano, conta_id, categoria_id, tipo,
+                         SUM(total) AS total, SUM(quantidade) AS quantidade, COUNT_BIG(*) AS meses
+                  FROM {self.schema}.resumo_mensal
+                  GROUP BY ano, conta_id, categoria_id, tipo')
+            
+            EXEC('CREATE UNIQUE CLUSTERED INDEX IX_resumo_anual
+                  ON {self.schema}.resumo_anual (ano, conta_id, categoria_id, tipo)')
+        END
+        """)
+    
+    def _create_transferencia_indexes(self):
+        """Cria os índices que localizam a outra perna de uma transferência (ExtratoConta.perna_destino)."""
+        for tabela in ('transacoes', 'transacoes_arquivo'):
+            self.db.execute_query(f"""
+            IF NOT EXISTS (SELECT * FROM sys.indexes WHERE name = 'IX_{tabela}_transferencia_id'
+                           AND object_id = OBJECT_ID('{self.schema}.{tabela}'))
+            BEGIN
+                CREATE INDEX IX_{tabela}_transferencia_id ON {self.schema}.{tabela} (transferencia_id, id)
+                    WHERE transferencia_id IS NOT NULL
+            END
+            """)
+    
+    def _create_transacoes_fulltext_index(self):
+        """Cria o índice de texto completo da busca de transações, se o servidor suportar.
+        
+        Uma falha não interrompe as migrações (a busca usa LIKE sem o índice);
+        create_tables tenta de novo no próximo início.
+        
+        Returns:
+            bool: True se o índice existe ou o servidor não suporta texto completo
+        """
+        query = f"""
+        IF FULLTEXTSERVERPROPERTY('IsFullTextInstalled') = 1
+           AND NOT EXISTS (SELECT * FROM sys.fulltext_indexes WHERE object_id = OBJECT_ID('{self.schema}.transacoes'))
+        BEGIN
+            IF NOT EXISTS (SELECT * FROM sys.fulltext_catalogs WHERE name = 'ftc_{self.schema}')
+                EXEC('CREATE FULLTEXT CATALOG ftc_{self.schema}')
+            
+            DECLARE @pk SYSNAME = (SELECT name FROM sys.indexes
+                                   WHERE object_id = OBJECT_ID('{self.schema}.transacoes') AND is_primary_key = 1)
+            
+            EXEC('CREATE FULLTEXT INDEX ON {self.schema}.transacoes
+                  (descricao LANGUAGE 1046, local_transacao LANGUAGE 1046, observacao LANGUAGE 1046)
+                  KEY INDEX ' + @pk + ' ON ftc_{self.schema} WITH CHANGE_TRACKING AUTO')
+        END
+        """
+        connection = self.db.connect()
+        autocommit_anterior = connection.autocommit
+        try:
+            # Comandos FULLTEXT não podem rodar dentro de uma transação
+            connection.autocommit = True
+            connection.cursor().execute(query)
+            return True
+        except Exception as e:
+            print(f"Aviso: Não foi possível criar o índice de texto completo: {e}")
+            return False
+        finally:
+            connection.autocommit = autocommit_anterior
@@ -1,9 +1,17 @@
 """
 Módulo de modelos para o sistema de finanças pessoais.
 """
+from src.models.alteracoes import Alteracoes
 from src.models.conta import Conta
 from src.models.conta_dimensao import ContaDimensao
 from src.models.conta_saldo import ContaSaldo
 from src.models.categoria import Categoria
 from src.models.transacao import Transacao
-from src.models.meio_pagamento import MeioPagamento
\ No newline at end of file
+from src.models.transacao_linha import TransacaoLinha
+from src.models.resumo_mensal import ResumoMensal
+from src.models.arquivo_transacoes import ArquivoTransacoes
+from src.models.extrato_conta import ExtratoConta, LinhaExtrato
+from src.models.fatura_cartao import FaturaCartao
+from src.models.meio_pagamento import MeioPagamento
+from src.models.regra_categorizacao import RegraCategorizacao
+from src.models.impressao_transacao import ImpressaoTransacao
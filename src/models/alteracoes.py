@@ -0,0 +1,101 @@
+"""
+Consultas incrementais pelas colunas de versão (rowversion) das tabelas.
+"""
+from src.database.db_helper import get_db_connection
+
+class Alteracoes:
+    """Base das APIs "alterações desde a versão X" dos modelos.
+
+    As tabelas rastreadas têm uma coluna versao (ROWVERSION), atualizada pelo
+    servidor a cada INSERT ou UPDATE, e as exclusões ficam registradas em
+    exclusoes (preenchida por triggers). A versão devolvida por uma consulta é
+    MIN_ACTIVE_ROWVERSION(), lida antes dos dados: toda linha com versão menor
+    já estava confirmada, então a consulta seguinte (versao >= essa marca) não
+    perde alterações de transações que ainda estavam em andamento.
+    """
+
+    # Tabelas com coluna versao e trigger de exclusão
+    TABELAS = ('transacoes', 'conta_dimensao', 'conta_saldos', 'categorias', 'meios_pagamento',
+               'gastos_recorrentes', 'pagamentos_recorrentes')
+
+    @staticmethod
+    def condicao(alias=''):
+        """Condição "alterada desde a versão ?" (o parâmetro é a versão como inteiro)."""
+        prefixo = f"{alias}." if alias else ""
+        return f"{prefixo}versao >= CAST(CAST(? AS BIGINT) AS BINARY(8))"
+
+    @staticmethod
+    def marca(cursor):
+        """Versão a partir da qual a próxima consulta incremental deve começar."""
+        cursor.execute("SELECT CAST(MIN_ACTIVE_ROWVERSION() AS BIGINT)")
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def versao_atual():
+        """Versão atual do banco (para começar a acompanhar alterações após uma carga completa)."""
+        db = get_db_connection()
+        try:
+            return Alteracoes.marca(db.get_cursor())
+        except Exception as e:
+            print(f"Erro ao obter versão do banco: {e}")
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def excluidos(cursor, schema, tabela, versao):
+        """Ids das linhas da tabela excluídas desde a versão."""
+        cursor.execute(f"""
+            SELECT registro_id FROM {schema}.exclusoes
+            WHERE tabela = ? AND {Alteracoes.condicao()}
+        """, (tabela, versao))
+        return [row.registro_id for row in cursor.fetchall()]
+
+    @staticmethod
+    def buscar(tabela, versao, consultar):
+        """Executa uma consulta incremental.
+
+        Args:
+            tabela: Tabela cujas exclusões são devolvidas
+            versao: Versão devolvida pela chamada anterior; None para buscar tudo
+            consultar: Função (cursor, schema, versao) que retorna os registros alterados
+
+        Returns:
+            tuple: (registros alterados, ids excluídos, nova versão), ou None em caso de erro
+        """
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            nova_versao = Alteracoes.marca(cursor)
+            alterados = consultar(cursor, schema, versao or 0)
+            excluidos = Alteracoes.excluidos(cursor, schema, tabela, versao) if versao else []
+            return alterados, excluidos, nova_versao
+
+        except Exception as e:
+            print(f"Erro ao consultar alterações de {tabela}: {e}")
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def houve_alteracoes(versao, tabelas):
+        """Indica se alguma das tabelas teve linhas alteradas ou excluídas desde a versão."""
+        if not versao:
+            return True
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+            consultas = [f"SELECT 1 FROM {schema}.{tabela} WHERE {Alteracoes.condicao()}" for tabela in tabelas]
+            consultas.append(f"""SELECT 1 FROM {schema}.exclusoes
+                WHERE tabela IN ({', '.join('?' for _ in tabelas)}) AND {Alteracoes.condicao()}""")
+            cursor.execute(f"SELECT CASE WHEN EXISTS ({' UNION ALL '.join(consultas)}) THEN 1 ELSE 0 END",
+                           (versao,) * len(tabelas) + tuple(tabelas) + (versao,))
+            return bool(cursor.fetchone()[0])
+        except Exception as e:
+            print(f"Erro ao verificar alterações: {e}")
+            return True
+        finally:
+            db.close()
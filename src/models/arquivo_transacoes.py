@@ -0,0 +1,186 @@
+from datetime import date
+from src.database.db_helper import get_db_connection
+
+class ArquivoTransacoes:
+    """Arquivo das transações de anos encerrados.
+
+    arquivar_ano() move as transações de um ano anterior ao atual de
+    transacoes para transacoes_arquivo (mesmos ids) e o registra em
+    arquivamentos. Assim, transacoes guarda só o ano corrente e os anos ainda
+    não arquivados, e as consultas do dia a dia não passam pelo histórico.
+
+    As leituras usam fonte(): o arquivo só entra na consulta quando o
+    período começa antes do ano atual (ou não tem início). Transações
+    arquivadas são somente leitura; para alterá-las, use restaurar_ano().
+    Os totais por ano ficam na view indexada resumo_anual, mantida pelo
+    servidor a partir de resumo_mensal, que não muda com o arquivamento.
+    """
+
+    # Colunas comuns a transacoes e transacoes_arquivo (versao e id_diario só existem em transacoes)
+    COLUNAS = (
+        'id', 'descricao', 'valor', 'data_transacao', 'tipo', 'categoria_id', 'conta_id',
+        'meio_pagamento_id', 'descricao_pagamento', 'local_transacao', 'observacao',
+        'data_criacao', 'ativo', 'transferencia_id', 'conta_destino_id', 'impressao_digital'
+    )
+
+    @staticmethod
+    def inicio_ativo(hoje=None):
+        """Primeiro dia do ano corrente: transações anteriores podem estar arquivadas."""
+        return date((hoje or date.today()).year, 1, 1)
+
+    @staticmethod
+    def inclui_arquivo(data_inicio):
+        """Indica se um período que começa em data_inicio (None = sem início) precisa ler o arquivo."""
+        if not data_inicio:
+            return True
+        if hasattr(data_inicio, 'date'):
+            data_inicio = data_inicio.date()
+        return data_inicio < ArquivoTransacoes.inicio_ativo()
+
+    @staticmethod
+    def fonte(schema, data_inicio=None):
+        """Tabela de onde ler as transações de um período que começa em data_inicio.
+
+        Retorna transacoes quando o período está todo no ano corrente; caso
+        contrário, uma tabela derivada com transacoes e transacoes_arquivo
+        (com a coluna arquivada). Use sempre com um alias: FROM {fonte} t.
+        """
+        if not ArquivoTransacoes.inclui_arquivo(data_inicio):
+            return f"{schema}.transacoes"
+
+        colunas = ", ".join(ArquivoTransacoes.COLUNAS)
+        return f"""(
+            SELECT {colunas}, CAST(0 AS BIT) AS arquivada FROM {schema}.transacoes
+            UNION ALL
+            SELECT {colunas}, CAST(1 AS BIT) AS arquivada FROM {schema}.transacoes_arquivo
+        )"""
+
+    @staticmethod
+    def arquivar_ano(ano):
+        """Move as transações de um ano encerrado para o arquivo.
+
+        Transações ligadas a pagamentos de gastos recorrentes (e a outra perna
+        das transferências) ficam em transacoes. A remoção não gera registros
+        em exclusoes: as linhas continuam existindo para as consultas
+        incrementais, só mudam de tabela.
+
+        Returns:
+            int: Quantidade de transações arquivadas
+        """
+        if ano >= date.today().year:
+            raise ValueError(f"Só anos encerrados podem ser arquivados: {ano}")
+
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+            colunas = ", ".join(ArquivoTransacoes.COLUNAS)
+            periodo = (date(ano, 1, 1), date(ano + 1, 1, 1))
+
+            cursor.execute(f"""
+                INSERT INTO {schema}.transacoes_arquivo ({colunas})
+                SELECT {colunas}
+                FROM {schema}.transacoes t
+                WHERE t.data_transacao >= ? AND t.data_transacao < ?
+                  AND NOT EXISTS (
+                      SELECT 1
+                      FROM {schema}.pagamentos_recorrentes p
+                      INNER JOIN {schema}.transacoes r ON r.id = p.transacao_id
+                      WHERE r.id = t.id OR r.transferencia_id = t.transferencia_id
+                  )
+            """, periodo)
+            quantidade = cursor.rowcount
+
+            # Remover as linhas copiadas sem deixar registros de exclusão
+            arquivadas = f"""SELECT id FROM {schema}.transacoes_arquivo
+                             WHERE data_transacao >= ? AND data_transacao < ?"""
+            cursor.execute(f"DELETE FROM {schema}.transacoes WHERE id IN ({arquivadas})", periodo)
+            cursor.execute(f"""
+                DELETE FROM {schema}.exclusoes
+                WHERE tabela = 'transacoes' AND registro_id IN ({arquivadas})
+            """, periodo)
+
+            cursor.execute(f"""
+                MERGE {schema}.arquivamentos AS a
+                USING (SELECT ? AS ano) AS v ON a.ano = v.ano
+                WHEN MATCHED THEN
+                    UPDATE SET quantidade = a.quantidade + ?, data_arquivamento = GETDATE()
+                WHEN NOT MATCHED THEN
+                    INSERT (ano, quantidade) VALUES (v.ano, ?);
+            """, (ano, quantidade, quantidade))
+
+            db.commit()
+            return quantidade
+
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao arquivar transações de {ano}: {e}")
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def restaurar_ano(ano):
+        """Devolve as transações arquivadas de um ano para transacoes (voltam a poder ser alteradas).
+
+        Returns:
+            int: Quantidade de transações restauradas
+        """
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+            colunas = ", ".join(ArquivoTransacoes.COLUNAS)
+            periodo = (date(ano, 1, 1), date(ano + 1, 1, 1))
+
+            cursor.execute(f"SET IDENTITY_INSERT {schema}.transacoes ON")
+            try:
+                cursor.execute(f"""
+                    INSERT INTO {schema}.transacoes ({colunas})
+                    SELECT {colunas} FROM {schema}.transacoes_arquivo
+                    WHERE data_transacao >= ? AND data_transacao < ?
+                """, periodo)
+                quantidade = cursor.rowcount
+            finally:
+                cursor.execute(f"SET IDENTITY_INSERT {schema}.transacoes OFF")
+
+            cursor.execute(f"""
+                DELETE FROM {schema}.transacoes_arquivo WHERE data_transacao >= ? AND data_transacao < ?
+            """, periodo)
+            cursor.execute(f"DELETE FROM {schema}.arquivamentos WHERE ano = ?", (ano,))
+
+            db.commit()
+            return quantidade
+
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao restaurar transações de {ano}: {e}")
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def listar_anos():
+        """Lista os anos arquivados.
+
+        Returns:
+            Lista de dicionários com ano, quantidade e data_arquivamento
+        """
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            cursor.execute(f"""
+                SELECT ano, quantidade, data_arquivamento
+                FROM {db.schema}.arquivamentos
+                ORDER BY ano
+            """)
+            return [
+                {'ano': row.ano, 'quantidade': row.quantidade, 'data_arquivamento': row.data_arquivamento}
+                for row in cursor.fetchall()
+            ]
+
+        except Exception as e:
+            print(f"Erro ao listar anos arquivados: {e}")
+            return []
+        finally:
+            db.close()
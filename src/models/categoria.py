@@ -1,4 +1,5 @@
 from src.database.db_helper import get_db_connection
+from src.models.alteracoes import Alteracoes
 
 class Categoria:
     """Classe para representar uma categoria de receita, despesa ou transferência com suporte a hierarquia."""
@@ -131,17 +132,7 @@ class Categoria:
             rows = cursor.fetchall()
             
             for row in rows:
-                categoria = Categoria(
-                    id=row.id,
-                    nome=row.nome,
-                    tipo=row.tipo,
-                    descricao=row.descricao,
-                    categoria_pai_id=row.categoria_pai_id,
-                    nivel=row.nivel,
-                    data_criacao=row.data_criacao,
-                    ativo=row.ativo
-                )
-                categorias.append(categoria)
+                categorias.append(Categoria._de_row(row))
             
             return categorias
             
@@ -150,6 +141,32 @@ class Categoria:
             return []
         finally:
             db.close()
+
+    @staticmethod
+    def _de_row(row):
+        """Cria uma categoria a partir de uma linha de categorias."""
+        return Categoria(
+            id=row.id,
+            nome=row.nome,
+            tipo=row.tipo,
+            descricao=row.descricao,
+            categoria_pai_id=row.categoria_pai_id,
+            nivel=row.nivel,
+            data_criacao=row.data_criacao,
+            ativo=row.ativo
+        )
+
+    @staticmethod
+    def alteracoes_desde(versao):
+        """Categorias incluídas ou alteradas (inclusive inativadas) e ids excluídos desde a versão.
+
+        Returns:
+            tuple: (categorias, ids excluídos, nova versão), ou None em caso de erro
+        """
+        def consultar(cursor, schema, desde):
+            cursor.execute(f"SELECT * FROM {schema}.categorias WHERE {Alteracoes.condicao()}", (desde,))
+            return [Categoria._de_row(row) for row in cursor.fetchall()]
+        return Alteracoes.buscar('categorias', versao, consultar)
     
     @staticmethod
     def obter_subcategorias(categoria_pai_id, apenas_ativas=True):
@@ -2,6 +2,7 @@
 Classe fachada para representar uma conta bancária completa.
 """
 from decimal import Decimal
+from src.models.alteracoes import Alteracoes
 from src.models.conta_dimensao import ContaDimensao
 from src.models.conta_saldo import ContaSaldo
 
@@ -188,6 +189,46 @@ class Conta:
         
         return contas
     
+    @staticmethod
+    def alteracoes_desde(versao):
+        """Contas com dimensão ou saldo alterados e ids excluídos desde a versão.
+
+        Dimensão e saldo vêm na mesma consulta. As contas inativas também são
+        retornadas, para que quem mantém a lista possa removê-las.
+
+        Returns:
+            tuple: (contas, ids excluídos, nova versão), ou None em caso de erro
+        """
+        def consultar(cursor, schema, desde):
+            cursor.execute(f"""
+                SELECT d.*, s.id AS saldo_id, s.saldo_inicial, s.saldo_atual
+                FROM {schema}.conta_dimensao d
+                INNER JOIN {schema}.conta_saldos s ON s.conta_dimensao_id = d.id
+                WHERE {Alteracoes.condicao('d')} OR {Alteracoes.condicao('s')}
+            """, (desde, desde))
+            return [
+                Conta(
+                    id=row.id,
+                    dimensao_id=row.id,
+                    saldo_id=row.saldo_id,
+                    nome=row.nome,
+                    tipo=row.tipo,
+                    banco=row.instituicao,
+                    agencia=row.agencia,
+                    conta_contabil=row.conta_contabil,
+                    numero_banco=row.numero_banco,
+                    titular=row.titular,
+                    nome_gerente=row.nome_gerente,
+                    contato_gerente=row.contato_gerente,
+                    saldo_inicial=row.saldo_inicial,
+                    saldo_atual=row.saldo_atual,
+                    data_criacao=row.data_criacao,
+                    ativo=row.ativo
+                )
+                for row in cursor.fetchall()
+            ]
+        return Alteracoes.buscar('conta_dimensao', versao, consultar)
+
     @staticmethod
     def obter_saldo_total():
         """Retorna o saldo total de todas as contas ativas."""
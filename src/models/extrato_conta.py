@@ -0,0 +1,169 @@
+"""
+Extrato de uma conta com saldo de abertura e saldo corrente por lançamento.
+"""
+import base64
+import json
+from collections import namedtuple
+from datetime import date
+from decimal import Decimal
+from src.database.db_helper import get_db_connection
+from src.models.arquivo_transacoes import ArquivoTransacoes
+
+CAMPOS_LINHA_EXTRATO = (
+    'id', 'data_transacao', 'descricao', 'tipo', 'valor', 'valor_com_sinal',
+    'categoria_nome', 'meio_pagamento_nome', 'saldo'
+)
+
+class LinhaExtrato(namedtuple('LinhaExtrato', CAMPOS_LINHA_EXTRATO)):
+    """Lançamento do extrato, somente leitura, com o saldo após o lançamento."""
+    __slots__ = ()
+
+class ExtratoConta:
+    """Extrato paginado de uma conta, em ordem cronológica."""
+
+    def __init__(self, conta_id, saldo_abertura, linhas, proxima=None):
+        self.conta_id = conta_id
+        self.saldo_abertura = saldo_abertura
+        self.linhas = linhas
+        self.proxima = proxima
+
+    @property
+    def saldo_final(self):
+        """Saldo após o último lançamento da página."""
+        return self.linhas[-1].saldo if self.linhas else self.saldo_abertura
+
+    @staticmethod
+    def obter(conta_id, data_inicio=None, data_fim=None, tamanho_pagina=100, continuacao=None):
+        """Obtém uma página do extrato da conta.
+
+        O saldo corrente é calculado no servidor com uma função de janela sobre
+        a página. A primeira página parte do saldo de abertura em data_inicio;
+        as seguintes partem do saldo guardado no token de continuação, então
+        nenhuma página relê os lançamentos anteriores.
+
+        Args:
+            conta_id: Id da conta (conta_dimensao)
+            data_inicio: Data inicial (None para desde o primeiro lançamento)
+            data_fim: Data final (None para sem limite)
+            tamanho_pagina: Quantidade de lançamentos por página
+            continuacao: Token devolvido pela página anterior (None para a primeira)
+
+        Returns:
+            ExtratoConta com linhas e token da próxima página; saldo_abertura só
+            é preenchido na primeira página
+        """
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            condicoes = ["t.conta_id = ?"]
+            params = [conta_id]
+            if data_inicio:
+                condicoes.append("t.data_transacao >= ?")
+                params.append(data_inicio)
+            if data_fim:
+                condicoes.append("t.data_transacao <= ?")
+                params.append(data_fim)
+
+            inicio_pagina = data_inicio
+            if continuacao:
+                ultima_data, ultimo_id, saldo_base = ExtratoConta._decodificar_continuacao(continuacao, conta_id)
+                condicoes.append("(t.data_transacao > ? OR (t.data_transacao = ? AND t.id > ?))")
+                params.extend([ultima_data, ultima_data, ultimo_id])
+                inicio_pagina = max(filter(None, (data_inicio, ultima_data)))
+            else:
+                saldo_base = ExtratoConta._obter_saldo_abertura(cursor, schema, conta_id, data_inicio)
+
+            # Buscar uma linha a mais para saber se existe próxima página
+            fonte = ArquivoTransacoes.fonte(schema, inicio_pagina)
+            cursor.execute(f"""
+                SELECT p.id, p.data_transacao, p.descricao, p.tipo, p.valor, p.valor_com_sinal,
+                       p.categoria_nome, p.meio_pagamento_nome,
+                       CAST(? AS DECIMAL(15, 2)) + SUM(p.valor_com_sinal) OVER (
+                           ORDER BY p.data_transacao, p.id ROWS UNBOUNDED PRECEDING) AS saldo
+                FROM (
+                    SELECT TOP (?) t.id, t.data_transacao, t.descricao, t.tipo, t.valor,
+                           {ExtratoConta.valor_com_sinal(fonte)} AS valor_com_sinal,
+                           c.nome AS categoria_nome, mp.nome AS meio_pagamento_nome
+                    FROM {fonte} t
+                    LEFT JOIN {schema}.categorias c ON c.id = t.categoria_id
+                    LEFT JOIN {schema}.meios_pagamento mp ON mp.id = t.meio_pagamento_id
+                    WHERE {' AND '.join(condicoes)}
+                    ORDER BY t.data_transacao, t.id
+                ) AS p
+                ORDER BY p.data_transacao, p.id
+            """, [saldo_base, int(tamanho_pagina) + 1] + params)
+            rows = cursor.fetchall()
+
+            linhas = [LinhaExtrato._make(row) for row in rows[:tamanho_pagina]]
+            proxima = None
+            if len(rows) > tamanho_pagina:
+                ultima = linhas[-1]
+                proxima = ExtratoConta._codificar_continuacao(
+                    conta_id, ultima.data_transacao, ultima.id, ultima.saldo)
+
+            saldo_abertura = saldo_base if not continuacao else None
+            return ExtratoConta(conta_id, saldo_abertura, linhas, proxima)
+
+        except Exception as e:
+            print(f"Erro ao obter extrato da conta: {e}")
+            return ExtratoConta(conta_id, None, [])
+        finally:
+            db.close()
+
+    @staticmethod
+    def perna_destino(fonte, alias='t'):
+        """Condição SQL verdadeira na perna de destino (crédito) de uma transferência.
+
+        As duas pernas têm o mesmo transferencia_id e a de origem é inserida
+        primeiro (Transacao._salvar_transferencia), então a de destino é a que
+        tem outra perna com id menor. A descrição não é usada: pode ser editada.
+        """
+        return (f"EXISTS (SELECT 1 FROM {fonte} origem WHERE origem.transferencia_id = {alias}.transferencia_id "
+                f"AND origem.id < {alias}.id)")
+
+    @staticmethod
+    def valor_com_sinal(fonte, alias='t'):
+        """Expressão SQL com o efeito da linha no saldo da sua conta (receitas e destinos de transferência somam)."""
+        return (f"CASE WHEN {alias}.tipo = 'R' OR ({alias}.tipo = 'T' AND {ExtratoConta.perna_destino(fonte, alias)}) "
+                f"THEN {alias}.valor ELSE -{alias}.valor END")
+
+    @staticmethod
+    def _obter_saldo_abertura(cursor, schema, conta_id, data_inicio):
+        """Saldo inicial da conta mais os lançamentos anteriores a data_inicio (inclusive os arquivados)."""
+        params = [conta_id]
+        anteriores = "1 = 0"
+        if data_inicio:
+            anteriores = "t.data_transacao < ?"
+            params.append(data_inicio)
+        params.append(conta_id)
+
+        fonte = ArquivoTransacoes.fonte(schema)
+        cursor.execute(f"""
+            SELECT COALESCE((SELECT saldo_inicial FROM {schema}.conta_saldos WHERE conta_dimensao_id = ?), 0)
+                 + COALESCE((SELECT SUM({ExtratoConta.valor_com_sinal(fonte)})
+                             FROM {fonte} t
+                             WHERE {anteriores} AND t.conta_id = ?), 0) AS saldo
+        """, params)
+        return Decimal(cursor.fetchone().saldo)
+
+    @staticmethod
+    def _codificar_continuacao(conta_id, data_transacao, transacao_id, saldo):
+        """Gera o token com a posição e o saldo do último lançamento da página."""
+        conteudo = json.dumps([int(conta_id), data_transacao.isoformat(), int(transacao_id), str(saldo)])
+        return base64.urlsafe_b64encode(conteudo.encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def _decodificar_continuacao(token, conta_id):
+        """Lê um token de continuação, validando que pertence à mesma conta."""
+        try:
+            conta_token, data_iso, transacao_id, saldo = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+            data_transacao = date.fromisoformat(data_iso)
+            saldo = Decimal(saldo)
+        except (ValueError, TypeError, ArithmeticError) as e:
+            raise ValueError(f"Token de continuação inválido: {token}") from e
+
+        if conta_token != conta_id:
+            raise ValueError("Token de continuação gerado para outra conta.")
+        return data_transacao, int(transacao_id), saldo
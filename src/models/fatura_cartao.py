@@ -0,0 +1,184 @@
+import calendar
+from datetime import date, timedelta
+from decimal import Decimal
+from src.database.db_helper import get_db_connection
+
+class FaturaCartao:
+    """Classe para representar a fatura de um cartão de crédito em uma competência.
+
+    Os totais vêm da view indexada faturas_cartao, mantida pelo próprio servidor
+    a cada gravação em transacoes; as compras de anos arquivados são somadas a
+    partir de transacoes_arquivo só quando faturas fechadas são pedidas.
+    A competência é o mês de fechamento da fatura;
+    compras feitas após o dia de fechamento entram na fatura do mês seguinte.
+    Receitas no cartão (estornos) abatem o total.
+    """
+
+    ABERTA = 'Aberta'
+    FECHADA = 'Fechada'
+    FUTURA = 'Futura'
+
+    def __init__(self, meio_pagamento_id=None, ano=None, mes=None, dia_fechamento=None,
+                 dia_vencimento=None, total=Decimal('0.00'), quantidade=0, status=None):
+        self.meio_pagamento_id = meio_pagamento_id
+        self.ano = ano
+        self.mes = mes
+        self.dia_fechamento = dia_fechamento
+        self.dia_vencimento = dia_vencimento
+        self.total = total
+        self.quantidade = quantidade
+        self.status = status
+
+    @property
+    def data_fechamento(self):
+        """Data de fechamento da fatura (limitada ao último dia do mês)."""
+        return FaturaCartao._dia_no_mes(self.ano, self.mes, self.dia_fechamento)
+
+    @property
+    def data_vencimento(self):
+        """Data de vencimento; no mês seguinte se o vencimento for antes do fechamento."""
+        dia_vencimento = self.dia_vencimento or self.dia_fechamento
+        if dia_vencimento > self.dia_fechamento:
+            return FaturaCartao._dia_no_mes(self.ano, self.mes, dia_vencimento)
+        ano, mes = FaturaCartao._somar_meses(self.ano, self.mes, 1)
+        return FaturaCartao._dia_no_mes(ano, mes, dia_vencimento)
+
+    @property
+    def periodo(self):
+        """Primeiro e último dia de compras que entram nesta fatura."""
+        ano, mes = FaturaCartao._somar_meses(self.ano, self.mes, -1)
+        fechamento_anterior = FaturaCartao._dia_no_mes(ano, mes, self.dia_fechamento)
+        return fechamento_anterior + timedelta(days=1), self.data_fechamento
+
+    def listar_transacoes(self):
+        """Lista as transações desta fatura."""
+        from src.models.transacao import Transacao
+
+        data_inicio, data_fim = self.periodo
+        return Transacao.listar_linhas({
+            'meio_pagamento_id': self.meio_pagamento_id,
+            'data_inicio': data_inicio,
+            'data_fim': data_fim,
+            'ordenacao': 'data_transacao asc'
+        })
+
+    @staticmethod
+    def competencia_da_compra(data_compra, dia_fechamento):
+        """Retorna (ano, mes) da fatura em que uma compra feita em data_compra entra."""
+        if data_compra.day > dia_fechamento:
+            return FaturaCartao._somar_meses(data_compra.year, data_compra.month, 1)
+        return data_compra.year, data_compra.month
+
+    @staticmethod
+    def listar(meio_pagamento_id, status=None, hoje=None):
+        """Lista as faturas de um cartão, da mais recente para a mais antiga.
+
+        A fatura aberta é sempre incluída, mesmo sem compras.
+
+        Args:
+            meio_pagamento_id: Id do meio de pagamento (cartão de crédito)
+            status: FaturaCartao.ABERTA, FECHADA ou FUTURA para filtrar (None para todas)
+            hoje: Data de referência para o status (padrão: data atual)
+        """
+        hoje = hoje or date.today()
+        db = get_db_connection()
+        faturas = []
+
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            cursor.execute(f"SELECT dia_fechamento, dia_vencimento FROM {schema}.meios_pagamento WHERE id = ?",
+                           (meio_pagamento_id,))
+            meio = cursor.fetchone()
+            if not meio or not meio.dia_fechamento:
+                return []
+
+            ano_atual, mes_atual = FaturaCartao.competencia_da_compra(hoje, meio.dia_fechamento)
+            competencia_atual = ano_atual * 12 + mes_atual - 1
+
+            fontes = [f"""
+                SELECT competencia, total, quantidade
+                FROM {schema}.faturas_cartao WITH (NOEXPAND)
+                WHERE meio_pagamento_id = ?
+            """]
+            params = [meio_pagamento_id]
+            if status in (None, FaturaCartao.FECHADA):
+                # Compras arquivadas, agrupadas pela mesma regra de competência da view
+                fontes.append(f"""
+                    SELECT c.competencia, SUM(CASE WHEN t.tipo = 'R' THEN -t.valor ELSE t.valor END),
+                           COUNT(*)
+                    FROM {schema}.transacoes_arquivo t
+                    CROSS APPLY (SELECT YEAR(t.data_transacao) * 12 + MONTH(t.data_transacao) - 1
+                                        + CASE WHEN DAY(t.data_transacao) > ? THEN 1 ELSE 0 END) AS c(competencia)
+                    WHERE t.meio_pagamento_id = ? AND t.tipo IN ('R', 'D')
+                    GROUP BY c.competencia
+                """)
+                params.extend([meio.dia_fechamento, meio_pagamento_id])
+
+            query = f"""
+                SELECT competencia, SUM(total) AS total, SUM(quantidade) AS quantidade
+                FROM ({' UNION ALL '.join(fontes)}) AS f
+                WHERE 1=1
+            """
+            if status == FaturaCartao.ABERTA:
+                query += " AND competencia = ?"
+                params.append(competencia_atual)
+            elif status == FaturaCartao.FECHADA:
+                query += " AND competencia < ?"
+                params.append(competencia_atual)
+            elif status == FaturaCartao.FUTURA:
+                query += " AND competencia > ?"
+                params.append(competencia_atual)
+            query += " GROUP BY competencia ORDER BY competencia DESC"
+
+            cursor.execute(query, params)
+            totais = {row.competencia: (Decimal(row.total), row.quantidade) for row in cursor.fetchall()}
+
+            if status in (None, FaturaCartao.ABERTA):
+                totais.setdefault(competencia_atual, (Decimal('0.00'), 0))
+
+            for competencia in sorted(totais, reverse=True):
+                total, quantidade = totais[competencia]
+                if competencia < competencia_atual:
+                    situacao = FaturaCartao.FECHADA
+                elif competencia == competencia_atual:
+                    situacao = FaturaCartao.ABERTA
+                else:
+                    situacao = FaturaCartao.FUTURA
+
+                faturas.append(FaturaCartao(
+                    meio_pagamento_id=meio_pagamento_id,
+                    ano=competencia // 12,
+                    mes=competencia % 12 + 1,
+                    dia_fechamento=meio.dia_fechamento,
+                    dia_vencimento=meio.dia_vencimento,
+                    total=total,
+                    quantidade=quantidade,
+                    status=situacao
+                ))
+
+            return faturas
+
+        except Exception as e:
+            print(f"Erro ao listar faturas do cartão: {e}")
+            return []
+        finally:
+            db.close()
+
+    @staticmethod
+    def obter_aberta(meio_pagamento_id, hoje=None):
+        """Retorna a fatura aberta do cartão (ou None se o cartão não tiver ciclo configurado)."""
+        faturas = FaturaCartao.listar(meio_pagamento_id, FaturaCartao.ABERTA, hoje)
+        return faturas[0] if faturas else None
+
+    @staticmethod
+    def _somar_meses(ano, mes, meses):
+        """Soma meses a (ano, mes)."""
+        indice = ano * 12 + mes - 1 + meses
+        return indice // 12, indice % 12 + 1
+
+    @staticmethod
+    def _dia_no_mes(ano, mes, dia):
+        """Cria a data limitando o dia ao último dia do mês."""
+        return date(ano, mes, min(dia, calendar.monthrange(ano, mes)[1]))
@@ -2,6 +2,7 @@
 from datetime import datetime, date
 from decimal import Decimal
 from src.database.db_helper import get_db_connection
+from src.models.alteracoes import Alteracoes
 from src.models.categoria import Categoria
 from src.models.conta import Conta
 from src.models.meio_pagamento import MeioPagamento
@@ -31,6 +32,9 @@ class GastoRecorrente:
         self.ativo = ativo
         self.data_criacao = data_criacao
         
+        # Operação do diário local que inseriu o gasto (ver SincronizacaoService)
+        self.id_diario = None
+        
         # Objetos relacionados
         self._categoria = None
         self._conta = None
@@ -68,12 +72,12 @@ class GastoRecorrente:
                     INSERT INTO {schema}.gastos_recorrentes 
                     (nome, valor, dia_vencimento, periodicidade, tipo, categoria_id, 
                      conta_id, meio_pagamento_id, data_inicio, data_fim, 
-                     gerar_transacao, descricao_pagamento, observacao, ativo)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                     gerar_transacao, descricao_pagamento, observacao, ativo, id_diario)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (self.nome, self.valor, self.dia_vencimento, self.periodicidade, 
                       self.tipo, self.categoria_id, self.conta_id, self.meio_pagamento_id, 
                       self.data_inicio, self.data_fim, self.gerar_transacao, 
-                      self.descricao_pagamento, self.observacao, self.ativo))
+                      self.descricao_pagamento, self.observacao, self.ativo, self.id_diario))
                 
                 # Obter o ID gerado
                 cursor.execute("SELECT @@IDENTITY")
@@ -237,6 +241,28 @@ class GastoRecorrente:
             print(f"Erro ao verificar pagamento: {e}")
             return {'pago': False, 'erro': str(e)}
     
+    @staticmethod
+    def _de_row(row):
+        """Cria um gasto recorrente a partir de uma linha de gastos_recorrentes."""
+        return GastoRecorrente(
+            id=row.id,
+            nome=row.nome,
+            valor=row.valor,
+            dia_vencimento=row.dia_vencimento,
+            periodicidade=row.periodicidade,
+            tipo=getattr(row, 'tipo', 'D'),  # Padrão 'D' se não existir
+            categoria_id=row.categoria_id,
+            conta_id=row.conta_id,
+            meio_pagamento_id=row.meio_pagamento_id,
+            data_inicio=row.data_inicio,
+            data_fim=row.data_fim,
+            gerar_transacao=row.gerar_transacao,
+            descricao_pagamento=getattr(row, 'descricao_pagamento', None),
+            observacao=row.observacao,
+            ativo=row.ativo,
+            data_criacao=row.data_criacao
+        )
+
     @staticmethod
     def buscar_por_id(gasto_id):
         """Busca um gasto recorrente pelo ID."""
@@ -252,24 +278,7 @@ class GastoRecorrente:
             
             row = cursor.fetchone()
             if row:
-                return GastoRecorrente(
-                    id=row.id,
-                    nome=row.nome,
-                    valor=row.valor,
-                    dia_vencimento=row.dia_vencimento,
-                    periodicidade=row.periodicidade,
-                    tipo=getattr(row, 'tipo', 'D'),  # Padrão 'D' se não existir
-                    categoria_id=row.categoria_id,
-                    conta_id=row.conta_id,
-                    meio_pagamento_id=row.meio_pagamento_id,
-                    data_inicio=row.data_inicio,
-                    data_fim=row.data_fim,
-                    gerar_transacao=row.gerar_transacao,
-                    descricao_pagamento=getattr(row, 'descricao_pagamento', None),
-                    observacao=row.observacao,
-                    ativo=row.ativo,
-                    data_criacao=row.data_criacao
-                )
+                return GastoRecorrente._de_row(row)
             return None
             
         except Exception as e:
@@ -295,28 +304,53 @@ class GastoRecorrente:
             rows = cursor.fetchall()
             
             for row in rows:
-                gasto = GastoRecorrente(
-                    id=row.id,
-                    nome=row.nome,
-                    valor=row.valor,
-                    dia_vencimento=row.dia_vencimento,
-                    periodicidade=row.periodicidade,
-                    tipo=getattr(row, 'tipo', 'D'),  # Padrão 'D' se não existir
-                    categoria_id=row.categoria_id,
-                    conta_id=row.conta_id,
-                    meio_pagamento_id=row.meio_pagamento_id,
-                    data_inicio=row.data_inicio,
-                    data_fim=row.data_fim,
-                    gerar_transacao=row.gerar_transacao,
-                    descricao_pagamento=getattr(row, 'descricao_pagamento', None),
-                    observacao=row.observacao,
-                    ativo=row.ativo,
-                    data_criacao=row.data_criacao
-                )
-                gastos.append(gasto)
+                gastos.append(GastoRecorrente._de_row(row))
             
             return gastos
             
         except Exception as e:
             print(f"Erro ao listar gastos recorrentes: {e}")
-            return []
\ No newline at end of file
+            return []
+
+    @staticmethod
+    def alteracoes_desde(versao):
+        """Gastos incluídos ou alterados (inclusive inativados) e ids excluídos desde a versão.
+
+        Returns:
+            tuple: (gastos, ids excluídos, nova versão), ou None em caso de erro
+        """
+        def consultar(cursor, schema, desde):
+            cursor.execute(f"SELECT * FROM {schema}.gastos_recorrentes WHERE {Alteracoes.condicao()}", (desde,))
+            return [GastoRecorrente._de_row(row) for row in cursor.fetchall()]
+        return Alteracoes.buscar('gastos_recorrentes', versao, consultar)
+
+    @staticmethod
+    def pagamentos_alterados_desde(versao):
+        """Registros de pagamento incluídos ou alterados e ids excluídos desde a versão.
+
+        Cada registro é um dicionário com as chaves de verificar_pagamento()
+        mais gasto_recorrente_id, ano e mes.
+
+        Returns:
+            tuple: (pagamentos, ids excluídos, nova versão), ou None em caso de erro
+        """
+        def consultar(cursor, schema, desde):
+            cursor.execute(f"""
+                SELECT id, gasto_recorrente_id, ano, mes, data_pagamento, valor_pago, transacao_id
+                FROM {schema}.pagamentos_recorrentes
+                WHERE {Alteracoes.condicao()}
+            """, (desde,))
+            return [
+                {
+                    'pago': row.data_pagamento is not None,
+                    'data_pagamento': row.data_pagamento,
+                    'valor_pago': row.valor_pago,
+                    'transacao_id': row.transacao_id,
+                    'pagamento_id': row.id,
+                    'gasto_recorrente_id': row.gasto_recorrente_id,
+                    'ano': row.ano,
+                    'mes': row.mes
+                }
+                for row in cursor.fetchall()
+            ]
+        return Alteracoes.buscar('pagamentos_recorrentes', versao, consultar)
@@ -0,0 +1,141 @@
+"""
+Impressão digital de transações, usada na detecção de duplicatas.
+"""
+import hashlib
+import re
+import unicodedata
+from datetime import datetime
+from decimal import Decimal
+from src.database.db_helper import get_db_connection
+
+class ImpressaoTransacao:
+    """Calcula a impressão digital gravada em transacoes.impressao_digital.
+
+    A impressão é um hash de 64 bits (BIGINT) de conta, faixa de datas, tipo,
+    valor em centavos e descrição normalizada. Duas transações com a mesma
+    impressão, ou com impressões de faixas vizinhas e datas a até JANELA_DIAS
+    dias, são candidatas a duplicata. A coluna é indexada, então a busca das
+    candidatas de um lote é uma única consulta por igualdade.
+    """
+
+    # Tamanho, em dias, de cada faixa de datas (e diferença máxima entre duplicatas)
+    JANELA_DIAS = 3
+
+    # Quantidade de linhas recalculadas por lote
+    TAMANHO_LOTE = 5000
+
+    _NAO_ALFABETICO = re.compile(r'[^A-Z ]+')
+    _ESPACOS = re.compile(r'\s+')
+    _SUFIXO_TRANSFERENCIA = re.compile(r'\s*\((Origem|Destino)\)$')
+
+    @staticmethod
+    def normalizar_descricao(descricao):
+        """Remove acentos, números, pontuação e espaços repetidos, em maiúsculas.
+
+        Números são descartados porque extratos costumam acrescentar códigos de
+        autorização ou parcelas que não aparecem no lançamento manual.
+        """
+        texto = unicodedata.normalize('NFKD', descricao or '')
+        texto = ''.join(c for c in texto if not unicodedata.combining(c)).upper()
+        texto = ImpressaoTransacao._NAO_ALFABETICO.sub(' ', texto)
+        return ImpressaoTransacao._ESPACOS.sub(' ', texto).strip()
+
+    @staticmethod
+    def faixa(data_transacao):
+        """Retorna o número da faixa de datas da transação."""
+        return data_transacao.toordinal() // ImpressaoTransacao.JANELA_DIAS
+
+    @staticmethod
+    def calcular(conta_id, data_transacao, valor, tipo, descricao, faixa=None):
+        """Calcula a impressão digital (inteiro de 64 bits com sinal).
+
+        Args:
+            faixa: Faixa de datas a usar no lugar da faixa da data (para sondar faixas vizinhas)
+        """
+        if faixa is None:
+            faixa = ImpressaoTransacao.faixa(data_transacao)
+        centavos = int((Decimal(str(valor)) * 100).to_integral_value())
+        chave = '|'.join((str(conta_id or 0), str(faixa), tipo or '', str(centavos),
+                          ImpressaoTransacao.normalizar_descricao(descricao)))
+        digest = hashlib.blake2b(chave.encode('utf-8'), digest_size=8).digest()
+        return int.from_bytes(digest, 'big', signed=True)
+
+    @staticmethod
+    def vizinhas(conta_id, data_transacao, valor, tipo, descricao):
+        """Impressões da faixa da transação e das duas faixas vizinhas."""
+        faixa = ImpressaoTransacao.faixa(data_transacao)
+        return [ImpressaoTransacao.calcular(conta_id, data_transacao, valor, tipo, descricao, f)
+                for f in (faixa - 1, faixa, faixa + 1)]
+
+    @staticmethod
+    def de_transacao(transacao):
+        """Calcula a impressão de um objeto com os campos de uma transação."""
+        # As duas pernas de uma transferência usam a descrição sem o sufixo (Origem)/(Destino)
+        descricao = ImpressaoTransacao._SUFIXO_TRANSFERENCIA.sub('', transacao.descricao or '')
+        return ImpressaoTransacao.calcular(transacao.conta_id, ImpressaoTransacao.como_data(transacao.data_transacao),
+                                           transacao.valor, transacao.tipo, descricao)
+
+    @staticmethod
+    def recalcular(cursor, schema, condicao, params):
+        """Recalcula a impressão das transações da condição, na transação em andamento.
+
+        Usado depois de alterações em lote de conta ou data.
+        """
+        cursor.execute(f"""
+            SELECT id, conta_id, data_transacao, valor, tipo, descricao
+            FROM {schema}.transacoes
+            WHERE {condicao}
+        """, params)
+        atualizacoes = [(ImpressaoTransacao.de_transacao(row), row.id) for row in cursor.fetchall()]
+        if atualizacoes:
+            cursor.executemany(f"UPDATE {schema}.transacoes SET impressao_digital = ? WHERE id = ?",
+                               atualizacoes)
+        return len(atualizacoes)
+
+    @staticmethod
+    def preencher(apenas_pendentes=True):
+        """Calcula a impressão das transações já gravadas, em lotes (um commit por lote).
+
+        Args:
+            apenas_pendentes: Se True, só as transações sem impressão
+
+        Returns:
+            int: Quantidade de transações atualizadas
+        """
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            cursor.fast_executemany = True
+            schema = db.schema
+
+            condicao = "id > ?"
+            if apenas_pendentes:
+                condicao += " AND impressao_digital IS NULL"
+
+            total = 0
+            ultimo_id = 0
+            while True:
+                cursor.execute(f"""
+                    SELECT TOP (?) id FROM {schema}.transacoes WHERE {condicao} ORDER BY id
+                """, (ImpressaoTransacao.TAMANHO_LOTE, ultimo_id))
+                ids = [row.id for row in cursor.fetchall()]
+                if not ids:
+                    break
+
+                total += ImpressaoTransacao.recalcular(cursor, schema, "id BETWEEN ? AND ?", (ids[0], ids[-1]))
+                db.commit()
+                ultimo_id = ids[-1]
+
+            return total
+
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao calcular impressões das transações: {e}")
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def como_data(valor):
+        """Converte datetime em date (o driver pode devolver qualquer um dos dois)."""
+        return valor.date() if isinstance(valor, datetime) else valor
@@ -1,13 +1,17 @@
 from decimal import Decimal
 from src.database.db_helper import get_db_connection
+from src.models.alteracoes import Alteracoes
 from src.models.conta import Conta
 from src.models.conta_dimensao import ContaDimensao
 
 class MeioPagamento:
     """Classe para representar um meio de pagamento."""
     
+    # Tipo cujas compras são agrupadas em faturas (ver FaturaCartao)
+    TIPO_CARTAO_CREDITO = "Cartão de Crédito"
+    
     def __init__(self, id=None, nome=None, descricao=None, conta_id=None, 
-                 tipo=None, data_criacao=None, ativo=True):
+                 tipo=None, data_criacao=None, ativo=True, dia_fechamento=None, dia_vencimento=None):
         self.id = id
         self.nome = nome
         self.descricao = descricao
@@ -15,6 +19,8 @@ class MeioPagamento:
         self.tipo = tipo  # Cartão de Crédito, Cartão de Débito, PIX, Dinheiro, Transferência, etc.
         self.data_criacao = data_criacao
         self.ativo = ativo
+        self.dia_fechamento = dia_fechamento  # Dia de fechamento da fatura (cartão de crédito)
+        self.dia_vencimento = dia_vencimento  # Dia de vencimento da fatura (cartão de crédito)
         
         # Objeto relacionado
         self._conta = None
@@ -65,9 +71,10 @@ class MeioPagamento:
                 # Inserir novo meio de pagamento
                 cursor.execute(f"""
                     INSERT INTO {schema}.meios_pagamento 
-                    (nome, descricao, conta_id, tipo, ativo)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (self.nome, self.descricao, self.conta_id, self.tipo, self.ativo))
+                    (nome, descricao, conta_id, tipo, ativo, dia_fechamento, dia_vencimento)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """, (self.nome, self.descricao, self.conta_id, self.tipo, self.ativo,
+                      self.dia_fechamento, self.dia_vencimento))
                 
                 # Obter o ID gerado
                 cursor.execute("SELECT @@IDENTITY")
@@ -76,9 +83,11 @@ class MeioPagamento:
                 # Atualizar meio de pagamento existente
                 cursor.execute(f"""
                     UPDATE {schema}.meios_pagamento
-                    SET nome = ?, descricao = ?, conta_id = ?, tipo = ?, ativo = ?
+                    SET nome = ?, descricao = ?, conta_id = ?, tipo = ?, ativo = ?,
+                        dia_fechamento = ?, dia_vencimento = ?
                     WHERE id = ?
-                """, (self.nome, self.descricao, self.conta_id, self.tipo, self.ativo, self.id))
+                """, (self.nome, self.descricao, self.conta_id, self.tipo, self.ativo,
+                      self.dia_fechamento, self.dia_vencimento, self.id))
             
             db.commit()
             return True
@@ -112,6 +121,26 @@ class MeioPagamento:
         finally:
             db.close()
     
+    @property
+    def possui_fatura(self):
+        """Indica se as compras neste meio de pagamento são agrupadas em faturas."""
+        return self.tipo == self.TIPO_CARTAO_CREDITO and bool(self.dia_fechamento)
+    
+    @staticmethod
+    def _de_row(row):
+        """Cria um meio de pagamento a partir de uma linha de meios_pagamento."""
+        return MeioPagamento(
+            id=row.id,
+            nome=row.nome,
+            descricao=row.descricao,
+            conta_id=row.conta_id,
+            tipo=row.tipo,
+            data_criacao=row.data_criacao,
+            ativo=row.ativo,
+            dia_fechamento=row.dia_fechamento,
+            dia_vencimento=row.dia_vencimento
+        )
+    
     @staticmethod
     def buscar_por_id(meio_pagamento_id):
         """Busca um meio de pagamento pelo ID."""
@@ -124,15 +153,7 @@ class MeioPagamento:
             row = cursor.fetchone()
             
             if row:
-                return MeioPagamento(
-                    id=row.id,
-                    nome=row.nome,
-                    descricao=row.descricao,
-                    conta_id=row.conta_id,
-                    tipo=row.tipo,
-                    data_criacao=row.data_criacao,
-                    ativo=row.ativo
-                )
+                return MeioPagamento._de_row(row)
             return None
             
         except Exception as e:
@@ -167,16 +188,7 @@ class MeioPagamento:
             rows = cursor.fetchall()
             
             for row in rows:
-                meio_pagamento = MeioPagamento(
-                    id=row.id,
-                    nome=row.nome,
-                    descricao=row.descricao,
-                    conta_id=row.conta_id,
-                    tipo=row.tipo,
-                    data_criacao=row.data_criacao,
-                    ativo=row.ativo
-                )
-                meios_pagamento.append(meio_pagamento)
+                meios_pagamento.append(MeioPagamento._de_row(row))
             
             return meios_pagamento
             
@@ -185,6 +197,18 @@ class MeioPagamento:
             return []
         finally:
             db.close()
+
+    @staticmethod
+    def alteracoes_desde(versao):
+        """Meios de pagamento incluídos ou alterados (inclusive inativados) e ids excluídos desde a versão.
+
+        Returns:
+            tuple: (meios de pagamento, ids excluídos, nova versão), ou None em caso de erro
+        """
+        def consultar(cursor, schema, desde):
+            cursor.execute(f"SELECT * FROM {schema}.meios_pagamento WHERE {Alteracoes.condicao()}", (desde,))
+            return [MeioPagamento._de_row(row) for row in cursor.fetchall()]
+        return Alteracoes.buscar('meios_pagamento', versao, consultar)
     
     @staticmethod
     def listar_por_tipo(tipo, apenas_ativos=True):
@@ -208,16 +232,7 @@ class MeioPagamento:
             rows = cursor.fetchall()
             
             for row in rows:
-                meio_pagamento = MeioPagamento(
-                    id=row.id,
-                    nome=row.nome,
-                    descricao=row.descricao,
-                    conta_id=row.conta_id,
-                    tipo=row.tipo,
-                    data_criacao=row.data_criacao,
-                    ativo=row.ativo
-                )
-                meios_pagamento.append(meio_pagamento)
+                meios_pagamento.append(MeioPagamento._de_row(row))
             
             return meios_pagamento
             
@@ -0,0 +1,196 @@
+import re
+from src.database.db_helper import get_db_connection
+
+class RegraCategorizacao:
+    """Regra que associa um padrão na descrição ou no local da transação a categoria,
+    meio de pagamento e/ou conta.
+
+    As regras são avaliadas em ordem de prioridade (menor primeiro); a primeira
+    que casar define os campos que ela preenche.
+    """
+
+    # Campos da transação em que o padrão pode ser procurado
+    CAMPOS = ('descricao', 'local_transacao')
+
+    def __init__(self, id=None, nome=None, padrao=None, campo='descricao', expressao_regular=False,
+                 categoria_id=None, meio_pagamento_id=None, conta_id=None, prioridade=100,
+                 acertos=0, ultimo_acerto=None, data_criacao=None, ativo=True):
+        self.id = id
+        self.nome = nome
+        self.padrao = padrao  # Texto procurado ou expressão regular
+        self.campo = campo  # 'descricao' ou 'local_transacao'
+        self.expressao_regular = expressao_regular
+        self.categoria_id = categoria_id
+        self.meio_pagamento_id = meio_pagamento_id
+        self.conta_id = conta_id
+        self.prioridade = prioridade
+        self.acertos = acertos  # Quantidade de transações classificadas pela regra
+        self.ultimo_acerto = ultimo_acerto
+        self.data_criacao = data_criacao
+        self.ativo = ativo
+
+    def expressao(self):
+        """Retorna o padrão como expressão regular (texto simples é escapado).
+
+        Raises:
+            ValueError: Se a expressão for inválida ou usar grupos nomeados
+        """
+        if not self.expressao_regular:
+            return re.escape(self.padrao.strip())
+        try:
+            compilada = re.compile(self.padrao)
+        except re.error as e:
+            raise ValueError(f"Expressão regular inválida na regra '{self.nome}': {e}")
+        # Os grupos nomeados identificam as regras no padrão combinado
+        if compilada.groupindex:
+            raise ValueError(f"A regra '{self.nome}' não pode usar grupos nomeados.")
+        return self.padrao
+
+    def validar(self):
+        """Verifica os campos da regra, levantando ValueError se houver problema."""
+        if not self.nome or not self.padrao or not self.padrao.strip():
+            raise ValueError("Nome e padrão da regra são obrigatórios.")
+        if self.campo not in self.CAMPOS:
+            raise ValueError(f"Campo inválido para a regra: {self.campo}")
+        if not (self.categoria_id or self.meio_pagamento_id or self.conta_id):
+            raise ValueError("A regra deve definir categoria, meio de pagamento ou conta.")
+        self.expressao()
+
+    def salvar(self):
+        """Salva ou atualiza uma regra no banco de dados."""
+        try:
+            self.validar()
+        except ValueError as e:
+            print(f"Erro ao salvar regra de categorização: {e}")
+            return False
+
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            if self.id is None:
+                cursor.execute(f"""
+                    INSERT INTO {schema}.regras_categorizacao
+                    (nome, padrao, campo, expressao_regular, categoria_id, meio_pagamento_id,
+                     conta_id, prioridade, ativo)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (self.nome, self.padrao, self.campo, self.expressao_regular, self.categoria_id,
+                      self.meio_pagamento_id, self.conta_id, self.prioridade, self.ativo))
+
+                cursor.execute("SELECT @@IDENTITY")
+                self.id = cursor.fetchone()[0]
+            else:
+                cursor.execute(f"""
+                    UPDATE {schema}.regras_categorizacao
+                    SET nome = ?, padrao = ?, campo = ?, expressao_regular = ?, categoria_id = ?,
+                        meio_pagamento_id = ?, conta_id = ?, prioridade = ?, ativo = ?
+                    WHERE id = ?
+                """, (self.nome, self.padrao, self.campo, self.expressao_regular, self.categoria_id,
+                      self.meio_pagamento_id, self.conta_id, self.prioridade, self.ativo, self.id))
+
+            db.commit()
+            return True
+
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao salvar regra de categorização: {e}")
+            return False
+        finally:
+            db.close()
+
+    def excluir(self):
+        """Marca uma regra como inativa (exclusão lógica)."""
+        if self.id is None:
+            return False
+
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            cursor.execute(f"UPDATE {schema}.regras_categorizacao SET ativo = 0 WHERE id = ?", (self.id,))
+            db.commit()
+            self.ativo = False
+            return True
+
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao excluir regra de categorização: {e}")
+            return False
+        finally:
+            db.close()
+
+    @staticmethod
+    def _de_row(row):
+        """Cria uma regra a partir de uma linha de regras_categorizacao."""
+        return RegraCategorizacao(
+            id=row.id,
+            nome=row.nome,
+            padrao=row.padrao,
+            campo=row.campo,
+            expressao_regular=bool(row.expressao_regular),
+            categoria_id=row.categoria_id,
+            meio_pagamento_id=row.meio_pagamento_id,
+            conta_id=row.conta_id,
+            prioridade=row.prioridade,
+            acertos=row.acertos,
+            ultimo_acerto=row.ultimo_acerto,
+            data_criacao=row.data_criacao,
+            ativo=bool(row.ativo)
+        )
+
+    @staticmethod
+    def buscar_por_id(regra_id):
+        """Busca uma regra pelo ID."""
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            cursor.execute(f"SELECT * FROM {schema}.regras_categorizacao WHERE id = ?", (regra_id,))
+            row = cursor.fetchone()
+            return RegraCategorizacao._de_row(row) if row else None
+
+        except Exception as e:
+            print(f"Erro ao buscar regra de categorização: {e}")
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def listar_todas(apenas_ativas=True):
+        """Lista as regras na ordem em que são avaliadas."""
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            query = f"SELECT * FROM {schema}.regras_categorizacao"
+            if apenas_ativas:
+                query += " WHERE ativo = 1"
+            query += " ORDER BY prioridade, id"
+
+            cursor.execute(query)
+            return [RegraCategorizacao._de_row(row) for row in cursor.fetchall()]
+
+        except Exception as e:
+            print(f"Erro ao listar regras de categorização: {e}")
+            return []
+        finally:
+            db.close()
+
+    @staticmethod
+    def registrar_acertos(cursor, schema, acertos):
+        """Soma os acertos de um lote às regras, na transação em andamento.
+
+        Args:
+            acertos: Dicionário {regra_id: quantidade}
+        """
+        if not acertos:
+            return
+        cursor.executemany(f"""
+            UPDATE {schema}.regras_categorizacao
+            SET acertos = acertos + ?, ultimo_acerto = GETDATE()
+            WHERE id = ?
+        """, [(int(quantidade), int(regra_id)) for regra_id, quantidade in acertos.items()])
@@ -0,0 +1,207 @@
+from datetime import date, timedelta
+from src.database.db_helper import get_db_connection
+from src.models.arquivo_transacoes import ArquivoTransacoes
+
+class ResumoMensal:
+    """Totais materializados de transações por conta, categoria, tipo e mês.
+
+    A tabela resumo_mensal é mantida na mesma transação das gravações em
+    transacoes. Referências nulas de conta e categoria são guardadas como 0.
+    A view indexada resumo_anual soma o resumo por ano.
+    """
+
+    # Agregação das transações no formato da tabela de resumo
+    _AGREGACAO = """
+        SELECT ISNULL(conta_id, 0) AS conta_id, ISNULL(categoria_id, 0) AS categoria_id, tipo,
+               YEAR(data_transacao) AS ano, MONTH(data_transacao) AS mes,
+               SUM(valor) AS total, COUNT(*) AS quantidade
+        FROM {fonte} AS t
+        {where}
+        GROUP BY ISNULL(conta_id, 0), ISNULL(categoria_id, 0), tipo,
+                 YEAR(data_transacao), MONTH(data_transacao)
+    """
+
+    @staticmethod
+    def registrar(cursor, schema, condicao, params, sinal=1):
+        """Soma (sinal=1) ou subtrai (sinal=-1) do resumo as transações que atendem à condição.
+
+        Deve ser chamado com o cursor da transação em andamento: depois de um
+        INSERT/UPDATE com sinal 1 e antes de um UPDATE/DELETE com sinal -1.
+        """
+        agregacao = ResumoMensal._AGREGACAO.format(fonte=f"{schema}.transacoes", where=f"WHERE {condicao}")
+        cursor.execute(f"""
+            MERGE {schema}.resumo_mensal WITH (HOLDLOCK) AS r
+            USING (
+                SELECT conta_id, categoria_id, tipo, ano, mes,
+                       total * ? AS total, quantidade * ? AS quantidade
+                FROM ({agregacao}) AS a
+            ) AS v
+            ON r.ano = v.ano AND r.mes = v.mes AND r.conta_id = v.conta_id
+               AND r.categoria_id = v.categoria_id AND r.tipo = v.tipo
+            WHEN MATCHED AND r.quantidade + v.quantidade = 0 THEN
+                DELETE
+            WHEN MATCHED THEN
+                UPDATE SET total = r.total + v.total, quantidade = r.quantidade + v.quantidade
+            WHEN NOT MATCHED THEN
+                INSERT (conta_id, categoria_id, tipo, ano, mes, total, quantidade)
+                VALUES (v.conta_id, v.categoria_id, v.tipo, v.ano, v.mes, v.total, v.quantidade);
+        """, [sinal, sinal] + list(params))
+
+    @staticmethod
+    def aplicar_variacoes(cursor, schema, variacoes):
+        """Aplica variações já agregadas ao resumo.
+
+        Args:
+            variacoes: Lista de tuplas (conta_id, categoria_id, tipo, ano, mes, total, quantidade)
+        """
+        cursor.executemany(f"""
+            MERGE {schema}.resumo_mensal WITH (HOLDLOCK) AS r
+            USING (SELECT ? AS conta_id, ? AS categoria_id, ? AS tipo, ? AS ano, ? AS mes,
+                          ? AS total, ? AS quantidade) AS v
+            ON r.ano = v.ano AND r.mes = v.mes AND r.conta_id = v.conta_id
+               AND r.categoria_id = v.categoria_id AND r.tipo = v.tipo
+            WHEN MATCHED THEN
+                UPDATE SET total = r.total + v.total, quantidade = r.quantidade + v.quantidade
+            WHEN NOT MATCHED THEN
+                INSERT (conta_id, categoria_id, tipo, ano, mes, total, quantidade)
+                VALUES (v.conta_id, v.categoria_id, v.tipo, v.ano, v.mes, v.total, v.quantidade);
+        """, variacoes)
+
+    @staticmethod
+    def reconstruir():
+        """Recalcula todo o resumo a partir das transações, inclusive as arquivadas (para cargas retroativas).
+
+        Returns:
+            int: Quantidade de linhas do resumo após a reconstrução
+        """
+        db = get_db_connection()
+        try:
+            total = ResumoMensal.recalcular(db.get_cursor(), db.schema)
+            db.commit()
+            return total
+
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao reconstruir resumo mensal: {e}")
+            raise
+        finally:
+            db.close()
+
+    @staticmethod
+    def recalcular(cursor, schema):
+        """Recalcula o resumo do esquema a partir das transações (inclusive as arquivadas), na transação em andamento.
+
+        Returns:
+            int: Quantidade de linhas do resumo
+        """
+        cursor.execute(f"DELETE FROM {schema}.resumo_mensal")
+        cursor.execute(f"""
+            INSERT INTO {schema}.resumo_mensal
+            (conta_id, categoria_id, tipo, ano, mes, total, quantidade)
+            {ResumoMensal._AGREGACAO.format(fonte=ArquivoTransacoes.fonte(schema), where='')}
+        """)
+        cursor.execute(f"SELECT COUNT(*) FROM {schema}.resumo_mensal")
+        return cursor.fetchone()[0]
+
+    @staticmethod
+    def consulta_periodo(schema, data_inicio, data_fim):
+        """Monta uma tabela derivada com os totais do período.
+
+        Anos inteiros vêm de resumo_anual, os demais meses inteiros do resumo
+        mensal, e apenas os dias das pontas que não cobrem um mês inteiro são
+        lidos das transações (incluindo o arquivo só se a ponta for de um ano
+        anterior ao atual).
+
+        Returns:
+            tuple: (sql com colunas conta_id, categoria_id, tipo, total, quantidade, params)
+        """
+        meses, trechos = ResumoMensal._dividir_periodo(data_inicio, data_fim)
+        partes = []
+        params = []
+
+        if meses:
+            anos, faixas = ResumoMensal._dividir_meses(*meses)
+            if anos:
+                partes.append(f"""
+                    SELECT NULLIF(conta_id, 0) AS conta_id, NULLIF(categoria_id, 0) AS categoria_id,
+                           tipo, total, quantidade
+                    FROM {schema}.resumo_anual WITH (NOEXPAND)
+                    WHERE ano BETWEEN ? AND ?
+                """)
+                params.extend(anos)
+
+            for faixa in faixas:
+                partes.append(f"""
+                    SELECT NULLIF(conta_id, 0) AS conta_id, NULLIF(categoria_id, 0) AS categoria_id,
+                           tipo, total, quantidade
+                    FROM {schema}.resumo_mensal
+                    WHERE ano * 100 + mes BETWEEN ? AND ?
+                """)
+                params.extend(faixa)
+
+        for inicio, fim in trechos:
+            partes.append(f"""
+                SELECT conta_id, categoria_id, tipo, valor AS total, 1 AS quantidade
+                FROM {ArquivoTransacoes.fonte(schema, inicio)} AS t
+                WHERE data_transacao BETWEEN ? AND ?
+            """)
+            params.extend([inicio, fim])
+
+        return " UNION ALL ".join(partes), params
+
+    @staticmethod
+    def _dividir_meses(mes_inicio, mes_fim):
+        """Separa uma faixa de meses (aaaamm) em anos inteiros e faixas de meses nas pontas.
+
+        Returns:
+            tuple: ((ano_inicio, ano_fim) ou None, lista de (aaaamm_inicio, aaaamm_fim))
+        """
+        ano_inicio, primeiro_mes = divmod(mes_inicio, 100)
+        ano_fim, ultimo_mes = divmod(mes_fim, 100)
+
+        primeiro_ano = ano_inicio if primeiro_mes == 1 else ano_inicio + 1
+        ultimo_ano = ano_fim if ultimo_mes == 12 else ano_fim - 1
+
+        if primeiro_ano > ultimo_ano:
+            return None, [(mes_inicio, mes_fim)]
+
+        faixas = []
+        if mes_inicio < primeiro_ano * 100 + 1:
+            faixas.append((mes_inicio, (primeiro_ano - 1) * 100 + 12))
+        if mes_fim > ultimo_ano * 100 + 12:
+            faixas.append(((ultimo_ano + 1) * 100 + 1, mes_fim))
+        return (primeiro_ano, ultimo_ano), faixas
+
+    @staticmethod
+    def _dividir_periodo(data_inicio, data_fim):
+        """Separa o período em meses inteiros e trechos parciais nas pontas.
+
+        Returns:
+            tuple: ((aaaamm_inicio, aaaamm_fim) ou None, lista de (inicio, fim) parciais)
+        """
+        inicio = data_inicio.date() if hasattr(data_inicio, 'date') else data_inicio
+        fim = data_fim.date() if hasattr(data_fim, 'date') else data_fim
+
+        # Primeiro dia do primeiro mês inteiro e último dia do último mês inteiro
+        primeiro = inicio if inicio.day == 1 else ResumoMensal._proximo_mes(inicio)
+        proximo = ResumoMensal._proximo_mes(fim)
+        ultimo = fim if (proximo - timedelta(days=1)) == fim else fim.replace(day=1) - timedelta(days=1)
+
+        if primeiro > ultimo:
+            return None, [(inicio, fim)]
+
+        trechos = []
+        if inicio < primeiro:
+            trechos.append((inicio, primeiro - timedelta(days=1)))
+        if ultimo < fim:
+            trechos.append((ultimo + timedelta(days=1), fim))
+
+        meses = (primeiro.year * 100 + primeiro.month, ultimo.year * 100 + ultimo.month)
+        return meses, trechos
+
+    @staticmethod
+    def _proximo_mes(data):
+        """Retorna o primeiro dia do mês seguinte."""
+        if data.month == 12:
+            return date(data.year + 1, 1, 1)
+        return date(data.year, data.month + 1, 1)
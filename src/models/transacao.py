@@ -1,21 +1,50 @@
-from datetime import datetime
+import base64
+import json
+import re
+from datetime import datetime, date
 from decimal import Decimal
 from src.database.db_helper import get_db_connection
+from src.models.alteracoes import Alteracoes
+from src.models.arquivo_transacoes import ArquivoTransacoes
 from src.models.conta import Conta
+from src.models.extrato_conta import ExtratoConta
 from src.models.categoria import Categoria
 from src.models.meio_pagamento import MeioPagamento
+from src.models.impressao_transacao import ImpressaoTransacao
+from src.models.resumo_mensal import ResumoMensal
+from src.models.transacao_linha import TransacaoLinha
 
 class Transacao:
     """Classe para representar uma transação financeira."""
     
+    # Indica, por esquema, se a tabela transacoes possui índice de texto completo
+    _cache_texto_completo = {}
+    
+    # Ordenações aceitas em listar_todas (o id desempata linhas da mesma data)
+    ORDENACAO_PADRAO = "data_transacao desc"
+    ORDENACOES = {
+        "data_transacao desc": "data_transacao DESC, id DESC",
+        "data_transacao asc": "data_transacao ASC, id ASC",
+        "valor desc": "valor DESC, id DESC",
+        "valor asc": "valor ASC, id ASC",
+        "descricao asc": "descricao ASC, id ASC",
+        "descricao desc": "descricao DESC, id DESC"
+    }
+
+    # Campos que podem ser alterados em lote nas transações selecionadas
+    CAMPOS_LOTE = ('categoria_id', 'conta_id', 'meio_pagamento_id', 'data_transacao')
+
     def __init__(self, id=None, descricao=None, valor=0.0, data_transacao=None, tipo=None, 
                  categoria_id=None, conta_id=None, meio_pagamento_id=None, 
                  descricao_pagamento=None, local_transacao=None, observacao=None, 
                  data_criacao=None, transferencia_id=None, conta_destino_id=None):
         self.id = id
         self.descricao = descricao
-        # Converter para Decimal para garantir consistência
-        self.valor = Decimal(str(valor)) if valor is not None else Decimal('0.0')
+        # Converter para Decimal para garantir consistência (o driver já devolve Decimal)
+        if isinstance(valor, Decimal):
+            self.valor = valor
+        else:
+            self.valor = Decimal(str(valor)) if valor is not None else Decimal('0.0')
         self.data_transacao = data_transacao if data_transacao else datetime.now().date()
         self.tipo = tipo  # 'R' para Receita, 'D' para Despesa, 'T' para Transferência
         self.categoria_id = categoria_id
@@ -28,6 +57,12 @@ class Transacao:
         self.transferencia_id = transferencia_id
         self.conta_destino_id = conta_destino_id
         
+        # Operação do diário local que inseriu a transação (ver SincronizacaoService)
+        self.id_diario = None
+        
+        # Transações de anos arquivados (ArquivoTransacoes) são somente leitura
+        self.arquivada = False
+        
         # Objetos relacionados
         self._categoria = None
         self._conta = None
@@ -64,6 +99,10 @@ class Transacao:
     
     def salvar(self):
         """Salva ou atualiza uma transação no banco de dados."""
+        if self.arquivada:
+            print(f"Erro ao salvar transação: a transação {self.id} é de um ano arquivado")
+            return False
+        
         db = None
         try:
             db = get_db_connection()
@@ -80,17 +119,20 @@ class Transacao:
                     INSERT INTO {schema}.transacoes 
                     (descricao, valor, data_transacao, tipo, categoria_id, conta_id, 
                     meio_pagamento_id, descricao_pagamento, local_transacao, observacao,
-                    transferencia_id, conta_destino_id)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    transferencia_id, conta_destino_id, impressao_digital, id_diario)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (self.descricao, self.valor, self.data_transacao, self.tipo, 
                     self.categoria_id, self.conta_id, self.meio_pagamento_id,
                     self.descricao_pagamento, self.local_transacao, self.observacao,
-                    self.transferencia_id, self.conta_destino_id))
+                    self.transferencia_id, self.conta_destino_id, ImpressaoTransacao.de_transacao(self),
+                    self.id_diario))
                 
                 # Obter o ID gerado
                 cursor.execute("SELECT @@IDENTITY")
                 self.id = cursor.fetchone()[0]
                 
+                ResumoMensal.registrar(cursor, schema, "id = ?", (self.id,))
+                
                 db.commit()
                 
                 # Atualizar saldo da conta
@@ -106,18 +148,25 @@ class Transacao:
             else:
                 # Atualizar transação existente
                 original = self._obter_transacao_original(self.id, cursor)
+                if original is None:
+                    raise ValueError(f"Transação {self.id} não encontrada (excluída ou de ano arquivado)")
+                
+                ResumoMensal.registrar(cursor, schema, "id = ?", (self.id,), sinal=-1)
                 
                 cursor.execute(f"""
                     UPDATE {schema}.transacoes
                     SET descricao = ?, valor = ?, data_transacao = ?, tipo = ?, 
                         categoria_id = ?, conta_id = ?, meio_pagamento_id = ?,
                         descricao_pagamento = ?, local_transacao = ?, observacao = ?,
-                        transferencia_id = ?, conta_destino_id = ?
+                        transferencia_id = ?, conta_destino_id = ?, impressao_digital = ?
                     WHERE id = ?
                 """, (self.descricao, self.valor, self.data_transacao, self.tipo, 
                     self.categoria_id, self.conta_id, self.meio_pagamento_id,
                     self.descricao_pagamento, self.local_transacao, self.observacao,
-                    self.transferencia_id, self.conta_destino_id, self.id))
+                    self.transferencia_id, self.conta_destino_id,
+                    ImpressaoTransacao.de_transacao(self), self.id))
+                
+                ResumoMensal.registrar(cursor, schema, "id = ?", (self.id,))
                 
                 db.commit()
                 
@@ -174,13 +223,15 @@ class Transacao:
                 INSERT INTO {schema}.transacoes 
                 (descricao, valor, data_transacao, tipo, categoria_id, conta_id, 
                 meio_pagamento_id, descricao_pagamento, local_transacao, observacao,
-                transferencia_id, conta_destino_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                transferencia_id, conta_destino_id, impressao_digital, id_diario)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (f"{self.descricao} (Origem)", self.valor, self.data_transacao, 'T', 
                 self.categoria_id, self.conta_id, self.meio_pagamento_id,
                 self.descricao_pagamento, self.local_transacao, 
                 f"Transferência para conta destino. {self.observacao or ''}".strip(),
-                self.transferencia_id, self.conta_destino_id))
+                self.transferencia_id, self.conta_destino_id,
+                ImpressaoTransacao.calcular(self.conta_id, self.data_transacao, self.valor, 'T', self.descricao),
+                self.id_diario))
             
             # Obter ID da primeira transação
             cursor.execute("SELECT @@IDENTITY")
@@ -191,18 +242,22 @@ class Transacao:
                 INSERT INTO {schema}.transacoes 
                 (descricao, valor, data_transacao, tipo, categoria_id, conta_id, 
                 meio_pagamento_id, descricao_pagamento, local_transacao, observacao,
-                transferencia_id, conta_destino_id)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                transferencia_id, conta_destino_id, impressao_digital, id_diario)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (f"{self.descricao} (Destino)", self.valor, self.data_transacao, 'T', 
                 self.categoria_id, self.conta_destino_id, None,
                 self.descricao_pagamento, self.local_transacao, 
                 f"Transferência da conta origem. {self.observacao or ''}".strip(),
-                self.transferencia_id, self.conta_id))
+                self.transferencia_id, self.conta_id,
+                ImpressaoTransacao.calcular(self.conta_destino_id, self.data_transacao, self.valor, 'T', self.descricao),
+                self.id_diario))
             
             # Obter ID da segunda transação
             cursor.execute("SELECT @@IDENTITY")
             transacao_destino_id = cursor.fetchone()[0]
             
+            ResumoMensal.registrar(cursor, schema, "transferencia_id = ?", (self.transferencia_id,))
+            
             db.commit()
             
             # Definir o ID da transação principal como a primeira criada
@@ -259,7 +314,7 @@ class Transacao:
     
     def excluir(self):
         """Exclui uma transação e atualiza o saldo da conta."""
-        if self.id is None:
+        if self.id is None or self.arquivada:
             return False
         
         db = get_db_connection()
@@ -269,10 +324,15 @@ class Transacao:
             
             # Se for uma transferência, excluir ambas as transações
             if self.transferencia_id:
-                cursor.execute(f"DELETE FROM {schema}.transacoes WHERE transferencia_id = ?", 
-                             (self.transferencia_id,))
+                condicao, params = "transferencia_id = ?", (self.transferencia_id,)
             else:
-                cursor.execute(f"DELETE FROM {schema}.transacoes WHERE id = ?", (self.id,))
+                condicao, params = "id = ?", (self.id,)
+            
+            # Retirar do resumo mensal antes de apagar as linhas
+            ResumoMensal.registrar(cursor, schema, condicao, params, sinal=-1)
+            cursor.execute(f"DELETE FROM {schema}.transacoes WHERE {condicao}", params)
+            if cursor.rowcount == 0:
+                raise ValueError(f"Transação {self.id} não encontrada (excluída ou de ano arquivado)")
             
             db.commit()
             
@@ -298,6 +358,210 @@ class Transacao:
             return False
         finally:
             db.close()
+
+    @staticmethod
+    def _condicao_lote(schema):
+        """Condição que seleciona as transações de uma lista de ids e as pernas das transferências.
+
+        Os ids são passados como um único parâmetro separado por vírgulas (usado
+        duas vezes), então o tamanho da seleção não esbarra no limite de
+        parâmetros do SQL Server.
+        """
+        ids = "SELECT CAST(value AS INT) FROM STRING_SPLIT(?, ',')"
+        return f"""(id IN ({ids}) OR transferencia_id IN (
+                    SELECT transferencia_id FROM {schema}.transacoes
+                    WHERE transferencia_id IS NOT NULL AND id IN ({ids})))"""
+
+    @staticmethod
+    def _registrar_saldos(cursor, schema, condicao, params, sinal=1):
+        """Soma (sinal=1) ou subtrai (sinal=-1) dos saldos das contas o efeito das transações da condição.
+
+        As transações são agregadas por conta e cada saldo recebe um único UPDATE,
+        na transação em andamento. Segue a mesma convenção de ResumoMensal.registrar.
+        """
+        cursor.execute(f"""
+            UPDATE cs
+            SET saldo_atual = cs.saldo_atual + ? * d.variacao
+            FROM {schema}.conta_saldos cs
+            INNER JOIN (
+                SELECT t.conta_id, SUM({ExtratoConta.valor_com_sinal(f'{schema}.transacoes')}) AS variacao
+                FROM {schema}.transacoes t
+                WHERE t.conta_id IS NOT NULL AND {condicao}
+                GROUP BY t.conta_id
+            ) d ON d.conta_id = cs.conta_dimensao_id
+        """, (sinal,) + tuple(params))
+
+    @staticmethod
+    def atualizar_em_lote(ids, campos):
+        """Altera categoria, conta, meio de pagamento e/ou data de várias transações de uma vez.
+
+        Tudo é feito em uma única transação: um UPDATE para as linhas selecionadas,
+        o resumo mensal retirado e recolocado, e os saldos das contas ajustados
+        pela diferença agregada por conta. Categoria e data valem para as duas
+        pernas de uma transferência; conta e meio de pagamento não são alterados
+        em transferências, pois dependem da conta de cada perna.
+
+        Args:
+            ids: Ids das transações selecionadas
+            campos: Dicionário com um ou mais de CAMPOS_LOTE e os novos valores
+
+        Returns:
+            Quantidade de transações alteradas, ou None em caso de erro
+        """
+        campos = {campo: valor for campo, valor in campos.items() if campo in Transacao.CAMPOS_LOTE}
+        if not ids or not campos:
+            return 0
+
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            lista_ids = ','.join(str(int(i)) for i in ids)
+            condicao = Transacao._condicao_lote(schema)
+            params = (lista_ids, lista_ids)
+            if 'conta_id' in campos or 'meio_pagamento_id' in campos:
+                condicao += " AND tipo <> 'T'"
+
+            # O meio de pagamento não entra no resumo nem no saldo
+            altera_resumo = any(campo != 'meio_pagamento_id' for campo in campos)
+            altera_saldos = 'conta_id' in campos
+
+            if altera_resumo:
+                ResumoMensal.registrar(cursor, schema, condicao, params, sinal=-1)
+            if altera_saldos:
+                Transacao._registrar_saldos(cursor, schema, condicao, params, sinal=-1)
+
+            atribuicoes = ', '.join(f"{campo} = ?" for campo in campos)
+            cursor.execute(f"UPDATE {schema}.transacoes SET {atribuicoes} WHERE {condicao}",
+                           tuple(campos.values()) + params)
+            alteradas = cursor.rowcount
+
+            if altera_resumo:
+                ResumoMensal.registrar(cursor, schema, condicao, params)
+            if altera_saldos:
+                Transacao._registrar_saldos(cursor, schema, condicao, params)
+            if 'conta_id' in campos or 'data_transacao' in campos:
+                ImpressaoTransacao.recalcular(cursor, schema, condicao, params)
+
+            db.commit()
+            return alteradas
+
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao alterar transações em lote: {e}")
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def excluir_em_lote(ids):
+        """Exclui várias transações (e as duas pernas das transferências) em uma única transação.
+
+        O resumo mensal e os saldos das contas são revertidos com a soma agregada
+        das linhas excluídas antes de um único DELETE.
+
+        Returns:
+            Quantidade de transações excluídas, ou None em caso de erro
+        """
+        if not ids:
+            return 0
+
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            lista_ids = ','.join(str(int(i)) for i in ids)
+            condicao = Transacao._condicao_lote(schema)
+            params = (lista_ids, lista_ids)
+
+            ResumoMensal.registrar(cursor, schema, condicao, params, sinal=-1)
+            Transacao._registrar_saldos(cursor, schema, condicao, params, sinal=-1)
+            cursor.execute(f"DELETE FROM {schema}.transacoes WHERE {condicao}", params)
+            excluidas = cursor.rowcount
+
+            db.commit()
+            return excluidas
+
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao excluir transações em lote: {e}")
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def inserir_em_lote(transacoes):
+        """Insere várias transações (exceto transferências) em uma única transação.
+
+        Cada INSERT devolve o id gerado (OUTPUT); o resumo mensal e os saldos das
+        contas recebem a soma agregada das linhas inseridas, com um único commit.
+
+        Returns:
+            Lista de ids alinhada com transacoes, ou None em caso de erro
+        """
+        if not transacoes:
+            return []
+
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            ids = []
+            for transacao in transacoes:
+                cursor.execute(f"""
+                    INSERT INTO {schema}.transacoes
+                    (descricao, valor, data_transacao, tipo, categoria_id, conta_id,
+                    meio_pagamento_id, descricao_pagamento, local_transacao, observacao, impressao_digital,
+                    id_diario)
+                    OUTPUT INSERTED.id
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, (transacao.descricao, transacao.valor, transacao.data_transacao, transacao.tipo,
+                      transacao.categoria_id, transacao.conta_id, transacao.meio_pagamento_id,
+                      transacao.descricao_pagamento, transacao.local_transacao, transacao.observacao,
+                      ImpressaoTransacao.de_transacao(transacao), transacao.id_diario))
+                ids.append(cursor.fetchone()[0])
+
+            condicao = "id IN (SELECT CAST(value AS INT) FROM STRING_SPLIT(?, ','))"
+            params = (','.join(str(int(i)) for i in ids),)
+            ResumoMensal.registrar(cursor, schema, condicao, params)
+            Transacao._registrar_saldos(cursor, schema, condicao, params)
+
+            db.commit()
+            for transacao, transacao_id in zip(transacoes, ids):
+                transacao.id = transacao_id
+            return ids
+
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao inserir transações em lote: {e}")
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def _de_row(row):
+        """Cria uma transação a partir de uma linha de transacoes (ou de ArquivoTransacoes.fonte)."""
+        transacao = Transacao(
+            id=row.id,
+            descricao=row.descricao,
+            valor=row.valor,
+            data_transacao=row.data_transacao,
+            tipo=row.tipo,
+            categoria_id=getattr(row, 'categoria_id', None),
+            conta_id=getattr(row, 'conta_id', None),
+            meio_pagamento_id=getattr(row, 'meio_pagamento_id', None),
+            descricao_pagamento=getattr(row, 'descricao_pagamento', None),
+            local_transacao=getattr(row, 'local_transacao', None),
+            observacao=getattr(row, 'observacao', None),
+            data_criacao=getattr(row, 'data_criacao', None),
+            transferencia_id=getattr(row, 'transferencia_id', None),
+            conta_destino_id=getattr(row, 'conta_destino_id', None)
+        )
+        transacao.arquivada = bool(getattr(row, 'arquivada', False))
+        return transacao
     
     @staticmethod
     def buscar_por_id(transacao_id):
@@ -307,26 +571,11 @@ class Transacao:
             cursor = db.get_cursor()
             schema = db.schema
             
-            cursor.execute(f"SELECT * FROM {schema}.transacoes WHERE id = ?", (transacao_id,))
+            cursor.execute(f"SELECT * FROM {ArquivoTransacoes.fonte(schema)} t WHERE id = ?", (transacao_id,))
             row = cursor.fetchone()
             
             if row:
-                return Transacao(
-                    id=row.id,
-                    descricao=row.descricao,
-                    valor=row.valor,
-                    data_transacao=row.data_transacao,
-                    tipo=row.tipo,
-                    categoria_id=getattr(row, 'categoria_id', None),
-                    conta_id=getattr(row, 'conta_id', None),
-                    meio_pagamento_id=getattr(row, 'meio_pagamento_id', None),
-                    descricao_pagamento=getattr(row, 'descricao_pagamento', None),
-                    local_transacao=getattr(row, 'local_transacao', None),
-                    observacao=getattr(row, 'observacao', None),
-                    data_criacao=getattr(row, 'data_criacao', None),
-                    transferencia_id=getattr(row, 'transferencia_id', None),
-                    conta_destino_id=getattr(row, 'conta_destino_id', None)
-                )
+                return Transacao._de_row(row)
             return None
             
         except Exception as e:
@@ -335,9 +584,56 @@ class Transacao:
         finally:
             db.close()
     
+    @staticmethod
+    def _montar_filtros(filtros, alias=''):
+        """Monta as condições SQL (sempre parametrizadas) a partir do dicionário de filtros.
+        
+        Returns:
+            tuple: (lista de condições, lista de parâmetros)
+        """
+        condicoes = []
+        params = []
+        if not filtros:
+            return condicoes, params
+        
+        prefixo = f"{alias}." if alias else ""
+        
+        if filtros.get('data_inicio'):
+            condicoes.append(f"{prefixo}data_transacao >= ?")
+            params.append(filtros['data_inicio'])
+        
+        if filtros.get('data_fim'):
+            condicoes.append(f"{prefixo}data_transacao <= ?")
+            params.append(filtros['data_fim'])
+        
+        for campo in ('tipo', 'categoria_id', 'conta_id', 'meio_pagamento_id'):
+            if filtros.get(campo):
+                condicoes.append(f"{prefixo}{campo} = ?")
+                params.append(filtros[campo])
+        
+        if filtros.get('local_transacao'):
+            condicoes.append(f"{prefixo}local_transacao LIKE ?")
+            params.append(f"%{filtros['local_transacao']}%")
+        
+        return condicoes, params
+    
+    @staticmethod
+    def _obter_ordenacao(filtros):
+        """Retorna a cláusula ORDER BY permitida para o filtro 'ordenacao'."""
+        ordenacao = (filtros or {}).get('ordenacao') or Transacao.ORDENACAO_PADRAO
+        chave = " ".join(ordenacao.split()).lower()
+        if chave not in Transacao.ORDENACOES:
+            print(f"Aviso: Ordenação não permitida ignorada: {ordenacao}")
+            chave = Transacao.ORDENACAO_PADRAO
+        return Transacao.ORDENACOES[chave]
+    
     @staticmethod
     def listar_todas(filtros=None):
-        """Lista todas as transações com opções de filtro."""
+        """Lista todas as transações com opções de filtro.
+        
+        As transações arquivadas só são consultadas quando data_inicio é anterior
+        ao ano corrente ou não foi informada.
+        """
         db = get_db_connection()
         transacoes = []
         
@@ -345,69 +641,23 @@ class Transacao:
             cursor = db.get_cursor()
             schema = db.schema
             
-            query = f"SELECT * FROM {schema}.transacoes WHERE 1=1"
-            params = []
-            
-            if filtros:
-                if 'data_inicio' in filtros and filtros['data_inicio']:
-                    query += " AND data_transacao >= ?"
-                    params.append(filtros['data_inicio'])
-                
-                if 'data_fim' in filtros and filtros['data_fim']:
-                    query += " AND data_transacao <= ?"
-                    params.append(filtros['data_fim'])
-                
-                if 'tipo' in filtros and filtros['tipo']:
-                    query += " AND tipo = ?"
-                    params.append(filtros['tipo'])
-                
-                if 'categoria_id' in filtros and filtros['categoria_id']:
-                    query += " AND categoria_id = ?"
-                    params.append(filtros['categoria_id'])
-                
-                if 'conta_id' in filtros and filtros['conta_id']:
-                    query += " AND conta_id = ?"
-                    params.append(filtros['conta_id'])
-                
-                if 'meio_pagamento_id' in filtros and filtros['meio_pagamento_id']:
-                    query += " AND meio_pagamento_id = ?"
-                    params.append(filtros['meio_pagamento_id'])
-                
-                if 'local_transacao' in filtros and filtros['local_transacao']:
-                    query += " AND local_transacao LIKE ?"
-                    params.append(f"%{filtros['local_transacao']}%")
-            
-            # Ordenação padrão por data mais recente
-            ordenacao = "data_transacao DESC"
-            if filtros and 'ordenacao' in filtros and filtros['ordenacao']:
-                ordenacao = filtros['ordenacao']
-            
-            query += f" ORDER BY {ordenacao}"
+            condicoes, params = Transacao._montar_filtros(filtros)
+            # O arquivo só é lido se o período começar antes do ano corrente
+            fonte = ArquivoTransacoes.fonte(schema, (filtros or {}).get('data_inicio'))
+            query = f"SELECT * FROM {fonte} t WHERE 1=1"
+            query += "".join(f" AND {condicao}" for condicao in condicoes)
+            query += f" ORDER BY {Transacao._obter_ordenacao(filtros)}"
             
             # Limite de registros
-            if filtros and 'limite' in filtros and filtros['limite']:
-                query += f" OFFSET 0 ROWS FETCH NEXT {filtros['limite']} ROWS ONLY"
+            if filtros and filtros.get('limite'):
+                query += " OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY"
+                params.append(int(filtros['limite']))
             
             cursor.execute(query, params)
             rows = cursor.fetchall()
             
             for row in rows:
-                transacao = Transacao(
-                    id=row.id,
-                    descricao=row.descricao,
-                    valor=row.valor,
-                    data_transacao=row.data_transacao,
-                    tipo=row.tipo,
-                    categoria_id=getattr(row, 'categoria_id', None),
-                    conta_id=getattr(row, 'conta_id', None),
-                    meio_pagamento_id=getattr(row, 'meio_pagamento_id', None),
-                    descricao_pagamento=getattr(row, 'descricao_pagamento', None),
-                    local_transacao=getattr(row, 'local_transacao', None),
-                    observacao=getattr(row, 'observacao', None),
-                    data_criacao=getattr(row, 'data_criacao', None),
-                    transferencia_id=getattr(row, 'transferencia_id', None),
-                    conta_destino_id=getattr(row, 'conta_destino_id', None)
-                )
+                transacao = Transacao._de_row(row)
                 transacoes.append(transacao)
             
             return transacoes
@@ -416,4 +666,356 @@ class Transacao:
             print(f"Erro ao listar transações: {e}")
             return []
         finally:
-            db.close()
\ No newline at end of file
+            db.close()
+    
+    @staticmethod
+    def _consulta_linhas(schema, topo=False, fonte=None):
+        """Retorna o SELECT (com os nomes das referências) que alimenta TransacaoLinha.
+        
+        fonte substitui a tabela transacoes (ex.: ArquivoTransacoes.fonte).
+        """
+        return f"""
+            SELECT {'TOP (?) ' if topo else ''}t.id, t.data_transacao, t.descricao, t.tipo, t.valor,
+                   t.categoria_id, t.conta_id, t.conta_destino_id, t.meio_pagamento_id,
+                   t.transferencia_id, t.local_transacao,
+                   c.nome AS categoria_nome, cd.nome AS conta_nome,
+                   cdd.nome AS conta_destino_nome, mp.nome AS meio_pagamento_nome
+            FROM {fonte or f"{schema}.transacoes"} t
+            LEFT JOIN {schema}.categorias c ON c.id = t.categoria_id
+            LEFT JOIN {schema}.conta_dimensao cd ON cd.id = t.conta_id
+            LEFT JOIN {schema}.conta_dimensao cdd ON cdd.id = t.conta_destino_id
+            LEFT JOIN {schema}.meios_pagamento mp ON mp.id = t.meio_pagamento_id
+        """
+    
+    @staticmethod
+    def listar_linhas(filtros=None):
+        """Lista transações como TransacaoLinha (somente leitura), para telas e relatórios.
+        
+        Aceita os mesmos filtros de listar_todas. Os nomes de categoria, conta e meio
+        de pagamento vêm na mesma consulta, sem buscas adicionais por linha.
+        """
+        db = get_db_connection()
+        
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+            
+            condicoes, params = Transacao._montar_filtros(filtros, alias='t')
+            ordenacao = ", ".join(f"t.{parte.strip()}" for parte in Transacao._obter_ordenacao(filtros).split(","))
+            
+            fonte = ArquivoTransacoes.fonte(schema, (filtros or {}).get('data_inicio'))
+            query = Transacao._consulta_linhas(schema, fonte=fonte) + " WHERE 1=1"
+            query += "".join(f" AND {condicao}" for condicao in condicoes)
+            query += f" ORDER BY {ordenacao}"
+            
+            if filtros and filtros.get('limite'):
+                query += " OFFSET 0 ROWS FETCH NEXT ? ROWS ONLY"
+                params.append(int(filtros['limite']))
+            
+            cursor.execute(query, params)
+            return [TransacaoLinha.de_row(row) for row in cursor.fetchall()]
+
+        except Exception as e:
+            print(f"Erro ao listar transações: {e}")
+            return []
+        finally:
+            db.close()
+
+    @staticmethod
+    def alteracoes_desde(versao):
+        """Transações incluídas ou alteradas e ids excluídos desde a versão.
+
+        Returns:
+            tuple: (transações, ids excluídos, nova versão), ou None em caso de erro
+        """
+        def consultar(cursor, schema, desde):
+            cursor.execute(f"SELECT * FROM {schema}.transacoes WHERE {Alteracoes.condicao()}", (desde,))
+            return [Transacao._de_row(row) for row in cursor.fetchall()]
+        return Alteracoes.buscar('transacoes', versao, consultar)
+
+    @staticmethod
+    def linhas_alteradas_desde(versao):
+        """Como alteracoes_desde, mas retorna TransacaoLinha (com os nomes das referências)."""
+        def consultar(cursor, schema, desde):
+            cursor.execute(Transacao._consulta_linhas(schema) + f" WHERE {Alteracoes.condicao('t')}", (desde,))
+            return [TransacaoLinha.de_row(row) for row in cursor.fetchall()]
+        return Alteracoes.buscar('transacoes', versao, consultar)
+
+    @staticmethod
+    def listar_pagina(filtros=None, tamanho_pagina=100, continuacao=None, decrescente=True):
+        """Lista uma página de transações usando paginação por chave (data_transacao, id).
+        
+        Cada página continua exatamente após a última linha da anterior, sem reler
+        ou pular linhas, então o custo por página não cresce com a posição.
+        
+        Args:
+            filtros: Mesmos filtros de listar_todas (exceto ordenacao e limite)
+            tamanho_pagina: Quantidade de transações por página
+            continuacao: Token devolvido pela página anterior (None para a primeira)
+            decrescente: True para as mais recentes primeiro
+            
+        Returns:
+            tuple: (lista de transações, token da próxima página ou None se for a última)
+        """
+        db = get_db_connection()
+        transacoes = []
+        
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+            
+            condicoes, params = Transacao._montar_filtros(filtros)
+            direcao = "DESC" if decrescente else "ASC"
+            
+            if continuacao:
+                ultima_data, ultimo_id = Transacao._decodificar_continuacao(continuacao, direcao)
+                operador = "<" if decrescente else ">"
+                condicoes.append(
+                    f"(data_transacao {operador} ? OR (data_transacao = ? AND id {operador} ?))"
+                )
+                params.extend([ultima_data, ultima_data, ultimo_id])
+            
+            # Buscar uma linha a mais para saber se existe próxima página
+            fonte = ArquivoTransacoes.fonte(schema, (filtros or {}).get('data_inicio'))
+            query = f"SELECT TOP (?) * FROM {fonte} t WHERE 1=1"
+            query += "".join(f" AND {condicao}" for condicao in condicoes)
+            query += f" ORDER BY data_transacao {direcao}, id {direcao}"
+            
+            cursor.execute(query, [int(tamanho_pagina) + 1] + params)
+            rows = cursor.fetchall()
+            
+            for row in rows[:tamanho_pagina]:
+                transacoes.append(Transacao._de_row(row))
+            
+            proxima = None
+            if len(rows) > tamanho_pagina:
+                ultima = transacoes[-1]
+                proxima = Transacao._codificar_continuacao(ultima.data_transacao, ultima.id, direcao)
+            
+            return transacoes, proxima
+            
+        except Exception as e:
+            print(f"Erro ao listar página de transações: {e}")
+            return [], None
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _codificar_continuacao(data_transacao, transacao_id, direcao):
+        """Gera o token opaco que identifica a posição da última linha de uma página."""
+        conteudo = json.dumps([data_transacao.isoformat(), int(transacao_id), direcao])
+        return base64.urlsafe_b64encode(conteudo.encode('utf-8')).decode('ascii')
+    
+    @staticmethod
+    def _decodificar_continuacao(token, direcao):
+        """Lê um token de continuação, validando que pertence à mesma ordenação."""
+        try:
+            data_iso, transacao_id, direcao_token = json.loads(base64.urlsafe_b64decode(token.encode('ascii')))
+            data_transacao = date.fromisoformat(data_iso)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Token de continuação inválido: {token}") from e
+        
+        if direcao_token != direcao:
+            raise ValueError("Token de continuação gerado para outra ordenação.")
+        return data_transacao, int(transacao_id)
+    
+    @staticmethod
+    def obter_resumo_por_periodo(data_inicio, data_fim):
+        """Obtém os totais de receitas e despesas do período em uma única consulta.
+        
+        Returns:
+            Dicionário com total_receitas, total_despesas, saldo_periodo e quantidade
+        """
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+            
+            # Meses inteiros vêm do resumo mensal; só as pontas leem transacoes
+            fonte, params = ResumoMensal.consulta_periodo(schema, data_inicio, data_fim)
+            cursor.execute(f"""
+                SELECT
+                    COALESCE(SUM(CASE WHEN tipo = 'R' THEN total END), 0) AS total_receitas,
+                    COALESCE(SUM(CASE WHEN tipo = 'D' THEN total END), 0) AS total_despesas,
+                    COALESCE(SUM(quantidade), 0) AS quantidade
+                FROM ({fonte}) AS r
+            """, params)
+            row = cursor.fetchone()
+            
+            total_receitas = Decimal(row.total_receitas)
+            total_despesas = Decimal(row.total_despesas)
+            return {
+                'total_receitas': total_receitas,
+                'total_despesas': total_despesas,
+                'saldo_periodo': total_receitas - total_despesas,
+                'quantidade': row.quantidade
+            }
+            
+        except Exception as e:
+            print(f"Erro ao obter resumo por período: {e}")
+            return {
+                'total_receitas': Decimal('0.0'),
+                'total_despesas': Decimal('0.0'),
+                'saldo_periodo': Decimal('0.0'),
+                'quantidade': 0
+            }
+        finally:
+            db.close()
+    
+    @staticmethod
+    def obter_resumo_por_categoria(data_inicio, data_fim, tipo, limite=None):
+        """Obtém o total por categoria no período, do maior para o menor.
+        
+        Returns:
+            Lista de dicionários com categoria_id, nome_categoria, total e quantidade
+        """
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+            
+            topo = "TOP (?)" if limite else ""
+            fonte, params_fonte = ResumoMensal.consulta_periodo(schema, data_inicio, data_fim)
+            params = [limite] if limite else []
+            params.extend(params_fonte)
+            params.append(tipo)
+            
+            cursor.execute(f"""
+                SELECT {topo} r.categoria_id,
+                       COALESCE(c.nome, 'Sem categoria') AS nome_categoria,
+                       SUM(r.total) AS total,
+                       SUM(r.quantidade) AS quantidade
+                FROM ({fonte}) AS r
+                LEFT JOIN {schema}.categorias c ON c.id = r.categoria_id
+                WHERE r.tipo = ?
+                GROUP BY r.categoria_id, c.nome
+                ORDER BY SUM(r.total) DESC
+            """, params)
+            
+            return [
+                {
+                    'categoria_id': row.categoria_id,
+                    'nome_categoria': row.nome_categoria,
+                    'total': Decimal(row.total),
+                    'quantidade': row.quantidade
+                }
+                for row in cursor.fetchall()
+            ]
+            
+        except Exception as e:
+            print(f"Erro ao obter resumo por categoria: {e}")
+            return []
+        finally:
+            db.close()
+    
+    @staticmethod
+    def pesquisar(texto, filtros=None, limite=200):
+        """Pesquisa transações por termos em descricao, local_transacao e observacao.
+        
+        Cada termo é tratado como prefixo e todos precisam ocorrer. Usa o índice de
+        texto completo do SQL Server (ordenando por relevância) quando disponível.
+        Os anos arquivados entram na busca quando o período começa antes do ano
+        atual (ou não tem início); como o arquivo não tem índice de texto completo,
+        as transações arquivadas são procuradas com LIKE e vêm depois das demais.
+        Retorna objetos TransacaoLinha, somente leitura.
+        
+        Args:
+            texto: Termos da busca separados por espaço (ex.: "mercado pao")
+            filtros: Filtros adicionais (data_inicio, data_fim, tipo, conta_id, ...)
+            limite: Número máximo de resultados
+        """
+        termos = Transacao._extrair_termos(texto)
+        if not termos:
+            return []
+        
+        db = get_db_connection()
+        
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+            
+            condicoes, params = Transacao._montar_filtros(filtros, alias='t')
+            inclui_arquivo = ArquivoTransacoes.inclui_arquivo((filtros or {}).get('data_inicio'))
+            fonte = ArquivoTransacoes.fonte(schema) if inclui_arquivo else None
+            condicao_like, params_like = Transacao._condicao_termos_like(termos)
+            
+            if Transacao._texto_completo_disponivel(cursor, schema):
+                # Busca indexada: todos os termos como prefixo, ordenada pela relevância
+                condicao_busca = " AND ".join(f'"{termo}*"' for termo in termos)
+                if inclui_arquivo:
+                    # Ativas pelo índice; arquivadas (fora do índice) pelos mesmos termos com LIKE
+                    juncao = "LEFT JOIN"
+                    condicao_juncao = "ft.[KEY] = t.id AND t.arquivada = 0"
+                    condicoes.insert(0, f"(ft.[KEY] IS NOT NULL OR (t.arquivada = 1 AND {condicao_like}))")
+                    params = params_like + params
+                else:
+                    juncao = "INNER JOIN"
+                    condicao_juncao = "ft.[KEY] = t.id"
+                query = f"""
+                    {Transacao._consulta_linhas(schema, topo=True, fonte=fonte)}
+                    {juncao} CONTAINSTABLE({schema}.transacoes,
+                        (descricao, local_transacao, observacao), ?) ft ON {condicao_juncao}
+                    WHERE 1=1 {''.join(' AND ' + c for c in condicoes)}
+                    ORDER BY ft.[RANK] DESC, t.data_transacao DESC, t.id DESC
+                """
+                params = [limite, condicao_busca] + params
+            else:
+                # Sem índice de texto completo: cada termo deve aparecer em algum dos campos
+                condicoes.append(condicao_like)
+                params.extend(params_like)
+                query = f"""
+                    {Transacao._consulta_linhas(schema, topo=True, fonte=fonte)}
+                    WHERE {' AND '.join(condicoes)}
+                    ORDER BY t.data_transacao DESC, t.id DESC
+                """
+                params = [limite] + params
+            
+            cursor.execute(query, params)
+            return [TransacaoLinha.de_row(row) for row in cursor.fetchall()]
+            
+        except Exception as e:
+            print(f"Erro ao pesquisar transações: {e}")
+            return []
+        finally:
+            db.close()
+    
+    @staticmethod
+    def _extrair_termos(texto):
+        """Separa o texto da busca em termos, removendo caracteres especiais."""
+        if not texto:
+            return []
+        return [termo for termo in re.findall(r"[\w\-']+", texto.lower()) if len(termo) > 1]
+    
+    @staticmethod
+    def _condicao_termos_like(termos):
+        """Condição LIKE em que cada termo aparece em descricao, local_transacao ou observacao.
+        
+        Returns:
+            tuple: (condição com alias t, parâmetros)
+        """
+        condicoes, params = [], []
+        for termo in termos:
+            condicoes.append("(t.descricao LIKE ? ESCAPE '\\' OR t.local_transacao LIKE ? ESCAPE '\\' "
+                             "OR t.observacao LIKE ? ESCAPE '\\')")
+            params.extend([f"%{Transacao._escapar_like(termo)}%"] * 3)
+        return f"({' AND '.join(condicoes)})", params
+    
+    @staticmethod
+    def _escapar_like(termo):
+        """Escapa os curingas do LIKE (_, % e [) para que o termo seja buscado literalmente."""
+        return re.sub(r"([\\_%\[])", r"\\\1", termo)
+    
+    @staticmethod
+    def _texto_completo_disponivel(cursor, schema):
+        """Indica se existe índice de texto completo em transacoes (resultado em cache por esquema)."""
+        if schema not in Transacao._cache_texto_completo:
+            try:
+                cursor.execute("""
+                    SELECT COUNT(*) FROM sys.fulltext_indexes
+                    WHERE object_id = OBJECT_ID(?) AND is_enabled = 1
+                """, (f"{schema}.transacoes",))
+                Transacao._cache_texto_completo[schema] = cursor.fetchone()[0] > 0
+            except Exception as e:
+                print(f"Aviso: Não foi possível verificar o índice de texto completo: {e}")
+                Transacao._cache_texto_completo[schema] = False
+        return Transacao._cache_texto_completo[schema]
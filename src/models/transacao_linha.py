@@ -0,0 +1,34 @@
+"""
+Representação compacta e somente leitura de transações para listagens e relatórios.
+"""
+from collections import namedtuple
+
+# Colunas na mesma ordem do SELECT de Transacao._consulta_linhas
+CAMPOS_LINHA = (
+    'id', 'data_transacao', 'descricao', 'tipo', 'valor',
+    'categoria_id', 'conta_id', 'conta_destino_id', 'meio_pagamento_id', 'transferencia_id',
+    'local_transacao', 'categoria_nome', 'conta_nome', 'conta_destino_nome', 'meio_pagamento_nome'
+)
+
+class TransacaoLinha(namedtuple('TransacaoLinha', CAMPOS_LINHA)):
+    """Linha de transação somente leitura, sem __dict__ nem objetos relacionados.
+
+    O valor é mantido como o Decimal devolvido pelo driver e os nomes das
+    referências já vêm resolvidos pela consulta. Para alterações, use Transacao.
+    """
+    __slots__ = ()
+
+    @classmethod
+    def de_row(cls, row):
+        """Cria a linha a partir de um registro do cursor (colunas em CAMPOS_LINHA)."""
+        return cls._make(row)
+
+    @property
+    def valor_centavos(self):
+        """Valor em centavos como inteiro."""
+        return int(self.valor * 100)
+
+    @property
+    def valor_com_sinal(self):
+        """Valor positivo para receitas e negativo para despesas e transferências."""
+        return self.valor if self.tipo == 'R' else -self.valor
@@ -1,4 +1,32 @@
-from .relatorio_service import RelatorioService
-from .notion_service import NotionService
+"""
+Serviços da aplicação.
 
-__all__ = ['RelatorioService', 'NotionService']
\ No newline at end of file
+Os serviços dependem de bibliotecas pesadas (pandas, matplotlib, NumPy), então
+são importados apenas no primeiro acesso a cada nome, e não ao importar o pacote.
+"""
+import importlib
+
+# Nome exportado -> módulo que o define
+_MODULOS = {
+    'RelatorioService': '.relatorio_service',
+    'NotionService': '.notion_service',
+    'ImportacaoService': '.importacao_service',
+    'ExportacaoService': '.exportacao_service',
+    'ArmazemTransacoes': '.armazem_transacoes',
+    'PrevisaoService': '.previsao_service',
+    'CategorizacaoService': '.categorizacao_service',
+    'DuplicidadeService': '.duplicidade_service',
+    'SincronizacaoService': '.sincronizacao_service',
+}
+
+__all__ = list(_MODULOS)
+
+def __getattr__(nome):
+    if nome not in _MODULOS:
+        raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
+    valor = getattr(importlib.import_module(_MODULOS[nome], __name__), nome)
+    globals()[nome] = valor
+    return valor
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
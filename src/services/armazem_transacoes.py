@@ -0,0 +1,275 @@
+"""
+Armazém colunar em memória das transações, para análises e gráficos locais.
+"""
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+import numpy as np
+from src.database.db_helper import get_db_connection
+from src.models.alteracoes import Alteracoes
+from src.models.arquivo_transacoes import ArquivoTransacoes
+from src.models.extrato_conta import ExtratoConta
+
+class ArmazemTransacoes:
+    """Mantém as transações em arrays NumPy e agrega localmente, sem consultar o servidor.
+
+    Cada coluna é um array: dias (int32, dias desde 1970-01-01), centavos (int64),
+    contas/categorias/meios de pagamento (int32, 0 quando nulo) e tipos (uint8).
+    A carga completa (que inclui as transações arquivadas) acontece uma vez
+    por sessão; depois, atualizar() busca
+    apenas as linhas incluídas ou alteradas desde a última versão lida (coluna
+    versao) e remove as excluídas, registradas em exclusoes.
+    O atributo versao é incrementado sempre que o conteúdo muda, e pode ser
+    usado como chave de caches de resultados derivados.
+    """
+
+    # Códigos de tipo. Transferências são separadas pela perna (origem/destino)
+    TIPO_RECEITA = 1
+    TIPO_DESPESA = 2
+    TIPO_TRANSFERENCIA_SAIDA = 3
+    TIPO_TRANSFERENCIA_ENTRADA = 4
+    CODIGOS_TIPO = {'R': (1,), 'D': (2,), 'T': (3, 4)}
+
+    # Agrupamentos suportados por agrupar()/totais_por()
+    CAMPOS_AGRUPAMENTO = ('dia', 'mes', 'ano', 'categoria', 'conta', 'meio_pagamento', 'tipo')
+
+    # Intervalo mínimo (segundos) entre verificações de alterações no servidor
+    INTERVALO_ATUALIZACAO = 30
+
+    TAMANHO_LOTE = 20000
+
+    _instancias = {}
+    _trava_instancias = threading.Lock()
+
+    def __init__(self, schema=None):
+        self.schema = schema
+        self._trava = threading.Lock()
+        self._limpar()
+        self.nomes_categorias = {}
+        self.versao = 0
+        self._ultima_verificacao = 0
+
+    @classmethod
+    def obter(cls, forcar_atualizacao=False):
+        """Retorna o armazém da sessão para o esquema atual, carregando-o se necessário."""
+        schema = get_db_connection().schema
+        with cls._trava_instancias:
+            if schema not in cls._instancias:
+                cls._instancias[schema] = cls(schema)
+            armazem = cls._instancias[schema]
+        armazem.atualizar(forcar=forcar_atualizacao)
+        return armazem
+
+    def __len__(self):
+        return len(self.ids)
+
+    def invalidar(self):
+        """Força a verificação de alterações na próxima chamada de atualizar()."""
+        self._ultima_verificacao = 0
+
+    def atualizar(self, forcar=False):
+        """Sincroniza o armazém com o servidor de forma incremental."""
+        with self._trava:
+            if not forcar and time.monotonic() - self._ultima_verificacao < self.INTERVALO_ATUALIZACAO:
+                return
+
+            db = get_db_connection()
+            try:
+                cursor = db.get_cursor()
+                schema = db.schema
+
+                nova_versao = Alteracoes.marca(cursor)
+                anterior = self.nomes_categorias
+                if self._versao_servidor is None:
+                    self._limpar()
+                    alterados = self._buscar(cursor, ArquivoTransacoes.fonte(schema), "1=1", ())
+                    removidos = 0
+                else:
+                    excluidos = Alteracoes.excluidos(cursor, schema, 'transacoes', self._versao_servidor)
+                    alterados = self._buscar(cursor, f"{schema}.transacoes", Alteracoes.condicao(),
+                                             (self._versao_servidor,))
+                    # Linhas alteradas saem e voltam com os valores novos
+                    removidos = self._remover(np.concatenate([np.array(excluidos, dtype=np.int64), alterados[:, 0]]))
+                self._anexar(alterados)
+
+                self._carregar_nomes_categorias(cursor, schema)
+                if len(alterados) or removidos or self._versao_servidor is None or self.nomes_categorias != anterior:
+                    self.versao += 1
+                self._versao_servidor = nova_versao
+                self._ultima_verificacao = time.monotonic()
+
+            except Exception as e:
+                print(f"Erro ao atualizar armazém de transações: {e}")
+            finally:
+                db.close()
+
+    def agrupar(self, campo, com_sinal=False, **filtros):
+        """Soma os valores (em centavos) agrupados por um campo.
+
+        Args:
+            campo: Um de CAMPOS_AGRUPAMENTO
+            com_sinal: Se True, receitas e entradas somam e despesas e saídas subtraem
+            filtros: data_inicio, data_fim, tipo, conta_id, categoria_id, meio_pagamento_id
+
+        Returns:
+            tuple: (array de chaves ordenadas, array int64 de totais em centavos)
+        """
+        if campo not in self.CAMPOS_AGRUPAMENTO:
+            raise ValueError(f"Agrupamento não suportado: {campo}")
+
+        mascara = self._mascara(**filtros)
+        chaves = self._chaves(campo)[mascara]
+        valores = self.centavos[mascara]
+        if com_sinal:
+            valores = valores * self.sinais[mascara]
+
+        unicas, inverso = np.unique(chaves, return_inverse=True)
+        totais = np.bincount(inverso, weights=valores, minlength=len(unicas))
+        return unicas, np.rint(totais).astype(np.int64)
+
+    def totais_por(self, campo, com_sinal=False, **filtros):
+        """Como agrupar(), mas retorna {chave: Decimal} com chaves em tipos Python.
+
+        Chaves: date para 'dia', (ano, mes) para 'mes', int para 'ano' e ids
+        (None para referências nulas) e a letra do tipo para 'tipo'.
+        """
+        chaves, totais = self.agrupar(campo, com_sinal, **filtros)
+        return {
+            self._converter_chave(campo, chave): Decimal(int(total)).scaleb(-2)
+            for chave, total in zip(chaves, totais)
+        }
+
+    def resumo_periodo(self, data_inicio=None, data_fim=None, **filtros):
+        """Retorna total_receitas, total_despesas e saldo_periodo calculados localmente."""
+        totais = self.totais_por('tipo', data_inicio=data_inicio, data_fim=data_fim, **filtros)
+        receitas = totais.get('R', Decimal('0.00'))
+        despesas = totais.get('D', Decimal('0.00'))
+        return {
+            'total_receitas': receitas,
+            'total_despesas': despesas,
+            'saldo_periodo': receitas - despesas
+        }
+
+    def _mascara(self, data_inicio=None, data_fim=None, tipo=None, conta_id=None,
+                 categoria_id=None, meio_pagamento_id=None):
+        """Monta a máscara booleana dos filtros."""
+        mascara = np.ones(len(self), dtype=bool)
+        if data_inicio:
+            mascara &= self.dias >= self._dia(data_inicio)
+        if data_fim:
+            mascara &= self.dias <= self._dia(data_fim)
+        if tipo:
+            mascara &= np.isin(self.tipos, self.CODIGOS_TIPO[tipo])
+        if conta_id:
+            mascara &= self.contas == conta_id
+        if categoria_id:
+            mascara &= self.categorias == categoria_id
+        if meio_pagamento_id:
+            mascara &= self.meios == meio_pagamento_id
+        return mascara
+
+    def _chaves(self, campo):
+        """Retorna o array usado como chave de agrupamento."""
+        if campo == 'dia':
+            return self.dias
+        if campo == 'mes':
+            return self.dias.astype('datetime64[D]').astype('datetime64[M]').astype(np.int32)
+        if campo == 'ano':
+            return self.dias.astype('datetime64[D]').astype('datetime64[Y]').astype(np.int32)
+        if campo == 'categoria':
+            return self.categorias
+        if campo == 'conta':
+            return self.contas
+        if campo == 'meio_pagamento':
+            return self.meios
+        # Agrupamento por tipo junta as duas pernas das transferências
+        return np.minimum(self.tipos, self.TIPO_TRANSFERENCIA_SAIDA)
+
+    def _converter_chave(self, campo, chave):
+        """Converte a chave NumPy para o tipo Python correspondente."""
+        chave = int(chave)
+        if campo == 'dia':
+            return date(1970, 1, 1) + timedelta(days=chave)
+        if campo == 'mes':
+            return (1970 + chave // 12, chave % 12 + 1)
+        if campo == 'ano':
+            return 1970 + chave
+        if campo == 'tipo':
+            return {1: 'R', 2: 'D', 3: 'T'}[chave]
+        return chave or None
+
+    @staticmethod
+    def _dia(data):
+        """Converte uma data em dias desde 1970-01-01."""
+        if hasattr(data, 'date'):
+            data = data.date()
+        return (data - date(1970, 1, 1)).days
+
+    def _buscar(self, cursor, fonte, condicao, params):
+        """Busca as transações da fonte que atendem à condição como um array int64 (uma linha por transação)."""
+        # Conversões feitas no servidor para que cada linha chegue só com inteiros
+        cursor.execute(f"""
+            SELECT id,
+                   DATEDIFF(DAY, '19700101', data_transacao) AS dia,
+                   CAST(ROUND(valor * 100, 0) AS BIGINT) AS centavos,
+                   ISNULL(conta_id, 0) AS conta_id,
+                   ISNULL(categoria_id, 0) AS categoria_id,
+                   ISNULL(meio_pagamento_id, 0) AS meio_pagamento_id,
+                   CASE tipo WHEN 'R' THEN 1 WHEN 'D' THEN 2
+                        ELSE CASE WHEN {ExtratoConta.perna_destino(fonte)} THEN 4 ELSE 3 END END AS tipo
+            FROM {fonte} t
+            WHERE {condicao}
+            ORDER BY id
+        """, params)
+
+        blocos = []
+        while True:
+            rows = cursor.fetchmany(self.TAMANHO_LOTE)
+            if not rows:
+                break
+            blocos.append(np.array([tuple(row) for row in rows], dtype=np.int64))
+
+        if not blocos:
+            return np.empty((0, 7), dtype=np.int64)
+        return np.concatenate(blocos)
+
+    def _remover(self, ids):
+        """Remove dos arrays as transações com os ids informados e retorna quantas saíram."""
+        manter = ~np.isin(self.ids, ids)
+        removidos = len(self) - int(manter.sum())
+        if removidos:
+            for coluna in ('ids', 'dias', 'centavos', 'contas', 'categorias', 'meios', 'tipos', 'sinais'):
+                setattr(self, coluna, getattr(self, coluna)[manter])
+        return removidos
+
+    def _anexar(self, novos):
+        """Anexa aos arrays as linhas retornadas por _buscar()."""
+        if not len(novos):
+            return
+        self.ids = np.concatenate([self.ids, novos[:, 0].astype(np.int32)])
+        self.dias = np.concatenate([self.dias, novos[:, 1].astype(np.int32)])
+        self.centavos = np.concatenate([self.centavos, novos[:, 2]])
+        self.contas = np.concatenate([self.contas, novos[:, 3].astype(np.int32)])
+        self.categorias = np.concatenate([self.categorias, novos[:, 4].astype(np.int32)])
+        self.meios = np.concatenate([self.meios, novos[:, 5].astype(np.int32)])
+        self.tipos = np.concatenate([self.tipos, novos[:, 6].astype(np.uint8)])
+        self.sinais = np.where(np.isin(self.tipos, (self.TIPO_RECEITA, self.TIPO_TRANSFERENCIA_ENTRADA)),
+                               1, -1).astype(np.int8)
+
+    def _carregar_nomes_categorias(self, cursor, schema):
+        """Atualiza o dicionário {id: nome} das categorias."""
+        cursor.execute(f"SELECT id, nome FROM {schema}.categorias")
+        self.nomes_categorias = {row.id: row.nome for row in cursor.fetchall()}
+
+    def _limpar(self):
+        """Esvazia os arrays do armazém."""
+        self.ids = np.empty(0, dtype=np.int32)
+        self.dias = np.empty(0, dtype=np.int32)
+        self.centavos = np.empty(0, dtype=np.int64)
+        self.contas = np.empty(0, dtype=np.int32)
+        self.categorias = np.empty(0, dtype=np.int32)
+        self.meios = np.empty(0, dtype=np.int32)
+        self.tipos = np.empty(0, dtype=np.uint8)
+        self.sinais = np.empty(0, dtype=np.int8)
+        self._versao_servidor = None
@@ -0,0 +1,198 @@
+"""
+Serviço de categorização automática de transações por regras.
+"""
+import re
+import threading
+from collections import Counter, defaultdict
+from src.database.db_helper import get_db_connection
+from src.models.regra_categorizacao import RegraCategorizacao
+from src.models.transacao import Transacao
+
+class CategorizacaoService:
+    """Classifica transações com as regras de categorização ativas.
+
+    Todas as regras de um mesmo campo são compiladas em uma única expressão
+    regular, com um grupo nomeado por regra dentro de um lookahead. Uma única
+    varredura do texto encontra, em cada posição, a regra de maior prioridade
+    que casa ali; a melhor entre todas as posições é a escolhida. Os lotes são
+    classificados uma vez por texto distinto, já que extratos repetem muito as
+    mesmas descrições.
+    """
+
+    # Transações lidas por vez ao reaplicar as regras ao histórico
+    TAMANHO_LOTE = 5000
+
+    _instancias = {}
+    _trava_instancias = threading.Lock()
+
+    def __init__(self, regras):
+        self.regras = []
+        padroes = defaultdict(list)
+        for regra in regras:
+            if not regra.ativo:
+                continue
+            try:
+                expressao = regra.expressao()
+            except ValueError as e:
+                print(f"Aviso: Regra de categorização ignorada: {e}")
+                continue
+            padroes[regra.campo].append(f"(?=(?P<r{len(self.regras)}>{expressao}))")
+            self.regras.append(regra)
+
+        self._padroes = {
+            campo: re.compile('|'.join(alternativas), re.IGNORECASE)
+            for campo, alternativas in padroes.items()
+        }
+
+    def __bool__(self):
+        return bool(self.regras)
+
+    @classmethod
+    def carregar(cls):
+        """Cria o classificador com as regras ativas do banco (em ordem de prioridade)."""
+        return cls(RegraCategorizacao.listar_todas(apenas_ativas=True))
+
+    @classmethod
+    def obter(cls):
+        """Retorna o classificador da sessão para o esquema atual, carregando-o se necessário."""
+        schema = get_db_connection().schema
+        with cls._trava_instancias:
+            if schema not in cls._instancias:
+                cls._instancias[schema] = cls.carregar()
+            return cls._instancias[schema]
+
+    @classmethod
+    def invalidar(cls):
+        """Descarta os classificadores em cache (chamar após alterar as regras)."""
+        with cls._trava_instancias:
+            cls._instancias.clear()
+
+    def classificar(self, descricao, local_transacao=None):
+        """Retorna a regra de maior prioridade que casa com a transação, ou None."""
+        melhor = None
+        for campo, texto in (('descricao', descricao), ('local_transacao', local_transacao)):
+            padrao = self._padroes.get(campo)
+            if padrao is None or not texto:
+                continue
+            for correspondencia in padrao.finditer(texto):
+                indice = int(correspondencia.lastgroup[1:])
+                if melhor is None or indice < melhor:
+                    melhor = indice
+                    if melhor == 0:
+                        return self.regras[0]
+        return self.regras[melhor] if melhor is not None else None
+
+    def classificar_lote(self, descricoes, locais=None):
+        """Classifica um lote de transações.
+
+        Args:
+            descricoes: Sequência de descrições
+            locais: Sequência de locais alinhada às descrições (opcional)
+
+        Returns:
+            Lista alinhada com a regra de cada transação, ou None se nenhuma casou
+        """
+        if not self.regras:
+            return [None] * len(descricoes)
+        if locais is None:
+            locais = [None] * len(descricoes)
+
+        resultados = {}
+        regras = []
+        for descricao, local in zip(descricoes, locais):
+            chave = (descricao, local)
+            if chave not in resultados:
+                resultados[chave] = self.classificar(descricao, local)
+            regras.append(resultados[chave])
+        return regras
+
+    def reaplicar_ao_historico(self, apenas_sem_categoria=True):
+        """Aplica as regras às transações já gravadas.
+
+        As transações são lidas em lotes e classificadas localmente; depois, cada
+        regra altera todas as suas transações com um único UPDATE em lote
+        (Transacao.atualizar_em_lote), que também mantém o resumo mensal.
+        Só categoria e meio de pagamento são reaplicados: a conta de uma
+        transação gravada não é alterada. Transferências não são classificadas.
+
+        Args:
+            apenas_sem_categoria: Se True, considera só as transações sem categoria
+
+        Returns:
+            Quantidade de transações alteradas, ou None em caso de erro
+        """
+        regras_historico = {id(r) for r in self.regras if r.categoria_id or r.meio_pagamento_id}
+        if not regras_historico:
+            return 0
+
+        ids_por_regra = defaultdict(list)
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            condicao = "id > ? AND tipo <> 'T'"
+            if apenas_sem_categoria:
+                condicao += " AND categoria_id IS NULL"
+
+            ultimo_id = 0
+            while True:
+                cursor.execute(f"""
+                    SELECT TOP (?) id, descricao, local_transacao, categoria_id, meio_pagamento_id
+                    FROM {schema}.transacoes
+                    WHERE {condicao}
+                    ORDER BY id
+                """, (self.TAMANHO_LOTE, ultimo_id))
+                rows = cursor.fetchall()
+                if not rows:
+                    break
+                ultimo_id = rows[-1].id
+
+                regras = self.classificar_lote([row.descricao for row in rows],
+                                               [row.local_transacao for row in rows])
+                for row, regra in zip(rows, regras):
+                    if regra is None or id(regra) not in regras_historico:
+                        continue
+                    if ((regra.categoria_id and regra.categoria_id != row.categoria_id) or
+                            (regra.meio_pagamento_id and regra.meio_pagamento_id != row.meio_pagamento_id)):
+                        ids_por_regra[regra].append(row.id)
+
+        except Exception as e:
+            print(f"Erro ao ler transações para reaplicar regras: {e}")
+            return None
+        finally:
+            db.close()
+
+        alteradas = 0
+        acertos = Counter()
+        for regra, ids in ids_por_regra.items():
+            campos = {}
+            if regra.categoria_id:
+                campos['categoria_id'] = regra.categoria_id
+            if regra.meio_pagamento_id:
+                campos['meio_pagamento_id'] = regra.meio_pagamento_id
+
+            quantidade = Transacao.atualizar_em_lote(ids, campos)
+            if quantidade is None:
+                return None
+            alteradas += quantidade
+            acertos[regra.id] += quantidade
+
+        CategorizacaoService.gravar_acertos(acertos)
+        return alteradas
+
+    @staticmethod
+    def gravar_acertos(acertos):
+        """Soma os acertos às regras em uma transação própria."""
+        if not acertos:
+            return
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            RegraCategorizacao.registrar_acertos(cursor, db.schema, acertos)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao registrar acertos das regras: {e}")
+        finally:
+            db.close()
@@ -0,0 +1,199 @@
+"""
+Serviço de detecção e mesclagem de transações duplicadas.
+"""
+from collections import defaultdict
+from datetime import timedelta
+from src.database.db_helper import get_db_connection
+from src.models.arquivo_transacoes import ArquivoTransacoes
+from src.models.impressao_transacao import ImpressaoTransacao
+from src.models.resumo_mensal import ResumoMensal
+from src.models.transacao import Transacao
+
+class DuplicidadeService:
+    """Encontra transações duplicadas pela impressão digital (ImpressaoTransacao).
+
+    Tanto a verificação de um lote importado quanto a varredura de um período
+    são junções por hash: as impressões são agrupadas em dicionários e cada
+    transação só é comparada com as que têm a mesma impressão (na sua faixa de
+    datas ou na vizinha), sem comparar todos os pares.
+    """
+
+    # Tratamento das duplicatas na importação
+    IGNORAR = 'ignorar'    # não grava a linha importada (mantém a transação existente)
+    MARCAR = 'marcar'      # grava a linha com a observação de possível duplicata
+    IMPORTAR = 'importar'  # grava sem verificar
+
+    # Colunas lidas na varredura de duplicatas
+    _CONSULTA_VARREDURA = """
+        SELECT t.id, t.conta_id, t.data_transacao, t.valor, t.tipo, t.descricao, t.impressao_digital,
+               t.categoria_id, t.meio_pagamento_id, t.local_transacao, t.observacao,
+               c.nome AS categoria_nome, cd.nome AS conta_nome
+        FROM {schema}.transacoes t
+        LEFT JOIN {schema}.categorias c ON c.id = t.categoria_id
+        LEFT JOIN {schema}.conta_dimensao cd ON cd.id = t.conta_id
+        WHERE t.tipo <> 'T' {where}
+        ORDER BY t.data_transacao, t.id
+    """
+
+    @staticmethod
+    def casar_lote(cursor, schema, registros):
+        """Procura, para cada registro de um lote, uma transação gravada equivalente.
+
+        Uma única consulta busca pelo índice de impressao_digital todas as
+        impressões do lote (faixa de cada registro e faixas vizinhas). Cada
+        transação gravada casa com no máximo um registro, então duas compras
+        iguais no lote só são consideradas duplicatas se houver duas gravadas.
+
+        Args:
+            registros: Lista de tuplas (conta_id, data_transacao, valor, tipo, descricao)
+
+        Returns:
+            Lista alinhada com o id da transação gravada equivalente, ou None
+        """
+        sondas = [ImpressaoTransacao.vizinhas(*registro) for registro in registros]
+        impressoes = {impressao for vizinhas in sondas for impressao in vizinhas}
+        if not impressoes:
+            return []
+
+        # Extratos antigos também são comparados com as transações arquivadas
+        inicio = min(ImpressaoTransacao.como_data(registro[1]) for registro in registros)
+        fonte = ArquivoTransacoes.fonte(schema, inicio - timedelta(days=ImpressaoTransacao.JANELA_DIAS))
+        cursor.execute(f"""
+            SELECT id, impressao_digital, data_transacao
+            FROM {fonte} t
+            WHERE impressao_digital IN (SELECT CAST(value AS BIGINT) FROM STRING_SPLIT(?, ','))
+            ORDER BY id
+        """, (','.join(str(i) for i in impressoes),))
+
+        gravadas = defaultdict(list)
+        for row in cursor.fetchall():
+            gravadas[row.impressao_digital].append([row.id, ImpressaoTransacao.como_data(row.data_transacao)])
+
+        correspondencias = []
+        for registro, vizinhas in zip(registros, sondas):
+            data = registro[1]
+            encontrada = None
+            # Faixa do próprio registro primeiro, depois as vizinhas
+            for impressao in (vizinhas[1], vizinhas[0], vizinhas[2]):
+                for candidata in gravadas.get(impressao, ()):
+                    if abs((candidata[1] - data).days) <= ImpressaoTransacao.JANELA_DIAS:
+                        encontrada = candidata
+                        break
+                if encontrada:
+                    gravadas[impressao].remove(encontrada)
+                    break
+            correspondencias.append(encontrada[0] if encontrada else None)
+        return correspondencias
+
+    @staticmethod
+    def detectar(data_inicio=None, data_fim=None):
+        """Agrupa as transações (exceto transferências) que parecem duplicadas.
+
+        Uma única leitura do período; cada transação é ligada às anteriores com
+        a mesma impressão ou a da faixa anterior e data a até JANELA_DIAS dias.
+
+        Returns:
+            Lista de grupos (listas de linhas com id, data_transacao, descricao,
+            valor, tipo, categoria_nome, conta_nome, observacao...), em ordem de data
+        """
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            condicoes, params = [], []
+            if data_inicio:
+                condicoes.append("t.data_transacao >= ?")
+                params.append(data_inicio)
+            if data_fim:
+                condicoes.append("t.data_transacao <= ?")
+                params.append(data_fim)
+            where = ''.join(f" AND {condicao}" for condicao in condicoes)
+
+            cursor.execute(DuplicidadeService._CONSULTA_VARREDURA.format(schema=schema, where=where), params)
+            linhas = cursor.fetchall()
+
+        except Exception as e:
+            print(f"Erro ao procurar transações duplicadas: {e}")
+            return []
+        finally:
+            db.close()
+
+        # União de conjuntos: grupo[i] aponta para o representante do grupo da linha i
+        grupo = list(range(len(linhas)))
+
+        def representante(i):
+            while grupo[i] != i:
+                grupo[i] = grupo[grupo[i]]
+                i = grupo[i]
+            return i
+
+        por_impressao = defaultdict(list)
+        for i, linha in enumerate(linhas):
+            data = ImpressaoTransacao.como_data(linha.data_transacao)
+            impressao = linha.impressao_digital
+            if impressao is None:
+                impressao = ImpressaoTransacao.de_transacao(linha)
+            anterior = ImpressaoTransacao.calcular(linha.conta_id, data, linha.valor, linha.tipo, linha.descricao,
+                                                   ImpressaoTransacao.faixa(data) - 1)
+            for chave in (impressao, anterior):
+                for j in por_impressao.get(chave, ()):
+                    dias = (data - ImpressaoTransacao.como_data(linhas[j].data_transacao)).days
+                    if dias <= ImpressaoTransacao.JANELA_DIAS:
+                        grupo[representante(i)] = representante(j)
+            por_impressao[impressao].append(i)
+
+        grupos = defaultdict(list)
+        for i, linha in enumerate(linhas):
+            grupos[representante(i)].append(linha)
+        return [membros for membros in grupos.values() if len(membros) > 1]
+
+    @staticmethod
+    def mesclar(grupos):
+        """Mescla cada grupo de duplicatas na transação mantida.
+
+        Categoria, meio de pagamento e local ausentes na transação mantida são
+        copiados das removidas (em uma única transação, mantendo o resumo
+        mensal); em seguida as removidas são excluídas com um único DELETE,
+        que também ajusta os saldos das contas.
+
+        Args:
+            grupos: Lista de tuplas (id_mantido, [ids_removidos])
+
+        Returns:
+            Quantidade de transações removidas, ou None em caso de erro
+        """
+        pares = [(manter, remover) for manter, removidos in grupos for remover in removidos]
+        if not pares:
+            return 0
+
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            mantidas = ','.join(str(int(manter)) for manter, _ in grupos)
+            condicao = "id IN (SELECT CAST(value AS INT) FROM STRING_SPLIT(?, ','))"
+
+            ResumoMensal.registrar(cursor, schema, condicao, (mantidas,), sinal=-1)
+            cursor.executemany(f"""
+                UPDATE t
+                SET categoria_id = COALESCE(t.categoria_id, o.categoria_id),
+                    meio_pagamento_id = COALESCE(t.meio_pagamento_id, o.meio_pagamento_id),
+                    local_transacao = COALESCE(t.local_transacao, o.local_transacao)
+                FROM {schema}.transacoes t
+                INNER JOIN {schema}.transacoes o ON o.id = ?
+                WHERE t.id = ?
+            """, [(int(remover), int(manter)) for manter, remover in pares])
+            ResumoMensal.registrar(cursor, schema, condicao, (mantidas,))
+
+            db.commit()
+
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao mesclar transações duplicadas: {e}")
+            return None
+        finally:
+            db.close()
+
+        return Transacao.excluir_em_lote([remover for _, remover in pares])
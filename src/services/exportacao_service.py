@@ -0,0 +1,191 @@
+"""
+Serviço para exportação de transações em CSV ou Parquet com memória constante.
+"""
+import csv
+import os
+from src.database.db_helper import get_db_connection
+from src.models.arquivo_transacoes import ArquivoTransacoes
+
+class ExportacaoService:
+    """Serviço para exportar transações lendo o resultado da consulta em lotes."""
+
+    # Quantidade de linhas buscadas do servidor por vez
+    TAMANHO_LOTE = 5000
+
+    # Colunas exportadas, na ordem do arquivo
+    COLUNAS = [
+        'id', 'data_transacao', 'descricao', 'tipo', 'valor',
+        'categoria_id', 'categoria', 'conta_id', 'conta',
+        'conta_destino_id', 'conta_destino', 'meio_pagamento_id', 'meio_pagamento',
+        'descricao_pagamento', 'local_transacao', 'observacao', 'transferencia_id'
+    ]
+
+    def __init__(self, tamanho_lote=None):
+        self.tamanho_lote = tamanho_lote or self.TAMANHO_LOTE
+
+    def exportar(self, caminho_arquivo, filtros=None, progresso=None):
+        """Exporta as transações, escolhendo o formato pela extensão do arquivo.
+
+        Args:
+            caminho_arquivo: Caminho do arquivo de saída (.csv ou .parquet)
+            filtros: Dicionário com data_inicio, data_fim, tipo, categoria_id, conta_id, meio_pagamento_id
+            progresso: Função chamada com o total de linhas exportadas após cada lote
+
+        Returns:
+            tuple: (sucesso, mensagem, total_exportado)
+        """
+        extensao = os.path.splitext(caminho_arquivo)[1].lower()
+        if extensao == '.parquet':
+            return self.exportar_parquet(caminho_arquivo, filtros, progresso)
+        if extensao == '.csv':
+            return self.exportar_csv(caminho_arquivo, filtros, progresso)
+        return False, f"Formato de arquivo não suportado: {extensao}", 0
+
+    def exportar_csv(self, caminho_arquivo, filtros=None, progresso=None, separador=';'):
+        """Exporta as transações para CSV, escrevendo cada lote assim que chega."""
+        try:
+            total = 0
+            with open(caminho_arquivo, 'w', newline='', encoding='utf-8-sig') as arquivo:
+                writer = csv.writer(arquivo, delimiter=separador)
+                writer.writerow(self.COLUNAS)
+
+                for lote in self._ler_lotes(filtros):
+                    writer.writerows(lote)
+                    total += len(lote)
+                    if progresso:
+                        progresso(total)
+
+            return True, f"{total} transações exportadas com sucesso.", total
+
+        except Exception as e:
+            print(f"Erro ao exportar transações para CSV: {e}")
+            return False, f"Erro ao exportar transações: {str(e)}", 0
+
+    def exportar_parquet(self, caminho_arquivo, filtros=None, progresso=None):
+        """Exporta as transações para Parquet, gravando um row group por lote."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            return False, "A exportação em Parquet requer o pacote pyarrow.", 0
+
+        try:
+            schema = self._schema_parquet(pa)
+            total = 0
+            with pq.ParquetWriter(caminho_arquivo, schema, compression='snappy') as writer:
+                for lote in self._ler_lotes(filtros):
+                    colunas = list(zip(*lote))
+                    tabela = pa.Table.from_arrays(
+                        [pa.array(valores, type=campo.type) for valores, campo in zip(colunas, schema)],
+                        schema=schema
+                    )
+                    writer.write_table(tabela)
+                    total += len(lote)
+                    if progresso:
+                        progresso(total)
+
+            return True, f"{total} transações exportadas com sucesso.", total
+
+        except Exception as e:
+            print(f"Erro ao exportar transações para Parquet: {e}")
+            return False, f"Erro ao exportar transações: {str(e)}", 0
+
+    @staticmethod
+    def carregar_parquet(caminho_arquivo, colunas=None, data_inicio=None, data_fim=None):
+        """Carrega um arquivo Parquet exportado como DataFrame para análises locais.
+
+        Apenas as colunas e row groups necessários são lidos do disco. O valor é
+        convertido para float para permitir agregações vetorizadas.
+        """
+        import pyarrow.compute as pc
+        import pyarrow.dataset as ds
+
+        dataset = ds.dataset(caminho_arquivo, format='parquet')
+        filtro = None
+        if data_inicio:
+            filtro = pc.field('data_transacao') >= data_inicio
+        if data_fim:
+            condicao = pc.field('data_transacao') <= data_fim
+            filtro = condicao if filtro is None else filtro & condicao
+
+        tabela = dataset.to_table(columns=colunas, filter=filtro)
+        if 'valor' in tabela.column_names:
+            indice = tabela.column_names.index('valor')
+            tabela = tabela.set_column(indice, 'valor', pc.cast(tabela.column('valor'), 'float64'))
+        return tabela.to_pandas()
+
+    def _ler_lotes(self, filtros):
+        """Executa a consulta de exportação e produz as linhas em lotes com fetchmany."""
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            cursor.arraysize = self.tamanho_lote
+            query, params = self._montar_consulta(db.schema, filtros)
+            cursor.execute(query, params)
+
+            while True:
+                rows = cursor.fetchmany(self.tamanho_lote)
+                if not rows:
+                    break
+                yield [tuple(row) for row in rows]
+        finally:
+            db.close()
+
+    @staticmethod
+    def _montar_consulta(schema, filtros):
+        """Monta a consulta com os nomes das referências resolvidos no servidor."""
+        query = f"""
+            SELECT t.id, t.data_transacao, t.descricao, t.tipo, t.valor,
+                   t.categoria_id, c.nome AS categoria,
+                   t.conta_id, cd.nome AS conta,
+                   t.conta_destino_id, cdd.nome AS conta_destino,
+                   t.meio_pagamento_id, mp.nome AS meio_pagamento,
+                   t.descricao_pagamento, t.local_transacao, t.observacao, t.transferencia_id
+            FROM {ArquivoTransacoes.fonte(schema, (filtros or {}).get('data_inicio'))} t
+            LEFT JOIN {schema}.categorias c ON c.id = t.categoria_id
+            LEFT JOIN {schema}.conta_dimensao cd ON cd.id = t.conta_id
+            LEFT JOIN {schema}.conta_dimensao cdd ON cdd.id = t.conta_destino_id
+            LEFT JOIN {schema}.meios_pagamento mp ON mp.id = t.meio_pagamento_id
+            WHERE 1=1
+        """
+        params = []
+
+        if filtros:
+            if filtros.get('data_inicio'):
+                query += " AND t.data_transacao >= ?"
+                params.append(filtros['data_inicio'])
+
+            if filtros.get('data_fim'):
+                query += " AND t.data_transacao <= ?"
+                params.append(filtros['data_fim'])
+
+            for campo in ('tipo', 'categoria_id', 'conta_id', 'meio_pagamento_id'):
+                if filtros.get(campo):
+                    query += f" AND t.{campo} = ?"
+                    params.append(filtros[campo])
+
+        query += " ORDER BY t.data_transacao, t.id"
+        return query, params
+
+    @staticmethod
+    def _schema_parquet(pa):
+        """Retorna o schema colunar usado nos arquivos Parquet."""
+        return pa.schema([
+            ('id', pa.int32()),
+            ('data_transacao', pa.date32()),
+            ('descricao', pa.string()),
+            ('tipo', pa.string()),
+            ('valor', pa.decimal128(15, 2)),
+            ('categoria_id', pa.int32()),
+            ('categoria', pa.string()),
+            ('conta_id', pa.int32()),
+            ('conta', pa.string()),
+            ('conta_destino_id', pa.int32()),
+            ('conta_destino', pa.string()),
+            ('meio_pagamento_id', pa.int32()),
+            ('meio_pagamento', pa.string()),
+            ('descricao_pagamento', pa.string()),
+            ('local_transacao', pa.string()),
+            ('observacao', pa.string()),
+            ('transferencia_id', pa.int32())
+        ])
@@ -0,0 +1,455 @@
+"""
+Serviço para importação em lote de extratos bancários (CSV e OFX).
+"""
+import csv
+import os
+import re
+from datetime import datetime
+from decimal import Decimal
+import pandas as pd
+from src.database.db_helper import get_db_connection
+from src.models.categoria import Categoria
+from src.models.conta_dimensao import ContaDimensao
+from src.models.impressao_transacao import ImpressaoTransacao
+from src.models.regra_categorizacao import RegraCategorizacao
+from src.models.resumo_mensal import ResumoMensal
+from src.services.categorizacao_service import CategorizacaoService
+from src.services.duplicidade_service import DuplicidadeService
+
+class ImportacaoService:
+    """Serviço para importar extratos bancários em lote."""
+
+    # Quantidade de linhas lidas e inseridas por lote (uma transação por lote)
+    TAMANHO_LOTE = 5000
+
+    # Tratamento padrão de linhas que já existem no banco (ver DuplicidadeService)
+    DUPLICADAS_PADRAO = DuplicidadeService.IGNORAR
+
+    # Mapeamento padrão das colunas do CSV para os campos da transação
+    COLUNAS_PADRAO = {
+        'data': 'data',
+        'descricao': 'descricao',
+        'valor': 'valor',
+        'categoria': 'categoria',
+        'conta': 'conta',
+        'local': 'local'
+    }
+
+    _TAG_OFX = re.compile(r'<(/?\w+)>([^<\r\n]*)')
+
+    # Número com separadores: dígitos em grupos separados por ponto ou vírgula
+    _NUMERO = re.compile(r'\d+(?:[.,]\d+)*')
+
+    def __init__(self, tamanho_lote=None):
+        self.tamanho_lote = tamanho_lote or self.TAMANHO_LOTE
+        self._categorias = None
+        self._contas = None
+        self._categorizacao = None
+
+    def importar_arquivo(self, caminho_arquivo, conta_id=None, **opcoes):
+        """Importa um extrato, escolhendo o leitor pela extensão do arquivo.
+
+        Returns:
+            tuple: (sucesso, mensagem, total_importado)
+        """
+        extensao = os.path.splitext(caminho_arquivo)[1].lower()
+        if extensao == '.ofx':
+            return self.importar_ofx(caminho_arquivo, conta_id, **opcoes)
+        if extensao in ('.csv', '.txt'):
+            return self.importar_csv(caminho_arquivo, conta_id, **opcoes)
+        return False, f"Formato de arquivo não suportado: {extensao}", 0
+
+    def importar_csv(self, caminho_arquivo, conta_id=None, separador=None, encoding='utf-8-sig',
+                     formato_data='%d/%m/%Y', colunas=None, duplicadas=None, separador_decimal=','):
+        """Importa um extrato em CSV lendo o arquivo em lotes.
+
+        Args:
+            caminho_arquivo: Caminho do arquivo CSV
+            conta_id: Conta padrão para linhas sem a coluna de conta
+            separador: Separador de campos (detectado automaticamente se None)
+            encoding: Codificação do arquivo
+            formato_data: Formato das datas; datas ISO (AAAA-MM-DD) também são aceitas
+            colunas: Dicionário {campo: nome_da_coluna} sobrescrevendo COLUNAS_PADRAO
+            duplicadas: Tratamento das linhas já gravadas (DuplicidadeService.IGNORAR,
+                MARCAR ou IMPORTAR; padrão DUPLICADAS_PADRAO)
+            separador_decimal: Separador decimal do banco (',' ou '.'), usado só nos
+                valores ambíguos como '1.000'; None recusa esses valores
+
+        Returns:
+            tuple: (sucesso, mensagem, total_importado)
+        """
+        try:
+            mapeamento = dict(self.COLUNAS_PADRAO)
+            if colunas:
+                mapeamento.update(colunas)
+
+            if separador is None:
+                separador = self._detectar_separador(caminho_arquivo, encoding)
+
+            leitor = pd.read_csv(
+                caminho_arquivo,
+                sep=separador,
+                encoding=encoding,
+                dtype=str,
+                chunksize=self.tamanho_lote
+            )
+
+            lotes = (self._renomear_colunas(lote, mapeamento) for lote in leitor)
+            return self._importar_lotes(lotes, conta_id, formato_data, "CSV", duplicadas, separador_decimal)
+
+        except Exception as e:
+            print(f"Erro ao importar extrato CSV: {e}")
+            return False, f"Erro ao importar extrato: {str(e)}", 0
+
+    def importar_ofx(self, caminho_arquivo, conta_id=None, encoding='latin-1', duplicadas=None):
+        """Importa um extrato OFX lendo as transações em lotes.
+
+        Returns:
+            tuple: (sucesso, mensagem, total_importado)
+        """
+        try:
+            lotes = self._ler_lotes_ofx(caminho_arquivo, encoding)
+            # No OFX o separador decimal é o ponto e não há separador de milhar
+            return self._importar_lotes(lotes, conta_id, '%Y%m%d', "OFX", duplicadas, '.')
+        except Exception as e:
+            print(f"Erro ao importar extrato OFX: {e}")
+            return False, f"Erro ao importar extrato: {str(e)}", 0
+
+    def _importar_lotes(self, lotes, conta_id, formato_data, origem, duplicadas=None, separador_decimal=','):
+        """Normaliza e grava cada lote de linhas do extrato."""
+        duplicadas = duplicadas or self.DUPLICADAS_PADRAO
+        db = get_db_connection()
+        total_importado = 0
+        total_ignorado = 0
+        total_duplicadas = 0
+        # Linhas já vistas neste extrato, para achar as repetidas entre lotes
+        vistas = set()
+
+        try:
+            cursor = db.get_cursor()
+            cursor.fast_executemany = True
+            schema = db.schema
+            observacao = f"Importado de extrato {origem} em {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
+
+            for lote in lotes:
+                df = self._normalizar_lote(lote, conta_id, formato_data, separador_decimal)
+                total_ignorado += len(lote) - len(df)
+                if df.empty:
+                    continue
+
+                self._verificar_duplicadas(cursor, schema, df, duplicadas, vistas)
+                duplicatas = df['duplicata_de'].notna() | df['repetida']
+                total_duplicadas += int(duplicatas.sum())
+                if duplicadas == DuplicidadeService.IGNORAR:
+                    df = df[~duplicatas]
+                    if df.empty:
+                        continue
+
+                self._gravar_lote(cursor, schema, df, observacao)
+                db.commit()
+                total_importado += len(df)
+
+            if total_importado == 0:
+                if total_duplicadas:
+                    return False, f"Nenhuma transação nova: {total_duplicadas} já estavam gravadas.", 0
+                return False, "Nenhuma transação foi importada.", 0
+
+            mensagem = f"{total_importado} transações importadas com sucesso."
+            if total_ignorado:
+                mensagem += f" {total_ignorado} linhas ignoradas por dados incompletos ou valores inválidos."
+            if total_duplicadas:
+                if duplicadas == DuplicidadeService.IGNORAR:
+                    mensagem += f" {total_duplicadas} linhas já gravadas ou repetidas no extrato foram ignoradas."
+                else:
+                    mensagem += f" {total_duplicadas} possíveis duplicatas marcadas na observação."
+            return True, mensagem, total_importado
+
+        except Exception as e:
+            db.rollback()
+            print(f"Erro ao gravar lote do extrato: {e}")
+            return False, f"Erro ao importar extrato após {total_importado} transações: {str(e)}", total_importado
+        finally:
+            db.close()
+
+    def _normalizar_lote(self, lote, conta_id, formato_data, separador_decimal=','):
+        """Converte valores, datas e referências de um lote de forma vetorizada."""
+        faltantes = [c for c in ('data', 'descricao', 'valor') if c not in lote]
+        if faltantes:
+            raise ValueError(f"Colunas obrigatórias ausentes no extrato: {', '.join(faltantes)}")
+
+        df = pd.DataFrame(index=lote.index)
+
+        valores = self._normalizar_valores(lote['valor'], separador_decimal)
+        datas = lote['data'].str.strip()
+        df['data_transacao'] = pd.to_datetime(datas, format=formato_data, errors='coerce')
+        if formato_data != '%Y-%m-%d':
+            df['data_transacao'] = df['data_transacao'].fillna(
+                pd.to_datetime(datas, format='%Y-%m-%d', errors='coerce'))
+        df['descricao'] = lote['descricao'].fillna('').str.strip()
+        df['tipo'] = valores.lt(0).map({True: 'D', False: 'R'})
+        df['centavos'] = valores.abs().mul(100).round()
+
+        # Descrição vazia ou valor inválido tornam a linha inutilizável
+        df = df[df['data_transacao'].notna() & df['centavos'].notna() &
+                df['centavos'].gt(0) & df['descricao'].ne('')]
+        lote = lote.loc[df.index]
+
+        df['centavos'] = df['centavos'].astype('int64')
+        df['data_transacao'] = df['data_transacao'].dt.date
+        df['descricao'] = df['descricao'].str.slice(0, 255)
+
+        # Resolver referências por nome usando os caches
+        if 'categoria' in lote:
+            categorias = self._obter_cache_categorias()
+            df['categoria_id'] = lote['categoria'].str.strip().str.lower().map(categorias)
+        else:
+            df['categoria_id'] = None
+
+        if 'conta' in lote:
+            contas = self._obter_cache_contas()
+            df['conta_id'] = lote['conta'].str.strip().str.lower().map(contas)
+        else:
+            df['conta_id'] = None
+
+        df['local_transacao'] = lote['local'].str.strip().str.slice(0, 255) if 'local' in lote else None
+
+        self._aplicar_regras(df)
+        df['conta_id'] = df['conta_id'].fillna(conta_id or 0)
+
+        # Linhas sem conta não podem ser importadas
+        return df[df['conta_id'].astype('int64') > 0]
+
+    def _aplicar_regras(self, df):
+        """Preenche categoria, meio de pagamento e conta pelas regras de categorização.
+
+        O lote inteiro é classificado de uma vez; as regras só preenchem campos
+        que o extrato não trouxe. A coluna regra_id guarda a regra aplicada.
+        """
+        df['meio_pagamento_id'] = None
+        df['regra_id'] = None
+
+        categorizacao = self._obter_categorizacao()
+        if not categorizacao or df.empty:
+            return
+
+        locais = df['local_transacao'].tolist() if df['local_transacao'].notna().any() else None
+        regras = pd.Series(categorizacao.classificar_lote(df['descricao'].tolist(), locais),
+                           index=df.index, dtype=object)
+        com_regra = regras.notna()
+        if not com_regra.any():
+            return
+
+        aplicadas = regras[com_regra]
+        df.loc[com_regra, 'regra_id'] = aplicadas.map(lambda regra: regra.id)
+        for campo in ('categoria_id', 'meio_pagamento_id', 'conta_id'):
+            valores = aplicadas.map(lambda regra: getattr(regra, campo))
+            df[campo] = df[campo].astype(object).where(df[campo].notna(), valores.reindex(df.index))
+
+    def _verificar_duplicadas(self, cursor, schema, df, duplicadas, vistas):
+        """Calcula a impressão digital das linhas e procura as já gravadas ou repetidas.
+
+        Preenche as colunas impressao_digital, duplicata_de (id da transação
+        gravada equivalente, com uma única consulta ao banco por lote) e
+        repetida (linha idêntica a uma anterior do mesmo extrato, registrada
+        em vistas).
+        """
+        registros = [
+            (int(row.conta_id), row.data_transacao, Decimal(int(row.centavos)).scaleb(-2), row.tipo, row.descricao)
+            for row in df.itertuples(index=False)
+        ]
+        df['impressao_digital'] = [ImpressaoTransacao.calcular(*registro) for registro in registros]
+
+        if duplicadas == DuplicidadeService.IMPORTAR:
+            df['duplicata_de'] = None
+            df['repetida'] = False
+        else:
+            repetidas = []
+            for registro in registros:
+                repetidas.append(registro in vistas)
+                vistas.add(registro)
+            df['repetida'] = repetidas
+            df['duplicata_de'] = pd.Series(DuplicidadeService.casar_lote(cursor, schema, registros),
+                                           index=df.index, dtype=object)
+
+    def _gravar_lote(self, cursor, schema, df, observacao):
+        """Insere um lote e aplica uma única variação de saldo por conta e de resumo por mês."""
+        registros = df.astype(object).where(df.notna(), None)
+
+        params = [
+            (row.descricao, Decimal(int(row.centavos)).scaleb(-2), row.data_transacao, row.tipo,
+             self._inteiro_ou_none(row.categoria_id), int(row.conta_id),
+             self._inteiro_ou_none(row.meio_pagamento_id), row.local_transacao,
+             f"{observacao}. Possível duplicata da transação {int(row.duplicata_de)}"
+             if row.duplicata_de is not None else
+             f"{observacao}. Possível duplicata de outra linha do extrato"
+             if row.repetida else observacao,
+             int(row.impressao_digital))
+            for row in registros.itertuples(index=False)
+        ]
+
+        cursor.executemany(f"""
+            INSERT INTO {schema}.transacoes
+            (descricao, valor, data_transacao, tipo, categoria_id, conta_id,
+             meio_pagamento_id, local_transacao, observacao, impressao_digital)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, params)
+
+        # Acertos das regras de categorização no lote
+        RegraCategorizacao.registrar_acertos(cursor, schema, df['regra_id'].dropna().value_counts().to_dict())
+
+        # Receitas somam e despesas subtraem; uma atualização por conta
+        sinal = df['tipo'].map({'R': 1, 'D': -1})
+        variacoes = (df['centavos'] * sinal).groupby(df['conta_id'].astype('int64')).sum()
+
+        cursor.executemany(f"""
+            UPDATE {schema}.conta_saldos
+            SET saldo_atual = saldo_atual + ?
+            WHERE conta_dimensao_id = ?
+        """, [(Decimal(int(centavos)).scaleb(-2), int(conta)) for conta, centavos in variacoes.items()])
+        
+        # Resumo mensal: uma variação por conta, categoria, tipo e mês
+        datas = pd.to_datetime(df['data_transacao'])
+        resumo = df.groupby([
+            df['conta_id'].astype('int64'), df['categoria_id'].fillna(0).astype('int64'),
+            df['tipo'], datas.dt.year, datas.dt.month
+        ])['centavos'].agg(['sum', 'count'])
+        
+        ResumoMensal.aplicar_variacoes(cursor, schema, [
+            (int(conta), int(categoria), tipo, int(ano), int(mes),
+             Decimal(int(centavos)).scaleb(-2), int(quantidade))
+            for (conta, categoria, tipo, ano, mes), (centavos, quantidade) in resumo.iterrows()
+        ])
+
+    @staticmethod
+    def _normalizar_valores(serie, separador_decimal=','):
+        """Converte textos monetários ('R$ 1.234,56', '-10.5', '(12,30)') em números; NaN se inválidos."""
+        valores = serie.fillna('').astype(str).map(
+            lambda texto: ImportacaoService._converter_valor(texto, separador_decimal))
+        return pd.to_numeric(valores, errors='coerce')
+
+    @staticmethod
+    def _converter_valor(texto, separador_decimal=','):
+        """Converte um texto monetário em float, ou None se for inválido ou ambíguo.
+
+        O separador decimal é o último separador quando há pontos e vírgulas
+        ('1.234,56', '1,234.56') ou quando ele não é seguido de três dígitos
+        ('12,30', '10.5'); um separador repetido é de milhar ('1.000.000').
+        Um único separador seguido de três dígitos ('1.000') é decidido por
+        separador_decimal, e recusado se ele for None. Os grupos de milhar
+        precisam ter três dígitos.
+        """
+        texto = re.sub(r'[R$\s]', '', texto)
+        negativo = False
+        if texto.startswith('(') and texto.endswith(')'):
+            negativo, texto = True, texto[1:-1]
+        if texto.startswith('-') or texto.endswith('-'):
+            if negativo:
+                return None
+            negativo, texto = True, texto[1:] if texto.startswith('-') else texto[:-1]
+        elif texto.startswith('+'):
+            texto = texto[1:]
+        if not ImportacaoService._NUMERO.fullmatch(texto):
+            return None
+
+        separadores = re.findall(r'[.,]', texto)
+        decimal = None
+        if separadores:
+            ultimo = separadores[-1]
+            casas = len(texto) - texto.rindex(ultimo) - 1
+            if separadores.count(ultimo) == 1 and (len(set(separadores)) > 1 or casas != 3):
+                decimal = ultimo
+            elif len(separadores) == 1:
+                if separador_decimal not in ('.', ','):
+                    return None
+                decimal = ultimo if ultimo == separador_decimal else None
+
+        inteiro, fracao = texto.rsplit(decimal, 1) if decimal else (texto, '0')
+        milhar = re.findall(r'[.,]', inteiro)
+        if milhar:
+            if not re.fullmatch(rf'\d{{1,3}}(?:{re.escape(milhar[0])}\d{{3}})+', inteiro):
+                return None
+            inteiro = inteiro.replace(milhar[0], '')
+
+        valor = float(f"{inteiro}.{fracao}")
+        return -valor if negativo else valor
+
+    def _ler_lotes_ofx(self, caminho_arquivo, encoding):
+        """Lê as transações (STMTTRN) de um arquivo OFX, produzindo DataFrames em lotes."""
+        registros = []
+        atual = None
+
+        with open(caminho_arquivo, 'r', encoding=encoding, errors='replace') as arquivo:
+            for linha in arquivo:
+                for tag, valor in self._TAG_OFX.findall(linha):
+                    tag = tag.upper()
+                    if tag == 'STMTTRN':
+                        atual = {}
+                    elif tag == '/STMTTRN' and atual is not None:
+                        registros.append(self._converter_registro_ofx(atual))
+                        atual = None
+                    elif atual is not None and valor.strip():
+                        # Em SGML as tags de valor não são fechadas
+                        atual[tag] = valor.strip()
+
+                if len(registros) >= self.tamanho_lote:
+                    yield pd.DataFrame(registros, dtype=str)
+                    registros = []
+
+        if registros:
+            yield pd.DataFrame(registros, dtype=str)
+
+    @staticmethod
+    def _converter_registro_ofx(registro):
+        """Converte um bloco STMTTRN nas colunas padrão do importador."""
+        return {
+            'data': registro.get('DTPOSTED', '')[:8],
+            'descricao': registro.get('MEMO') or registro.get('NAME', ''),
+            'valor': registro.get('TRNAMT', ''),
+            'local': registro.get('NAME')
+        }
+
+    @staticmethod
+    def _detectar_separador(caminho_arquivo, encoding):
+        """Detecta o separador do CSV a partir do cabeçalho."""
+        with open(caminho_arquivo, 'r', encoding=encoding, errors='replace') as arquivo:
+            amostra = arquivo.readline()
+        try:
+            return csv.Sniffer().sniff(amostra, delimiters=';,\t|').delimiter
+        except csv.Error:
+            return ';'
+
+    @staticmethod
+    def _renomear_colunas(lote, mapeamento):
+        """Renomeia as colunas do lote para os nomes de campo internos."""
+        colunas = {str(c).strip().lower(): c for c in lote.columns}
+        renomear = {}
+        for campo, coluna in mapeamento.items():
+            original = colunas.get(str(coluna).strip().lower())
+            if original is not None:
+                renomear[original] = campo
+        return lote.rename(columns=renomear)
+
+    @staticmethod
+    def _inteiro_ou_none(valor):
+        """Converte ids vindos do pandas (float/NaN) para int ou None."""
+        if valor is None or pd.isna(valor):
+            return None
+        return int(valor)
+
+    def _obter_cache_categorias(self):
+        """Retorna o cache {nome em minúsculas: id} das categorias ativas."""
+        if self._categorias is None:
+            self._categorias = {c.nome.strip().lower(): c.id for c in Categoria.listar_todas()}
+        return self._categorias
+
+    def _obter_categorizacao(self):
+        """Retorna o classificador com as regras ativas, carregado uma vez por importação."""
+        if self._categorizacao is None:
+            self._categorizacao = CategorizacaoService.carregar()
+        return self._categorizacao
+
+    def _obter_cache_contas(self):
+        """Retorna o cache {nome em minúsculas: id} das contas ativas."""
+        if self._contas is None:
+            self._contas = {c.nome.strip().lower(): c.id for c in ContaDimensao.listar_todas()}
+        return self._contas
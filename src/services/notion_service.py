@@ -1,20 +1,20 @@
-import os
 import requests
+from collections import Counter
 from datetime import datetime
-from dotenv import load_dotenv
 from src.models.transacao import Transacao
 from src.models.categoria import Categoria
 from src.models.conta import Conta
-
-# Carrega as variáveis de ambiente
-load_dotenv()
+from src.config import Configuracao
+from src.database.db_helper import get_db_connection
+from src.services.categorizacao_service import CategorizacaoService
+from src.services.duplicidade_service import DuplicidadeService
 
 class NotionService:
     """Serviço para integração com a API do Notion."""
     
     def __init__(self):
         """Inicializa o serviço com as credenciais do Notion."""
-        self.token = os.getenv('NOTION_TOKEN')
+        self.token = Configuracao.carregar().notion_token
         self.base_url = "https://api.notion.com/v1"
         self.version = "2022-06-28"  # Versão atual da API do Notion
         
@@ -76,8 +76,12 @@ class NotionService:
             if not resultado:
                 return False, "Não foi possível obter dados do Notion.", 0
             
-            # Processar os resultados
-            transacoes_importadas = 0
+            # Regras de categorização para itens sem categoria no Notion
+            categorizacao = CategorizacaoService.carregar()
+            acertos = Counter()
+            
+            # Extrair os dados de todos os itens antes de gravar
+            itens = []
             for item in resultado.get('results', []):
                 # Extrair propriedades do item do Notion
                 # Nota: Ajuste os nomes das propriedades conforme seu banco de dados no Notion
@@ -97,9 +101,34 @@ class NotionService:
                     
                     # Converter string de data para objeto date
                     data_transacao = datetime.strptime(data_str, "%Y-%m-%d").date()
+                    itens.append((descricao, valor, data_transacao, categoria_nome))
                     
-                    # Buscar ou criar categoria
+                except Exception as e:
+                    print(f"Erro ao processar item do Notion: {e}")
+                    continue
+            
+            # Itens já gravados (importação repetida) são ignorados: uma única consulta para todos
+            duplicadas = self._casar_duplicadas(
+                [(conta_id, data_transacao, valor, 'D', descricao)
+                 for descricao, valor, data_transacao, _ in itens]
+            )
+            
+            # Processar os resultados
+            transacoes_importadas = 0
+            transacoes_ignoradas = 0
+            for (descricao, valor, data_transacao, categoria_nome), duplicata_de in zip(itens, duplicadas):
+                if duplicata_de is not None:
+                    transacoes_ignoradas += 1
+                    continue
+                
+                try:
+                    # Buscar ou criar categoria; sem categoria, usar as regras
                     categoria_id = self._obter_categoria_id(categoria_nome)
+                    regra = categorizacao.classificar(descricao)
+                    meio_pagamento_id = None
+                    if regra:
+                        categoria_id = categoria_id or regra.categoria_id
+                        meio_pagamento_id = regra.meio_pagamento_id
                     
                     # Criar transação
                     transacao = Transacao(
@@ -109,26 +138,47 @@ class NotionService:
                         tipo='D',  # Assumindo que são despesas de cartão de crédito
                         categoria_id=categoria_id,
                         conta_id=conta_id,
+                        meio_pagamento_id=meio_pagamento_id,
                         observacao=f"Importado do Notion em {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
                     )
                     
                     # Salvar transação
                     if transacao.salvar():
                         transacoes_importadas += 1
+                        if regra:
+                            acertos[regra.id] += 1
                     
                 except Exception as e:
-                    print(f"Erro ao processar item do Notion: {e}")
+                    print(f"Erro ao importar item do Notion: {e}")
                     continue
             
+            CategorizacaoService.gravar_acertos(acertos)
+            
+            ignoradas = f" {transacoes_ignoradas} já existentes ignoradas." if transacoes_ignoradas else ""
             if transacoes_importadas > 0:
-                return True, f"{transacoes_importadas} transações importadas com sucesso.", transacoes_importadas
+                return (True, f"{transacoes_importadas} transações importadas com sucesso.{ignoradas}",
+                        transacoes_importadas)
             else:
-                return False, "Nenhuma transação foi importada.", 0
+                return False, f"Nenhuma transação foi importada.{ignoradas}", 0
                 
         except Exception as e:
             print(f"Erro ao importar transações do Notion: {e}")
             return False, f"Erro ao importar transações: {str(e)}", 0
     
+    def _casar_duplicadas(self, registros):
+        """Retorna, alinhado aos registros, o id da transação já gravada equivalente (ou None)."""
+        if not registros:
+            return []
+        db = get_db_connection()
+        try:
+            correspondencias = DuplicidadeService.casar_lote(db.get_cursor(), db.schema, registros)
+        except Exception as e:
+            print(f"Erro ao verificar transações duplicadas: {e}")
+            correspondencias = [None] * len(registros)
+        finally:
+            db.close()
+        return correspondencias
+    
     def _extrair_texto(self, propriedade):
         """Extrai texto de uma propriedade do Notion."""
         try:
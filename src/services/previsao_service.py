@@ -0,0 +1,187 @@
+"""
+Serviço de previsão de fluxo de caixa a partir dos gastos recorrentes.
+"""
+from datetime import date
+from decimal import Decimal
+import numpy as np
+from src.database.db_helper import get_db_connection
+from src.models.gasto_recorrente import GastoRecorrente
+
+class PrevisaoService:
+    """Projeta o saldo diário das contas expandindo as recorrências ativas.
+
+    Todas as ocorrências (recorrência x mês do horizonte) são calculadas de uma
+    vez com aritmética de datas do NumPy, sem laços por recorrência ou por dia.
+    """
+
+    # Intervalo, em meses, entre ocorrências de cada periodicidade
+    MESES_POR_PERIODICIDADE = {
+        'Mensal': 1,
+        'Bimestral': 2,
+        'Trimestral': 3,
+        'Semestral': 6,
+        'Anual': 12
+    }
+
+    @staticmethod
+    def projetar(horizonte_meses=12, hoje=None, gastos=None, contas=None, pagos=None):
+        """Projeta o saldo diário de cada conta de amanhã até o fim do horizonte.
+
+        Args:
+            horizonte_meses: Quantidade de meses projetados
+            hoje: Data de referência (padrão: data atual); ocorrências até hoje não entram
+            gastos: Lista de GastoRecorrente (padrão: recorrências ativas do banco)
+            contas: Lista de tuplas (id, nome, saldo_atual) (padrão: contas ativas do banco)
+            pagos: Conjunto de (gasto_id, ano, mes) já pagos (padrão: lido do banco)
+
+        Returns:
+            dict com:
+                datas: array datetime64[D] dos dias projetados
+                contas: lista de dicionários id, nome, saldo_atual e saldos (array em R$ por dia)
+                total: saldo projetado somando todas as contas e recorrências sem conta
+                ocorrencias: arrays alinhados data, gasto_id, conta_id (-1 sem conta) e valor (com sinal)
+                nomes_gastos: dicionário {gasto_id: nome}
+        """
+        hoje = hoje or date.today()
+        if gastos is None:
+            gastos = GastoRecorrente.listar_todos(apenas_ativos=True)
+        if contas is None or pagos is None:
+            contas_banco, pagos_banco = PrevisaoService._carregar_contas_e_pagamentos(hoje)
+            contas = contas_banco if contas is None else contas
+            pagos = pagos_banco if pagos is None else pagos
+
+        # Horizonte: de amanhã até a mesma data (limitada ao fim do mês) daqui a horizonte_meses
+        inicio = np.datetime64(hoje, 'D') + 1
+        mes_atual = np.datetime64(hoje, 'M')
+        meses = np.arange(mes_atual, mes_atual + horizonte_meses + 1)
+        primeiro_dia_final = meses[-1].astype('datetime64[D]')
+        dias_mes_final = int(((meses[-1] + 1).astype('datetime64[D]') - primeiro_dia_final).astype(np.int64))
+        fim = primeiro_dia_final + (min(hoje.day, dias_mes_final) - 1)
+        datas = np.arange(inicio, fim + 1)
+
+        ocorrencias = PrevisaoService._expandir(gastos, meses, inicio, fim, pagos)
+
+        # Saldo inicial por conta e variação diária acumulada
+        ids_contas = np.array([conta_id for conta_id, _, _ in contas], dtype=np.int64)
+        saldos_iniciais = np.array([int(Decimal(saldo) * 100) for _, _, saldo in contas], dtype=np.int64)
+        variacoes = np.zeros((len(contas), len(datas)), dtype=np.int64)
+
+        dia = (ocorrencias['data'] - inicio).astype(np.int64)
+        # Linha da conta de cada ocorrência (recorrências sem conta ativa só entram no total)
+        com_conta = np.isin(ocorrencias['conta_id'], ids_contas)
+        ordem_contas = np.argsort(ids_contas)
+        linhas = ordem_contas[np.searchsorted(ids_contas[ordem_contas], ocorrencias['conta_id'][com_conta])]
+        np.add.at(variacoes, (linhas, dia[com_conta]), ocorrencias['centavos'][com_conta])
+
+        saldos = saldos_iniciais[:, None] + np.cumsum(variacoes, axis=1)
+        variacao_total = np.bincount(dia, weights=ocorrencias['centavos'], minlength=len(datas))
+        total = saldos_iniciais.sum() + np.cumsum(np.rint(variacao_total).astype(np.int64))
+
+        return {
+            'datas': datas,
+            'contas': [
+                {
+                    'id': conta_id,
+                    'nome': nome,
+                    'saldo_atual': Decimal(saldo),
+                    'saldos': saldos[i] / 100
+                }
+                for i, (conta_id, nome, saldo) in enumerate(contas)
+            ],
+            'total': total / 100,
+            'ocorrencias': {
+                'data': ocorrencias['data'],
+                'gasto_id': ocorrencias['gasto_id'],
+                'conta_id': ocorrencias['conta_id'],
+                'valor': ocorrencias['centavos'] / 100
+            },
+            'nomes_gastos': {g.id: g.nome for g in gastos}
+        }
+
+    @staticmethod
+    def _expandir(gastos, meses, inicio, fim, pagos):
+        """Expande as recorrências em ocorrências datadas dentro de [inicio, fim].
+
+        Returns:
+            dict de arrays alinhados: data, gasto_id, conta_id (-1 sem conta) e centavos (com sinal)
+        """
+        vazio = {
+            'data': np.empty(0, dtype='datetime64[D]'),
+            'gasto_id': np.empty(0, dtype=np.int64),
+            'conta_id': np.empty(0, dtype=np.int64),
+            'centavos': np.empty(0, dtype=np.int64)
+        }
+        gastos = [g for g in gastos if g.ativo and g.periodicidade in PrevisaoService.MESES_POR_PERIODICIDADE]
+        if not gastos:
+            return vazio
+
+        ids = np.array([g.id or 0 for g in gastos], dtype=np.int64)
+        contas = np.array([g.conta_id or -1 for g in gastos], dtype=np.int64)
+        passos = np.array([PrevisaoService.MESES_POR_PERIODICIDADE[g.periodicidade] for g in gastos])
+        dias = np.array([g.dia_vencimento or 1 for g in gastos], dtype=np.int64)
+        centavos = np.array([int(g.valor * 100) * (1 if g.tipo == 'R' else -1) for g in gastos], dtype=np.int64)
+        data_inicio = np.array([g.data_inicio for g in gastos], dtype='datetime64[D]')
+        data_fim = np.array([g.data_fim or fim.astype(date) for g in gastos], dtype='datetime64[D]')
+
+        # Matriz recorrência x mês: a recorrência ocorre a cada "passo" meses desde o mês de início
+        mes_inicio = data_inicio.astype('datetime64[M]')
+        deslocamento = (meses[None, :] - mes_inicio[:, None]).astype(np.int64)
+        ocorre = (deslocamento >= 0) & (deslocamento % passos[:, None] == 0)
+
+        # Dia de vencimento limitado ao último dia de cada mês
+        primeiro_dia = meses.astype('datetime64[D]')
+        dias_no_mes = ((meses + 1).astype('datetime64[D]') - primeiro_dia).astype(np.int64)
+        vencimentos = primeiro_dia[None, :] + (np.minimum(dias[:, None], dias_no_mes[None, :]) - 1)
+
+        ocorre &= (vencimentos >= inicio) & (vencimentos <= fim)
+        ocorre &= (vencimentos >= data_inicio[:, None]) & (vencimentos <= data_fim[:, None])
+
+        # Ocorrências já pagas no mês não entram na projeção
+        if pagos:
+            chaves_pagas = np.array([gasto_id * 100000 + ano * 12 + mes - 1 for gasto_id, ano, mes in pagos],
+                                    dtype=np.int64)
+            indices_mes = meses.astype(np.int64) + 1970 * 12
+            chaves = ids[:, None] * 100000 + indices_mes[None, :]
+            ocorre &= ~np.isin(chaves, chaves_pagas)
+
+        linha, coluna = np.nonzero(ocorre)
+        ordem = np.argsort(vencimentos[linha, coluna], kind='stable')
+        linha, coluna = linha[ordem], coluna[ordem]
+        return {
+            'data': vencimentos[linha, coluna],
+            'gasto_id': ids[linha],
+            'conta_id': contas[linha],
+            'centavos': centavos[linha]
+        }
+
+    @staticmethod
+    def _carregar_contas_e_pagamentos(hoje):
+        """Lê os saldos atuais das contas ativas e os pagamentos já feitos a partir do mês atual."""
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            schema = db.schema
+
+            cursor.execute(f"""
+                SELECT cd.id, cd.nome, cs.saldo_atual
+                FROM {schema}.conta_dimensao cd
+                INNER JOIN {schema}.conta_saldos cs ON cs.conta_dimensao_id = cd.id
+                WHERE cd.ativo = 1
+                ORDER BY cd.nome
+            """)
+            contas = [(row.id, row.nome, row.saldo_atual) for row in cursor.fetchall()]
+
+            cursor.execute(f"""
+                SELECT gasto_recorrente_id, ano, mes
+                FROM {schema}.pagamentos_recorrentes
+                WHERE data_pagamento IS NOT NULL AND ano * 12 + mes >= ?
+            """, (hoje.year * 12 + hoje.month,))
+            pagos = {(row.gasto_recorrente_id, row.ano, row.mes) for row in cursor.fetchall()}
+
+            return contas, pagos
+
+        except Exception as e:
+            print(f"Erro ao carregar saldos para a previsão: {e}")
+            return [], set()
+        finally:
+            db.close()
@@ -1,16 +1,37 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-from datetime import datetime, timedelta
+import threading
+from collections import OrderedDict
+from datetime import datetime
 from src.models.transacao import Transacao
 from src.models.categoria import Categoria
 from src.models.conta import Conta
+from src.services.armazem_transacoes import ArmazemTransacoes
+from src.services.previsao_service import PrevisaoService
 
 class RelatorioService:
-    """Serviço para geração de relatórios financeiros."""
+    """Serviço para geração de relatórios financeiros.
+
+    pandas e matplotlib são importados dentro de cada relatório, para que só
+    sejam carregados quando um relatório for gerado pela primeira vez.
+
+    Os gráficos são desenhados fora da tela pelo backend Agg em objetos Figure
+    (sem o estado global do pyplot), que as views exibem com GraficoWidget.
+    As figuras ficam em cache pela chave (gráfico, parâmetros, versão dos
+    dados), então reabrir um relatório não redesenha nada enquanto as
+    transações não mudarem.
+    """
+    
+    # Quantidade máxima de figuras mantidas no cache
+    LIMITE_CACHE_GRAFICOS = 16
+    
+    # (gráfico, parâmetros, versão dos dados) -> Figure, da menos para a mais recentemente usada
+    _cache_graficos = OrderedDict()
+    _trava_cache = threading.Lock()
     
     @staticmethod
     def gerar_fluxo_caixa(data_inicio, data_fim):
         """Gera um relatório de fluxo de caixa para o período especificado."""
+        import pandas as pd
+        
         try:
             # Obter todas as transações do período
             filtros = {
@@ -18,13 +39,13 @@ class RelatorioService:
                 'data_fim': data_fim,
                 'ordenacao': 'data_transacao ASC'
             }
-            transacoes = Transacao.listar_todas(filtros)
+            transacoes = Transacao.listar_linhas(filtros)
             
             # Criar DataFrame para análise
             dados = []
             for t in transacoes:
-                categoria_nome = t.categoria.nome if t.categoria else "Sem categoria"
-                conta_nome = t.conta.nome if t.conta else "Sem conta"
+                categoria_nome = t.categoria_nome or "Sem categoria"
+                conta_nome = t.conta_nome or "Sem conta"
                 
                 dados.append({
                     'data': t.data_transacao,
@@ -81,8 +102,17 @@ class RelatorioService:
     def gerar_resumo_por_categoria(data_inicio, data_fim, tipo):
         """Gera um resumo de gastos ou receitas por categoria."""
         try:
-            # Obter resumo por categoria
-            resumo = Transacao.obter_resumo_por_categoria(data_inicio, data_fim, tipo)
+            # Agregar localmente a partir do armazém colunar
+            armazem = ArmazemTransacoes.obter()
+            totais = armazem.totais_por('categoria', data_inicio=data_inicio, data_fim=data_fim, tipo=tipo)
+            resumo = [
+                {
+                    'categoria_id': categoria_id,
+                    'nome_categoria': armazem.nomes_categorias.get(categoria_id, "Sem categoria"),
+                    'total': total
+                }
+                for categoria_id, total in sorted(totais.items(), key=lambda item: item[1], reverse=True)
+            ]
             
             # Calcular percentuais
             total = sum(item['total'] for item in resumo)
@@ -102,8 +132,12 @@ class RelatorioService:
     
     @staticmethod
     def gerar_grafico_pizza_categorias(data_inicio, data_fim, tipo, caminho_arquivo=None):
-        """Gera um gráfico de pizza com a distribuição por categorias."""
-        try:
+        """Gera um gráfico de pizza com a distribuição por categorias.
+        
+        Returns:
+            Figure renderizada (salva também em caminho_arquivo, se informado) ou None
+        """
+        def desenhar(figura):
             resumo = RelatorioService.gerar_resumo_por_categoria(data_inicio, data_fim, tipo)
             
             if not resumo:
@@ -111,152 +145,192 @@ class RelatorioService:
             
             # Preparar dados para o gráfico
             labels = [item['nome_categoria'] for item in resumo]
-            valores = [item['total'] for item in resumo]
+            valores = [float(item['total']) for item in resumo]
             
-            # Criar gráfico
-            plt.figure(figsize=(10, 7))
-            plt.pie(valores, labels=labels, autopct='%1.1f%%', startangle=90)
-            plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+            ax = figura.add_subplot()
+            ax.pie(valores, labels=labels, autopct='%1.1f%%', startangle=90)
+            ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
             
             titulo = "Distribuição de Receitas por Categoria" if tipo == 'R' else "Distribuição de Despesas por Categoria"
-            plt.title(titulo)
-            
-            # Salvar ou mostrar o gráfico
-            if caminho_arquivo:
-                plt.savefig(caminho_arquivo)
-                plt.close()
-                return True
-            else:
-                plt.show()
-                return True
+            ax.set_title(titulo)
+        
+        try:
+            chave = ('pizza_categorias', (data_inicio, data_fim, tipo), RelatorioService._versao_dados())
+            return RelatorioService._renderizar(chave, (10, 7), desenhar, caminho_arquivo)
                 
         except Exception as e:
             print(f"Erro ao gerar gráfico de pizza: {e}")
-            return False
+            return None
     
     @staticmethod
     def gerar_grafico_evolucao_saldo(data_inicio, data_fim, caminho_arquivo=None):
-        """Gera um gráfico de linha mostrando a evolução do saldo no período."""
-        try:
-            # Obter todas as transações do período
-            filtros = {
-                'data_inicio': data_inicio,
-                'data_fim': data_fim,
-                'ordenacao': 'data_transacao ASC'
-            }
-            transacoes = Transacao.listar_todas(filtros)
-            
-            if not transacoes:
+        """Gera um gráfico de linha mostrando a evolução do saldo no período.
+        
+        Returns:
+            Figure renderizada (salva também em caminho_arquivo, se informado) ou None
+        """
+        def desenhar(figura):
+            # Variação diária (receitas positivas, despesas negativas) agregada localmente
+            dias, centavos = ArmazemTransacoes.obter().agrupar(
+                'dia', com_sinal=True, data_inicio=data_inicio, data_fim=data_fim)
+            
+            if len(dias) == 0:
                 return False
             
-            # Criar DataFrame para análise
-            dados = []
-            for t in transacoes:
-                dados.append({
-                    'data': t.data_transacao,
-                    'valor': t.valor if t.tipo == 'R' else -t.valor  # Receitas positivas, despesas negativas
-                })
-            
-            df = pd.DataFrame(dados)
-            
-            # Agrupar por data e somar valores
-            df_agrupado = df.groupby('data')['valor'].sum().reset_index()
-            
             # Calcular saldo acumulado
-            df_agrupado['saldo_acumulado'] = df_agrupado['valor'].cumsum()
-            
-            # Criar gráfico
-            plt.figure(figsize=(12, 6))
-            plt.plot(df_agrupado['data'], df_agrupado['saldo_acumulado'], marker='o')
-            plt.title('Evolução do Saldo')
-            plt.xlabel('Data')
-            plt.ylabel('Saldo (R$)')
-            plt.grid(True)
+            saldo_acumulado = centavos.cumsum() / 100
             
-            # Formatar eixo Y com valores monetários
-            plt.gca().yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'R$ {x:,.2f}'))
+            ax = figura.add_subplot()
+            ax.plot(dias.astype('datetime64[D]'), saldo_acumulado, marker='o')
+            ax.set_title('Evolução do Saldo')
+            ax.set_xlabel('Data')
+            ax.set_ylabel('Saldo (R$)')
+            ax.grid(True)
+            RelatorioService._formatar_eixo_moeda(ax)
             
             # Rotacionar datas no eixo X para melhor visualização
-            plt.xticks(rotation=45)
-            
-            # Ajustar layout
-            plt.tight_layout()
-            
-            # Salvar ou mostrar o gráfico
-            if caminho_arquivo:
-                plt.savefig(caminho_arquivo)
-                plt.close()
-                return True
-            else:
-                plt.show()
-                return True
+            ax.tick_params(axis='x', labelrotation=45)
+        
+        try:
+            chave = ('evolucao_saldo', (data_inicio, data_fim), RelatorioService._versao_dados())
+            return RelatorioService._renderizar(chave, (12, 6), desenhar, caminho_arquivo)
                 
         except Exception as e:
             print(f"Erro ao gerar gráfico de evolução de saldo: {e}")
-            return False
+            return None
     
     @staticmethod
     def gerar_comparativo_mensal(ano, tipo, caminho_arquivo=None):
-        """Gera um gráfico de barras comparando receitas ou despesas por mês."""
-        try:
-            # Preparar dados para todos os meses do ano
-            meses = []
-            valores = []
-            
-            for mes in range(1, 13):
-                # Definir primeiro e último dia do mês
-                if mes == 12:
-                    data_inicio = datetime(ano, mes, 1)
-                    data_fim = datetime(ano + 1, 1, 1) - timedelta(days=1)
-                else:
-                    data_inicio = datetime(ano, mes, 1)
-                    data_fim = datetime(ano, mes + 1, 1) - timedelta(days=1)
-                
-                # Obter resumo do período
-                resumo = Transacao.obter_resumo_por_periodo(data_inicio, data_fim)
-                
-                # Adicionar aos dados
-                meses.append(data_inicio.strftime('%b'))  # Nome abreviado do mês
-                if tipo == 'R':
-                    valores.append(resumo['total_receitas'])
-                else:
-                    valores.append(resumo['total_despesas'])
-            
-            # Criar gráfico
-            plt.figure(figsize=(12, 6))
+        """Gera um gráfico de barras comparando receitas ou despesas por mês.
+        
+        Returns:
+            Figure renderizada (salva também em caminho_arquivo, se informado) ou None
+        """
+        def desenhar(figura):
+            # Totais do ano agrupados por mês em uma única passada local
+            totais = ArmazemTransacoes.obter().totais_por(
+                'mes', data_inicio=datetime(ano, 1, 1), data_fim=datetime(ano, 12, 31), tipo=tipo)
+            
+            meses = [datetime(ano, mes, 1).strftime('%b') for mes in range(1, 13)]  # Nome abreviado do mês
+            valores = [float(totais.get((ano, mes), 0)) for mes in range(1, 13)]
             
             # Definir cores
             cor = 'green' if tipo == 'R' else 'red'
             
             # Criar barras
-            plt.bar(meses, valores, color=cor)
+            ax = figura.add_subplot()
+            ax.bar(meses, valores, color=cor)
             
             # Adicionar rótulos e título
             titulo = f"Receitas Mensais - {ano}" if tipo == 'R' else f"Despesas Mensais - {ano}"
-            plt.title(titulo)
-            plt.xlabel('Mês')
-            plt.ylabel('Valor (R$)')
-            
-            # Formatar eixo Y com valores monetários
-            plt.gca().yaxis.set_major_formatter(plt.FuncFormatter(lambda x, _: f'R$ {x:,.2f}'))
+            ax.set_title(titulo)
+            ax.set_xlabel('Mês')
+            ax.set_ylabel('Valor (R$)')
+            RelatorioService._formatar_eixo_moeda(ax)
             
             # Adicionar valores sobre as barras
             for i, valor in enumerate(valores):
-                plt.text(i, valor + (max(valores) * 0.01), f'R$ {valor:,.2f}', 
-                         ha='center', va='bottom', rotation=45, fontsize=8)
+                ax.text(i, valor + (max(valores) * 0.01), f'R$ {valor:,.2f}', 
+                        ha='center', va='bottom', rotation=45, fontsize=8)
+        
+        try:
+            chave = ('comparativo_mensal', (ano, tipo), RelatorioService._versao_dados())
+            return RelatorioService._renderizar(chave, (12, 6), desenhar, caminho_arquivo)
+                
+        except Exception as e:
+            print(f"Erro ao gerar comparativo mensal: {e}")
+            return None
+    
+    @staticmethod
+    def gerar_grafico_previsao_saldo(horizonte_meses=12, caminho_arquivo=None):
+        """Gera um gráfico com o saldo diário projetado de cada conta e o total.
+        
+        A previsão depende dos gastos recorrentes e dos saldos atuais, que o
+        armazém de transações não acompanha, então este gráfico não usa o cache.
+        
+        Returns:
+            Figure renderizada (salva também em caminho_arquivo, se informado) ou None
+        """
+        def desenhar(figura):
+            previsao = PrevisaoService.projetar(horizonte_meses)
+            
+            if len(previsao['datas']) == 0:
+                return False
             
-            # Ajustar layout
-            plt.tight_layout()
+            ax = figura.add_subplot()
+            for conta in previsao['contas']:
+                ax.plot(previsao['datas'], conta['saldos'], label=conta['nome'])
+            ax.plot(previsao['datas'], previsao['total'], label='Total', color='black', linestyle='--', linewidth=2)
             
-            # Salvar ou mostrar o gráfico
-            if caminho_arquivo:
-                plt.savefig(caminho_arquivo)
-                plt.close()
-                return True
-            else:
-                plt.show()
-                return True
+            ax.axhline(0, color='red', linewidth=0.8)
+            ax.set_title(f'Previsão de Saldo - Próximos {horizonte_meses} meses')
+            ax.set_xlabel('Data')
+            ax.set_ylabel('Saldo (R$)')
+            ax.grid(True)
+            ax.legend()
+            RelatorioService._formatar_eixo_moeda(ax)
+            
+            # Rotacionar datas no eixo X para melhor visualização
+            ax.tick_params(axis='x', labelrotation=45)
+        
+        try:
+            return RelatorioService._renderizar(None, (12, 6), desenhar, caminho_arquivo)
                 
         except Exception as e:
-            print(f"Erro ao gerar comparativo mensal: {e}")
-            return False
\ No newline at end of file
+            print(f"Erro ao gerar gráfico de previsão de saldo: {e}")
+            return None
+    
+    @staticmethod
+    def limpar_cache_graficos():
+        """Descarta todas as figuras em cache."""
+        with RelatorioService._trava_cache:
+            RelatorioService._cache_graficos.clear()
+    
+    @staticmethod
+    def _versao_dados():
+        """Versão atual das transações (esquema e versão do armazém colunar)."""
+        armazem = ArmazemTransacoes.obter()
+        return armazem.schema, armazem.versao
+    
+    @staticmethod
+    def _renderizar(chave, tamanho, desenhar, caminho_arquivo=None):
+        """Retorna a figura da chave, desenhando-a fora da tela se não estiver em cache.
+        
+        Args:
+            chave: (gráfico, parâmetros, versão dos dados), ou None para não usar o cache
+            tamanho: Tamanho da figura em polegadas (largura, altura)
+            desenhar: Função que recebe a Figure vazia e retorna False se não houver dados
+            caminho_arquivo: Se informado, a figura também é salva neste arquivo
+        """
+        with RelatorioService._trava_cache:
+            figura = RelatorioService._cache_graficos.get(chave) if chave else None
+            if figura is not None:
+                RelatorioService._cache_graficos.move_to_end(chave)
+        
+        if figura is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_agg import FigureCanvasAgg
+            
+            figura = Figure(figsize=tamanho)
+            FigureCanvasAgg(figura)
+            if desenhar(figura) is False:
+                return None
+            figura.tight_layout()
+            figura.canvas.draw()
+            
+            if chave:
+                with RelatorioService._trava_cache:
+                    RelatorioService._cache_graficos[chave] = figura
+                    while len(RelatorioService._cache_graficos) > RelatorioService.LIMITE_CACHE_GRAFICOS:
+                        RelatorioService._cache_graficos.popitem(last=False)
+        
+        if caminho_arquivo:
+            figura.savefig(caminho_arquivo)
+        return figura
+    
+    @staticmethod
+    def _formatar_eixo_moeda(ax):
+        """Formata o eixo Y com valores monetários."""
+        from matplotlib.ticker import FuncFormatter
+        
+        ax.yaxis.set_major_formatter(FuncFormatter(lambda x, _: f'R$ {x:,.2f}'))
@@ -0,0 +1,409 @@
+"""
+Envio ao servidor das gravações guardadas no diário local.
+"""
+from datetime import datetime
+from decimal import Decimal
+from src.database.db_helper import get_db_connection, get_diario_local
+from src.database.diario_local import DiarioLocal
+from src.models.gasto_recorrente import GastoRecorrente
+from src.models.transacao import Transacao
+
+class SincronizacaoService:
+    """Grava transações, gastos recorrentes e pagamentos no diário local e os envia ao servidor.
+
+    As views chamam os métodos de gravação, que só escrevem no diário (disco
+    local) e retornam; sincronizar() é executado em segundo plano e envia as
+    operações na ordem em que foram gravadas. Inserções simples e exclusões de
+    transações seguidas são enviadas em lote, com um único commit; as
+    alterações em lote seguem a fila como uma única operação. Alterações
+    são comparadas com os valores originais lidos do servidor: se outro
+    usuário alterou os mesmos campos, a operação fica em conflito e aguarda
+    decisão (DiarioDialog). As inclusões gravam no servidor o id_diario da
+    operação; uma inclusão enviada sem confirmação só é reenviada se nenhuma
+    linha com esse id existir.
+    """
+
+    # Operações lidas do diário por execução de sincronizar()
+    TAMANHO_LOTE = 200
+
+    CAMPOS_TRANSACAO = ('descricao', 'valor', 'data_transacao', 'tipo', 'categoria_id', 'conta_id',
+                        'meio_pagamento_id', 'descricao_pagamento', 'local_transacao', 'observacao',
+                        'transferencia_id', 'conta_destino_id')
+    CAMPOS_GASTO = ('nome', 'valor', 'dia_vencimento', 'periodicidade', 'tipo', 'categoria_id', 'conta_id',
+                    'meio_pagamento_id', 'data_inicio', 'data_fim', 'gerar_transacao', 'descricao_pagamento',
+                    'observacao', 'ativo')
+
+    @staticmethod
+    def campos(objeto, nomes):
+        """Retorna os campos informados de um objeto (usado para guardar os valores originais)."""
+        return {nome: getattr(objeto, nome) for nome in nomes}
+
+    @staticmethod
+    def salvar_transacao(transacao, original=None):
+        """Grava no diário a inclusão ou alteração de uma transação.
+
+        Args:
+            original: Campos da transação lidos do servidor antes da edição
+
+        Returns:
+            int: Id da transação (provisório e negativo nas inclusões)
+        """
+        dados = SincronizacaoService.campos(transacao, SincronizacaoService.CAMPOS_TRANSACAO)
+        operacao = 'inserir' if transacao.id is None else 'atualizar'
+        return get_diario_local().enfileirar('transacao', operacao, dados, original, transacao.id)
+
+    @staticmethod
+    def obter_transacao_para_edicao(transacao_id):
+        """Retorna a transação a editar e os valores que a edição espera encontrar no servidor.
+
+        Se uma gravação anterior da transação ainda está no diário, a edição
+        parte dela: os campos são os dessa gravação e os valores esperados são
+        os que o servidor terá depois de recebê-la (nenhum, para uma inclusão
+        ainda não enviada). Caso contrário, a transação é lida do servidor.
+        Alterações em lote gravadas depois são aplicadas aos dois.
+
+        Returns:
+            tuple: (transacao, original), ou (None, None) se a transação não existe
+        """
+        diario = get_diario_local()
+        operacao = diario.ultima_pendente('transacao', transacao_id)
+        if operacao is not None and operacao['operacao'] == 'excluir':
+            return None, None
+        if operacao is None:
+            transacao = Transacao.buscar_por_id(transacao_id)
+            if transacao is None:
+                return None, None
+            original = SincronizacaoService.campos(transacao, SincronizacaoService.CAMPOS_TRANSACAO)
+        else:
+            transacao = Transacao(id=transacao_id, **operacao['dados'])
+            original = dict(operacao['dados']) if operacao['operacao'] == 'atualizar' else None
+
+        for lote in diario.lotes_pendentes('transacao', operacao['id'] if operacao else 0):
+            if transacao_id in lote['dados']['ids']:
+                for campo, valor in lote['dados']['campos'].items():
+                    setattr(transacao, campo, valor)
+                    if original is not None:
+                        original[campo] = valor
+        return transacao, original
+
+    @staticmethod
+    def excluir_transacao(transacao_id):
+        """Grava no diário a exclusão de uma transação (e da outra perna, se for transferência)."""
+        return get_diario_local().enfileirar('transacao', 'excluir', {}, registro_id=transacao_id)
+
+    @staticmethod
+    def alterar_transacoes(ids, campos):
+        """Grava no diário a alteração de campos de várias transações (Transacao.atualizar_em_lote).
+
+        A operação entra na fila depois das gravações anteriores dessas
+        transações, que chegam ao servidor antes dela.
+        """
+        return get_diario_local().enfileirar('transacao', 'atualizar_lote', {'ids': list(ids), 'campos': campos})
+
+    @staticmethod
+    def excluir_transacoes(ids):
+        """Grava no diário a exclusão de várias transações; as operações são enviadas em um único lote."""
+        for transacao_id in ids:
+            SincronizacaoService.excluir_transacao(transacao_id)
+
+    @staticmethod
+    def salvar_gasto(gasto, original=None):
+        """Grava no diário a inclusão ou alteração de um gasto recorrente."""
+        dados = SincronizacaoService.campos(gasto, SincronizacaoService.CAMPOS_GASTO)
+        operacao = 'inserir' if gasto.id is None else 'atualizar'
+        return get_diario_local().enfileirar('gasto_recorrente', operacao, dados, original, gasto.id)
+
+    @staticmethod
+    def marcar_pagamento(gasto_id, ano, mes, data_pagamento=None, valor_pago=None, gerar_transacao=False,
+                         original=None):
+        """Grava no diário o pagamento de um gasto recorrente em um mês.
+
+        Args:
+            original: Situação do pagamento lida do servidor (GastoRecorrente.verificar_pagamento)
+        """
+        dados = {'ano': ano, 'mes': mes, 'data_pagamento': data_pagamento, 'valor_pago': valor_pago,
+                 'gerar_transacao': gerar_transacao}
+        if original is not None:
+            original = {'pago': bool(original.get('pago'))}
+        return get_diario_local().enfileirar('pagamento', 'pagar', dados, original, gasto_id)
+
+    @staticmethod
+    def sincronizar(limite=None):
+        """Envia ao servidor as próximas operações do diário, na ordem de gravação.
+
+        Para na primeira falha (as operações seguintes podem depender dela); a
+        operação que falhou é reenviada na próxima execução.
+
+        Returns:
+            dict com 'enviadas', 'conflitos', 'offline' (servidor inacessível),
+            'pendentes' e 'problemas' (operações restantes no diário)
+        """
+        diario = get_diario_local()
+        resultado = {'enviadas': 0, 'conflitos': 0, 'offline': False}
+        operacoes = diario.pendentes(limite or SincronizacaoService.TAMANHO_LOTE)
+
+        if operacoes:
+            db = get_db_connection()
+            try:
+                db.get_cursor()
+            except Exception as e:
+                print(f"Servidor indisponível, gravações mantidas no diário local: {e}")
+                resultado['offline'] = True
+                operacoes = []
+            finally:
+                db.close()
+
+        inicio = 0
+        while inicio < len(operacoes):
+            operacao = operacoes[inicio]
+            tipo = SincronizacaoService._tipo_lote(operacao)
+            fim = inicio + 1
+            if tipo:
+                while fim < len(operacoes) and SincronizacaoService._tipo_lote(operacoes[fim]) == tipo:
+                    fim += 1
+
+            if tipo == 'inserir':
+                continuar = SincronizacaoService._inserir_transacoes(diario, operacoes[inicio:fim], resultado)
+            elif tipo == 'excluir':
+                continuar = SincronizacaoService._excluir_transacoes(diario, operacoes[inicio:fim], resultado)
+            else:
+                continuar = SincronizacaoService._aplicar(diario, operacao, resultado)
+
+            if not continuar:
+                break
+            inicio = fim
+
+        resultado['pendentes'], resultado['problemas'] = diario.contar()
+        return resultado
+
+    @staticmethod
+    def _tipo_lote(operacao):
+        """Indica se a operação pode ser enviada em lote com as vizinhas ('inserir', 'excluir' ou None)."""
+        if operacao['entidade'] != 'transacao':
+            return None
+        if operacao['operacao'] == 'inserir' and not operacao['dados'].get('conta_destino_id'):
+            return 'inserir'
+        if operacao['operacao'] == 'excluir':
+            return 'excluir'
+        return None
+
+    @staticmethod
+    def _inserir_transacoes(diario, operacoes, resultado):
+        """Insere em lote transações que não são transferências."""
+        ids_servidor = {}
+
+        # Operações já enviadas sem confirmação: procurar a transação no servidor antes de reenviar
+        reenviadas = [op for op in operacoes if op['situacao'] == DiarioLocal.ENVIANDO]
+        if reenviadas:
+            encontradas = SincronizacaoService._procurar_enviados('transacoes',
+                                                                  [op['id_diario'] for op in reenviadas])
+            if encontradas is None:
+                return False
+            for operacao in reenviadas:
+                if operacao['id_diario'] in encontradas:
+                    ids_servidor[('transacao', operacao['registro_id'])] = encontradas[operacao['id_diario']]
+
+        a_enviar = [op for op in operacoes if ('transacao', op['registro_id']) not in ids_servidor]
+        diario.marcar([op['id'] for op in a_enviar], DiarioLocal.ENVIANDO)
+
+        ids = Transacao.inserir_em_lote([SincronizacaoService._novo_registro(Transacao, op) for op in a_enviar])
+        if ids is None and len(a_enviar) > 1:
+            # Enviar uma a uma para isolar a transação que impede o lote
+            ids = []
+            for operacao in a_enviar:
+                inserida = Transacao.inserir_em_lote([SincronizacaoService._novo_registro(Transacao, operacao)])
+                if inserida is None:
+                    break
+                ids.extend(inserida)
+        elif ids is None:
+            ids = []
+
+        for operacao, transacao_id in zip(a_enviar, ids):
+            ids_servidor[('transacao', operacao['registro_id'])] = transacao_id
+
+        concluidas = [op for op in operacoes if ('transacao', op['registro_id']) in ids_servidor]
+        diario.concluir([op['id'] for op in concluidas], ids_servidor)
+        resultado['enviadas'] += len(concluidas)
+
+        falhas = [op for op in operacoes if ('transacao', op['registro_id']) not in ids_servidor]
+        if falhas:
+            diario.registrar_falha(falhas[0]['id'], "Erro ao inserir a transação no servidor.")
+            # As seguintes não chegaram a ser enviadas
+            diario.marcar([op['id'] for op in falhas[1:]], DiarioLocal.PENDENTE)
+            return False
+        return True
+
+    @staticmethod
+    def _novo_registro(modelo, operacao):
+        """Cria o registro de uma operação de inclusão, marcado com o id_diario da operação."""
+        registro = modelo(**operacao['dados'])
+        registro.id_diario = operacao['id_diario']
+        return registro
+
+    @staticmethod
+    def _procurar_enviados(tabela, ids_diario):
+        """Procura no servidor as linhas inseridas pelas operações do diário.
+
+        Returns:
+            Dicionário {id_diario: id da linha} (a primeira linha, nas
+            transferências), ou None em caso de erro
+        """
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            marcadores = ', '.join('?' for _ in ids_diario)
+            cursor.execute(f"""
+                SELECT CAST(id_diario AS NVARCHAR(36)) AS id_diario, MIN(id) AS id
+                FROM {db.schema}.{tabela}
+                WHERE id_diario IN ({marcadores})
+                GROUP BY id_diario
+            """, list(ids_diario))
+            return {row.id_diario.lower(): row.id for row in cursor.fetchall()}
+        except Exception as e:
+            print(f"Erro ao verificar gravações já enviadas: {e}")
+            return None
+        finally:
+            db.close()
+
+    @staticmethod
+    def _excluir_transacoes(diario, operacoes, resultado):
+        """Exclui em lote as transações das operações."""
+        ids, validas = [], []
+        for operacao in operacoes:
+            transacao_id = diario.resolver('transacao', operacao['registro_id'])
+            if transacao_id is None:
+                SincronizacaoService._conflito(diario, operacao, resultado,
+                                               "A inclusão da transação não foi enviada ao servidor.")
+            else:
+                ids.append(transacao_id)
+                validas.append(operacao)
+
+        if ids and Transacao.excluir_em_lote(ids) is None:
+            diario.registrar_falha(validas[0]['id'], "Erro ao excluir as transações no servidor.")
+            return False
+
+        diario.concluir([op['id'] for op in validas])
+        resultado['enviadas'] += len(validas)
+        return True
+
+    @staticmethod
+    def _aplicar(diario, operacao, resultado):
+        """Envia uma operação que não é agrupada em lote."""
+        entidade, dados = operacao['entidade'], operacao['dados']
+        ids_servidor = {}
+
+        if entidade == 'pagamento':
+            gasto_id = diario.resolver('gasto_recorrente', operacao['registro_id'])
+            gasto = GastoRecorrente.buscar_por_id(gasto_id) if gasto_id is not None else None
+            if gasto is None:
+                SincronizacaoService._conflito(diario, operacao, resultado, "Gasto recorrente não encontrado.")
+                return True
+            if operacao['original'] is not None:
+                situacao = gasto.verificar_pagamento(dados['ano'], dados['mes']) or {}
+                if 'erro' in situacao:
+                    diario.registrar_falha(operacao['id'], situacao['erro'])
+                    return False
+                if bool(situacao.get('pago')) != operacao['original']['pago']:
+                    SincronizacaoService._conflito(diario, operacao, resultado,
+                                                   "O pagamento do mês foi alterado no servidor.")
+                    return True
+            sucesso = gasto.marcar_como_pago(dados['ano'], dados['mes'], dados['data_pagamento'],
+                                             dados['valor_pago'], dados['gerar_transacao'])
+
+        elif operacao['operacao'] == 'atualizar_lote':
+            ids = [diario.resolver('transacao', transacao_id) for transacao_id in dados['ids']]
+            ids = [transacao_id for transacao_id in ids if transacao_id is not None]
+            sucesso = not ids or Transacao.atualizar_em_lote(ids, dados['campos']) is not None
+
+        else:
+            modelo = Transacao if entidade == 'transacao' else GastoRecorrente
+            tabela = 'transacoes' if entidade == 'transacao' else 'gastos_recorrentes'
+
+            if operacao['operacao'] == 'inserir':
+                registro = SincronizacaoService._novo_registro(modelo, operacao)
+                if operacao['situacao'] == DiarioLocal.ENVIANDO:
+                    encontrados = SincronizacaoService._procurar_enviados(tabela, [operacao['id_diario']])
+                    if encontrados is None:
+                        return False
+                    if operacao['id_diario'] in encontrados:
+                        ids_servidor[(entidade, operacao['registro_id'])] = encontrados[operacao['id_diario']]
+                if not ids_servidor:
+                    diario.marcar([operacao['id']], DiarioLocal.ENVIANDO)
+                    sucesso = registro.salvar()
+                    if sucesso:
+                        ids_servidor[(entidade, operacao['registro_id'])] = registro.id
+                else:
+                    sucesso = True
+            else:
+                registro_id = diario.resolver(entidade, operacao['registro_id'])
+                if registro_id is None:
+                    SincronizacaoService._conflito(diario, operacao, resultado,
+                                                   "A inclusão do registro não foi enviada ao servidor.")
+                    return True
+                if operacao['original'] is not None:
+                    conflito = SincronizacaoService._verificar_conflito(tabela, registro_id,
+                                                                        operacao['original'], dados)
+                    if conflito is False:
+                        return False
+                    if conflito:
+                        SincronizacaoService._conflito(diario, operacao, resultado, conflito)
+                        return True
+                sucesso = modelo(id=registro_id, **dados).salvar()
+
+        if not sucesso:
+            diario.registrar_falha(operacao['id'], "Erro ao gravar no servidor.")
+            return False
+
+        diario.concluir([operacao['id']], ids_servidor)
+        resultado['enviadas'] += 1
+        return True
+
+    @staticmethod
+    def _verificar_conflito(tabela, registro_id, original, dados):
+        """Compara o registro no servidor com os valores lidos antes da edição.
+
+        Há conflito quando um campo foi alterado no servidor para um valor
+        diferente do gravado localmente.
+
+        Returns:
+            Mensagem do conflito, None se não há conflito, ou False em caso de erro
+        """
+        db = get_db_connection()
+        try:
+            cursor = db.get_cursor()
+            colunas = ', '.join(original)
+            cursor.execute(f"SELECT {colunas} FROM {db.schema}.{tabela} WHERE id = ?", (registro_id,))
+            row = cursor.fetchone()
+        except Exception as e:
+            print(f"Erro ao verificar conflito de gravação: {e}")
+            return False
+        finally:
+            db.close()
+
+        if row is None:
+            return "O registro foi excluído no servidor."
+        alterados = [
+            campo for campo, valor in original.items()
+            if not SincronizacaoService._iguais(getattr(row, campo), valor)
+            and not SincronizacaoService._iguais(getattr(row, campo), dados.get(campo))
+        ]
+        if alterados:
+            return f"Campos alterados no servidor: {', '.join(alterados)}."
+        return None
+
+    @staticmethod
+    def _iguais(a, b):
+        """Compara valores vindos do servidor e do diário (datas e números em tipos diferentes)."""
+        if isinstance(a, datetime) and not isinstance(b, datetime):
+            a = a.date()
+        if isinstance(b, datetime) and not isinstance(a, datetime):
+            b = b.date()
+        if isinstance(a, (int, float, Decimal)) and isinstance(b, (int, float, Decimal)):
+            return Decimal(str(a)) == Decimal(str(b))
+        return a == b
+
+    @staticmethod
+    def _conflito(diario, operacao, resultado, mensagem):
+        """Marca a operação como em conflito; ela fica fora da fila até decisão do usuário."""
+        diario.marcar([operacao['id']], DiarioLocal.CONFLITO, mensagem)
+        resultado['conflitos'] += 1
@@ -1,10 +1,11 @@
 """
 Utilitário para copiar dados do ambiente de produção para o ambiente de desenvolvimento.
 """
-import os
 import pyodbc
-from dotenv import load_dotenv
 from PyQt5.QtCore import QObject, pyqtSignal
+from src.config import Configuracao
+from src.database.setup import DatabaseSetup
+from src.models.resumo_mensal import ResumoMensal
 
 class DataCopyUtil(QObject):
     """Classe para copiar dados entre ambientes."""
@@ -16,152 +17,73 @@ class DataCopyUtil(QObject):
     def __init__(self):
         super().__init__()
     
-    def create_tables_in_dev(self, conn, cursor, dev_schema):
-        """Cria as tabelas no esquema de desenvolvimento."""
-        self.progress_updated.emit("Criando tabelas no esquema de desenvolvimento...")
+    # Tabelas mantidas pela própria aplicação, que não são copiadas de produção
+    TABELAS_NAO_COPIADAS = ('versao_esquema', 'resumo_mensal', 'exclusoes')
+    
+    def drop_dev_objects(self, conn, cursor, dev_schema):
+        """Remove as views, as chaves estrangeiras e as tabelas do esquema de desenvolvimento.
         
-        # Criar tabela categorias
-        self.progress_updated.emit("Criando tabela categorias...")
-        cursor.execute(f"""
-        CREATE TABLE {dev_schema}.categorias (
-            id INT IDENTITY(1,1) PRIMARY KEY,
-            nome NVARCHAR(100) NOT NULL,
-            tipo CHAR(1) NOT NULL,
-            descricao NVARCHAR(255) NULL,
-            categoria_pai_id INT NULL,
-            nivel INT NOT NULL DEFAULT 1,
-            data_criacao DATETIME DEFAULT GETDATE(),
-            ativo BIT DEFAULT 1
-        )
-        """)
-        conn.commit()
+        As views vêm primeiro (faturas_cartao é criada WITH SCHEMABINDING e
+        impede a exclusão de transacoes), e as chaves estrangeiras antes das
+        tabelas, para que a ordem de exclusão não importe. Com versao_esquema
+        removida, as migrações recriam o esquema inteiro.
+        """
+        cursor.execute("SELECT name FROM sys.views WHERE schema_id = SCHEMA_ID(?)", (dev_schema,))
+        for (view,) in cursor.fetchall():
+            cursor.execute(f"DROP VIEW {dev_schema}.{view}")
         
-        # Adicionar a restrição de chave estrangeira para categoria_pai_id
-        cursor.execute(f"""
-        ALTER TABLE {dev_schema}.categorias
-        ADD CONSTRAINT FK_{dev_schema}_categorias_pai 
-        FOREIGN KEY (categoria_pai_id) REFERENCES {dev_schema}.categorias(id)
-        """)
-        conn.commit()
-        
-        # Criar tabela conta_dimensao
-        self.progress_updated.emit("Criando tabela conta_dimensao...")
-        cursor.execute(f"""
-        CREATE TABLE {dev_schema}.conta_dimensao (
-            id INT IDENTITY(1,1) NOT NULL,
-            nome NVARCHAR(100) NOT NULL,
-            tipo NVARCHAR(50) NOT NULL,
-            instituicao NVARCHAR(100) NULL,
-            agencia NVARCHAR(20) NULL,
-            conta_contabil NVARCHAR(30) NULL,
-            numero_banco NVARCHAR(10) NULL,
-            titular NVARCHAR(150) NULL,
-            nome_gerente NVARCHAR(100) NULL,
-            contato_gerente NVARCHAR(100) NULL,
-            data_criacao DATETIME DEFAULT GETDATE(),
-            ativo BIT DEFAULT 1,
-            PRIMARY KEY CLUSTERED (id ASC)
-        )
-        """)
-        conn.commit()
+        cursor.execute("""
+        SELECT fk.name, OBJECT_NAME(fk.parent_object_id)
+        FROM sys.foreign_keys fk
+        WHERE fk.schema_id = SCHEMA_ID(?)
+        """, (dev_schema,))
+        for constraint, table in cursor.fetchall():
+            cursor.execute(f"ALTER TABLE {dev_schema}.{table} DROP CONSTRAINT {constraint}")
         
-        # Criar tabela conta_saldos
-        self.progress_updated.emit("Criando tabela conta_saldos...")
-        cursor.execute(f"""
-        CREATE TABLE {dev_schema}.conta_saldos (
-            id INT IDENTITY(1,1) NOT NULL,
-            conta_dimensao_id INT NOT NULL,
-            saldo_inicial DECIMAL(15, 2) DEFAULT 0.00,
-            saldo_atual DECIMAL(15, 2) DEFAULT 0.00,
-            data_criacao DATETIME DEFAULT GETDATE(),
-            PRIMARY KEY CLUSTERED (id ASC),
-            CONSTRAINT FK_{dev_schema}_conta_saldos_dimensao FOREIGN KEY (conta_dimensao_id) 
-                REFERENCES {dev_schema}.conta_dimensao (id)
-        )
-        """)
+        cursor.execute("SELECT name FROM sys.tables WHERE schema_id = SCHEMA_ID(?)", (dev_schema,))
+        for (table,) in cursor.fetchall():
+            self.progress_updated.emit(f"Removendo tabela {table}...")
+            cursor.execute(f"DROP TABLE {dev_schema}.{table}")
         conn.commit()
+    
+    def tables_to_copy(self, cursor, prod_schema, dev_schema):
+        """Tabelas do esquema de desenvolvimento que existem em produção, cada uma depois das que ela referencia."""
+        cursor.execute("""
+        SELECT d.name
+        FROM sys.tables d
+        INNER JOIN sys.tables p ON p.name = d.name AND p.schema_id = SCHEMA_ID(?)
+        WHERE d.schema_id = SCHEMA_ID(?)
+        """, (prod_schema, dev_schema))
+        tables = [row[0] for row in cursor.fetchall() if row[0] not in self.TABELAS_NAO_COPIADAS]
         
-        # Criar tabela meios_pagamento
-        self.progress_updated.emit("Criando tabela meios_pagamento...")
-        cursor.execute(f"""
-        CREATE TABLE {dev_schema}.meios_pagamento (
-            id INT IDENTITY(1,1) PRIMARY KEY,
-            nome NVARCHAR(100) NOT NULL,
-            tipo NVARCHAR(50) NOT NULL,
-            descricao NVARCHAR(255) NULL,
-            conta_id INT NULL,
-            data_criacao DATETIME DEFAULT GETDATE(),
-            ativo BIT DEFAULT 1,
-            CONSTRAINT FK_{dev_schema}_meios_pagamento_conta FOREIGN KEY (conta_id) 
-                REFERENCES {dev_schema}.conta_dimensao(id)
-        )
-        """)
-        conn.commit()
+        cursor.execute("""
+        SELECT OBJECT_NAME(fk.parent_object_id), OBJECT_NAME(fk.referenced_object_id)
+        FROM sys.foreign_keys fk
+        WHERE fk.schema_id = SCHEMA_ID(?)
+        """, (dev_schema,))
+        dependencies = {table: set() for table in tables}
+        for table, referenced in cursor.fetchall():
+            if table in dependencies and referenced in dependencies and referenced != table:
+                dependencies[table].add(referenced)
         
-        # Criar tabela transacoes
-        self.progress_updated.emit("Criando tabela transacoes...")
-        cursor.execute(f"""
-        CREATE TABLE {dev_schema}.transacoes (
-            id INT IDENTITY(1,1) PRIMARY KEY,
-            descricao NVARCHAR(255) NOT NULL,
-            valor DECIMAL(15, 2) NOT NULL,
-            data_transacao DATE NOT NULL,
-            tipo CHAR(1) NOT NULL,
-            categoria_id INT NULL,
-            conta_id INT NULL,
-            meio_pagamento_id INT NULL,
-            descricao_pagamento NVARCHAR(255) NULL,
-            local_transacao NVARCHAR(255) NULL,
-            observacao NVARCHAR(MAX) NULL,
-            data_criacao DATETIME DEFAULT GETDATE(),
-            ativo BIT DEFAULT 1,
-            CONSTRAINT FK_{dev_schema}_transacoes_categoria FOREIGN KEY (categoria_id) 
-                REFERENCES {dev_schema}.categorias(id),
-            CONSTRAINT FK_{dev_schema}_transacoes_conta FOREIGN KEY (conta_id) 
-                REFERENCES {dev_schema}.conta_dimensao(id),
-            CONSTRAINT FK_{dev_schema}_transacoes_meio_pagamento FOREIGN KEY (meio_pagamento_id) 
-                REFERENCES {dev_schema}.meios_pagamento(id)
-        )
-        """)
-        conn.commit()
+        ordered = []
+        while dependencies:
+            ready = sorted(table for table, referenced in dependencies.items() if referenced <= set(ordered))
+            if not ready:
+                raise RuntimeError(f"Dependência circular entre as tabelas: {', '.join(dependencies)}")
+            ordered.extend(ready)
+            for table in ready:
+                del dependencies[table]
+        return ordered
     
     def copy_data_from_prod_to_dev(self):
         """Copia todos os dados do esquema de produção para o esquema de desenvolvimento."""
-        # Carregar variáveis de ambiente
-        load_dotenv()
-        
-        # Configurações de conexão
-        server = os.getenv('DB_SERVER')
-        database = os.getenv('DB_DATABASE')
-        username = os.getenv('DB_USERNAME')
-        password = os.getenv('DB_PASSWORD')
-        driver = os.getenv('DB_DRIVER', 'ODBC Driver 17 for SQL Server')
-        
         # Esquemas
         prod_schema = "financas_pessoais"
         dev_schema = "financas_pessoais_dev"
         
-        # Tabelas a serem copiadas (na ordem correta para respeitar as chaves estrangeiras)
-        tables = [
-            "categorias",
-            "conta_dimensao",
-            "conta_saldos",
-            "meios_pagamento",
-            "transacoes"
-        ]
-        
-        # Tabelas na ordem inversa para exclusão (para respeitar as chaves estrangeiras)
-        delete_order = [
-            "transacoes",
-            "meios_pagamento",
-            "conta_saldos",
-            "conta_dimensao",
-            "categorias"
-        ]
-        
-        # Conectar ao banco de dados
-        connection_string = f'DRIVER={{{driver}}};SERVER={server};DATABASE={database};UID={username};PWD={password}'
-        conn = pyodbc.connect(connection_string)
+        # Conectar ao banco de dados com a mesma configuração da aplicação
+        conn = pyodbc.connect(Configuracao.carregar().string_conexao())
         cursor = conn.cursor()
         
         try:
@@ -177,31 +99,28 @@ class DataCopyUtil(QObject):
             conn.commit()
             self.progress_updated.emit(f"Esquema {dev_schema} verificado.")
             
-            # Primeiro, excluir tabelas na ordem inversa para respeitar as chaves estrangeiras
+            # Remover o esquema de desenvolvimento atual (views, chaves estrangeiras e tabelas)
             self.progress_updated.emit("Removendo tabelas existentes...")
-            for table in delete_order:
-                self.progress_updated.emit(f"Verificando tabela {table}...")
-                
-                cursor.execute(f"""
-                IF EXISTS (SELECT * FROM sys.tables WHERE name = '{table}' AND schema_id = SCHEMA_ID('{dev_schema}'))
-                BEGIN
-                    DROP TABLE {dev_schema}.{table}
-                END
-                """)
-                conn.commit()
+            self.drop_dev_objects(conn, cursor, dev_schema)
+            
+            # Criar as tabelas pelas migrações da aplicação, como em um banco novo
+            self.progress_updated.emit("Criando tabelas no esquema de desenvolvimento...")
+            if not DatabaseSetup(environment='dev').create_tables():
+                raise RuntimeError("Não foi possível criar as tabelas no esquema de desenvolvimento.")
             
-            # Criar as tabelas no esquema de desenvolvimento
-            self.create_tables_in_dev(conn, cursor, dev_schema)
+            # Tabelas de produção a copiar, na ordem das chaves estrangeiras
+            tables = self.tables_to_copy(cursor, prod_schema, dev_schema)
             
             # Finalmente, copiar os dados na ordem correta
             for table in tables:
                 self.progress_updated.emit(f"Copiando dados para tabela {table}...")
                 
-                # Obter colunas da tabela
+                # Obter colunas da tabela (a coluna versao, ROWVERSION, é gerada pelo servidor)
                 cursor.execute(f"""
                 SELECT COLUMN_NAME 
                 FROM INFORMATION_SCHEMA.COLUMNS 
                 WHERE TABLE_SCHEMA = '{prod_schema}' AND TABLE_NAME = '{table}'
+                  AND DATA_TYPE <> 'timestamp'
                 ORDER BY ORDINAL_POSITION
                 """)
                 columns = [row.COLUMN_NAME for row in cursor.fetchall()]
@@ -254,6 +173,11 @@ class DataCopyUtil(QObject):
                 result = cursor.fetchone()
                 self.progress_updated.emit(f"Tabela: {result[0]}, Prod: {result[1]}, Dev: {result[2]}, Status: {result[3]}")
             
+            # O resumo mensal é derivado das transações copiadas
+            self.progress_updated.emit("Reconstruindo resumo mensal...")
+            ResumoMensal.recalcular(cursor, dev_schema)
+            conn.commit()
+            
             self.operation_completed.emit(True, "Cópia de dados concluída com sucesso!")
             
         except Exception as e:
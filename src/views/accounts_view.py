@@ -10,6 +10,7 @@ from PyQt5.QtCore import Qt, pyqtSignal, QLocale
 from PyQt5.QtGui import QDoubleValidator
 from decimal import Decimal
 from src.models.conta import Conta
+from src.views.tarefas import ExecutorTarefas
 
 class ContaDialog(QDialog):
     """Diálogo para criar ou editar uma conta."""
@@ -143,6 +144,13 @@ class AccountsView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Gestão de Contas")
+        self.tarefas = ExecutorTarefas(self)
+        
+        # Contas ativas exibidas ({id: conta}) e versão do banco em que foram lidas;
+        # as recargas buscam só as contas alteradas desde essa versão
+        self.contas = {}
+        self._versao_contas = None
+        
         self.setup_ui()
         self.carregar_contas()
         
@@ -208,9 +216,36 @@ class AccountsView(QWidget):
         self.setLayout(layout)
         
     def carregar_contas(self):
-        """Carrega as contas do banco de dados e exibe na tabela."""
-        contas = Conta.listar_todas(apenas_ativas=True)
+        """Busca em segundo plano as contas alteradas desde a última carga."""
+        self.tarefas.executar('contas', Conta.alteracoes_desde, self._versao_contas,
+                              ao_concluir=self._aplicar_alteracoes)
+    
+    def _aplicar_alteracoes(self, resultado):
+        """Aplica as contas alteradas e excluídas ao cache e redesenha a tabela se algo mudou."""
+        if resultado is None:
+            return
+        alteradas, excluidas, versao = resultado
+        carga_completa = self._versao_contas is None
+        self._versao_contas = versao
+        if not (carga_completa or alteradas or excluidas):
+            return
+        
+        if carga_completa:
+            self.contas = {}
+        for conta_id in excluidas:
+            self.contas.pop(conta_id, None)
+        for conta in alteradas:
+            if conta.ativo:
+                self.contas[conta.id] = conta
+            else:
+                self.contas.pop(conta.id, None)
         
+        contas = sorted(self.contas.values(), key=lambda conta: (conta.nome or "").casefold())
+        self._exibir_contas(contas)
+        self._exibir_saldo_total(sum((conta.saldo_atual or Decimal('0.00') for conta in contas), Decimal('0.00')))
+    
+    def _exibir_contas(self, contas):
+        """Exibe as contas na tabela."""
         self.tabela_contas.setRowCount(0)
         
         for conta in contas:
@@ -232,8 +267,9 @@ class AccountsView(QWidget):
             saldo_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
             self.tabela_contas.setItem(row, 9, saldo_item)
         
-        # Atualizar saldo total
-        saldo_total = Conta.obter_saldo_total()
+    def _exibir_saldo_total(self, saldo_total):
+        """Atualiza o saldo total e avisa a janela principal."""
+        saldo_total = saldo_total or Decimal('0.00')
         self.total_label.setText(f"Saldo Total: R$ {float(saldo_total):.2f}".replace('.', ','))
         self.saldo_atualizado.emit(saldo_total)
         
@@ -262,11 +298,7 @@ class AccountsView(QWidget):
                 contato_gerente=dados['contato_gerente']
             )
             
-            if conta.salvar():
-                self.carregar_contas()
-                QMessageBox.information(self, "Sucesso", "Conta criada com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao criar conta.")
+            self._gravar(conta.salvar, "Conta criada com sucesso!", "Erro ao criar conta.")
     
     def editar_conta(self):
         """Abre o diálogo para editar a conta selecionada."""
@@ -280,7 +312,11 @@ class AccountsView(QWidget):
         conta_id = int(self.tabela_contas.item(row, 0).text())
         
         # Buscar a conta no banco de dados
-        conta = Conta.buscar_por_id(conta_id)
+        self.tarefas.executar('buscar_conta', Conta.buscar_por_id, conta_id,
+                              ao_concluir=self._editar_conta_carregada)
+    
+    def _editar_conta_carregada(self, conta):
+        """Abre o diálogo de edição da conta buscada no banco."""
         if not conta:
             QMessageBox.critical(self, "Erro", "Conta não encontrada.")
             return
@@ -305,11 +341,7 @@ class AccountsView(QWidget):
             conta.nome_gerente = dados['nome_gerente']
             conta.contato_gerente = dados['contato_gerente']
             
-            if conta.salvar():
-                self.carregar_contas()
-                QMessageBox.information(self, "Sucesso", "Conta atualizada com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao atualizar conta.")
+            self._gravar(conta.salvar, "Conta atualizada com sucesso!", "Erro ao atualizar conta.")
     
     def excluir_conta(self):
         """Exclui (desativa) a conta selecionada."""
@@ -333,15 +365,33 @@ class AccountsView(QWidget):
         row = selected_rows[0].row()
         conta_id = int(self.tabela_contas.item(row, 0).text())
         
-        # Buscar a conta no banco de dados
-        conta = Conta.buscar_por_id(conta_id)
-        if not conta:
-            QMessageBox.critical(self, "Erro", "Conta não encontrada.")
-            return
+        def excluir():
+            # Buscar a conta e excluí-la na mesma tarefa (None se não encontrada)
+            conta = Conta.buscar_por_id(conta_id)
+            return conta.excluir() if conta else None
         
-        # Excluir a conta
-        if conta.excluir():
-            self.carregar_contas()
-            QMessageBox.information(self, "Sucesso", "Conta excluída com sucesso!")
-        else:
-            QMessageBox.critical(self, "Erro", "Erro ao excluir conta.")
\ No newline at end of file
+        self._gravar(excluir, "Conta excluída com sucesso!", "Erro ao excluir conta.")
+    
+    def _gravar(self, funcao, mensagem_sucesso, mensagem_erro):
+        """Executa uma gravação em segundo plano e recarrega as contas ao terminar.
+        
+        Os botões ficam desabilitados até o fim da gravação, evitando envios repetidos.
+        """
+        def ao_concluir(sucesso):
+            self._habilitar_botoes(True)
+            if sucesso is None:
+                QMessageBox.critical(self, "Erro", "Conta não encontrada.")
+            elif sucesso:
+                self.carregar_contas()
+                QMessageBox.information(self, "Sucesso", mensagem_sucesso)
+            else:
+                QMessageBox.critical(self, "Erro", mensagem_erro)
+        
+        self._habilitar_botoes(False)
+        self.tarefas.executar(None, funcao, ao_concluir=ao_concluir,
+                              ao_falhar=lambda erro: ao_concluir(False))
+    
+    def _habilitar_botoes(self, habilitar):
+        """Habilita ou desabilita os botões de alteração."""
+        for botao in (self.btn_nova, self.btn_editar, self.btn_excluir):
+            botao.setEnabled(habilitar)
@@ -10,6 +10,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                             QTabWidget)
 from PyQt5.QtCore import Qt, pyqtSignal
 from src.models.categoria import Categoria
+from src.views.tarefas import ExecutorTarefas
 
 class CategoriaDialog(QDialog):
     """Diálogo para criar ou editar uma categoria."""
@@ -136,6 +137,8 @@ class CategoriesView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Gestão de Categorias")
+        self.todas_categorias = []
+        self.tarefas = ExecutorTarefas(self)
         self.setup_ui()
         self.carregar_categorias()
         
@@ -162,7 +165,7 @@ class CategoriesView(QWidget):
         
         # Botão para aplicar filtros
         self.btn_filtrar = QPushButton("Filtrar")
-        self.btn_filtrar.clicked.connect(self.carregar_categorias)
+        self.btn_filtrar.clicked.connect(lambda: self._exibir_categorias(self.todas_categorias))
         filtros_layout.addWidget(self.btn_filtrar)
         
         filtros_layout.addStretch()
@@ -222,15 +225,20 @@ class CategoriesView(QWidget):
         self.setLayout(layout)
     
     def carregar_categorias(self):
-        """Carrega as categorias do banco de dados e exibe na interface."""
+        """Carrega todas as categorias em segundo plano; os filtros são aplicados localmente."""
+        self.tarefas.executar('categorias', Categoria.listar_todas, apenas_ativas=False,
+                              ao_concluir=self._exibir_categorias)
+    
+    def _exibir_categorias(self, todas_categorias):
+        """Exibe na tabela e na árvore as categorias que atendem aos filtros."""
         tipo = self.tipo_combo.currentData()
         apenas_ativas = self.apenas_ativos_check.isChecked()
         
-        # Carregar todas as categorias para uso interno
-        self.todas_categorias = Categoria.listar_todas(apenas_ativas=False)
+        # Guardar todas as categorias para uso interno
+        self.todas_categorias = todas_categorias
         
         # Filtrar categorias para exibição
-        categorias = Categoria.listar_todas(apenas_ativas=apenas_ativas, tipo=tipo)
+        categorias = self._filtrar(todas_categorias, tipo, apenas_ativas)
         
         # Atualizar tabela
         self.tabela_categorias.setRowCount(0)
@@ -258,27 +266,17 @@ class CategoriesView(QWidget):
         self.atualizar_arvore_categorias(tipo, apenas_ativas)
     
     def atualizar_arvore_categorias(self, tipo=None, apenas_ativas=True):
-        """Atualiza a árvore de categorias."""
+        """Atualiza a árvore de categorias a partir das categorias já carregadas."""
         self.arvore_categorias.clear()
         
-        # Obter categorias principais
-        categorias_principais = Categoria.obter_categorias_principais(
-            tipo=tipo, 
-            apenas_ativas=apenas_ativas
-        )
+        # Agrupar as categorias filtradas pela categoria pai (já ordenadas por nome)
+        filhas = {}
+        for categoria in self._filtrar(self.todas_categorias, tipo, apenas_ativas):
+            filhas.setdefault(categoria.categoria_pai_id, []).append(categoria)
         
         # Função recursiva para adicionar itens à árvore
         def adicionar_subcategorias(parent_item, categoria_pai_id):
-            subcategorias = Categoria.obter_subcategorias(
-                categoria_pai_id=categoria_pai_id,
-                apenas_ativas=apenas_ativas
-            )
-            
-            # Filtrar por tipo manualmente
-            if tipo:
-                subcategorias = [s for s in subcategorias if s.tipo == tipo]
-            
-            for subcategoria in subcategorias:
+            for subcategoria in filhas.get(categoria_pai_id, []):
                 item = QTreeWidgetItem(parent_item)
                 item.setText(0, subcategoria.nome)
                 item.setText(1, Categoria.get_tipo_display(subcategoria.tipo))
@@ -288,20 +286,20 @@ class CategoriesView(QWidget):
                 # Adicionar subcategorias recursivamente
                 adicionar_subcategorias(item, subcategoria.id)
         
-        # Adicionar categorias principais
-        for categoria in categorias_principais:
-            item = QTreeWidgetItem(self.arvore_categorias)
-            item.setText(0, categoria.nome)
-            item.setText(1, Categoria.get_tipo_display(categoria.tipo))
-            item.setText(2, str(categoria.id))
-            item.setData(0, Qt.UserRole, categoria.id)
-            
-            # Adicionar subcategorias
-            adicionar_subcategorias(item, categoria.id)
+        # Adicionar categorias principais e suas subcategorias
+        adicionar_subcategorias(self.arvore_categorias, None)
         
         # Expandir todos os itens
         self.arvore_categorias.expandAll()
     
+    @staticmethod
+    def _filtrar(categorias, tipo=None, apenas_ativas=True):
+        """Filtra as categorias por tipo e situação, mantendo a ordem."""
+        return [
+            c for c in categorias
+            if (not tipo or c.tipo == tipo) and (not apenas_ativas or c.ativo)
+        ]
+    
     def nova_categoria(self):
         """Abre o diálogo para criar uma nova categoria."""
         # Filtrar categorias pais pelo tipo selecionado
@@ -325,11 +323,7 @@ class CategoriesView(QWidget):
                 nivel=dados['nivel']
             )
             
-            if categoria.salvar():
-                self.carregar_categorias()
-                QMessageBox.information(self, "Sucesso", "Categoria criada com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao criar categoria.")
+            self._gravar(categoria.salvar, "Categoria criada com sucesso!", "Erro ao criar categoria.")
     
     def editar_categoria(self):
         """Abre o diálogo para editar a categoria selecionada."""
@@ -338,8 +332,8 @@ class CategoriesView(QWidget):
             QMessageBox.warning(self, "Aviso", "Selecione uma categoria para editar.")
             return
         
-        # Buscar a categoria no banco de dados
-        categoria = Categoria.buscar_por_id(categoria_id)
+        # Buscar a categoria entre as já carregadas
+        categoria = self._categoria_carregada(categoria_id)
         if not categoria:
             QMessageBox.critical(self, "Erro", "Categoria não encontrada.")
             return
@@ -363,11 +357,7 @@ class CategoriesView(QWidget):
             categoria.categoria_pai_id = dados['categoria_pai_id']
             categoria.nivel = dados['nivel']
             
-            if categoria.salvar():
-                self.carregar_categorias()
-                QMessageBox.information(self, "Sucesso", "Categoria atualizada com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao atualizar categoria.")
+            self._gravar(categoria.salvar, "Categoria atualizada com sucesso!", "Erro ao atualizar categoria.")
     
     def excluir_categoria(self):
         """Exclui (desativa) a categoria selecionada."""
@@ -376,14 +366,14 @@ class CategoriesView(QWidget):
             QMessageBox.warning(self, "Aviso", "Selecione uma categoria para excluir.")
             return
         
-        # Buscar a categoria no banco de dados
-        categoria = Categoria.buscar_por_id(categoria_id)
+        # Buscar a categoria entre as já carregadas
+        categoria = self._categoria_carregada(categoria_id)
         if not categoria:
             QMessageBox.critical(self, "Erro", "Categoria não encontrada.")
             return
         
-        # Verificar se tem subcategorias
-        subcategorias = Categoria.obter_subcategorias(categoria_id)
+        # Verificar se tem subcategorias ativas
+        subcategorias = [c for c in self.todas_categorias if c.categoria_pai_id == categoria_id and c.ativo]
         if subcategorias:
             aviso = f"ATENÇÃO: Esta categoria possui {len(subcategorias)} subcategoria(s).\n"
             aviso += "Excluir esta categoria não excluirá suas subcategorias, mas elas ficarão órfãs."
@@ -401,11 +391,33 @@ class CategoriesView(QWidget):
             return
         
         # Excluir a categoria
-        if categoria.excluir():
-            self.carregar_categorias()
-            QMessageBox.information(self, "Sucesso", "Categoria excluída com sucesso!")
-        else:
-            QMessageBox.critical(self, "Erro", "Erro ao excluir categoria.")
+        self._gravar(categoria.excluir, "Categoria excluída com sucesso!", "Erro ao excluir categoria.")
+    
+    def _categoria_carregada(self, categoria_id):
+        """Retorna a categoria já carregada com o id informado (ou None)."""
+        return next((c for c in self.todas_categorias if c.id == categoria_id), None)
+    
+    def _gravar(self, funcao, mensagem_sucesso, mensagem_erro):
+        """Executa uma gravação em segundo plano e recarrega as categorias ao terminar.
+        
+        Os botões ficam desabilitados até o fim da gravação, evitando envios repetidos.
+        """
+        def ao_concluir(sucesso):
+            self._habilitar_botoes(True)
+            if sucesso:
+                self.carregar_categorias()
+                QMessageBox.information(self, "Sucesso", mensagem_sucesso)
+            else:
+                QMessageBox.critical(self, "Erro", mensagem_erro)
+        
+        self._habilitar_botoes(False)
+        self.tarefas.executar(None, funcao, ao_concluir=ao_concluir,
+                              ao_falhar=lambda erro: ao_concluir(False))
+    
+    def _habilitar_botoes(self, habilitar):
+        """Habilita ou desabilita os botões de alteração."""
+        for botao in (self.btn_nova, self.btn_editar, self.btn_excluir):
+            botao.setEnabled(habilitar)
     
     def obter_categoria_selecionada_id(self):
         """Obtém o ID da categoria selecionada na interface atual."""
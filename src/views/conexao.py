@@ -0,0 +1,122 @@
+"""
+Acompanhamento da conexão com o servidor e sondagem de reconexão em segundo plano.
+"""
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from src.database.db_helper import get_db_connection
+from src.database.estado_conexao import EstadoConexao
+from src.views.tarefas import GerenciadorTarefas
+
+class MonitorConexao(QObject):
+    """Repassa à interface o estado da conexão (EstadoConexao) e sonda o servidor enquanto ele estiver fora.
+
+    O estado é atualizado pelas próprias chamadas ao banco, em qualquer
+    thread; a mudança chega à interface pelo sinal estado_alterado. Com o
+    servidor instável ou fora, uma sondagem (DatabaseConnection.testar) roda no pool de
+    tarefas quando o disjuntor permite uma nova tentativa. A preparação do
+    esquema, passada a iniciar(), também roda no pool e é repetida na
+    reconexão se tiver falhado; o sinal preparado avisa quando ela termina e
+    preparacao_falhou, quando ela falha com o servidor respondendo.
+    """
+
+    # Situação da conexão (EstadoConexao.CONECTADO, INSTAVEL ou OFFLINE)
+    estado_alterado = pyqtSignal(str)
+
+    # Emitido quando o servidor volta a responder depois de ficar fora
+    reconectado = pyqtSignal()
+
+    # Emitido uma vez, quando a preparação do esquema termina com sucesso (ou em iniciar(), sem preparação)
+    preparado = pyqtSignal()
+
+    # Emitido uma vez, quando a preparação falha sem que a conexão tenha caído (ex.: erro numa migração)
+    preparacao_falhou = pyqtSignal()
+
+    _instancia = None
+
+    def __init__(self):
+        super().__init__()
+        self.db = get_db_connection()
+        self.situacao = self.db.estado.situacao
+        self._preparar = None
+        self._preparado = False
+        self._falha_avisada = False
+        self._sondando = False
+        self._repetir = False
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.sondar)
+
+        # Chamado na thread que detectou a mudança; o sinal leva a situação à thread da interface
+        self.db.estado.ao_mudar(self.estado_alterado.emit)
+        self.estado_alterado.connect(self._ao_mudar)
+
+    @classmethod
+    def instancia(cls):
+        """Retorna o monitor da aplicação (criado na thread da interface)."""
+        if cls._instancia is None:
+            cls._instancia = cls()
+        return cls._instancia
+
+    def iniciar(self, preparar=None):
+        """Abre a primeira conexão em segundo plano executando preparar() (ex.: migrações do esquema)."""
+        self._preparar = preparar
+        if preparar is None:
+            self._preparado = True
+            self.preparado.emit()
+        self.sondar()
+
+    def sondar(self):
+        """Testa o servidor (ou prepara o esquema, se ainda não preparado) no pool de tarefas."""
+        if self._sondando:
+            return
+        self._timer.stop()
+        self._sondando = True
+        if self._preparar and not self._preparado:
+            GerenciadorTarefas.instancia().submeter(self._preparar,
+                                                    ao_concluir=self._ao_preparar,
+                                                    ao_falhar=lambda erro: self._ao_preparar(False))
+        else:
+            GerenciadorTarefas.instancia().submeter(self.db.testar,
+                                                    ao_concluir=self._ao_sondar,
+                                                    ao_falhar=lambda erro: self._ao_sondar(False))
+
+    def _ao_preparar(self, sucesso):
+        """Registra a preparação do esquema; se falhou, ela é repetida na próxima reconexão."""
+        self._preparado = bool(sucesso)
+        if self._preparado:
+            self.preparado.emit()
+        elif self.db.estado.situacao == EstadoConexao.CONECTADO and not self._falha_avisada:
+            # O servidor responde: esperar a reconexão deixaria a interface parada
+            self._falha_avisada = True
+            self.preparacao_falhou.emit()
+        self._ao_sondar(sucesso)
+
+    def _ao_sondar(self, sucesso):
+        """Agenda a próxima sondagem enquanto o servidor não responde."""
+        self._sondando = False
+        if self._repetir:
+            self._repetir = False
+            self.sondar()
+        elif not sucesso and self.db.estado.situacao != EstadoConexao.CONECTADO:
+            self._agendar()
+
+    def _agendar(self):
+        """Agenda uma sondagem para quando o disjuntor permitir nova tentativa."""
+        if not self._sondando:
+            segundos = self.db.estado.segundos_para_tentar() or EstadoConexao.ESPERA_INICIAL
+            self._timer.start(int(segundos * 1000))
+
+    def _ao_mudar(self, situacao):
+        """Atualiza a situação; com falhas, começa a sondar, e ao voltar, avisa a reconexão."""
+        anterior, self.situacao = self.situacao, situacao
+        if situacao != EstadoConexao.CONECTADO:
+            self._agendar()
+        elif situacao == EstadoConexao.CONECTADO:
+            self._timer.stop()
+            if anterior in (EstadoConexao.OFFLINE, EstadoConexao.INSTAVEL):
+                if self._preparar and not self._preparado:
+                    if self._sondando:
+                        self._repetir = True
+                    else:
+                        self.sondar()
+                self.reconectado.emit()
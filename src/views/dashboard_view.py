@@ -4,17 +4,25 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QFont
-from datetime import datetime, timedelta
+from datetime import datetime
 from src.models.conta import Conta
 from src.models.transacao import Transacao
+from src.views.tarefas import ExecutorTarefas
 
 class DashboardView(QWidget):
     """Widget para exibir o dashboard com resumo financeiro."""
     
-    def __init__(self, parent=None):
+    # Quantidade de itens exibidos nos cards de listas
+    LIMITE_RECENTES = 5
+    LIMITE_CATEGORIAS = 5
+    
+    def __init__(self, parent=None, carregar=True):
         super().__init__(parent)
+        self.tarefas = ExecutorTarefas(self)
         self.setup_ui()
-        self.load_data()
+        # Com carregar=False, quem cria o dashboard chama load_data() quando o banco estiver pronto
+        if carregar:
+            self.load_data()
     
     def setup_ui(self):
         """Configura a interface do dashboard."""
@@ -50,6 +58,10 @@ class DashboardView(QWidget):
         self.recent_transactions_card = self._create_card("Transações Recentes", "Carregando...")
         grid_layout.addWidget(self.recent_transactions_card, 1, 1, 1, 2)
         
+        # Card de principais categorias de despesa do mês
+        self.top_categories_card = self._create_card("Maiores Despesas do Mês", "Carregando...")
+        grid_layout.addWidget(self.top_categories_card, 2, 0, 1, 3)
+        
         main_layout.addLayout(grid_layout)
         
         # Botões de ação rápida
@@ -107,37 +119,74 @@ class DashboardView(QWidget):
         return card
     
     def load_data(self):
-        """Carrega os dados para o dashboard."""
+        """Dispara em paralelo as consultas do dashboard; cada card é preenchido ao chegar seu resultado."""
+        hoje = datetime.now().date()
+        primeiro_dia_mes = hoje.replace(day=1)
+        
+        for card in (self.balance_card, self.income_card, self.expense_card, self.month_balance_card,
+                     self.recent_transactions_card, self.top_categories_card):
+            card.content_label.setText("Carregando...")
+        
+        # (função, argumentos) de cada consulta; chamadas iguais de outras abas são agrupadas
+        tarefas = {
+            'saldo': (Conta.obter_saldo_total, ()),
+            'resumo': (Transacao.obter_resumo_por_periodo, (primeiro_dia_mes, hoje)),
+            'categorias': (Transacao.obter_resumo_por_categoria, (primeiro_dia_mes, hoje, 'D', self.LIMITE_CATEGORIAS)),
+            'recentes': (Transacao.listar_linhas, ({
+                'limite': self.LIMITE_RECENTES,
+                'ordenacao': 'data_transacao DESC'
+            },))
+        }
+        
+        # Cada consulta usa seu próprio canal: uma nova carga cancela a anterior ainda em andamento
+        for nome, (funcao, args) in tarefas.items():
+            self.tarefas.executar(
+                nome, funcao, *args,
+                ao_concluir=lambda resultado, nome=nome: self._on_tarefa_concluida(nome, resultado),
+                ao_falhar=lambda erro, nome=nome: self._on_tarefa_concluida(nome, None)
+            )
+    
+    def _on_tarefa_concluida(self, nome, resultado):
+        """Atualiza o card correspondente ao resultado recebido."""
         try:
-            # Obter saldo total
-            saldo_total = Conta.obter_saldo_total()
-            self.balance_card.content_label.setText(f"R$ {float(saldo_total):.2f}")
-            
-            # Obter datas do mês atual
-            hoje = datetime.now().date()
-            primeiro_dia_mes = hoje.replace(day=1)
-            if hoje.month == 12:
-                ultimo_dia_mes = hoje.replace(year=hoje.year + 1, month=1, day=1) - timedelta(days=1)
-            else:
-                ultimo_dia_mes = hoje.replace(month=hoje.month + 1, day=1) - timedelta(days=1)
-            
-            # Placeholder para resumo do mês (implementar método na classe Transacao)
-            resumo = {
-                'total_receitas': 0.0,
-                'total_despesas': 0.0,
-                'saldo_periodo': 0.0
-            }
-            
-            # Atualizar cards
-            self.income_card.content_label.setText(f"R$ {resumo['total_receitas']:.2f}")
-            self.expense_card.content_label.setText(f"R$ {resumo['total_despesas']:.2f}")
-            self.month_balance_card.content_label.setText(f"R$ {resumo['saldo_periodo']:.2f}")
-            
-            # Placeholder para transações recentes
-            self.recent_transactions_card.content_label.setText("Nenhuma transação recente.")
-                
+            if resultado is None:
+                for card in self._cards_da_tarefa(nome):
+                    card.content_label.setText("Erro ao carregar dados.")
+            elif nome == 'saldo':
+                self.balance_card.content_label.setText(self._formatar_valor(resultado))
+            elif nome == 'resumo':
+                self.income_card.content_label.setText(self._formatar_valor(resultado['total_receitas']))
+                self.expense_card.content_label.setText(self._formatar_valor(resultado['total_despesas']))
+                self.month_balance_card.content_label.setText(self._formatar_valor(resultado['saldo_periodo']))
+            elif nome == 'categorias':
+                linhas = [f"{item['nome_categoria']}: {self._formatar_valor(item['total'])}" for item in resultado]
+                self.top_categories_card.content_label.setText(
+                    "\n".join(linhas) or "Nenhuma despesa no mês.")
+            elif nome == 'recentes':
+                linhas = []
+                for t in resultado:
+                    sinal = "+" if t.tipo == 'R' else "-"
+                    linhas.append(f"{t.data_transacao.strftime('%d/%m/%Y')} - {t.descricao}: "
+                                  f"{sinal}{self._formatar_valor(t.valor)}")
+                self.recent_transactions_card.content_label.setText(
+                    "\n".join(linhas) or "Nenhuma transação recente.")
         except Exception as e:
-            print(f"Erro ao carregar dados do dashboard: {e}")
+            print(f"Erro ao atualizar dados do dashboard: {e}")
+    
+    def _cards_da_tarefa(self, nome):
+        """Retorna os cards atualizados por uma tarefa."""
+        return {
+            'saldo': (self.balance_card,),
+            'resumo': (self.income_card, self.expense_card, self.month_balance_card),
+            'categorias': (self.top_categories_card,),
+            'recentes': (self.recent_transactions_card,)
+        }[nome]
+    
+    @staticmethod
+    def _formatar_valor(valor):
+        """Formata um valor monetário no padrão brasileiro (R$ 1.234,56)."""
+        texto = f"{float(valor):,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
+        return f"R$ {texto}"
     
     def add_income(self):
         """Abre o formulário para adicionar receita."""
@@ -0,0 +1,113 @@
+"""
+Diálogo com as gravações do diário local que não puderam ser enviadas.
+"""
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget,
+                            QTableWidgetItem, QHeaderView, QDialogButtonBox, QMessageBox)
+from src.database.db_helper import get_diario_local
+from src.database.diario_local import DiarioLocal
+from src.views.sincronizacao import SincronizadorDiario
+
+class DiarioDialog(QDialog):
+    """Lista as operações em conflito ou com erro e permite descartá-las ou enviá-las mesmo assim."""
+
+    ENTIDADES = {'transacao': "Transação", 'gasto_recorrente': "Gasto Recorrente", 'pagamento': "Pagamento"}
+    OPERACOES = {'inserir': "Inclusão", 'atualizar': "Alteração", 'atualizar_lote': "Alteração em Lote",
+                 'excluir': "Exclusão", 'pagar': "Pagamento"}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.operacoes = []
+        self.setWindowTitle("Gravações Pendentes")
+        self.resize(850, 400)
+        self.setup_ui()
+        self.carregar_operacoes()
+
+    def setup_ui(self):
+        """Configura a interface do diálogo."""
+        layout = QVBoxLayout(self)
+
+        self.resumo_label = QLabel()
+        layout.addWidget(self.resumo_label)
+
+        self.tabela = QTableWidget(0, 6)
+        self.tabela.setHorizontalHeaderLabels(["Registro", "Operação", "Descrição", "Gravada em",
+                                               "Situação", "Motivo"])
+        self.tabela.horizontalHeader().setSectionResizeMode(5, QHeaderView.Stretch)
+        self.tabela.setSelectionBehavior(QTableWidget.SelectRows)
+        self.tabela.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.tabela)
+
+        btn_layout = QHBoxLayout()
+        self.btn_reenviar = QPushButton("Enviar Mesmo Assim")
+        self.btn_reenviar.setToolTip("Sobrescreve no servidor as alterações feitas por outra pessoa")
+        self.btn_reenviar.clicked.connect(self.reenviar)
+        btn_layout.addWidget(self.btn_reenviar)
+
+        self.btn_descartar = QPushButton("Descartar")
+        self.btn_descartar.clicked.connect(self.descartar)
+        btn_layout.addWidget(self.btn_descartar)
+
+        btn_layout.addStretch()
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        btn_layout.addWidget(buttons)
+        layout.addLayout(btn_layout)
+
+    def carregar_operacoes(self):
+        """Lê do diário local as operações que aguardam decisão."""
+        diario = get_diario_local()
+        self.operacoes = diario.problemas()
+        pendentes, _ = diario.contar()
+        self.resumo_label.setText(f"{pendentes} gravação(ões) aguardando envio ao servidor. "
+                                  f"{len(self.operacoes)} com conflito ou erro:")
+
+        self.tabela.setRowCount(len(self.operacoes))
+        for row, operacao in enumerate(self.operacoes):
+            dados = operacao['dados']
+            valores = [
+                self.ENTIDADES.get(operacao['entidade'], operacao['entidade']),
+                self.OPERACOES.get(operacao['operacao'], operacao['operacao']),
+                dados.get('descricao') or dados.get('nome') or (
+                    f"{dados['mes']:02d}/{dados['ano']}" if 'mes' in dados else
+                    f"{len(dados['ids'])} transações" if 'ids' in dados else f"Id {operacao['registro_id']}"),
+                operacao['data_criacao'].replace('T', ' '),
+                "Conflito" if operacao['situacao'] == DiarioLocal.CONFLITO else "Erro",
+                operacao['erro'] or ""
+            ]
+            for coluna, valor in enumerate(valores):
+                self.tabela.setItem(row, coluna, QTableWidgetItem(valor))
+
+    def _selecionadas(self):
+        """Retorna as operações das linhas selecionadas."""
+        return [self.operacoes[indice.row()] for indice in self.tabela.selectionModel().selectedRows()]
+
+    def reenviar(self):
+        """Volta as operações selecionadas à fila, sem verificar conflito."""
+        selecionadas = self._selecionadas()
+        if not selecionadas:
+            QMessageBox.warning(self, "Aviso", "Selecione as gravações que deseja enviar.")
+            return
+        diario = get_diario_local()
+        for operacao in selecionadas:
+            diario.reenviar(operacao['id'])
+        SincronizadorDiario.instancia().agendar()
+        self.carregar_operacoes()
+
+    def descartar(self):
+        """Remove do diário as operações selecionadas."""
+        selecionadas = self._selecionadas()
+        if not selecionadas:
+            QMessageBox.warning(self, "Aviso", "Selecione as gravações que deseja descartar.")
+            return
+        resposta = QMessageBox.question(
+            self, "Confirmar Descarte",
+            f"Descartar {len(selecionadas)} gravação(ões)? Elas não serão enviadas ao servidor.",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if resposta != QMessageBox.Yes:
+            return
+        diario = get_diario_local()
+        for operacao in selecionadas:
+            diario.descartar(operacao['id'])
+        self.carregar_operacoes()
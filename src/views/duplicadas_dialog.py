@@ -0,0 +1,148 @@
+"""
+Diálogo para procurar e mesclar transações duplicadas.
+"""
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QDateEdit,
+                            QTreeWidget, QTreeWidgetItem, QHeaderView, QDialogButtonBox, QMessageBox)
+from PyQt5.QtCore import Qt, QDate
+from src.services.duplicidade_service import DuplicidadeService
+from src.views.tarefas import ExecutorTarefas
+
+class DuplicadasDialog(QDialog):
+    """Lista os grupos de transações duplicadas e mescla as marcadas para remoção.
+
+    Em cada grupo, a transação mantida (desmarcada) é a que tem categoria ou,
+    entre elas, a de menor id; as demais vêm marcadas para remoção.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.houve_alteracoes = False
+        self.tarefas = ExecutorTarefas(self)
+        self.setWindowTitle("Transações Duplicadas")
+        self.resize(900, 550)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Configura a interface do diálogo."""
+        layout = QVBoxLayout(self)
+
+        filtro_layout = QHBoxLayout()
+        filtro_layout.addWidget(QLabel("De:"))
+        self.data_inicio_edit = QDateEdit(QDate.currentDate().addYears(-1))
+        self.data_inicio_edit.setCalendarPopup(True)
+        filtro_layout.addWidget(self.data_inicio_edit)
+
+        filtro_layout.addWidget(QLabel("Até:"))
+        self.data_fim_edit = QDateEdit(QDate.currentDate())
+        self.data_fim_edit.setCalendarPopup(True)
+        filtro_layout.addWidget(self.data_fim_edit)
+
+        self.btn_procurar = QPushButton("Procurar")
+        self.btn_procurar.clicked.connect(self.procurar)
+        filtro_layout.addWidget(self.btn_procurar)
+        filtro_layout.addStretch()
+        layout.addLayout(filtro_layout)
+
+        self.arvore = QTreeWidget()
+        self.arvore.setHeaderLabels(["Remover", "Data", "Descrição", "Valor", "Conta", "Categoria", "ID"])
+        self.arvore.header().setSectionResizeMode(2, QHeaderView.Stretch)
+        layout.addWidget(self.arvore)
+
+        self.status_label = QLabel("Escolha o período e clique em Procurar.")
+        layout.addWidget(self.status_label)
+
+        btn_layout = QHBoxLayout()
+        self.btn_mesclar = QPushButton("Mesclar Selecionadas")
+        self.btn_mesclar.setEnabled(False)
+        self.btn_mesclar.clicked.connect(self.mesclar)
+        btn_layout.addWidget(self.btn_mesclar)
+
+        btn_layout.addStretch()
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        btn_layout.addWidget(buttons)
+        layout.addLayout(btn_layout)
+
+    def procurar(self):
+        """Procura em segundo plano as duplicatas do período."""
+        self._habilitar_botoes(False)
+        self.status_label.setText("Procurando transações duplicadas...")
+        self.tarefas.executar('duplicadas', DuplicidadeService.detectar,
+                              self.data_inicio_edit.date().toPyDate(), self.data_fim_edit.date().toPyDate(),
+                              ao_concluir=self._exibir_grupos,
+                              ao_falhar=lambda erro: self._exibir_grupos([]))
+
+    def _exibir_grupos(self, grupos):
+        """Exibe um item por grupo, com as transações como filhos marcáveis."""
+        self._habilitar_botoes(True)
+        self.arvore.clear()
+
+        for grupo in grupos:
+            manter = min(grupo, key=lambda linha: (linha.categoria_id is None, linha.id))
+            raiz = QTreeWidgetItem(self.arvore, ["", "", f"{grupo[0].descricao} ({len(grupo)} transações)"])
+            raiz.setFlags(Qt.ItemIsEnabled)
+            for linha in grupo:
+                item = QTreeWidgetItem(raiz, [
+                    "",
+                    linha.data_transacao.strftime("%d/%m/%Y"),
+                    linha.descricao,
+                    f"R$ {float(linha.valor):.2f}",
+                    linha.conta_nome or "",
+                    linha.categoria_nome or "",
+                    str(linha.id)
+                ])
+                item.setData(0, Qt.UserRole, linha.id)
+                item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsUserCheckable)
+                item.setCheckState(0, Qt.Unchecked if linha is manter else Qt.Checked)
+                item.setTextAlignment(3, Qt.AlignRight | Qt.AlignVCenter)
+
+        self.arvore.expandAll()
+        self.status_label.setText(f"{len(grupos)} grupo(s) de transações duplicadas encontrado(s).")
+        self.btn_mesclar.setEnabled(bool(grupos))
+
+    def _grupos_marcados(self):
+        """Retorna (id_mantido, [ids_removidos]) dos grupos com alguma transação marcada."""
+        grupos = []
+        for i in range(self.arvore.topLevelItemCount()):
+            raiz = self.arvore.topLevelItem(i)
+            filhos = [raiz.child(j) for j in range(raiz.childCount())]
+            mantidos = [f.data(0, Qt.UserRole) for f in filhos if f.checkState(0) == Qt.Unchecked]
+            removidos = [f.data(0, Qt.UserRole) for f in filhos if f.checkState(0) == Qt.Checked]
+            if removidos and mantidos:
+                grupos.append((mantidos[0], removidos))
+        return grupos
+
+    def mesclar(self):
+        """Mescla os grupos, removendo as transações marcadas."""
+        grupos = self._grupos_marcados()
+        if not grupos:
+            QMessageBox.warning(self, "Aviso",
+                                "Marque as transações a remover, deixando ao menos uma desmarcada em cada grupo.")
+            return
+
+        quantidade = sum(len(removidos) for _, removidos in grupos)
+        resposta = QMessageBox.question(self, "Confirmar Mesclagem",
+                                        f"Remover {quantidade} transação(ões) duplicada(s)?",
+                                        QMessageBox.Yes | QMessageBox.No)
+        if resposta != QMessageBox.Yes:
+            return
+
+        def ao_concluir(removidas):
+            self._habilitar_botoes(True)
+            if removidas is None:
+                QMessageBox.critical(self, "Erro", "Erro ao mesclar as transações duplicadas.")
+                return
+            self.houve_alteracoes = True
+            QMessageBox.information(self, "Transações Duplicadas",
+                                    f"{removidas} transação(ões) duplicada(s) removida(s).")
+            self.procurar()
+
+        self._habilitar_botoes(False)
+        self.tarefas.executar(None, DuplicidadeService.mesclar, grupos, ao_concluir=ao_concluir,
+                              ao_falhar=lambda erro: ao_concluir(None))
+
+    def _habilitar_botoes(self, habilitar):
+        """Habilita ou desabilita os botões."""
+        self.btn_procurar.setEnabled(habilitar)
+        self.btn_mesclar.setEnabled(habilitar and self.arvore.topLevelItemCount() > 0)
@@ -0,0 +1,183 @@
+"""
+Interface gráfica para o extrato de uma conta com saldo corrente.
+"""
+
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                            QLabel, QTableWidget, QTableWidgetItem, QComboBox,
+                            QDateEdit, QHeaderView)
+from PyQt5.QtCore import Qt, QDate
+from PyQt5.QtGui import QColor
+from src.models.conta import Conta
+from src.models.extrato_conta import ExtratoConta
+from src.views.tarefas import ExecutorTarefas
+
+class ExtratoView(QWidget):
+    """Widget para consulta do extrato de uma conta."""
+
+    # Lançamentos buscados por página; as seguintes vêm ao rolar até o fim
+    TAMANHO_PAGINA = 200
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Extrato da Conta")
+        self._proxima = None
+        self._filtros = None
+        self.tarefas = ExecutorTarefas(self)
+        self.setup_ui()
+        self.carregar_contas()
+
+    def setup_ui(self):
+        """Configura a interface do widget."""
+        layout = QVBoxLayout(self)
+
+        # Área de filtros
+        filtros_layout = QHBoxLayout()
+
+        self.conta_combo = QComboBox()
+        filtros_layout.addWidget(QLabel("Conta:"))
+        filtros_layout.addWidget(self.conta_combo)
+
+        self.data_inicio_edit = QDateEdit()
+        self.data_inicio_edit.setCalendarPopup(True)
+        self.data_inicio_edit.setDate(QDate.currentDate().addMonths(-1))
+
+        self.data_fim_edit = QDateEdit()
+        self.data_fim_edit.setCalendarPopup(True)
+        self.data_fim_edit.setDate(QDate.currentDate())
+
+        filtros_layout.addWidget(QLabel("De:"))
+        filtros_layout.addWidget(self.data_inicio_edit)
+        filtros_layout.addWidget(QLabel("Até:"))
+        filtros_layout.addWidget(self.data_fim_edit)
+
+        self.btn_consultar = QPushButton("Consultar")
+        self.btn_consultar.clicked.connect(self.carregar_extrato)
+        filtros_layout.addWidget(self.btn_consultar)
+
+        filtros_layout.addStretch()
+        layout.addLayout(filtros_layout)
+
+        # Saldo de abertura
+        self.saldo_abertura_label = QLabel("Saldo anterior: R$ 0,00")
+        layout.addWidget(self.saldo_abertura_label)
+
+        # Tabela de lançamentos
+        self.tabela_extrato = QTableWidget(0, 6)
+        self.tabela_extrato.setHorizontalHeaderLabels([
+            "Data", "Descrição", "Categoria", "Meio de Pagamento", "Valor", "Saldo"
+        ])
+        self.tabela_extrato.setColumnWidth(0, 100)  # Data
+        self.tabela_extrato.setColumnWidth(2, 120)  # Categoria
+        self.tabela_extrato.setColumnWidth(3, 120)  # Meio de Pagamento
+        self.tabela_extrato.setColumnWidth(4, 100)  # Valor
+        self.tabela_extrato.setColumnWidth(5, 110)  # Saldo
+        self.tabela_extrato.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.tabela_extrato.setSelectionBehavior(QTableWidget.SelectRows)
+        self.tabela_extrato.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tabela_extrato.verticalScrollBar().valueChanged.connect(self._ao_rolar)
+        layout.addWidget(self.tabela_extrato)
+
+        # Rodapé com saldo final e carregamento manual da próxima página
+        rodape_layout = QHBoxLayout()
+        self.saldo_final_label = QLabel("Saldo final: R$ 0,00")
+        rodape_layout.addWidget(self.saldo_final_label)
+        rodape_layout.addStretch()
+
+        self.btn_mais = QPushButton("Carregar mais")
+        self.btn_mais.setEnabled(False)
+        self.btn_mais.clicked.connect(self.carregar_proxima_pagina)
+        rodape_layout.addWidget(self.btn_mais)
+
+        layout.addLayout(rodape_layout)
+
+    def carregar_contas(self):
+        """Carrega as contas ativas no combo em segundo plano."""
+        self.tarefas.executar('contas', Conta.listar_todas, ao_concluir=self._exibir_contas)
+
+    def _exibir_contas(self, contas):
+        """Preenche o combo de contas, mantendo a conta selecionada."""
+        conta_atual = self.conta_combo.currentData()
+        self.conta_combo.clear()
+        for conta in contas:
+            self.conta_combo.addItem(conta.nome, conta.id)
+
+        if conta_atual is not None:
+            index = self.conta_combo.findData(conta_atual)
+            if index >= 0:
+                self.conta_combo.setCurrentIndex(index)
+
+    def carregar_extrato(self):
+        """Carrega a primeira página do extrato com os filtros atuais."""
+        conta_id = self.conta_combo.currentData()
+        self.tabela_extrato.setRowCount(0)
+        self._proxima = None
+        self.btn_mais.setEnabled(False)
+        # Páginas da consulta anterior que ainda estejam em andamento são descartadas
+        self.tarefas.cancelar('pagina')
+
+        if conta_id is None:
+            return
+
+        self._filtros = {
+            'conta_id': conta_id,
+            'data_inicio': self.data_inicio_edit.date().toPyDate(),
+            'data_fim': self.data_fim_edit.date().toPyDate()
+        }
+
+        self.tarefas.executar('extrato', ExtratoConta.obter, tamanho_pagina=self.TAMANHO_PAGINA,
+                              ao_concluir=self._exibir_primeira_pagina, **self._filtros)
+
+    def _exibir_primeira_pagina(self, extrato):
+        """Exibe o saldo de abertura e a primeira página do extrato."""
+        saldo_abertura = extrato.saldo_abertura or 0
+        self.saldo_abertura_label.setText(f"Saldo anterior: {self._formatar_valor(saldo_abertura)}")
+        self._adicionar_pagina(extrato)
+
+    def carregar_proxima_pagina(self):
+        """Acrescenta a próxima página do extrato à tabela."""
+        if not self._proxima or not self._filtros or self.tarefas.em_andamento('pagina'):
+            return
+
+        self.tarefas.executar('pagina', ExtratoConta.obter, tamanho_pagina=self.TAMANHO_PAGINA,
+                              continuacao=self._proxima, ao_concluir=self._adicionar_pagina, **self._filtros)
+
+    def _adicionar_pagina(self, extrato):
+        """Acrescenta os lançamentos de uma página ao fim da tabela."""
+        self._proxima = extrato.proxima
+        self.btn_mais.setEnabled(extrato.proxima is not None)
+
+        self.tabela_extrato.setUpdatesEnabled(False)
+        try:
+            inicio = self.tabela_extrato.rowCount()
+            self.tabela_extrato.setRowCount(inicio + len(extrato.linhas))
+
+            for i, linha in enumerate(extrato.linhas, start=inicio):
+                self.tabela_extrato.setItem(i, 0, QTableWidgetItem(linha.data_transacao.strftime("%d/%m/%Y")))
+                self.tabela_extrato.setItem(i, 1, QTableWidgetItem(linha.descricao))
+                self.tabela_extrato.setItem(i, 2, QTableWidgetItem(linha.categoria_nome or ""))
+                self.tabela_extrato.setItem(i, 3, QTableWidgetItem(linha.meio_pagamento_nome or ""))
+
+                valor_item = QTableWidgetItem(self._formatar_valor(linha.valor_com_sinal))
+                valor_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                valor_item.setForeground(QColor("green") if linha.valor_com_sinal >= 0 else QColor("red"))
+                self.tabela_extrato.setItem(i, 4, valor_item)
+
+                saldo_item = QTableWidgetItem(self._formatar_valor(linha.saldo))
+                saldo_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.tabela_extrato.setItem(i, 5, saldo_item)
+        finally:
+            self.tabela_extrato.setUpdatesEnabled(True)
+
+        if extrato.linhas or extrato.saldo_abertura is not None:
+            self.saldo_final_label.setText(f"Saldo final: {self._formatar_valor(extrato.saldo_final or 0)}")
+
+    def _ao_rolar(self, valor):
+        """Busca a próxima página quando a rolagem chega ao fim da tabela."""
+        if self._proxima and valor == self.tabela_extrato.verticalScrollBar().maximum():
+            self.carregar_proxima_pagina()
+
+    @staticmethod
+    def _formatar_valor(valor):
+        """Formata um valor como moeda brasileira."""
+        texto = f"{float(valor):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        return f"R$ {texto}"
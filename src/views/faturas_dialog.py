@@ -0,0 +1,123 @@
+"""
+Diálogo para consulta das faturas de um cartão de crédito.
+"""
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget,
+                            QTableWidgetItem, QComboBox, QDialogButtonBox, QHeaderView)
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QColor
+from src.models.fatura_cartao import FaturaCartao
+from src.views.tarefas import ExecutorTarefas
+
+class FaturasDialog(QDialog):
+    """Diálogo que lista as faturas de um cartão e as compras da fatura selecionada."""
+
+    def __init__(self, meio_pagamento, parent=None):
+        super().__init__(parent)
+        self.meio_pagamento = meio_pagamento
+        self.faturas = []
+        self.tarefas = ExecutorTarefas(self)
+        self.setWindowTitle(f"Faturas - {meio_pagamento.nome}")
+        self.resize(800, 600)
+        self.setup_ui()
+        self.carregar_faturas()
+
+    def setup_ui(self):
+        """Configura a interface do diálogo."""
+        layout = QVBoxLayout(self)
+
+        # Filtro por situação
+        filtros_layout = QHBoxLayout()
+        self.status_combo = QComboBox()
+        self.status_combo.addItem("Todas", None)
+        self.status_combo.addItem("Aberta", FaturaCartao.ABERTA)
+        self.status_combo.addItem("Fechadas", FaturaCartao.FECHADA)
+        self.status_combo.addItem("Futuras", FaturaCartao.FUTURA)
+        self.status_combo.currentIndexChanged.connect(self.carregar_faturas)
+        filtros_layout.addWidget(QLabel("Situação:"))
+        filtros_layout.addWidget(self.status_combo)
+        filtros_layout.addStretch()
+        layout.addLayout(filtros_layout)
+
+        # Tabela de faturas
+        self.tabela_faturas = QTableWidget(0, 6)
+        self.tabela_faturas.setHorizontalHeaderLabels([
+            "Referência", "Fechamento", "Vencimento", "Situação", "Compras", "Total"
+        ])
+        self.tabela_faturas.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.tabela_faturas.setSelectionBehavior(QTableWidget.SelectRows)
+        self.tabela_faturas.setSelectionMode(QTableWidget.SingleSelection)
+        self.tabela_faturas.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.tabela_faturas.itemSelectionChanged.connect(self.carregar_compras)
+        layout.addWidget(self.tabela_faturas)
+
+        # Compras da fatura selecionada
+        layout.addWidget(QLabel("Compras da fatura:"))
+        self.tabela_compras = QTableWidget(0, 4)
+        self.tabela_compras.setHorizontalHeaderLabels(["Data", "Descrição", "Categoria", "Valor"])
+        self.tabela_compras.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        self.tabela_compras.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.tabela_compras)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def carregar_faturas(self):
+        """Carrega em segundo plano as faturas do cartão com a situação selecionada."""
+        self.tarefas.executar('faturas', FaturaCartao.listar, self.meio_pagamento.id,
+                              self.status_combo.currentData(), ao_concluir=self._exibir_faturas)
+
+    def _exibir_faturas(self, faturas):
+        """Exibe as faturas na tabela."""
+        self.faturas = faturas
+        self.tarefas.cancelar('compras')
+
+        self.tabela_faturas.setRowCount(len(self.faturas))
+        self.tabela_compras.setRowCount(0)
+
+        for row, fatura in enumerate(self.faturas):
+            self.tabela_faturas.setItem(row, 0, QTableWidgetItem(f"{fatura.mes:02d}/{fatura.ano}"))
+            self.tabela_faturas.setItem(row, 1, QTableWidgetItem(fatura.data_fechamento.strftime("%d/%m/%Y")))
+            self.tabela_faturas.setItem(row, 2, QTableWidgetItem(fatura.data_vencimento.strftime("%d/%m/%Y")))
+
+            status_item = QTableWidgetItem(fatura.status)
+            if fatura.status == FaturaCartao.ABERTA:
+                status_item.setForeground(QColor("blue"))
+            self.tabela_faturas.setItem(row, 3, status_item)
+
+            self.tabela_faturas.setItem(row, 4, QTableWidgetItem(str(fatura.quantidade)))
+
+            total_item = QTableWidgetItem(self._formatar_valor(fatura.total))
+            total_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            self.tabela_faturas.setItem(row, 5, total_item)
+
+    def carregar_compras(self):
+        """Carrega em segundo plano as compras da fatura selecionada."""
+        selecionadas = self.tabela_faturas.selectionModel().selectedRows()
+        if not selecionadas:
+            self.tarefas.cancelar('compras')
+            self.tabela_compras.setRowCount(0)
+            return
+
+        fatura = self.faturas[selecionadas[0].row()]
+        self.tarefas.executar('compras', fatura.listar_transacoes, ao_concluir=self._exibir_compras)
+
+    def _exibir_compras(self, compras):
+        """Exibe as compras da fatura na tabela."""
+        self.tabela_compras.setRowCount(len(compras))
+        for row, compra in enumerate(compras):
+            self.tabela_compras.setItem(row, 0, QTableWidgetItem(compra.data_transacao.strftime("%d/%m/%Y")))
+            self.tabela_compras.setItem(row, 1, QTableWidgetItem(compra.descricao))
+            self.tabela_compras.setItem(row, 2, QTableWidgetItem(compra.categoria_nome or ""))
+
+            valor = compra.valor if compra.tipo == 'D' else -compra.valor
+            valor_item = QTableWidgetItem(self._formatar_valor(valor))
+            valor_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+            self.tabela_compras.setItem(row, 3, valor_item)
+
+    @staticmethod
+    def _formatar_valor(valor):
+        """Formata um valor como moeda brasileira."""
+        texto = f"{float(valor):,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        return f"R$ {texto}"
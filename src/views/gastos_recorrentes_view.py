@@ -7,10 +7,14 @@ from PyQt5.QtCore import Qt, pyqtSignal, QDate, QLocale
 from PyQt5.QtGui import QColor, QDoubleValidator
 from datetime import date, datetime
 from decimal import Decimal
+from src.models.alteracoes import Alteracoes
 from src.models.gasto_recorrente import GastoRecorrente
 from src.models.categoria import Categoria
 from src.models.conta import Conta
 from src.models.meio_pagamento import MeioPagamento
+from src.services.sincronizacao_service import SincronizacaoService
+from src.views.sincronizacao import SincronizadorDiario
+from src.views.tarefas import ExecutorTarefas
 
 class GastoRecorrenteDialog(QDialog):
     """Diálogo para criar ou editar um gasto recorrente."""
@@ -340,6 +344,19 @@ class GastosRecorrentesView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Gestão de Gastos Recorrentes")
+        self.gastos_carregados = {}
+        self.tarefas = ExecutorTarefas(self)
+        
+        # Gastos ativos ({id: gasto}) e registros de pagamento ({id: registro}) de todos os meses,
+        # com a versão do banco em que cada cache foi lido; trocar de mês não consulta o servidor
+        # e as recargas buscam só as alterações
+        self._gastos = {}
+        self._pagamentos = {}
+        self._versoes = (None, None)
+        
+        # Gravações vão para o diário local; a tabela é recarregada quando chegam ao servidor
+        SincronizadorDiario.instancia().sincronizado.connect(self._ao_sincronizar)
+        
         self.setup_ui()
         self.carregar_gastos()
         
@@ -406,24 +423,87 @@ class GastosRecorrentesView(QWidget):
         self.setLayout(layout)
     
     def carregar_gastos(self):
-        """Carrega os gastos recorrentes do banco de dados e exibe na tabela."""
+        """Busca em segundo plano as alterações nos gastos e pagamentos e exibe os gastos do mês."""
         mes = self.mes_combo.currentIndex() + 1
         ano = self.ano_spin.value()
-        apenas_pendentes = self.apenas_pendentes_check.isChecked()
         
-        self.tabela_gastos.setRowCount(0)
+        self.tarefas.executar('gastos', self._buscar_alteracoes, *self._versoes,
+                              ao_concluir=lambda resultado: self._aplicar_alteracoes(resultado, ano, mes))
+    
+    @staticmethod
+    def _buscar_alteracoes(versao_gastos, versao_pagamentos):
+        """Busca os gastos e pagamentos alterados desde as versões informadas.
+        
+        Executado fora da thread da interface. Se alguma categoria mudou, todos os
+        gastos são lidos de novo, pois as categorias ficam nos gastos em cache.
+        
+        Returns:
+            Tupla (alterações dos gastos, alterações dos pagamentos), cada uma no formato
+            (registros, ids excluídos, nova versão, carga completa), ou None em caso de erro
+        """
+        if versao_gastos and Alteracoes.houve_alteracoes(versao_gastos, ('categorias',)):
+            versao_gastos = None
+        gastos = GastoRecorrente.alteracoes_desde(versao_gastos)
+        pagamentos = GastoRecorrente.pagamentos_alterados_desde(versao_pagamentos)
+        if gastos is None or pagamentos is None:
+            return None
+        
+        # Carregar a categoria aqui, e não ao preencher a tabela
+        for gasto in gastos[0]:
+            gasto.categoria
+        return gastos + (versao_gastos is None,), pagamentos + (versao_pagamentos is None,)
+    
+    def _aplicar_alteracoes(self, resultado, ano, mes):
+        """Aplica as alterações aos caches e exibe os gastos do mês."""
+        if resultado is not None:
+            (gastos, gastos_excluidos, versao_gastos, gastos_completos), \
+                (pagamentos, pagamentos_excluidos, versao_pagamentos, pagamentos_completos) = resultado
+            
+            if gastos_completos:
+                self._gastos = {}
+            for gasto_id in gastos_excluidos:
+                self._gastos.pop(gasto_id, None)
+            for gasto in gastos:
+                if gasto.ativo:
+                    self._gastos[gasto.id] = gasto
+                else:
+                    self._gastos.pop(gasto.id, None)
+            
+            if pagamentos_completos:
+                self._pagamentos = {}
+            for pagamento_id in pagamentos_excluidos:
+                self._pagamentos.pop(pagamento_id, None)
+            for pagamento in pagamentos:
+                self._pagamentos[pagamento['pagamento_id']] = pagamento
+            
+            self._versoes = (versao_gastos, versao_pagamentos)
         
-        gastos = GastoRecorrente.listar_todos(apenas_ativos=True)
+        self._exibir_gastos(self._gastos_do_mes(ano, mes), ano, mes)
+    
+    def _gastos_do_mes(self, ano, mes):
+        """Retorna os gastos em cache vigentes no mês, como tuplas (gasto, status_pagamento)."""
+        pagamentos = {(pagamento['gasto_recorrente_id'], pagamento['ano'], pagamento['mes']): pagamento
+                      for pagamento in self._pagamentos.values()}
         
-        for gasto in gastos:
+        resultado = []
+        for gasto in sorted(self._gastos.values(), key=lambda gasto: (gasto.nome or "").casefold()):
             if gasto.data_inicio and date(ano, mes, 1) < gasto.data_inicio:
                 continue
             
             if gasto.data_fim and date(ano, mes, 28) > gasto.data_fim:
                 continue
             
-            status_pagamento = gasto.verificar_pagamento(ano, mes)
-            
+            resultado.append((gasto, pagamentos.get((gasto.id, ano, mes), {'pago': False})))
+        return resultado
+    
+    def _exibir_gastos(self, gastos, ano, mes):
+        """Exibe os gastos recorrentes na tabela."""
+        apenas_pendentes = self.apenas_pendentes_check.isChecked()
+        
+        self.tabela_gastos.setRowCount(0)
+        self.gastos_carregados = {gasto.id: gasto for gasto, _ in gastos}
+        
+        for gasto, status_pagamento in gastos:
             if apenas_pendentes and status_pagamento.get('pago', False):
                 continue
             
@@ -483,11 +563,8 @@ class GastosRecorrentesView(QWidget):
                 observacao=dados['observacao']
             )
             
-            if gasto.salvar():
-                self.carregar_gastos()
-                QMessageBox.information(self, "Sucesso", "Gasto recorrente criado com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao criar gasto recorrente.")
+            self._enfileirar(lambda: SincronizacaoService.salvar_gasto(gasto),
+                             "Gasto recorrente criado com sucesso!", "Erro ao criar gasto recorrente.")
     
     def editar_gasto(self):
         """Abre o diálogo para editar o gasto recorrente selecionado."""
@@ -499,11 +576,14 @@ class GastosRecorrentesView(QWidget):
         row = selected_rows[0].row()
         gasto_id = int(self.tabela_gastos.item(row, 0).text())
         
-        gasto = GastoRecorrente.buscar_por_id(gasto_id)
+        gasto = self.gastos_carregados.get(gasto_id)
         if not gasto:
             QMessageBox.critical(self, "Erro", "Gasto recorrente não encontrado.")
             return
         
+        # Valores lidos do servidor, para detectar alterações feitas por outra pessoa até o envio
+        original = SincronizacaoService.campos(gasto, SincronizacaoService.CAMPOS_GASTO)
+        
         dialog = GastoRecorrenteDialog(self, gasto)
         if dialog.exec_() == QDialog.Accepted:
             dados = dialog.get_gasto_recorrente_data()
@@ -526,11 +606,8 @@ class GastosRecorrentesView(QWidget):
             gasto.descricao_pagamento = dados['descricao_pagamento']
             gasto.observacao = dados['observacao']
             
-            if gasto.salvar():
-                self.carregar_gastos()
-                QMessageBox.information(self, "Sucesso", "Gasto recorrente atualizado com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao atualizar gasto recorrente.")
+            self._enfileirar(lambda: SincronizacaoService.salvar_gasto(gasto, original),
+                             "Gasto recorrente atualizado com sucesso!", "Erro ao atualizar gasto recorrente.")
     
     def excluir_gasto(self):
         """Exclui (desativa) o gasto recorrente selecionado."""
@@ -542,7 +619,7 @@ class GastosRecorrentesView(QWidget):
         row = selected_rows[0].row()
         gasto_id = int(self.tabela_gastos.item(row, 0).text())
         
-        gasto = GastoRecorrente.buscar_por_id(gasto_id)
+        gasto = self.gastos_carregados.get(gasto_id)
         if not gasto:
             QMessageBox.critical(self, "Erro", "Gasto recorrente não encontrado.")
             return
@@ -557,12 +634,10 @@ class GastosRecorrentesView(QWidget):
         if resposta == QMessageBox.No:
             return
         
+        original = SincronizacaoService.campos(gasto, SincronizacaoService.CAMPOS_GASTO)
         gasto.ativo = False
-        if gasto.salvar():
-            self.carregar_gastos()
-            QMessageBox.information(self, "Sucesso", "Gasto recorrente excluído com sucesso!")
-        else:
-            QMessageBox.critical(self, "Erro", "Erro ao excluir gasto recorrente.")
+        self._enfileirar(lambda: SincronizacaoService.salvar_gasto(gasto, original),
+                         "Gasto recorrente excluído com sucesso!", "Erro ao excluir gasto recorrente.")
     
     def marcar_como_pago(self):
         """Marca um gasto recorrente como pago para o mês atual."""
@@ -571,7 +646,7 @@ class GastosRecorrentesView(QWidget):
         ano = btn.property("ano")
         mes = btn.property("mes")
         
-        gasto = GastoRecorrente.buscar_por_id(gasto_id)
+        gasto = self.gastos_carregados.get(gasto_id)
         if not gasto:
             QMessageBox.critical(self, "Erro", "Gasto recorrente não encontrado.")
             return
@@ -580,8 +655,33 @@ class GastosRecorrentesView(QWidget):
         if dialog.exec_() == QDialog.Accepted:
             dados = dialog.get_pagamento_data()
             
-            if gasto.marcar_como_pago(ano, mes, dados['data_pagamento'], dados['valor_pago'], dados['gerar_transacao']):
-                self.carregar_gastos()
-                QMessageBox.information(self, "Sucesso", "Pagamento registrado com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao registrar pagamento.")
\ No newline at end of file
+            # O botão "Pagar" só aparece para meses sem pagamento
+            registrado = self._enfileirar(
+                lambda: SincronizacaoService.marcar_pagamento(gasto.id, ano, mes, dados['data_pagamento'],
+                                                              dados['valor_pago'], dados['gerar_transacao'],
+                                                              original={'pago': False}),
+                "Pagamento registrado com sucesso!", "Erro ao registrar pagamento."
+            )
+            if registrado:
+                # Evita registrar o mesmo pagamento de novo antes do envio
+                btn.setEnabled(False)
+    
+    def _enfileirar(self, funcao, mensagem_sucesso, mensagem_erro):
+        """Grava no diário local, sem esperar o servidor, e agenda o envio (True se gravou).
+        
+        Os gastos são recarregados quando o envio termina (_ao_sincronizar).
+        """
+        try:
+            funcao()
+        except Exception as e:
+            print(f"Erro ao gravar no diário local: {e}")
+            QMessageBox.critical(self, "Erro", mensagem_erro)
+            return False
+        SincronizadorDiario.instancia().agendar()
+        QMessageBox.information(self, "Sucesso", mensagem_sucesso)
+        return True
+    
+    def _ao_sincronizar(self, resultado):
+        """Recarrega os gastos depois que gravações do diário chegam ao servidor."""
+        if resultado['enviadas']:
+            self.carregar_gastos()
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Widgets para exibir gráficos renderizados fora da tela pelo RelatorioService.
+"""
+
+from PyQt5.QtWidgets import QLabel, QDialog, QVBoxLayout, QDialogButtonBox, QSizePolicy
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImage, QPixmap
+
+class GraficoWidget(QLabel):
+    """Exibe a imagem já renderizada (backend Agg) de uma Figure do matplotlib.
+
+    A figura não é redesenhada: a imagem do buffer Agg é convertida uma vez
+    em QPixmap e apenas redimensionada quando o widget muda de tamanho.
+    """
+
+    def __init__(self, figura=None, parent=None):
+        super().__init__(parent)
+        self.setAlignment(Qt.AlignCenter)
+        self.setMinimumSize(200, 150)
+        self.setSizePolicy(QSizePolicy.Ignored, QSizePolicy.Ignored)
+        self._pixmap = None
+        self.definir_figura(figura)
+
+    def definir_figura(self, figura):
+        """Troca a figura exibida (None para limpar)."""
+        if figura is None:
+            self._pixmap = None
+            self.clear()
+            return
+
+        buffer = figura.canvas.buffer_rgba()
+        altura, largura = buffer.shape[:2]
+        imagem = QImage(bytes(buffer), largura, altura, 4 * largura, QImage.Format_RGBA8888)
+        self._pixmap = QPixmap.fromImage(imagem)
+        self._atualizar_pixmap()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._atualizar_pixmap()
+
+    def _atualizar_pixmap(self):
+        """Ajusta a imagem ao tamanho atual do widget, mantendo a proporção."""
+        if self._pixmap is not None:
+            self.setPixmap(self._pixmap.scaled(self.size(), Qt.KeepAspectRatio, Qt.SmoothTransformation))
+
+class GraficoDialog(QDialog):
+    """Diálogo simples que exibe um gráfico."""
+
+    def __init__(self, figura, titulo, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle(titulo)
+        self.resize(1000, 550)
+
+        layout = QVBoxLayout(self)
+        self.grafico = GraficoWidget(figura)
+        layout.addWidget(self.grafico)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
@@ -1,25 +1,45 @@
 import sys
 import os
+from importlib import import_module
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-    QPushButton, QLabel, QTabWidget, QMessageBox, QStatusBar, QAction, QCheckBox
+    QPushButton, QLabel, QTabWidget, QMessageBox, QStatusBar, QAction, QCheckBox,
+    QFileDialog, QInputDialog
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QIcon
 from src.views.dashboard_view import DashboardView
-from src.views.accounts_view import AccountsView
-from src.views.categories_view import CategoriesView
-from src.views.transactions_view import TransactionsView
-from src.views.payment_methods_view import PaymentMethodsView
-from src.views.gastos_recorrentes_view import GastosRecorrentesView
-from src.views.data_copy_dialog import DataCopyDialog
+from src.views.sincronizacao import SincronizadorDiario
+from src.views.conexao import MonitorConexao
+from src.views.tarefas import ExecutorTarefas
+from src.database.estado_conexao import EstadoConexao
+from src.database.setup import DatabaseSetup
 
 class MainWindow(QMainWindow):
     """Janela principal do aplicativo de finanças pessoais."""
     
+    # Abas criadas apenas na primeira vez em que são exibidas:
+    # (atributo, título, módulo, classe). O Dashboard, aberto na inicialização,
+    # é a única aba criada junto com a janela.
+    ABAS_SOB_DEMANDA = [
+        ('accounts_tab', "Contas", 'src.views.accounts_view', 'AccountsView'),
+        ('transactions_tab', "Transações", 'src.views.transactions_view', 'TransactionsView'),
+        ('extrato_tab', "Extrato", 'src.views.extrato_view', 'ExtratoView'),
+        ('categories_tab', "Categorias", 'src.views.categories_view', 'CategoriesView'),
+        ('payment_methods_tab', "Meios de Pagamento", 'src.views.payment_methods_view', 'PaymentMethodsView'),
+        ('gastos_recorrentes_tab', "Gastos Recorrentes", 'src.views.gastos_recorrentes_view', 'GastosRecorrentesView'),
+    ]
+    
+    # Linhas já exportadas (emitido pela tarefa de exportação, recebido na thread da interface)
+    progresso_exportacao = pyqtSignal(int)
+    
     def __init__(self, environment=None):
         super().__init__()
         
+        # Importação e exportação rodam no pool de tarefas
+        self.tarefas = ExecutorTarefas(self)
+        self.progresso_exportacao.connect(self._mostrar_progresso_exportacao)
+        
         # Verificar ambiente
         self.environment = environment or os.getenv('ENVIRONMENT', 'prod')
         
@@ -56,6 +76,12 @@ class MainWindow(QMainWindow):
         
         # Adicionar o rodapé
         self.setup_footer()
+        
+        # Enviar as gravações que ficaram no diário local
+        self.setup_sync()
+        
+        # Indicar a saúde da conexão e preparar o esquema em segundo plano
+        self.setup_connection()
     
     def setup_menu(self):
         """Configura a barra de menu."""
@@ -70,6 +96,18 @@ class MainWindow(QMainWindow):
         import_notion_action.triggered.connect(self.import_from_notion)
         file_menu.addAction(import_notion_action)
         
+        # Ação para importar extrato bancário
+        self.import_statement_action = QAction("Importar &Extrato (CSV/OFX)", self)
+        self.import_statement_action.setStatusTip("Importar transações de um extrato bancário em CSV ou OFX")
+        self.import_statement_action.triggered.connect(self.import_statement)
+        file_menu.addAction(self.import_statement_action)
+        
+        # Ação para exportar transações
+        self.export_action = QAction("E&xportar Transações (CSV/Parquet)", self)
+        self.export_action.setStatusTip("Exportar todas as transações para CSV ou Parquet")
+        self.export_action.triggered.connect(self.export_transactions)
+        file_menu.addAction(self.export_action)
+        
         # Separador
         file_menu.addSeparator()
         
@@ -89,6 +127,24 @@ class MainWindow(QMainWindow):
         copy_data_action.triggered.connect(self.show_data_copy_dialog)
         tools_menu.addAction(copy_data_action)
         
+        # Ação para cadastrar as regras de categorização automática
+        rules_action = QAction("&Regras de Categorização...", self)
+        rules_action.setStatusTip("Cadastrar regras que preenchem categoria, meio de pagamento e conta pela descrição")
+        rules_action.triggered.connect(self.show_categorization_rules_dialog)
+        tools_menu.addAction(rules_action)
+        
+        # Ação para procurar e mesclar transações duplicadas
+        duplicates_action = QAction("Procurar Transações &Duplicadas...", self)
+        duplicates_action.setStatusTip("Procurar transações lançadas mais de uma vez e mesclá-las")
+        duplicates_action.triggered.connect(self.show_duplicates_dialog)
+        tools_menu.addAction(duplicates_action)
+        
+        # Ação para revisar gravações que não puderam ser enviadas ao servidor
+        journal_action = QAction("&Gravações Pendentes...", self)
+        journal_action.setStatusTip("Revisar gravações do diário local em conflito ou com erro")
+        journal_action.triggered.connect(self.show_journal_dialog)
+        tools_menu.addAction(journal_action)
+        
         # Menu Relatórios
         reports_menu = menu_bar.addMenu("&Relatórios")
         
@@ -104,6 +160,12 @@ class MainWindow(QMainWindow):
         category_report_action.triggered.connect(self.show_category_report)
         reports_menu.addAction(category_report_action)
         
+        # Ação para previsão de saldo
+        forecast_action = QAction("&Previsão de Saldo", self)
+        forecast_action.setStatusTip("Projetar o saldo das contas a partir dos gastos recorrentes")
+        forecast_action.triggered.connect(self.show_forecast_report)
+        reports_menu.addAction(forecast_action)
+        
         # Menu Ajuda
         help_menu = menu_bar.addMenu("A&juda")
         
@@ -144,37 +206,51 @@ class MainWindow(QMainWindow):
         self.tabs = QTabWidget()
         
         # Aba de Dashboard
-        self.dashboard_tab = DashboardView()
+        # Os dados só são lidos depois da preparação do esquema (ver on_schema_ready)
+        self._esquema_pronto = False
+        self.dashboard_tab = DashboardView(carregar=False)
         self.tabs.addTab(self.dashboard_tab, "Dashboard")
         
-        # Aba de Contas
-        self.accounts_tab = AccountsView()
-        self.tabs.addTab(self.accounts_tab, "Contas")
-        # Conectar o sinal de saldo atualizado
-        self.accounts_tab.saldo_atualizado.connect(self.update_balance)
-        
-        # Aba de Transações
-        self.transactions_tab = TransactionsView()
-        self.tabs.addTab(self.transactions_tab, "Transações")
-        
-        # Aba de Categorias
-        self.categories_tab = CategoriesView()
-        self.tabs.addTab(self.categories_tab, "Categorias")
-        
-        # Aba de Meios de Pagamento
-        self.payment_methods_tab = PaymentMethodsView()
-        self.tabs.addTab(self.payment_methods_tab, "Meios de Pagamento")
-        
-        # Aba de Gastos Recorrentes
-        self.gastos_recorrentes_tab = GastosRecorrentesView()
-        self.tabs.addTab(self.gastos_recorrentes_tab, "Gastos Recorrentes")
+        # Demais abas: um contêiner vazio que recebe a view ao ser exibido
+        self._abas_pendentes = {}
+        for atributo, titulo, modulo, classe in self.ABAS_SOB_DEMANDA:
+            setattr(self, atributo, None)
+            container = QWidget()
+            container_layout = QVBoxLayout(container)
+            container_layout.setContentsMargins(0, 0, 0, 0)
+            indice = self.tabs.addTab(container, titulo)
+            self._abas_pendentes[indice] = (atributo, modulo, classe)
         
         # Aba de Relatórios (será implementada posteriormente)
         self.reports_tab = QWidget()
         self.tabs.addTab(self.reports_tab, "Relatórios")
         
+        self.tabs.currentChanged.connect(self.carregar_aba)
         self.main_layout.addWidget(self.tabs)
     
+    def carregar_aba(self, indice):
+        """Cria a view da aba na primeira vez em que ela é exibida."""
+        if not self._esquema_pronto:
+            # A view lê o banco ao ser criada: esperar a preparação do esquema
+            return
+        pendente = self._abas_pendentes.pop(indice, None)
+        if pendente is None:
+            return
+        
+        atributo, modulo, classe = pendente
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            view = getattr(import_module(modulo), classe)()
+        finally:
+            QApplication.restoreOverrideCursor()
+        
+        self.tabs.widget(indice).layout().addWidget(view)
+        setattr(self, atributo, view)
+        
+        if atributo == 'accounts_tab':
+            # Conectar o sinal de saldo atualizado
+            view.saldo_atualizado.connect(self.update_balance)
+    
     def setup_footer(self):
         """Configura o rodapé da aplicação."""
         footer_layout = QHBoxLayout()
@@ -193,6 +269,91 @@ class MainWindow(QMainWindow):
         
         self.main_layout.addLayout(footer_layout)
     
+    def setup_sync(self):
+        """Exibe na barra de status as gravações do diário local (o envio começa em on_schema_ready)."""
+        self.sync_label = QLabel()
+        self.status_bar.addPermanentWidget(self.sync_label)
+        
+        SincronizadorDiario.instancia().sincronizado.connect(self.update_sync_status)
+        self.refresh_sync_status()
+    
+    def refresh_sync_status(self):
+        """Lê do diário local as gravações pendentes e atualiza o indicador; retorna quantas faltam enviar."""
+        from src.database.db_helper import get_diario_local
+        
+        try:
+            pendentes, problemas = get_diario_local().contar()
+        except Exception as e:
+            print(f"Erro ao ler o diário local: {e}")
+            return 0
+        self.update_sync_status({'offline': False, 'pendentes': pendentes, 'problemas': problemas})
+        return pendentes
+    
+    def update_sync_status(self, resultado):
+        """Atualiza o indicador de gravações pendentes na barra de status."""
+        partes = []
+        if resultado['pendentes']:
+            partes.append(f"{resultado['pendentes']} gravação(ões) a enviar")
+        if resultado['problemas']:
+            partes.append(f"{resultado['problemas']} com conflito (Ferramentas > Gravações Pendentes)")
+        texto = "; ".join(partes)
+        if resultado['offline']:
+            texto = f"Sem conexão com o servidor - {texto}"
+        self.sync_label.setText(texto)
+    
+    def setup_connection(self):
+        """Exibe o estado da conexão na barra de status e abre a primeira conexão em segundo plano."""
+        self.connection_label = QLabel()
+        self.status_bar.addPermanentWidget(self.connection_label)
+        
+        monitor = MonitorConexao.instancia()
+        monitor.estado_alterado.connect(self.update_connection_status)
+        monitor.reconectado.connect(self.on_reconnected)
+        monitor.preparado.connect(self.on_schema_ready)
+        monitor.preparacao_falhou.connect(self.on_schema_failed)
+        self.update_connection_status(monitor.situacao)
+        
+        # As migrações pendentes rodam no pool: a janela abre sem esperar o servidor
+        monitor.iniciar(DatabaseSetup(environment=self.environment).create_tables)
+    
+    def update_connection_status(self, situacao):
+        """Atualiza o indicador de conexão na barra de status."""
+        textos = {
+            EstadoConexao.CONECTADO: ("Conectado", "green"),
+            EstadoConexao.INSTAVEL: ("Conexão instável", "darkorange"),
+            EstadoConexao.OFFLINE: ("Sem conexão - tentando reconectar", "red"),
+        }
+        texto, cor = textos.get(situacao, ("Conectando...", "gray"))
+        self.connection_label.setText(texto)
+        self.connection_label.setStyleSheet(f"color: {cor};")
+    
+    def on_schema_ready(self):
+        """Carrega o dashboard e a aba atual e envia as gravações pendentes depois que o esquema foi preparado."""
+        self._esquema_pronto = True
+        if self.refresh_sync_status():
+            SincronizadorDiario.instancia().agendar()
+        self.dashboard_tab.load_data()
+        self.carregar_aba(self.tabs.currentIndex())
+    
+    def on_schema_failed(self):
+        """Avisa que o esquema não foi atualizado e libera as abas com o esquema atual do servidor."""
+        QMessageBox.warning(
+            self,
+            "Banco de Dados",
+            "Não foi possível atualizar a estrutura do banco de dados. "
+            "Algumas funções podem não funcionar até a próxima atualização bem-sucedida."
+        )
+        self.on_schema_ready()
+    
+    def on_reconnected(self):
+        """Envia as gravações pendentes e recarrega o dashboard quando o servidor volta."""
+        if not self._esquema_pronto:
+            # A preparação é repetida na reconexão; on_schema_ready faz a carga quando ela terminar
+            return
+        if self.refresh_sync_status():
+            SincronizadorDiario.instancia().agendar()
+        self.dashboard_tab.load_data()
+    
     def update_balance(self, saldo_total):
         """Atualiza o saldo total exibido no cabeçalho."""
         self.balance_label.setText(f"Saldo Total: R$ {float(saldo_total):.2f}")
@@ -205,11 +366,141 @@ class MainWindow(QMainWindow):
             "Funcionalidade de importação do Notion será implementada em breve."
         )
     
+    def import_statement(self):
+        """Importa transações de um extrato bancário (CSV ou OFX)."""
+        caminho, _ = QFileDialog.getOpenFileName(
+            self,
+            "Importar Extrato",
+            "",
+            "Extratos (*.csv *.ofx *.txt);;Todos os arquivos (*)"
+        )
+        if not caminho:
+            return
+        
+        # Selecionar a conta padrão das transações importadas
+        from src.models.conta import Conta
+        
+        self.import_statement_action.setEnabled(False)
+        self.tarefas.executar('importacao', Conta.listar_todas, apenas_ativas=True,
+                              ao_concluir=lambda contas: self._escolher_conta_importacao(caminho, contas),
+                              ao_falhar=lambda erro: self._ao_importar((False, "Erro ao carregar as contas.", 0)))
+    
+    def _escolher_conta_importacao(self, caminho, contas):
+        """Pede a conta do extrato e inicia a importação em segundo plano."""
+        if not contas:
+            self.import_statement_action.setEnabled(True)
+            QMessageBox.warning(self, "Importar Extrato", "Cadastre uma conta antes de importar extratos.")
+            return
+        
+        nomes = [conta.nome for conta in contas]
+        nome, ok = QInputDialog.getItem(self, "Importar Extrato", "Conta do extrato:", nomes, 0, False)
+        if not ok:
+            self.import_statement_action.setEnabled(True)
+            return
+        conta_id = contas[nomes.index(nome)].id
+        
+        self.status_bar.showMessage("Importando extrato...")
+        self.tarefas.executar('importacao', self._importar_extrato, caminho, conta_id,
+                              ao_concluir=self._ao_importar,
+                              ao_falhar=lambda erro: self._ao_importar((False, f"Erro ao importar extrato: {erro}", 0)))
+    
+    @staticmethod
+    def _importar_extrato(caminho, conta_id):
+        """Importa o extrato (executado fora da thread da interface)."""
+        # Importar o serviço apenas quando necessário (depende do pandas)
+        from src.services.importacao_service import ImportacaoService
+        
+        return ImportacaoService().importar_arquivo(caminho, conta_id=conta_id)
+    
+    def _ao_importar(self, resultado):
+        """Exibe o resultado da importação e recarrega as abas já criadas."""
+        sucesso, mensagem, _ = resultado
+        self.import_statement_action.setEnabled(True)
+        self.status_bar.showMessage(mensagem)
+        if sucesso:
+            # Abas ainda não criadas carregarão os dados novos ao serem exibidas
+            if self.transactions_tab:
+                self.transactions_tab.carregar_transacoes()
+            if self.accounts_tab:
+                self.accounts_tab.carregar_contas()
+            QMessageBox.information(self, "Importar Extrato", mensagem)
+        else:
+            QMessageBox.warning(self, "Importar Extrato", mensagem)
+    
+    def export_transactions(self):
+        """Exporta todas as transações para CSV ou Parquet, em segundo plano."""
+        caminho, _ = QFileDialog.getSaveFileName(
+            self,
+            "Exportar Transações",
+            "transacoes.csv",
+            "CSV (*.csv);;Parquet (*.parquet)"
+        )
+        if not caminho:
+            return
+        
+        self.export_action.setEnabled(False)
+        self.status_bar.showMessage("Exportando transações...")
+        self.tarefas.executar('exportacao', self._exportar, caminho, self.progresso_exportacao.emit,
+                              ao_concluir=self._ao_exportar,
+                              ao_falhar=lambda erro: self._ao_exportar((False, f"Erro ao exportar transações: {erro}", 0)))
+    
+    @staticmethod
+    def _exportar(caminho, progresso):
+        """Exporta as transações (executado fora da thread da interface)."""
+        from src.services.exportacao_service import ExportacaoService
+        
+        return ExportacaoService().exportar(caminho, progresso=progresso)
+    
+    def _mostrar_progresso_exportacao(self, total):
+        """Mostra na barra de status quantas linhas já foram exportadas."""
+        self.status_bar.showMessage(f"Exportando transações... {total} linhas")
+    
+    def _ao_exportar(self, resultado):
+        """Exibe o resultado da exportação."""
+        sucesso, mensagem, _ = resultado
+        self.export_action.setEnabled(True)
+        self.status_bar.showMessage(mensagem)
+        if sucesso:
+            QMessageBox.information(self, "Exportar Transações", mensagem)
+        else:
+            QMessageBox.warning(self, "Exportar Transações", mensagem)
+    
     def show_data_copy_dialog(self):
         """Mostra o diálogo para copiar dados de PROD para DEV."""
+        from src.views.data_copy_dialog import DataCopyDialog
+        
         dialog = DataCopyDialog(self)
         dialog.exec_()
     
+    def show_categorization_rules_dialog(self):
+        """Mostra o diálogo de regras de categorização."""
+        from src.views.regras_categorizacao_dialog import RegrasCategorizacaoDialog
+        
+        dialog = RegrasCategorizacaoDialog(self)
+        dialog.exec_()
+        
+        if self.transactions_tab:
+            self.transactions_tab.carregar_transacoes()
+    
+    def show_duplicates_dialog(self):
+        """Mostra o diálogo de transações duplicadas."""
+        from src.views.duplicadas_dialog import DuplicadasDialog
+        
+        dialog = DuplicadasDialog(self)
+        dialog.exec_()
+        
+        if dialog.houve_alteracoes and self.transactions_tab:
+            self.transactions_tab.carregar_transacoes()
+    
+    def show_journal_dialog(self):
+        """Mostra o diálogo de gravações pendentes do diário local."""
+        from src.views.diario_dialog import DiarioDialog
+        
+        dialog = DiarioDialog(self)
+        dialog.exec_()
+        
+        self.refresh_sync_status()
+    
     def show_cash_flow_report(self):
         """Mostra o relatório de fluxo de caixa."""
         QMessageBox.information(
@@ -226,6 +517,29 @@ class MainWindow(QMainWindow):
             "Funcionalidade de relatório por categoria será implementada em breve."
         )
     
+    def show_forecast_report(self):
+        """Mostra o gráfico de previsão de saldo."""
+        horizonte, ok = QInputDialog.getInt(
+            self, "Previsão de Saldo", "Horizonte (meses):", 12, 1, 120
+        )
+        if not ok:
+            return
+        
+        from src.services.relatorio_service import RelatorioService
+        from src.views.grafico_widget import GraficoDialog
+        
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        try:
+            figura = RelatorioService.gerar_grafico_previsao_saldo(horizonte)
+        finally:
+            QApplication.restoreOverrideCursor()
+        
+        if figura is None:
+            QMessageBox.warning(self, "Previsão de Saldo", "Não foi possível gerar a previsão de saldo.")
+            return
+        
+        GraficoDialog(figura, "Previsão de Saldo", self).exec_()
+    
     def show_about(self):
         """Mostra informações sobre o aplicativo."""
         env_info = f" (Ambiente: {self.environment.upper()})" if self.environment == 'dev' else ""
@@ -5,17 +5,21 @@ Interface gráfica para gestão de meios de pagamento.
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, 
                             QLabel, QLineEdit, QTableWidget, QTableWidgetItem,
                             QMessageBox, QDialog, QFormLayout, QComboBox, 
-                            QDialogButtonBox, QHeaderView, QTextEdit, QCheckBox)
+                            QDialogButtonBox, QHeaderView, QTextEdit, QCheckBox, QSpinBox)
 from PyQt5.QtCore import Qt, pyqtSignal
+from src.models.alteracoes import Alteracoes
 from src.models.meio_pagamento import MeioPagamento
 from src.models.conta import Conta
+from src.views.faturas_dialog import FaturasDialog
+from src.views.tarefas import ExecutorTarefas
 
 class MeioPagamentoDialog(QDialog):
     """Diálogo para criar ou editar um meio de pagamento."""
     
-    def __init__(self, parent=None, meio_pagamento=None):
+    def __init__(self, parent=None, meio_pagamento=None, contas=None):
         super().__init__(parent)
         self.meio_pagamento = meio_pagamento
+        self.contas = contas
         self.setWindowTitle("Novo Meio de Pagamento" if meio_pagamento is None else "Editar Meio de Pagamento")
         self.setup_ui()
         
@@ -43,8 +47,8 @@ class MeioPagamentoDialog(QDialog):
         self.conta_combo = QComboBox(self)
         self.conta_combo.addItem("Nenhuma", None)
         
-        # Carregar contas
-        contas = Conta.listar_todas(apenas_ativas=True)
+        # Carregar contas (usa as já carregadas pela view, se informadas)
+        contas = self.contas if self.contas is not None else Conta.listar_todas(apenas_ativas=True)
         for conta in contas:
             self.conta_combo.addItem(f"{conta.nome} ({conta.tipo})", conta.id)
         
@@ -54,11 +58,27 @@ class MeioPagamentoDialog(QDialog):
             if index >= 0:
                 self.conta_combo.setCurrentIndex(index)
         
+        # Ciclo da fatura (apenas cartão de crédito); 0 indica não configurado
+        self.dia_fechamento_spin = QSpinBox(self)
+        self.dia_fechamento_spin.setRange(0, 31)
+        self.dia_fechamento_spin.setSpecialValueText("Não informado")
+        self.dia_vencimento_spin = QSpinBox(self)
+        self.dia_vencimento_spin.setRange(0, 31)
+        self.dia_vencimento_spin.setSpecialValueText("Não informado")
+        if self.meio_pagamento:
+            self.dia_fechamento_spin.setValue(self.meio_pagamento.dia_fechamento or 0)
+            self.dia_vencimento_spin.setValue(self.meio_pagamento.dia_vencimento or 0)
+        
+        self.tipo_combo.currentTextChanged.connect(self.atualizar_campos_fatura)
+        self.atualizar_campos_fatura(self.tipo_combo.currentText())
+        
         # Adicionar campos ao layout
         layout.addRow("Nome:", self.nome_edit)
         layout.addRow("Tipo:", self.tipo_combo)
         layout.addRow("Descrição:", self.descricao_edit)
         layout.addRow("Conta Associada:", self.conta_combo)
+        layout.addRow("Dia de Fechamento:", self.dia_fechamento_spin)
+        layout.addRow("Dia de Vencimento:", self.dia_vencimento_spin)
         
         # Botões
         buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
@@ -68,6 +88,12 @@ class MeioPagamentoDialog(QDialog):
         
         self.setLayout(layout)
         
+    def atualizar_campos_fatura(self, tipo):
+        """Habilita os dias de fechamento e vencimento apenas para cartão de crédito."""
+        cartao = tipo == MeioPagamento.TIPO_CARTAO_CREDITO
+        self.dia_fechamento_spin.setEnabled(cartao)
+        self.dia_vencimento_spin.setEnabled(cartao)
+    
     def get_meio_pagamento_data(self):
         """Retorna os dados do meio de pagamento do formulário."""
         nome = self.nome_edit.text().strip()
@@ -75,11 +101,17 @@ class MeioPagamentoDialog(QDialog):
         descricao = self.descricao_edit.toPlainText().strip() or None
         conta_id = self.conta_combo.currentData()
         
+        cartao = tipo == MeioPagamento.TIPO_CARTAO_CREDITO
+        dia_fechamento = self.dia_fechamento_spin.value() if cartao else 0
+        dia_vencimento = self.dia_vencimento_spin.value() if cartao else 0
+        
         return {
             'nome': nome,
             'tipo': tipo,
             'descricao': descricao,
-            'conta_id': conta_id
+            'conta_id': conta_id,
+            'dia_fechamento': dia_fechamento or None,
+            'dia_vencimento': dia_vencimento or None
         }
 
 class PaymentMethodsView(QWidget):
@@ -88,7 +120,15 @@ class PaymentMethodsView(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Gestão de Meios de Pagamento")
+        self.contas = None
+        self.tarefas = ExecutorTarefas(self)
+        
+        # Todos os meios de pagamento ({id: meio}) e versão do banco em que foram lidos;
+        # os filtros são aplicados localmente e as recargas buscam só as alterações
+        self.meios_pagamento = {}
+        self._versao_meios = None
         self.setup_ui()
+        self.carregar_contas()
         self.carregar_meios_pagamento()
         
     def setup_ui(self):
@@ -109,11 +149,6 @@ class PaymentMethodsView(QWidget):
         self.conta_combo = QComboBox()
         self.conta_combo.addItem("Todas as contas", None)
         
-        # Carregar contas
-        contas = Conta.listar_todas(apenas_ativas=True)
-        for conta in contas:
-            self.conta_combo.addItem(f"{conta.nome} ({conta.tipo})", conta.id)
-        
         filtros_layout.addWidget(QLabel("Conta:"))
         filtros_layout.addWidget(self.conta_combo)
         
@@ -153,6 +188,10 @@ class PaymentMethodsView(QWidget):
         self.btn_excluir.clicked.connect(self.excluir_meio_pagamento)
         btn_layout.addWidget(self.btn_excluir)
         
+        self.btn_faturas = QPushButton("Faturas")
+        self.btn_faturas.clicked.connect(self.ver_faturas)
+        btn_layout.addWidget(self.btn_faturas)
+        
         self.btn_atualizar = QPushButton("Atualizar")
         self.btn_atualizar.clicked.connect(self.carregar_meios_pagamento)
         btn_layout.addWidget(self.btn_atualizar)
@@ -161,18 +200,68 @@ class PaymentMethodsView(QWidget):
         
         self.setLayout(layout)
         
+    def carregar_contas(self):
+        """Carrega as contas do filtro em segundo plano."""
+        self.tarefas.executar('contas', Conta.listar_todas, apenas_ativas=True,
+                              ao_concluir=self._exibir_contas)
+    
+    def _exibir_contas(self, contas):
+        """Preenche o filtro de contas."""
+        self.contas = contas
+        for conta in contas:
+            self.conta_combo.addItem(f"{conta.nome} ({conta.tipo})", conta.id)
+    
     def carregar_meios_pagamento(self):
-        """Carrega os meios de pagamento do banco de dados e exibe na tabela."""
+        """Busca em segundo plano os meios de pagamento alterados e exibe os que atendem aos filtros."""
+        self.tarefas.executar('meios_pagamento', self._buscar_alteracoes, self._versao_meios,
+                              ao_concluir=self._aplicar_alteracoes)
+    
+    @staticmethod
+    def _buscar_alteracoes(versao):
+        """Busca os meios de pagamento alterados e suas contas (executado fora da thread da interface).
+        
+        Se alguma conta mudou, tudo é lido de novo, pois os nomes das contas ficam nos meios em cache.
+        """
+        if versao and Alteracoes.houve_alteracoes(versao, ('conta_dimensao',)):
+            versao = None
+        resultado = MeioPagamento.alteracoes_desde(versao)
+        if resultado is None:
+            return None
+        
+        # Carregar a conta de cada meio de pagamento alterado aqui, e não ao preencher a tabela
+        for meio in resultado[0]:
+            meio.conta
+        return resultado + (versao is None,)
+    
+    def _aplicar_alteracoes(self, resultado):
+        """Aplica as alterações ao cache e exibe os meios de pagamento filtrados."""
+        if resultado is not None:
+            alterados, excluidos, versao, carga_completa = resultado
+            if carga_completa:
+                self.meios_pagamento = {}
+            for meio_id in excluidos:
+                self.meios_pagamento.pop(meio_id, None)
+            for meio in alterados:
+                self.meios_pagamento[meio.id] = meio
+            self._versao_meios = versao
+        
+        self._exibir_meios_pagamento(self._filtrar_meios_pagamento())
+    
+    def _filtrar_meios_pagamento(self):
+        """Aplica ao cache os filtros da tela (mesmas regras de listar_por_tipo e listar_todos)."""
         tipo = self.tipo_combo.currentText() if self.tipo_combo.currentIndex() > 0 else None
         conta_id = self.conta_combo.currentData()
         apenas_ativos = self.apenas_ativos_check.isChecked()
         
-        # Buscar meios de pagamento
-        if tipo:
-            meios_pagamento = MeioPagamento.listar_por_tipo(tipo, apenas_ativos)
-        else:
-            meios_pagamento = MeioPagamento.listar_todos(apenas_ativos, conta_id)
-        
+        meios_pagamento = [
+            meio for meio in self.meios_pagamento.values()
+            if (not apenas_ativos or meio.ativo)
+            and (meio.tipo == tipo if tipo else (not conta_id or meio.conta_id in (conta_id, None)))
+        ]
+        return sorted(meios_pagamento, key=lambda meio: (meio.nome or "").casefold())
+    
+    def _exibir_meios_pagamento(self, meios_pagamento):
+        """Exibe os meios de pagamento na tabela."""
         # Limpar tabela
         self.tabela_meios_pagamento.setRowCount(0)
         
@@ -196,7 +285,7 @@ class PaymentMethodsView(QWidget):
     
     def novo_meio_pagamento(self):
         """Abre o diálogo para criar um novo meio de pagamento."""
-        dialog = MeioPagamentoDialog(self)
+        dialog = MeioPagamentoDialog(self, contas=self.contas)
         if dialog.exec_() == QDialog.Accepted:
             dados = dialog.get_meio_pagamento_data()
             
@@ -209,14 +298,13 @@ class PaymentMethodsView(QWidget):
                 nome=dados['nome'],
                 tipo=dados['tipo'],
                 descricao=dados['descricao'],
-                conta_id=dados['conta_id']
+                conta_id=dados['conta_id'],
+                dia_fechamento=dados['dia_fechamento'],
+                dia_vencimento=dados['dia_vencimento']
             )
             
-            if meio_pagamento.salvar():
-                self.carregar_meios_pagamento()
-                QMessageBox.information(self, "Sucesso", "Meio de pagamento criado com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao criar meio de pagamento.")
+            self._gravar(meio_pagamento.salvar, "Meio de pagamento criado com sucesso!",
+                         "Erro ao criar meio de pagamento.")
     
     def editar_meio_pagamento(self):
         """Abre o diálogo para editar o meio de pagamento selecionado."""
@@ -230,13 +318,17 @@ class PaymentMethodsView(QWidget):
         meio_pagamento_id = int(self.tabela_meios_pagamento.item(row, 0).text())
         
         # Buscar o meio de pagamento no banco de dados
-        meio_pagamento = MeioPagamento.buscar_por_id(meio_pagamento_id)
+        self.tarefas.executar('buscar_meio_pagamento', MeioPagamento.buscar_por_id, meio_pagamento_id,
+                              ao_concluir=self._editar_meio_pagamento_carregado)
+    
+    def _editar_meio_pagamento_carregado(self, meio_pagamento):
+        """Abre o diálogo de edição do meio de pagamento buscado no banco."""
         if not meio_pagamento:
             QMessageBox.critical(self, "Erro", "Meio de pagamento não encontrado.")
             return
         
         # Abrir diálogo de edição
-        dialog = MeioPagamentoDialog(self, meio_pagamento)
+        dialog = MeioPagamentoDialog(self, meio_pagamento, self.contas)
         if dialog.exec_() == QDialog.Accepted:
             dados = dialog.get_meio_pagamento_data()
             
@@ -249,30 +341,49 @@ class PaymentMethodsView(QWidget):
             meio_pagamento.tipo = dados['tipo']
             meio_pagamento.descricao = dados['descricao']
             meio_pagamento.conta_id = dados['conta_id']
+            meio_pagamento.dia_fechamento = dados['dia_fechamento']
+            meio_pagamento.dia_vencimento = dados['dia_vencimento']
             
-            if meio_pagamento.salvar():
-                self.carregar_meios_pagamento()
-                QMessageBox.information(self, "Sucesso", "Meio de pagamento atualizado com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao atualizar meio de pagamento.")
+            self._gravar(meio_pagamento.salvar, "Meio de pagamento atualizado com sucesso!",
+                         "Erro ao atualizar meio de pagamento.")
     
-    def excluir_meio_pagamento(self):
-        """Exclui (desativa) o meio de pagamento selecionado."""
+    def ver_faturas(self):
+        """Abre as faturas do cartão de crédito selecionado."""
         selected_rows = self.tabela_meios_pagamento.selectedItems()
         if not selected_rows:
-            QMessageBox.warning(self, "Aviso", "Selecione um meio de pagamento para excluir.")
+            QMessageBox.warning(self, "Aviso", "Selecione um cartão de crédito para ver as faturas.")
             return
         
-        # Obter o ID do meio de pagamento selecionado
         row = selected_rows[0].row()
         meio_pagamento_id = int(self.tabela_meios_pagamento.item(row, 0).text())
         
-        # Buscar o meio de pagamento no banco de dados
-        meio_pagamento = MeioPagamento.buscar_por_id(meio_pagamento_id)
+        self.tarefas.executar('buscar_meio_pagamento', MeioPagamento.buscar_por_id, meio_pagamento_id,
+                              ao_concluir=self._ver_faturas_carregado)
+    
+    def _ver_faturas_carregado(self, meio_pagamento):
+        """Abre as faturas do cartão buscado no banco."""
         if not meio_pagamento:
             QMessageBox.critical(self, "Erro", "Meio de pagamento não encontrado.")
             return
         
+        if not meio_pagamento.possui_fatura:
+            QMessageBox.warning(self, "Aviso", 
+                                "Informe o dia de fechamento do cartão de crédito para ver as faturas.")
+            return
+        
+        FaturasDialog(meio_pagamento, self).exec_()
+    
+    def excluir_meio_pagamento(self):
+        """Exclui (desativa) o meio de pagamento selecionado."""
+        selected_rows = self.tabela_meios_pagamento.selectedItems()
+        if not selected_rows:
+            QMessageBox.warning(self, "Aviso", "Selecione um meio de pagamento para excluir.")
+            return
+        
+        # Obter o ID do meio de pagamento selecionado
+        row = selected_rows[0].row()
+        meio_pagamento_id = int(self.tabela_meios_pagamento.item(row, 0).text())
+        
         # Confirmar exclusão
         resposta = QMessageBox.question(
             self, 
@@ -284,9 +395,33 @@ class PaymentMethodsView(QWidget):
         if resposta == QMessageBox.No:
             return
         
-        # Excluir o meio de pagamento
-        if meio_pagamento.excluir():
-            self.carregar_meios_pagamento()
-            QMessageBox.information(self, "Sucesso", "Meio de pagamento excluído com sucesso!")
-        else:
-            QMessageBox.critical(self, "Erro", "Erro ao excluir meio de pagamento.")
\ No newline at end of file
+        def excluir():
+            # Buscar o meio de pagamento e excluí-lo na mesma tarefa (None se não encontrado)
+            meio_pagamento = MeioPagamento.buscar_por_id(meio_pagamento_id)
+            return meio_pagamento.excluir() if meio_pagamento else None
+        
+        self._gravar(excluir, "Meio de pagamento excluído com sucesso!", "Erro ao excluir meio de pagamento.")
+    
+    def _gravar(self, funcao, mensagem_sucesso, mensagem_erro):
+        """Executa uma gravação em segundo plano e recarrega a tabela ao terminar.
+        
+        Os botões ficam desabilitados até o fim da gravação, evitando envios repetidos.
+        """
+        def ao_concluir(sucesso):
+            self._habilitar_botoes(True)
+            if sucesso is None:
+                QMessageBox.critical(self, "Erro", "Meio de pagamento não encontrado.")
+            elif sucesso:
+                self.carregar_meios_pagamento()
+                QMessageBox.information(self, "Sucesso", mensagem_sucesso)
+            else:
+                QMessageBox.critical(self, "Erro", mensagem_erro)
+        
+        self._habilitar_botoes(False)
+        self.tarefas.executar(None, funcao, ao_concluir=ao_concluir,
+                              ao_falhar=lambda erro: ao_concluir(False))
+    
+    def _habilitar_botoes(self, habilitar):
+        """Habilita ou desabilita os botões de alteração."""
+        for botao in (self.btn_novo, self.btn_editar, self.btn_excluir):
+            botao.setEnabled(habilitar)
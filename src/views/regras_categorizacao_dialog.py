@@ -0,0 +1,274 @@
+"""
+Diálogos para cadastro das regras de categorização automática.
+"""
+
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout, QPushButton,
+                            QTableWidget, QTableWidgetItem, QHeaderView, QLineEdit, QComboBox,
+                            QCheckBox, QSpinBox, QDialogButtonBox, QMessageBox)
+from PyQt5.QtCore import Qt
+from src.models.regra_categorizacao import RegraCategorizacao
+from src.models.categoria import Categoria
+from src.models.conta import Conta
+from src.models.meio_pagamento import MeioPagamento
+from src.services.categorizacao_service import CategorizacaoService
+from src.views.tarefas import ExecutorTarefas
+
+class RegraDialog(QDialog):
+    """Diálogo para criar ou editar uma regra de categorização."""
+
+    def __init__(self, parent=None, regra=None, opcoes=None):
+        super().__init__(parent)
+        self.regra = regra
+        self.opcoes = opcoes
+        self.setWindowTitle("Nova Regra" if regra is None else "Editar Regra")
+        self.setMinimumWidth(420)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Configura a interface do diálogo."""
+        layout = QFormLayout(self)
+
+        self.nome_edit = QLineEdit(self)
+        self.padrao_edit = QLineEdit(self)
+        self.padrao_edit.setPlaceholderText("Texto procurado (ex.: SUPERMERCADO)")
+        self.expressao_check = QCheckBox("Padrão é uma expressão regular", self)
+
+        self.campo_combo = QComboBox(self)
+        self.campo_combo.addItem("Descrição", 'descricao')
+        self.campo_combo.addItem("Local da transação", 'local_transacao')
+
+        self.prioridade_spin = QSpinBox(self)
+        self.prioridade_spin.setRange(0, 9999)
+        self.prioridade_spin.setValue(100)
+
+        self.categoria_combo = self._criar_combo(self.opcoes['categorias'])
+        self.meio_pagamento_combo = self._criar_combo(self.opcoes['meios_pagamento'])
+        self.conta_combo = self._criar_combo(self.opcoes['contas'])
+
+        if self.regra:
+            self.nome_edit.setText(self.regra.nome)
+            self.padrao_edit.setText(self.regra.padrao)
+            self.expressao_check.setChecked(self.regra.expressao_regular)
+            self.campo_combo.setCurrentIndex(max(self.campo_combo.findData(self.regra.campo), 0))
+            self.prioridade_spin.setValue(self.regra.prioridade)
+            for combo, valor in ((self.categoria_combo, self.regra.categoria_id),
+                                 (self.meio_pagamento_combo, self.regra.meio_pagamento_id),
+                                 (self.conta_combo, self.regra.conta_id)):
+                combo.setCurrentIndex(max(combo.findData(valor), 0))
+
+        layout.addRow("Nome:", self.nome_edit)
+        layout.addRow("Procurar em:", self.campo_combo)
+        layout.addRow("Padrão:", self.padrao_edit)
+        layout.addRow("", self.expressao_check)
+        layout.addRow("Prioridade (menor primeiro):", self.prioridade_spin)
+        layout.addRow("Categoria:", self.categoria_combo)
+        layout.addRow("Meio de Pagamento:", self.meio_pagamento_combo)
+        layout.addRow("Conta:", self.conta_combo)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+
+    def _criar_combo(self, opcoes):
+        """Cria um combo com a opção vazia e as opções (id, nome)."""
+        combo = QComboBox(self)
+        combo.addItem("(não alterar)", None)
+        for opcao_id, nome in opcoes:
+            combo.addItem(nome, opcao_id)
+        return combo
+
+    def get_regra(self):
+        """Retorna a regra com os dados do formulário."""
+        regra = self.regra or RegraCategorizacao()
+        regra.nome = self.nome_edit.text().strip()
+        regra.padrao = self.padrao_edit.text().strip()
+        regra.expressao_regular = self.expressao_check.isChecked()
+        regra.campo = self.campo_combo.currentData()
+        regra.prioridade = self.prioridade_spin.value()
+        regra.categoria_id = self.categoria_combo.currentData()
+        regra.meio_pagamento_id = self.meio_pagamento_combo.currentData()
+        regra.conta_id = self.conta_combo.currentData()
+        return regra
+
+class RegrasCategorizacaoDialog(QDialog):
+    """Lista as regras de categorização com seus acertos e permite reaplicá-las ao histórico."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.regras = []
+        self.opcoes = None
+        self.tarefas = ExecutorTarefas(self)
+        self.setWindowTitle("Regras de Categorização")
+        self.resize(900, 500)
+        self.setup_ui()
+        self.carregar_regras()
+
+    def setup_ui(self):
+        """Configura a interface do diálogo."""
+        layout = QVBoxLayout(self)
+
+        self.tabela = QTableWidget(0, 7)
+        self.tabela.setHorizontalHeaderLabels([
+            "Prioridade", "Nome", "Padrão", "Categoria", "Meio de Pagamento", "Conta", "Acertos"
+        ])
+        self.tabela.horizontalHeader().setSectionResizeMode(2, QHeaderView.Stretch)
+        self.tabela.setSelectionBehavior(QTableWidget.SelectRows)
+        self.tabela.setSelectionMode(QTableWidget.SingleSelection)
+        self.tabela.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.tabela)
+
+        btn_layout = QHBoxLayout()
+        self.btn_nova = QPushButton("Nova Regra")
+        self.btn_nova.clicked.connect(self.nova_regra)
+        btn_layout.addWidget(self.btn_nova)
+
+        self.btn_editar = QPushButton("Editar")
+        self.btn_editar.clicked.connect(self.editar_regra)
+        btn_layout.addWidget(self.btn_editar)
+
+        self.btn_excluir = QPushButton("Excluir")
+        self.btn_excluir.clicked.connect(self.excluir_regra)
+        btn_layout.addWidget(self.btn_excluir)
+
+        self.btn_reaplicar = QPushButton("Reaplicar ao Histórico")
+        self.btn_reaplicar.clicked.connect(self.reaplicar_ao_historico)
+        btn_layout.addWidget(self.btn_reaplicar)
+
+        btn_layout.addStretch()
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        btn_layout.addWidget(buttons)
+        layout.addLayout(btn_layout)
+
+    def carregar_regras(self):
+        """Carrega em segundo plano as regras e os nomes usados na tabela."""
+        self.tarefas.executar('regras', self._listar_regras, ao_concluir=self._exibir_regras)
+
+    @staticmethod
+    def _listar_regras():
+        """Lista as regras ativas e as opções (id, nome) de categoria, meio de pagamento e conta."""
+        categorias = Categoria.listar_todas(apenas_ativas=True)
+        nomes_categorias = {c.id: c.nome for c in categorias}
+        opcoes = {
+            'categorias': [
+                (c.id, f"{nomes_categorias[c.categoria_pai_id]} › {c.nome}"
+                 if c.categoria_pai_id in nomes_categorias else c.nome)
+                for c in categorias
+            ],
+            'meios_pagamento': [(m.id, m.nome) for m in MeioPagamento.listar_todos(apenas_ativos=True)],
+            'contas': [(c.id, c.nome) for c in Conta.listar_todas(apenas_ativas=True)]
+        }
+        return RegraCategorizacao.listar_todas(apenas_ativas=True), opcoes
+
+    def _exibir_regras(self, resultado):
+        """Exibe as regras na tabela."""
+        self.regras, self.opcoes = resultado
+        nomes = {campo: dict(opcoes) for campo, opcoes in self.opcoes.items()}
+
+        self.tabela.setRowCount(len(self.regras))
+        for row, regra in enumerate(self.regras):
+            padrao = regra.padrao if regra.campo == 'descricao' else f"[local] {regra.padrao}"
+            valores = [
+                str(regra.prioridade), regra.nome, padrao,
+                nomes['categorias'].get(regra.categoria_id, ""),
+                nomes['meios_pagamento'].get(regra.meio_pagamento_id, ""),
+                nomes['contas'].get(regra.conta_id, ""),
+                str(regra.acertos)
+            ]
+            for coluna, valor in enumerate(valores):
+                item = QTableWidgetItem(valor)
+                if coluna in (0, 6):
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.tabela.setItem(row, coluna, item)
+
+    def _regra_selecionada(self):
+        """Retorna a regra da linha selecionada, ou None."""
+        selecionadas = self.tabela.selectionModel().selectedRows()
+        return self.regras[selecionadas[0].row()] if selecionadas else None
+
+    def nova_regra(self):
+        """Abre o diálogo para criar uma regra."""
+        if self.opcoes is None:
+            return
+        dialog = RegraDialog(self, opcoes=self.opcoes)
+        if dialog.exec_() == QDialog.Accepted:
+            self._salvar(dialog.get_regra())
+
+    def editar_regra(self):
+        """Abre o diálogo para editar a regra selecionada."""
+        regra = self._regra_selecionada()
+        if regra is None:
+            QMessageBox.warning(self, "Aviso", "Selecione uma regra para editar.")
+            return
+        dialog = RegraDialog(self, regra, self.opcoes)
+        if dialog.exec_() == QDialog.Accepted:
+            self._salvar(dialog.get_regra())
+
+    def _salvar(self, regra):
+        """Valida e grava a regra."""
+        try:
+            regra.validar()
+        except ValueError as e:
+            QMessageBox.warning(self, "Erro", str(e))
+            self.carregar_regras()
+            return
+        self._gravar(regra.salvar, "Erro ao salvar a regra.")
+
+    def excluir_regra(self):
+        """Exclui a regra selecionada."""
+        regra = self._regra_selecionada()
+        if regra is None:
+            QMessageBox.warning(self, "Aviso", "Selecione uma regra para excluir.")
+            return
+        resposta = QMessageBox.question(self, "Confirmar Exclusão",
+                                        f"Tem certeza que deseja excluir a regra '{regra.nome}'?",
+                                        QMessageBox.Yes | QMessageBox.No)
+        if resposta == QMessageBox.Yes:
+            self._gravar(regra.excluir, "Erro ao excluir a regra.")
+
+    def _gravar(self, funcao, mensagem_erro):
+        """Grava em segundo plano e recarrega as regras, descartando o classificador em cache."""
+        def ao_concluir(sucesso):
+            self._habilitar_botoes(True)
+            CategorizacaoService.invalidar()
+            if not sucesso:
+                QMessageBox.critical(self, "Erro", mensagem_erro)
+            self.carregar_regras()
+
+        self._habilitar_botoes(False)
+        self.tarefas.executar(None, funcao, ao_concluir=ao_concluir,
+                              ao_falhar=lambda erro: ao_concluir(False))
+
+    def reaplicar_ao_historico(self):
+        """Aplica as regras às transações já gravadas."""
+        resposta = QMessageBox.question(
+            self,
+            "Reaplicar ao Histórico",
+            "Aplicar as regras também às transações que já têm categoria?\n\n"
+            "Sim: todas as transações\nNão: apenas as transações sem categoria",
+            QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel
+        )
+        if resposta == QMessageBox.Cancel:
+            return
+
+        def reaplicar(apenas_sem_categoria):
+            return CategorizacaoService.carregar().reaplicar_ao_historico(apenas_sem_categoria)
+
+        def ao_concluir(alteradas):
+            self._habilitar_botoes(True)
+            if alteradas is None:
+                QMessageBox.critical(self, "Erro", "Erro ao reaplicar as regras.")
+                return
+            QMessageBox.information(self, "Reaplicar ao Histórico",
+                                    f"{alteradas} transação(ões) atualizada(s) pelas regras.")
+            self.carregar_regras()
+
+        self._habilitar_botoes(False)
+        self.tarefas.executar(None, reaplicar, resposta == QMessageBox.No, ao_concluir=ao_concluir,
+                              ao_falhar=lambda erro: ao_concluir(None))
+
+    def _habilitar_botoes(self, habilitar):
+        """Habilita ou desabilita os botões de alteração."""
+        for botao in (self.btn_nova, self.btn_editar, self.btn_excluir, self.btn_reaplicar):
+            botao.setEnabled(habilitar)
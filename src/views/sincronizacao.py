@@ -0,0 +1,68 @@
+"""
+Envio em segundo plano das gravações do diário local.
+"""
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from src.services.sincronizacao_service import SincronizacaoService
+from src.views.tarefas import GerenciadorTarefas
+
+class SincronizadorDiario(QObject):
+    """Agenda SincronizacaoService.sincronizar() no pool de tarefas.
+
+    Uma execução é agendada a cada gravação no diário; enquanto houver
+    operações a enviar, as execuções se encadeiam. Sem conexão com o servidor,
+    a próxima tentativa espera ESPERA_INICIAL milissegundos, dobrando a cada
+    falha até ESPERA_MAXIMA.
+    """
+
+    # Resultado de SincronizacaoService.sincronizar(), emitido a cada execução
+    sincronizado = pyqtSignal(dict)
+
+    ESPERA_INICIAL = 5000
+    ESPERA_MAXIMA = 300000
+
+    _instancia = None
+
+    def __init__(self):
+        super().__init__()
+        self._em_andamento = False
+        self._repetir = False
+        self._espera = self.ESPERA_INICIAL
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.agendar)
+
+    @classmethod
+    def instancia(cls):
+        """Retorna o sincronizador da aplicação (criado na thread da interface)."""
+        if cls._instancia is None:
+            cls._instancia = cls()
+        return cls._instancia
+
+    def agendar(self):
+        """Envia as gravações pendentes assim que possível."""
+        if self._em_andamento:
+            self._repetir = True
+            return
+        self._timer.stop()
+        self._em_andamento = True
+        self._repetir = False
+        GerenciadorTarefas.instancia().submeter(SincronizacaoService.sincronizar,
+                                                ao_concluir=self._ao_concluir,
+                                                ao_falhar=lambda erro: self._ao_concluir(None))
+
+    def _ao_concluir(self, resultado):
+        """Encadeia a próxima execução ou espera antes de tentar de novo."""
+        self._em_andamento = False
+        if resultado is not None:
+            self.sincronizado.emit(resultado)
+
+        falhou = resultado is None or resultado['offline'] or (resultado['pendentes'] and not resultado['enviadas'])
+        if falhou and not self._repetir:
+            self._timer.start(self._espera)
+            self._espera = min(self._espera * 2, self.ESPERA_MAXIMA)
+            return
+
+        self._espera = self.ESPERA_INICIAL
+        if self._repetir or resultado['pendentes']:
+            self.agendar()
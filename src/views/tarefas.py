@@ -0,0 +1,226 @@
+"""
+Execução de chamadas aos modelos fora da thread da interface.
+"""
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+class _TarefaSinais(QObject):
+    """Sinais emitidos por uma tarefa ao terminar (entregues na thread da interface)."""
+    concluida = pyqtSignal(object, object)  # resultado, erro (None se não houve erro)
+
+class _Tarefa(QRunnable):
+    """Executa uma chamada em uma thread do pool e guarda as requisições que aguardam o resultado."""
+
+    def __init__(self, chave, funcao, args, kwargs):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.chave = chave
+        self.funcao = funcao
+        self.args = args
+        self.kwargs = kwargs
+        self.requisicoes = []
+        self.sinais = _TarefaSinais()
+
+    def run(self):
+        try:
+            resultado, erro = self.funcao(*self.args, **self.kwargs), None
+        except Exception as e:
+            nome = getattr(self.funcao, '__qualname__', repr(self.funcao))
+            print(f"Erro ao executar '{nome}' em segundo plano: {e}")
+            resultado, erro = None, e
+        self.sinais.concluida.emit(resultado, erro)
+
+class Requisicao:
+    """Pedido de execução feito por uma view; pode ser cancelado enquanto não termina."""
+
+    def __init__(self, ao_concluir=None, ao_falhar=None):
+        self.ao_concluir = ao_concluir
+        self.ao_falhar = ao_falhar
+        self.cancelada = False
+        self.concluida = False
+        self._tarefa = None
+
+    @property
+    def pendente(self):
+        return not self.cancelada and not self.concluida
+
+    def cancelar(self):
+        """Descarta o resultado; a tarefa é retirada do pool se ninguém mais a aguarda."""
+        if self.pendente:
+            self.cancelada = True
+            GerenciadorTarefas.instancia()._requisicao_cancelada(self)
+
+class GerenciadorTarefas(QObject):
+    """Pool de threads compartilhado por todas as views para chamadas ao banco.
+
+    Cada thread do pool mantém a própria conexão (DatabaseConnection guarda uma
+    conexão por thread), então as threads não expiram: o pool funciona como um
+    pool fixo de MAX_CONEXOES conexões reaproveitadas entre as chamadas.
+
+    Chamadas iguais (mesma função e mesmos argumentos) feitas enquanto uma delas
+    ainda está em andamento são agrupadas em uma única execução, e o resultado é
+    entregue a todas as requisições.
+    """
+
+    # Threads do pool, e portanto conexões simultâneas com o banco
+    MAX_CONEXOES = 4
+
+    _instancia = None
+
+    def __init__(self):
+        super().__init__()
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(self.MAX_CONEXOES)
+        self._pool.setExpiryTimeout(-1)
+        self._em_andamento = {}
+        self._tarefas = set()
+
+    @classmethod
+    def instancia(cls):
+        """Retorna o gerenciador da aplicação (criado na thread da interface)."""
+        if cls._instancia is None:
+            cls._instancia = cls()
+        return cls._instancia
+
+    def submeter(self, funcao, args=(), kwargs=None, ao_concluir=None, ao_falhar=None):
+        """Agenda funcao(*args, **kwargs) no pool.
+
+        Args:
+            funcao: Chamada a executar (normalmente um método de modelo)
+            args, kwargs: Argumentos da chamada
+            ao_concluir: Recebe o resultado, na thread da interface
+            ao_falhar: Recebe a exceção, na thread da interface
+
+        Returns:
+            Requisicao que pode ser cancelada
+        """
+        kwargs = kwargs or {}
+        requisicao = Requisicao(ao_concluir, ao_falhar)
+        chave = self._chave(funcao, args, kwargs)
+
+        tarefa = self._em_andamento.get(chave) if chave is not None else None
+        if tarefa is None:
+            tarefa = _Tarefa(chave, funcao, args, kwargs)
+            tarefa.sinais.concluida.connect(
+                lambda resultado, erro, tarefa=tarefa: self._ao_concluir(tarefa, resultado, erro))
+            if chave is not None:
+                self._em_andamento[chave] = tarefa
+            self._tarefas.add(tarefa)
+            self._pool.start(tarefa)
+
+        requisicao._tarefa = tarefa
+        tarefa.requisicoes.append(requisicao)
+        return requisicao
+
+    def aguardar(self, milissegundos=-1):
+        """Espera o fim das tarefas em execução (usado ao encerrar a aplicação)."""
+        return self._pool.waitForDone(milissegundos)
+
+    def _ao_concluir(self, tarefa, resultado, erro):
+        """Entrega o resultado às requisições que ainda o aguardam."""
+        self._descartar(tarefa)
+        for requisicao in tarefa.requisicoes:
+            if not requisicao.pendente:
+                continue
+            requisicao.concluida = True
+            try:
+                if erro is None:
+                    if requisicao.ao_concluir:
+                        requisicao.ao_concluir(resultado)
+                elif requisicao.ao_falhar:
+                    requisicao.ao_falhar(erro)
+            except Exception as e:
+                print(f"Erro ao processar resultado de tarefa: {e}")
+
+    def _requisicao_cancelada(self, requisicao):
+        """Retira a tarefa do pool se ela ainda não começou e ninguém mais a aguarda."""
+        tarefa = requisicao._tarefa
+        if tarefa is None or any(r.pendente for r in tarefa.requisicoes):
+            return
+        try:
+            retirada = self._pool.tryTake(tarefa)
+        except RuntimeError:
+            # Pool já destruído (views destruídas depois dele ao encerrar a aplicação)
+            return
+        # Uma tarefa já iniciada termina normalmente; o resultado é apenas ignorado
+        if retirada:
+            self._descartar(tarefa)
+        elif self._em_andamento.get(tarefa.chave) is tarefa:
+            # Nova chamada igual deve executar de novo em vez de aguardar um resultado descartado
+            del self._em_andamento[tarefa.chave]
+
+    def _descartar(self, tarefa):
+        """Remove a tarefa dos registros do gerenciador."""
+        if tarefa.chave is not None and self._em_andamento.get(tarefa.chave) is tarefa:
+            del self._em_andamento[tarefa.chave]
+        self._tarefas.discard(tarefa)
+
+    @staticmethod
+    def _chave(funcao, args, kwargs):
+        """Chave que identifica chamadas iguais (None se os argumentos não forem comparáveis)."""
+        try:
+            chave = (funcao, GerenciadorTarefas._congelar(args), GerenciadorTarefas._congelar(kwargs))
+            hash(chave)
+            return chave
+        except TypeError:
+            return None
+
+    @staticmethod
+    def _congelar(valor):
+        """Converte dicionários, listas e conjuntos em tuplas para usar como chave."""
+        if isinstance(valor, dict):
+            return tuple(sorted((k, GerenciadorTarefas._congelar(v)) for k, v in valor.items()))
+        if isinstance(valor, (list, tuple)):
+            return tuple(GerenciadorTarefas._congelar(v) for v in valor)
+        if isinstance(valor, (set, frozenset)):
+            return frozenset(valor)
+        return valor
+
+class ExecutorTarefas(QObject):
+    """Executor usado por uma view, com um canal por tipo de carga.
+
+    Uma nova requisição em um canal cancela a anterior do mesmo canal, então
+    ao trocar filtros só o resultado da consulta mais recente chega à tela.
+    Todas as requisições são canceladas quando a view é destruída.
+    """
+
+    def __init__(self, parent):
+        super().__init__(parent)
+        self._canais = {}
+        parent.destroyed.connect(self.cancelar_todas)
+
+    def executar(self, canal, funcao, *args, ao_concluir=None, ao_falhar=None, **kwargs):
+        """Executa funcao(*args, **kwargs) em segundo plano no canal informado.
+
+        Args:
+            canal: Nome do canal (ex.: 'transacoes'); None para não cancelar requisições anteriores
+            funcao: Chamada a executar
+            ao_concluir: Recebe o resultado, na thread da interface
+            ao_falhar: Recebe a exceção, na thread da interface
+
+        Returns:
+            Requisicao
+        """
+        if canal is not None:
+            self.cancelar(canal)
+
+        requisicao = GerenciadorTarefas.instancia().submeter(funcao, args, kwargs, ao_concluir, ao_falhar)
+        if canal is not None:
+            self._canais[canal] = requisicao
+        return requisicao
+
+    def em_andamento(self, canal):
+        """Indica se há uma requisição pendente no canal."""
+        requisicao = self._canais.get(canal)
+        return requisicao is not None and requisicao.pendente
+
+    def cancelar(self, canal):
+        """Cancela a requisição pendente do canal."""
+        requisicao = self._canais.pop(canal, None)
+        if requisicao:
+            requisicao.cancelar()
+
+    def cancelar_todas(self):
+        """Cancela todas as requisições pendentes deste executor."""
+        for canal in list(self._canais):
+            self.cancelar(canal)
@@ -6,15 +6,20 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                             QLabel, QLineEdit, QTableWidget, QTableWidgetItem,
                             QMessageBox, QDialog, QFormLayout, QComboBox, 
                             QDialogButtonBox, QHeaderView, QDateEdit, QTextEdit,
-                            QTabWidget, QGroupBox, QRadioButton)
-from PyQt5.QtCore import Qt, pyqtSignal, QDate, QLocale
+                            QTabWidget, QGroupBox, QRadioButton, QMenu)
+from PyQt5.QtCore import Qt, pyqtSignal, QDate, QLocale, QTimer
 from PyQt5.QtGui import QDoubleValidator
 from decimal import Decimal
 from datetime import datetime, date
+from src.models.alteracoes import Alteracoes
 from src.models.transacao import Transacao
 from src.models.conta import Conta
 from src.models.categoria import Categoria
 from src.models.meio_pagamento import MeioPagamento
+from src.services.categorizacao_service import CategorizacaoService
+from src.services.sincronizacao_service import SincronizacaoService
+from src.views.sincronizacao import SincronizadorDiario
+from src.views.tarefas import ExecutorTarefas
 
 class TransacaoDialog(QDialog):
     """Diálogo para criar ou editar uma transação."""
@@ -26,6 +31,12 @@ class TransacaoDialog(QDialog):
         # Configurar localização para Brasil (vírgula como separador decimal)
         self.locale = QLocale(QLocale.Portuguese, QLocale.Brazil)
         QLocale.setDefault(self.locale)
+        self.tarefas = ExecutorTarefas(self)
+        # Seleções aplicadas quando as listas carregadas em segundo plano chegarem
+        self._conta_desejada = transacao.conta_id if transacao else None
+        self._conta_destino_desejada = transacao.conta_destino_id if transacao else None
+        self._meio_pagamento_desejado = transacao.meio_pagamento_id if transacao else None
+        self._categoria_desejada = transacao.categoria_id if transacao else None
         self.setup_ui()
         
     def setup_ui(self):
@@ -92,34 +103,16 @@ class TransacaoDialog(QDialog):
         # Conta (para receitas/despesas) ou Conta Origem (para transferências)
         self.conta_label = QLabel("Conta:")
         self.conta_combo = QComboBox(self)
-        self.carregar_contas()
-        if self.transacao and self.transacao.conta_id:
-            index = self.conta_combo.findData(self.transacao.conta_id)
-            if index >= 0:
-                self.conta_combo.setCurrentIndex(index)
         
         # Conta Destino (apenas para transferências)
         self.conta_destino_label = QLabel("Conta Destino:")
         self.conta_destino_combo = QComboBox(self)
-        self.carregar_contas_destino()
-        if self.transacao and self.transacao.conta_destino_id:
-            index = self.conta_destino_combo.findData(self.transacao.conta_destino_id)
-            if index >= 0:
-                self.conta_destino_combo.setCurrentIndex(index)
         
-        # Meio de Pagamento
+        # Meio de Pagamento (carregado com as contas, para a conta selecionada)
         self.meio_pagamento_label = QLabel("Meio de Pagamento:")
         self.meio_pagamento_combo = QComboBox(self)
         self.conta_combo.currentIndexChanged.connect(self.atualizar_meios_pagamento)
         
-        # Atualizar meios de pagamento iniciais
-        self.atualizar_meios_pagamento()
-        
-        if self.transacao and self.transacao.meio_pagamento_id:
-            index = self.meio_pagamento_combo.findData(self.transacao.meio_pagamento_id)
-            if index >= 0:
-                self.meio_pagamento_combo.setCurrentIndex(index)
-        
         # Descrição do Pagamento
         self.descricao_pagamento_edit = QLineEdit(self)
         if self.transacao and self.transacao.descricao_pagamento:
@@ -136,15 +129,6 @@ class TransacaoDialog(QDialog):
         if self.transacao and self.transacao.observacao:
             self.observacao_edit.setText(self.transacao.observacao)
         
-        # Carregar categorias iniciais
-        self.atualizar_categorias()
-        
-        # Se for edição, selecionar categoria
-        if self.transacao and self.transacao.categoria_id:
-            index = self.categoria_combo.findData(self.transacao.categoria_id)
-            if index >= 0:
-                self.categoria_combo.setCurrentIndex(index)
-        
         # Adicionar campos ao layout
         layout.addRow("Descrição:", self.descricao_edit)
         layout.addRow(self.tipo_group)
@@ -164,40 +148,96 @@ class TransacaoDialog(QDialog):
         buttons.rejected.connect(self.reject)
         layout.addRow(buttons)
         
+        # Sem as contas carregadas não há como gravar
+        self.ok_button = buttons.button(QDialogButtonBox.Ok)
+        self.ok_button.setEnabled(False)
+        
         self.setLayout(layout)
         
-        # Atualizar interface inicial
+        # Atualizar interface inicial (carrega as categorias do tipo) e carregar as contas
         self.atualizar_interface_tipo()
+        self.carregar_contas()
+        
+        # Em novas transações, as regras de categorização sugerem os campos pela descrição
+        if self.transacao is None:
+            self.descricao_edit.editingFinished.connect(self.aplicar_regras)
+            self.local_transacao_edit.editingFinished.connect(self.aplicar_regras)
     
-    def carregar_contas(self):
-        """Carrega as contas disponíveis."""
-        self.conta_combo.clear()
-        contas = Conta.listar_todas(apenas_ativas=True)
+    def aplicar_regras(self):
+        """Preenche conta, meio de pagamento e categoria pela regra que casar com a descrição."""
+        regra = CategorizacaoService.obter().classificar(
+            self.descricao_edit.text().strip(), self.local_transacao_edit.text().strip())
+        if regra is None:
+            return
         
-        for conta in contas:
-            self.conta_combo.addItem(f"{conta.nome} (R$ {float(conta.saldo_atual):.2f})", conta.id)
+        # A conta vem primeiro, pois define os meios de pagamento disponíveis.
+        # Listas ainda carregando recebem a seleção quando chegarem.
+        if regra.conta_id:
+            if self.tarefas.em_andamento('contas'):
+                self._conta_desejada = regra.conta_id
+            else:
+                self._selecionar(self.conta_combo, regra.conta_id)
+        if regra.meio_pagamento_id:
+            if self.tarefas.em_andamento('contas') or self.tarefas.em_andamento('meios_pagamento'):
+                self._meio_pagamento_desejado = regra.meio_pagamento_id
+            else:
+                self._selecionar(self.meio_pagamento_combo, regra.meio_pagamento_id)
+        if regra.categoria_id:
+            if self.tarefas.em_andamento('categorias'):
+                self._categoria_desejada = regra.categoria_id
+            else:
+                self._selecionar(self.categoria_combo, regra.categoria_id)
+    
+    @staticmethod
+    def _selecionar(combo, valor):
+        """Seleciona no combo o item com o valor informado, se existir."""
+        index = combo.findData(valor) if valor else -1
+        if index >= 0:
+            combo.setCurrentIndex(index)
+    
+    def carregar_contas(self):
+        """Carrega em segundo plano as contas disponíveis (origem e destino)."""
+        self.tarefas.executar('contas', Conta.listar_todas, apenas_ativas=True,
+                              ao_concluir=self._exibir_contas,
+                              ao_falhar=lambda erro: QMessageBox.critical(
+                                  self, "Erro", "Não foi possível carregar as contas."))
     
-    def carregar_contas_destino(self):
-        """Carrega as contas disponíveis para o campo destino."""
-        self.conta_destino_combo.clear()
-        contas = Conta.listar_todas(apenas_ativas=True)
+    def _exibir_contas(self, contas):
+        """Preenche os combos de conta e destino e carrega os meios de pagamento da conta selecionada."""
+        self.conta_combo.blockSignals(True)
+        for combo in (self.conta_combo, self.conta_destino_combo):
+            combo.clear()
+            for conta in contas:
+                combo.addItem(f"{conta.nome} (R$ {float(conta.saldo_atual):.2f})", conta.id)
+        self._selecionar(self.conta_combo, self._conta_desejada)
+        self._selecionar(self.conta_destino_combo, self._conta_destino_desejada)
+        self._conta_desejada = self._conta_destino_desejada = None
+        self.conta_combo.blockSignals(False)
         
-        for conta in contas:
-            self.conta_destino_combo.addItem(f"{conta.nome} (R$ {float(conta.saldo_atual):.2f})", conta.id)
+        self.atualizar_meios_pagamento()
+        self.ok_button.setEnabled(True)
     
     def atualizar_meios_pagamento(self):
-        """Atualiza os meios de pagamento disponíveis para a conta selecionada."""
+        """Carrega em segundo plano os meios de pagamento da conta selecionada."""
         self.meio_pagamento_combo.clear()
         conta_id = self.conta_combo.currentData()
         
         if conta_id:
-            meios_pagamento = MeioPagamento.listar_todos(apenas_ativos=True, conta_id=conta_id)
-            
-            for meio in meios_pagamento:
-                self.meio_pagamento_combo.addItem(f"{meio.nome} ({meio.tipo})", meio.id)
+            self.tarefas.executar('meios_pagamento', MeioPagamento.listar_todos,
+                                  apenas_ativos=True, conta_id=conta_id,
+                                  ao_concluir=self._exibir_meios_pagamento)
+        else:
+            self.tarefas.cancelar('meios_pagamento')
+    
+    def _exibir_meios_pagamento(self, meios_pagamento):
+        """Preenche o combo de meios de pagamento."""
+        for meio in meios_pagamento:
+            self.meio_pagamento_combo.addItem(f"{meio.nome} ({meio.tipo})", meio.id)
+        self._selecionar(self.meio_pagamento_combo, self._meio_pagamento_desejado)
+        self._meio_pagamento_desejado = None
     
     def atualizar_categorias(self):
-        """Atualiza as categorias disponíveis com base no tipo selecionado."""
+        """Carrega em segundo plano as categorias do tipo selecionado."""
         self.categoria_combo.clear()
         
         if self.receita_radio.isChecked():
@@ -207,9 +247,11 @@ class TransacaoDialog(QDialog):
         else:  # transferencia_radio
             tipo = 'T'
         
-        categorias = Categoria.listar_todas(apenas_ativas=True, tipo=tipo)
-        
-        # Organizar categorias por hierarquia
+        self.tarefas.executar('categorias', Categoria.listar_todas, apenas_ativas=True, tipo=tipo,
+                              ao_concluir=self._exibir_categorias)
+    
+    def _exibir_categorias(self, categorias):
+        """Preenche o combo de categorias organizadas por hierarquia."""
         categorias_principais = [c for c in categorias if not c.categoria_pai_id]
         
         for cat in categorias_principais:
@@ -219,6 +261,9 @@ class TransacaoDialog(QDialog):
             subcategorias = [c for c in categorias if c.categoria_pai_id == cat.id]
             for subcat in subcategorias:
                 self.categoria_combo.addItem(f"  └─ {subcat.nome}", subcat.id)
+        
+        self._selecionar(self.categoria_combo, self._categoria_desejada)
+        self._categoria_desejada = None
     
     def atualizar_interface_tipo(self):
         """Atualiza a interface com base no tipo selecionado."""
@@ -286,12 +331,118 @@ class TransacaoDialog(QDialog):
             'observacao': observacao
         }
 
+class AlteracaoLoteDialog(QDialog):
+    """Diálogo para escolher o novo valor de um campo nas transações selecionadas."""
+
+    TITULOS = {
+        'categoria_id': "Alterar Categoria",
+        'conta_id': "Alterar Conta",
+        'meio_pagamento_id': "Alterar Meio de Pagamento",
+        'data_transacao': "Alterar Data"
+    }
+
+    def __init__(self, campo, quantidade, parent=None):
+        super().__init__(parent)
+        self.campo = campo
+        self.tarefas = ExecutorTarefas(self)
+        self.setWindowTitle(self.TITULOS[campo])
+        self.setMinimumWidth(350)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel(f"{quantidade} transação(ões) selecionada(s)."))
+
+        form_layout = QFormLayout()
+        if campo == 'data_transacao':
+            self.editor = QDateEdit()
+            self.editor.setCalendarPopup(True)
+            self.editor.setDate(QDate.currentDate())
+            form_layout.addRow("Nova data:", self.editor)
+        else:
+            self.editor = QComboBox()
+            form_layout.addRow("Novo valor:", self.editor)
+        layout.addLayout(form_layout)
+
+        if campo in ('conta_id', 'meio_pagamento_id'):
+            layout.addWidget(QLabel("Transferências selecionadas não são alteradas."))
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+        if campo != 'data_transacao':
+            # O OK fica desabilitado até as opções chegarem
+            self.ok_button = buttons.button(QDialogButtonBox.Ok)
+            self.ok_button.setEnabled(False)
+            self.carregar_opcoes()
+
+    def carregar_opcoes(self):
+        """Carrega em segundo plano as opções do campo escolhido."""
+        self.tarefas.executar('opcoes', self._listar_opcoes, self.campo,
+                              ao_concluir=self._exibir_opcoes,
+                              ao_falhar=lambda erro: QMessageBox.critical(
+                                  self, "Erro", "Não foi possível carregar as opções."))
+
+    @staticmethod
+    def _listar_opcoes(campo):
+        """Lista as opções do campo como (texto, valor) (executado fora da thread da interface)."""
+        opcoes = []
+        if campo == 'categoria_id':
+            categorias = Categoria.listar_todas(apenas_ativas=True)
+            for cat in [c for c in categorias if not c.categoria_pai_id]:
+                opcoes.append((cat.nome, cat.id))
+                for subcat in [c for c in categorias if c.categoria_pai_id == cat.id]:
+                    opcoes.append((f"  └─ {subcat.nome}", subcat.id))
+        elif campo == 'conta_id':
+            for conta in Conta.listar_todas(apenas_ativas=True):
+                opcoes.append((conta.nome, conta.id))
+        else:
+            opcoes.append(("Nenhum", None))
+            for meio in MeioPagamento.listar_todos(apenas_ativos=True):
+                opcoes.append((f"{meio.nome} ({meio.tipo})", meio.id))
+        return opcoes
+
+    def _exibir_opcoes(self, opcoes):
+        """Preenche o combo com as opções carregadas."""
+        for texto, valor in opcoes:
+            self.editor.addItem(texto, valor)
+        self.ok_button.setEnabled(True)
+
+    def get_valor(self):
+        """Retorna o novo valor escolhido."""
+        if self.campo == 'data_transacao':
+            return self.editor.date().toPyDate()
+        return self.editor.currentData()
+
 class TransactionsView(QWidget):
     """Widget para gestão de transações."""
     
+    # Espera (ms) após a última alteração de tipo ou data antes de aplicar os filtros
+    ATRASO_FILTRO_MS = 300
+    
+    # Máximo de resultados da busca textual
+    LIMITE_BUSCA = 200
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Gestão de Transações")
+        self.tarefas = ExecutorTarefas(self)
+        
+        # Linhas da última consulta ao banco, os filtros usados nela e a versão do banco
+        # em que foram lidas (None para a busca textual, que não é atualizada por alterações)
+        self._transacoes_carregadas = []
+        self._filtros_carregados = None
+        self._versao_carregada = None
+        
+        # Filtragem ao vivo: cada alteração reinicia o timer e só a última é aplicada
+        self._timer_filtro = QTimer(self)
+        self._timer_filtro.setSingleShot(True)
+        self._timer_filtro.setInterval(self.ATRASO_FILTRO_MS)
+        self._timer_filtro.timeout.connect(self.aplicar_filtros)
+        
+        # Gravações vão para o diário local; a tabela é recarregada quando chegam ao servidor
+        SincronizadorDiario.instancia().sincronizado.connect(self._ao_sincronizar)
+        
         self.setup_ui()
         self.carregar_transacoes()
         
@@ -308,6 +459,7 @@ class TransactionsView(QWidget):
         self.tipo_combo.addItem("Receitas", "R")
         self.tipo_combo.addItem("Despesas", "D")
         self.tipo_combo.addItem("Transferências", "T")
+        self.tipo_combo.currentIndexChanged.connect(self._timer_filtro.start)
         filtros_layout.addWidget(QLabel("Tipo:"))
         filtros_layout.addWidget(self.tipo_combo)
         
@@ -320,14 +472,25 @@ class TransactionsView(QWidget):
         self.data_fim_edit.setCalendarPopup(True)
         self.data_fim_edit.setDate(QDate.currentDate())
         
+        self.data_inicio_edit.dateChanged.connect(self._timer_filtro.start)
+        self.data_fim_edit.dateChanged.connect(self._timer_filtro.start)
+        
         filtros_layout.addWidget(QLabel("De:"))
         filtros_layout.addWidget(self.data_inicio_edit)
         filtros_layout.addWidget(QLabel("Até:"))
         filtros_layout.addWidget(self.data_fim_edit)
         
+        # Busca por texto em descrição, local e observação
+        self.busca_edit = QLineEdit()
+        self.busca_edit.setPlaceholderText("Descrição, local ou observação")
+        self.busca_edit.setClearButtonEnabled(True)
+        self.busca_edit.returnPressed.connect(self.aplicar_filtros)
+        filtros_layout.addWidget(QLabel("Buscar:"))
+        filtros_layout.addWidget(self.busca_edit)
+        
         # Botão para aplicar filtros
         self.btn_filtrar = QPushButton("Filtrar")
-        self.btn_filtrar.clicked.connect(self.carregar_transacoes)
+        self.btn_filtrar.clicked.connect(self.aplicar_filtros)
         filtros_layout.addWidget(self.btn_filtrar)
         
         filtros_layout.addStretch()
@@ -352,6 +515,7 @@ class TransactionsView(QWidget):
         
         # Configurar comportamento da tabela
         self.tabela_transacoes.setSelectionBehavior(QTableWidget.SelectRows)
+        self.tabela_transacoes.setSelectionMode(QTableWidget.ExtendedSelection)
         self.tabela_transacoes.setEditTriggers(QTableWidget.NoEditTriggers)
         layout.addWidget(self.tabela_transacoes)
         
@@ -389,109 +553,222 @@ class TransactionsView(QWidget):
         self.btn_excluir = QPushButton("Excluir")
         self.btn_excluir.clicked.connect(self.excluir_transacao)
         btn_layout.addWidget(self.btn_excluir)
-        
+
+        # Ações aplicadas de uma vez a todas as transações selecionadas
+        self.btn_lote = QPushButton("Ações em Lote")
+        menu_lote = QMenu(self.btn_lote)
+        for campo, titulo in AlteracaoLoteDialog.TITULOS.items():
+            menu_lote.addAction(titulo, lambda campo=campo: self.alterar_em_lote(campo))
+        menu_lote.addSeparator()
+        menu_lote.addAction("Excluir Selecionadas", self.excluir_em_lote)
+        self.btn_lote.setMenu(menu_lote)
+        btn_layout.addWidget(self.btn_lote)
+
         self.btn_atualizar = QPushButton("Atualizar")
-        self.btn_atualizar.clicked.connect(self.carregar_transacoes)
+        self.btn_atualizar.clicked.connect(self.atualizar_transacoes)
         btn_layout.addWidget(self.btn_atualizar)
         
         layout.addLayout(btn_layout)
         
         self.setLayout(layout)
     
+    def aplicar_filtros(self):
+        """Aplica os filtros atuais, reaproveitando as linhas já carregadas quando possível.
+        
+        Se o tipo e o período pedidos estiverem contidos nos da última consulta,
+        as linhas carregadas são filtradas localmente, sem consultar o banco.
+        """
+        self._timer_filtro.stop()
+        filtros = self._filtros_atuais()
+        
+        if self._contido_na_carga(filtros):
+            # Uma consulta mais ampla ainda em andamento não deve sobrescrever o resultado local
+            self.tarefas.cancelar('transacoes')
+            self._exibir_transacoes(self._filtrar_carregadas(filtros))
+        else:
+            self.carregar_transacoes()
+    
     def carregar_transacoes(self):
-        """Carrega as transações do banco de dados e exibe na tabela."""
-        # Construir filtros
-        filtros = {}
+        """Carrega as transações do banco em segundo plano e exibe na tabela.
+        
+        Uma nova carga cancela a anterior, então só o resultado dos filtros mais
+        recentes chega à tabela.
+        """
+        self._timer_filtro.stop()
+        filtros = self._filtros_atuais()
+        
+        consulta = {
+            'data_inicio': filtros['data_inicio'],
+            'data_fim': filtros['data_fim'],
+            'ordenacao': "data_transacao DESC"
+        }
+        if filtros['tipo']:
+            consulta['tipo'] = filtros['tipo']
         
-        # Filtro por tipo
-        tipo = self.tipo_combo.currentData()
-        if tipo:
-            filtros['tipo'] = tipo
+        def ao_concluir(resultado):
+            transacoes, self._versao_carregada = resultado
+            self._transacoes_carregadas = transacoes
+            self._filtros_carregados = filtros
+            self._exibir_transacoes(transacoes)
         
-        # Filtro por data
-        data_inicio = self.data_inicio_edit.date().toPyDate()
-        data_fim = self.data_fim_edit.date().toPyDate()
-        filtros['data_inicio'] = data_inicio
-        filtros['data_fim'] = data_fim
+        self.tarefas.executar('transacoes', self._listar, consulta, filtros['texto'], self.LIMITE_BUSCA,
+                              ao_concluir=ao_concluir)
+    
+    @staticmethod
+    def _listar(consulta, texto, limite):
+        """Busca as transações (pela busca textual, se houver termos) fora da thread da interface.
+        
+        Returns:
+            tuple: (linhas, versão do banco lida antes delas; None para a busca textual)
+        """
+        if texto:
+            return Transacao.pesquisar(texto, consulta, limite), None
+        versao = Alteracoes.versao_atual()
+        return Transacao.listar_linhas(consulta), versao
+    
+    def atualizar_transacoes(self):
+        """Atualiza a tabela aplicando às linhas carregadas só as transações alteradas desde a carga.
+        
+        Recarrega tudo quando não há versão (busca textual) ou os filtros saíram do
+        que foi carregado.
+        """
+        filtros = self._filtros_atuais()
+        if self._versao_carregada is None or filtros['texto'] or not self._contido_na_carga(filtros):
+            self.carregar_transacoes()
+            return
+        
+        self._timer_filtro.stop()
+        self.tarefas.executar('transacoes', self._buscar_alteracoes, self._versao_carregada,
+                              ao_concluir=lambda resultado: self._aplicar_alteracoes(resultado, filtros))
+    
+    @staticmethod
+    def _buscar_alteracoes(versao):
+        """Busca as linhas alteradas desde a versão (executado fora da thread da interface).
+        
+        Retorna None, pedindo a recarga completa, se categorias, contas ou meios de
+        pagamento mudaram, pois seus nomes vêm nas linhas carregadas.
+        """
+        if Alteracoes.houve_alteracoes(versao, ('categorias', 'conta_dimensao', 'meios_pagamento')):
+            return None
+        return Transacao.linhas_alteradas_desde(versao)
+    
+    def _aplicar_alteracoes(self, resultado, filtros):
+        """Substitui nas linhas carregadas as transações alteradas e remove as excluídas."""
+        if resultado is None:
+            self.carregar_transacoes()
+            return
         
-        # Ordenação
-        filtros['ordenacao'] = "data_transacao DESC"
+        alteradas, excluidas, versao = resultado
+        self._versao_carregada = versao
+        if not (alteradas or excluidas):
+            return
         
-        # Buscar transações
-        transacoes = Transacao.listar_todas(filtros)
+        removidas = set(excluidas) | {transacao.id for transacao in alteradas}
+        linhas = [transacao for transacao in self._transacoes_carregadas if transacao.id not in removidas]
+        linhas.extend(self._filtrar_carregadas(self._filtros_carregados, alteradas))
+        linhas.sort(key=lambda transacao: (transacao.data_transacao, transacao.id), reverse=True)
         
-        # Limpar tabela
+        self._transacoes_carregadas = linhas
+        self._exibir_transacoes(self._filtrar_carregadas(filtros))
+    
+    def _filtros_atuais(self):
+        """Lê os filtros da interface."""
+        return {
+            'tipo': self.tipo_combo.currentData(),
+            'data_inicio': self.data_inicio_edit.date().toPyDate(),
+            'data_fim': self.data_fim_edit.date().toPyDate(),
+            'texto': self.busca_edit.text().strip()
+        }
+    
+    def _contido_na_carga(self, filtros):
+        """Indica se o resultado dos filtros é um subconjunto das linhas já carregadas."""
+        carregados = self._filtros_carregados
+        if carregados is None or filtros['texto'] != carregados['texto']:
+            return False
+        
+        # A busca textual é limitada; com o limite atingido podem faltar linhas do período menor
+        if carregados['texto'] and len(self._transacoes_carregadas) >= self.LIMITE_BUSCA:
+            return False
+        
+        return (carregados['tipo'] in (None, filtros['tipo']) and
+                carregados['data_inicio'] <= filtros['data_inicio'] and
+                filtros['data_fim'] <= carregados['data_fim'])
+    
+    def _filtrar_carregadas(self, filtros, transacoes=None):
+        """Filtra as linhas já carregadas (ou as informadas) por tipo e período, mantendo a ordem."""
+        resultado = []
+        for transacao in self._transacoes_carregadas if transacoes is None else transacoes:
+            data = transacao.data_transacao
+            if isinstance(data, datetime):
+                data = data.date()
+            if filtros['tipo'] and transacao.tipo != filtros['tipo']:
+                continue
+            if filtros['data_inicio'] <= data <= filtros['data_fim']:
+                resultado.append(transacao)
+        return resultado
+    
+    def _exibir_transacoes(self, transacoes):
+        """Exibe as transações na tabela e atualiza o resumo."""
+        # Redimensionar a tabela uma vez e redesenhar só ao final
+        self.tabela_transacoes.setUpdatesEnabled(False)
         self.tabela_transacoes.setRowCount(0)
+        self.tabela_transacoes.setRowCount(len(transacoes))
         
         # Variáveis para calcular totais
         total_receitas = Decimal('0')
         total_despesas = Decimal('0')
         total_transferencias = Decimal('0')
         
-        # Carregar dados na tabela
-        for transacao in transacoes:
-            row = self.tabela_transacoes.rowCount()
-            self.tabela_transacoes.insertRow(row)
-            
-            # Formatar data
-            data_str = transacao.data_transacao.strftime("%d/%m/%Y")
-            
-            # Obter nome da categoria
-            categoria_nome = "N/A"
-            if transacao.categoria:
-                categoria_nome = transacao.categoria.nome
-            
-            # Obter nome da conta
-            conta_nome = "N/A"
-            if transacao.conta:
-                conta_nome = transacao.conta.nome
-            
-            # Obter nome da conta destino
-            conta_destino_nome = "N/A"
-            if transacao.conta_destino:
-                conta_destino_nome = transacao.conta_destino.nome
-            
-            # Obter nome do meio de pagamento
-            meio_pagamento_nome = "N/A"
-            if transacao.meio_pagamento:
-                meio_pagamento_nome = transacao.meio_pagamento.nome
-            
-            # Atualizar totais
-            if transacao.tipo == 'R':
-                total_receitas += transacao.valor
-            elif transacao.tipo == 'D':
-                total_despesas += transacao.valor
-            else:  # 'T'
-                total_transferencias += transacao.valor
-            
-            # Adicionar dados à tabela
-            self.tabela_transacoes.setItem(row, 0, QTableWidgetItem(str(transacao.id)))
-            self.tabela_transacoes.setItem(row, 1, QTableWidgetItem(data_str))
-            self.tabela_transacoes.setItem(row, 2, QTableWidgetItem(transacao.descricao))
-            
-            # Tipo da transação
-            tipo_display = {"R": "Receita", "D": "Despesa", "T": "Transferência"}
-            self.tabela_transacoes.setItem(row, 3, QTableWidgetItem(tipo_display.get(transacao.tipo, transacao.tipo)))
-            
-            self.tabela_transacoes.setItem(row, 4, QTableWidgetItem(categoria_nome))
-            self.tabela_transacoes.setItem(row, 5, QTableWidgetItem(conta_nome))
-            self.tabela_transacoes.setItem(row, 6, QTableWidgetItem(conta_destino_nome))
-            self.tabela_transacoes.setItem(row, 7, QTableWidgetItem(meio_pagamento_nome))
-            
-            # Formatar valor com 2 casas decimais usando vírgula como separador
-            valor_str = f"R$ {float(transacao.valor):.2f}".replace('.', ',')
-            valor_item = QTableWidgetItem(valor_str)
-            valor_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-            
-            # Colorir valor conforme o tipo
-            if transacao.tipo == 'R':
-                valor_item.setForeground(Qt.darkGreen)
-            elif transacao.tipo == 'D':
-                valor_item.setForeground(Qt.darkRed)
-            else:  # 'T'
-                valor_item.setForeground(Qt.darkBlue)
+        try:
+            # Carregar dados na tabela
+            for row, transacao in enumerate(transacoes):
+                # Formatar data
+                data_str = transacao.data_transacao.strftime("%d/%m/%Y")
+                
+                # Nomes das referências já vêm resolvidos na consulta
+                categoria_nome = transacao.categoria_nome or "N/A"
+                conta_nome = transacao.conta_nome or "N/A"
+                conta_destino_nome = transacao.conta_destino_nome or "N/A"
+                meio_pagamento_nome = transacao.meio_pagamento_nome or "N/A"
+                
+                # Atualizar totais
+                if transacao.tipo == 'R':
+                    total_receitas += transacao.valor
+                elif transacao.tipo == 'D':
+                    total_despesas += transacao.valor
+                else:  # 'T'
+                    total_transferencias += transacao.valor
                 
-            self.tabela_transacoes.setItem(row, 8, valor_item)
+                # Adicionar dados à tabela
+                self.tabela_transacoes.setItem(row, 0, QTableWidgetItem(str(transacao.id)))
+                self.tabela_transacoes.setItem(row, 1, QTableWidgetItem(data_str))
+                self.tabela_transacoes.setItem(row, 2, QTableWidgetItem(transacao.descricao))
+                
+                # Tipo da transação
+                tipo_display = {"R": "Receita", "D": "Despesa", "T": "Transferência"}
+                self.tabela_transacoes.setItem(row, 3, QTableWidgetItem(tipo_display.get(transacao.tipo, transacao.tipo)))
+                
+                self.tabela_transacoes.setItem(row, 4, QTableWidgetItem(categoria_nome))
+                self.tabela_transacoes.setItem(row, 5, QTableWidgetItem(conta_nome))
+                self.tabela_transacoes.setItem(row, 6, QTableWidgetItem(conta_destino_nome))
+                self.tabela_transacoes.setItem(row, 7, QTableWidgetItem(meio_pagamento_nome))
+                
+                # Formatar valor com 2 casas decimais usando vírgula como separador
+                valor_str = f"R$ {float(transacao.valor):.2f}".replace('.', ',')
+                valor_item = QTableWidgetItem(valor_str)
+                valor_item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                
+                # Colorir valor conforme o tipo
+                if transacao.tipo == 'R':
+                    valor_item.setForeground(Qt.darkGreen)
+                elif transacao.tipo == 'D':
+                    valor_item.setForeground(Qt.darkRed)
+                else:  # 'T'
+                    valor_item.setForeground(Qt.darkBlue)
+                
+                self.tabela_transacoes.setItem(row, 8, valor_item)
+        finally:
+            self.tabela_transacoes.setUpdatesEnabled(True)
         
         # Atualizar resumo
         saldo_periodo = total_receitas - total_despesas
@@ -546,14 +823,12 @@ class TransactionsView(QWidget):
                 observacao=dados['observacao']
             )
             
-            if transacao.salvar():
-                self.carregar_transacoes()
-                if dados['tipo'] == 'T':
-                    QMessageBox.information(self, "Sucesso", "Transferência criada com sucesso! Duas transações foram geradas automaticamente.")
-                else:
-                    QMessageBox.information(self, "Sucesso", "Transação criada com sucesso!")
+            if dados['tipo'] == 'T':
+                mensagem = "Transferência criada com sucesso! Duas transações serão geradas automaticamente."
             else:
-                QMessageBox.critical(self, "Erro", "Erro ao criar transação.")
+                mensagem = "Transação criada com sucesso!"
+            self._enfileirar(lambda: SincronizacaoService.salvar_transacao(transacao), mensagem,
+                             "Erro ao criar transação.")
     
     def duplicar_transacao(self):
         """Duplica a transação selecionada."""
@@ -567,7 +842,11 @@ class TransactionsView(QWidget):
         transacao_id = int(self.tabela_transacoes.item(row, 0).text())
         
         # Buscar a transação no banco de dados
-        transacao_original = Transacao.buscar_por_id(transacao_id)
+        self.tarefas.executar('buscar_transacao', Transacao.buscar_por_id, transacao_id,
+                              ao_concluir=self._duplicar_transacao_carregada)
+    
+    def _duplicar_transacao_carregada(self, transacao_original):
+        """Abre o diálogo de duplicação a partir da transação buscada no banco."""
         if not transacao_original:
             QMessageBox.critical(self, "Erro", "Transação não encontrada.")
             return
@@ -624,11 +903,8 @@ class TransactionsView(QWidget):
             transacao_copia.observacao = dados['observacao']
             
             # Salvar a nova transação
-            if transacao_copia.salvar():
-                self.carregar_transacoes()
-                QMessageBox.information(self, "Sucesso", "Transação duplicada com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao duplicar transação.")
+            self._enfileirar(lambda: SincronizacaoService.salvar_transacao(transacao_copia),
+                             "Transação duplicada com sucesso!", "Erro ao duplicar transação.")
     
     def editar_transacao(self):
         """Abre o diálogo para editar a transação selecionada."""
@@ -641,8 +917,13 @@ class TransactionsView(QWidget):
         row = selected_rows[0].row()
         transacao_id = int(self.tabela_transacoes.item(row, 0).text())
         
-        # Buscar a transação no banco de dados
-        transacao = Transacao.buscar_por_id(transacao_id)
+        # Buscar a transação (no diário local, se houver gravação dela ainda não enviada, ou no banco)
+        self.tarefas.executar('buscar_transacao', SincronizacaoService.obter_transacao_para_edicao, transacao_id,
+                              ao_concluir=self._editar_transacao_carregada)
+    
+    def _editar_transacao_carregada(self, resultado):
+        """Abre o diálogo de edição da transação buscada."""
+        transacao, original = resultado
         if not transacao:
             QMessageBox.critical(self, "Erro", "Transação não encontrada.")
             return
@@ -688,11 +969,8 @@ class TransactionsView(QWidget):
             transacao.local_transacao = dados['local_transacao']
             transacao.observacao = dados['observacao']
             
-            if transacao.salvar():
-                self.carregar_transacoes()
-                QMessageBox.information(self, "Sucesso", "Transação atualizada com sucesso!")
-            else:
-                QMessageBox.critical(self, "Erro", "Erro ao atualizar transação.")
+            self._enfileirar(lambda: SincronizacaoService.salvar_transacao(transacao, original),
+                             "Transação atualizada com sucesso!", "Erro ao atualizar transação.")
     
     def excluir_transacao(self):
         """Exclui a transação selecionada."""
@@ -700,7 +978,11 @@ class TransactionsView(QWidget):
         if not selected_rows:
             QMessageBox.warning(self, "Aviso", "Selecione uma transação para excluir.")
             return
-        
+
+        if len(self._ids_selecionados()) > 1:
+            self.excluir_em_lote()
+            return
+
         # Confirmar exclusão
         resposta = QMessageBox.question(
             self, 
@@ -716,18 +998,71 @@ class TransactionsView(QWidget):
         row = selected_rows[0].row()
         transacao_id = int(self.tabela_transacoes.item(row, 0).text())
         
-        # Buscar a transação no banco de dados
-        transacao = Transacao.buscar_por_id(transacao_id)
-        if not transacao:
-            QMessageBox.critical(self, "Erro", "Transação não encontrada.")
+        # Transferências são excluídas com as duas transações
+        self._enfileirar(lambda: SincronizacaoService.excluir_transacao(transacao_id),
+                         "Transação excluída com sucesso!", "Erro ao excluir transação.")
+
+    def alterar_em_lote(self, campo):
+        """Altera um campo de todas as transações selecionadas (enviado ao servidor em um único comando)."""
+        ids = self._ids_selecionados()
+        if not ids:
+            QMessageBox.warning(self, "Aviso", "Selecione as transações que deseja alterar.")
+            return
+
+        dialog = AlteracaoLoteDialog(campo, len(ids), self)
+        if dialog.exec_() != QDialog.Accepted:
             return
+
+        valor = dialog.get_valor()
+        if valor is None and campo != 'meio_pagamento_id':
+            QMessageBox.warning(self, "Erro", "Selecione o novo valor.")
+            return
+
+        self._enfileirar(lambda: SincronizacaoService.alterar_transacoes(ids, {campo: valor}),
+                         f"Alteração de {len(ids)} transação(ões) gravada com sucesso!",
+                         "Erro ao alterar as transações selecionadas.")
+
+    def excluir_em_lote(self):
+        """Exclui todas as transações selecionadas (enviadas ao servidor em um único lote)."""
+        ids = self._ids_selecionados()
+        if not ids:
+            QMessageBox.warning(self, "Aviso", "Selecione as transações que deseja excluir.")
+            return
+
+        resposta = QMessageBox.question(
+            self,
+            "Confirmar Exclusão",
+            f"Tem certeza que deseja excluir as {len(ids)} transações selecionadas? "
+            "Transferências são excluídas com as duas transações. Esta ação não pode ser desfeita.",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        if resposta == QMessageBox.No:
+            return
+
+        self._enfileirar(lambda: SincronizacaoService.excluir_transacoes(ids),
+                         f"Exclusão de {len(ids)} transação(ões) gravada com sucesso!",
+                         "Erro ao excluir as transações selecionadas.")
+
+    def _ids_selecionados(self):
+        """Retorna os ids das linhas selecionadas na tabela."""
+        linhas = self.tabela_transacoes.selectionModel().selectedRows()
+        return [int(self.tabela_transacoes.item(indice.row(), 0).text()) for indice in linhas]
+
+    def _enfileirar(self, funcao, mensagem_sucesso, mensagem_erro):
+        """Grava no diário local, sem esperar o servidor, e agenda o envio.
         
-        # Excluir a transação
-        if transacao.excluir():
-            self.carregar_transacoes()
-            if transacao.transferencia_id:
-                QMessageBox.information(self, "Sucesso", "Transferência excluída com sucesso! Ambas as transações foram removidas.")
-            else:
-                QMessageBox.information(self, "Sucesso", "Transação excluída com sucesso!")
-        else:
-            QMessageBox.critical(self, "Erro", "Erro ao excluir transação.")
\ No newline at end of file
+        A tabela é recarregada quando o envio termina (_ao_sincronizar).
+        """
+        try:
+            funcao()
+        except Exception as e:
+            print(f"Erro ao gravar no diário local: {e}")
+            QMessageBox.critical(self, "Erro", mensagem_erro)
+            return
+        SincronizadorDiario.instancia().agendar()
+        QMessageBox.information(self, "Sucesso", mensagem_sucesso)
+    
+    def _ao_sincronizar(self, resultado):
+        """Atualiza as transações depois que gravações do diário chegam ao servidor."""
+        if resultado['enviadas']:
+            self.atualizar_transacoes()
@@ -0,0 +1,104 @@
+"""
+Fixtures dos testes automatizados (pytest).
+
+Os testes de lógica pura não usam o banco e rodam offline. Os testes marcados
+com @pytest.mark.banco usam o esquema de desenvolvimento, cada um dentro de uma
+transação desfeita ao final: nada é gravado, os testes não dependem da ordem
+e podem rodar em paralelo (pytest -n auto), cada processo com a sua conexão.
+Sem .env ou sem resposta do servidor, esses testes são pulados.
+"""
+
+import os
+import sys
+import uuid
+
+import pytest
+
+# Adicionar o diretório raiz do projeto ao caminho de busca do Python
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+sys.path.insert(0, project_root)
+
+# Os testes nunca usam o esquema de produção (o .env não sobrescreve esta variável)
+os.environ['ENVIRONMENT'] = 'dev'
+
+# Scripts interativos de teste manual (python run_test.py <nome>), sem testes do pytest
+collect_ignore = [
+    'test_categoria.py',
+    'test_conta_corrigido.py',
+    'test_db_connection.py',
+    'test_meio_pagamento.py',
+    'test_transacao_direct.py',
+    'test_transacao_final.py',
+]
+
+# Ponto de salvamento criado no início de cada teste de banco
+PONTO_SALVAMENTO = 'teste_pytest'
+
+@pytest.fixture(scope='session')
+def banco():
+    """Conexão com o esquema de desenvolvimento; pula os testes de banco se não houver servidor."""
+    from src.config import Configuracao
+    from src.database.connection import DatabaseConnection
+
+    if Configuracao.carregar().variaveis_ausentes():
+        pytest.skip("Banco de testes não configurado (.env)")
+
+    db = DatabaseConnection(environment='dev')
+    if not db.testar():
+        pytest.skip("Servidor de banco de dados indisponível")
+    return db
+
+@pytest.fixture
+def transacao_banco(banco, monkeypatch):
+    """Executa o teste dentro de uma transação desfeita ao final.
+
+    commit() e close() dos modelos não confirmam nada, e rollback() volta ao
+    ponto de salvamento do início do teste, como se a transação do modelo
+    tivesse sido desfeita.
+    """
+    conexao = banco.connect()
+    cursor = conexao.cursor()
+    cursor.execute(f"IF @@TRANCOUNT = 0 BEGIN TRANSACTION; SAVE TRANSACTION {PONTO_SALVAMENTO}")
+
+    def rollback():
+        conexao.cursor().execute(f"ROLLBACK TRANSACTION {PONTO_SALVAMENTO}; SAVE TRANSACTION {PONTO_SALVAMENTO}")
+
+    monkeypatch.setattr(banco, 'commit', lambda: None)
+    monkeypatch.setattr(banco, 'close', lambda: None)
+    monkeypatch.setattr(banco, 'rollback', rollback)
+    try:
+        yield banco
+    finally:
+        conexao.rollback()
+
+@pytest.fixture
+def nome_unico():
+    """Gera nomes únicos, para que testes em paralelo não disputem as mesmas linhas."""
+    return lambda prefixo: f"{prefixo} {uuid.uuid4().hex[:8]}"
+
+@pytest.fixture
+def categoria(transacao_banco, nome_unico):
+    """Categoria de despesa criada na transação do teste."""
+    from src.models.categoria import Categoria
+
+    categoria = Categoria(nome=nome_unico("Categoria teste"), tipo='D')
+    assert categoria.salvar()
+    return categoria
+
+@pytest.fixture
+def conta(transacao_banco, nome_unico):
+    """Conta com saldo inicial de 1000,00 criada na transação do teste."""
+    from src.models.conta import Conta
+
+    conta = Conta(nome=nome_unico("Conta teste"), tipo="Corrente", saldo_inicial=1000.0)
+    assert conta.salvar()
+    return conta
+
+@pytest.fixture
+def meio_pagamento(transacao_banco, conta, nome_unico):
+    """Meio de pagamento ligado à conta do teste."""
+    from src.models.meio_pagamento import MeioPagamento
+
+    meio = MeioPagamento(nome=nome_unico("Cartão teste"), tipo="Cartão de Débito", conta_id=conta.id)
+    assert meio.salvar()
+    return meio
@@ -0,0 +1,54 @@
+"""
+Testes do disjuntor de conexão (EstadoConexao).
+"""
+
+import pytest
+
+from src.database.estado_conexao import EstadoConexao, ServidorIndisponivel
+
+@pytest.fixture
+def estado():
+    estado = EstadoConexao()
+    estado.mudancas = []
+    estado.ao_mudar(estado.mudancas.append)
+    return estado
+
+def test_abre_o_disjuntor_apos_o_limite_de_falhas(estado):
+    estado.registrar_falha("timeout")
+    assert estado.situacao == EstadoConexao.INSTAVEL
+    estado.verificar()
+
+    estado.registrar_falha("timeout")
+    assert estado.situacao == EstadoConexao.OFFLINE
+    with pytest.raises(ServidorIndisponivel):
+        estado.verificar()
+    assert estado.mudancas == [EstadoConexao.INSTAVEL, EstadoConexao.OFFLINE]
+
+def test_falhas_em_curso_nao_prolongam_a_espera(estado):
+    for _ in range(EstadoConexao.LIMITE_FALHAS):
+        estado.registrar_falha("timeout")
+    proxima = estado.proxima_tentativa
+
+    estado.registrar_falha("timeout")
+    assert estado.proxima_tentativa == proxima
+    assert estado.espera == EstadoConexao.ESPERA_INICIAL * 2
+
+def test_vencida_a_espera_deixa_passar_uma_tentativa(estado):
+    for _ in range(EstadoConexao.LIMITE_FALHAS):
+        estado.registrar_falha("timeout")
+    estado.proxima_tentativa = 0
+
+    estado.verificar()
+    assert estado.situacao == EstadoConexao.INSTAVEL
+    with pytest.raises(ServidorIndisponivel):
+        estado.verificar()
+
+def test_sucesso_fecha_o_disjuntor(estado):
+    for _ in range(EstadoConexao.LIMITE_FALHAS):
+        estado.registrar_falha("timeout")
+    estado.registrar_sucesso()
+
+    assert estado.situacao == EstadoConexao.CONECTADO
+    assert estado.falhas == 0
+    assert estado.espera == EstadoConexao.ESPERA_INICIAL
+    estado.verificar()
@@ -0,0 +1,72 @@
+"""
+Testes da conversão de valores e da marcação de linhas repetidas na importação de extratos.
+"""
+
+from datetime import date
+import math
+
+import pandas as pd
+import pytest
+
+from src.services.duplicidade_service import DuplicidadeService
+from src.services.importacao_service import ImportacaoService
+
+@pytest.mark.parametrize('texto, esperado', [
+    ("1.000", 1000.0),
+    ("R$ 1.000", 1000.0),
+    ("1.000,50", 1000.5),
+    ("1,234.56", 1234.56),
+    ("1.000.000,00", 1000000.0),
+    ("-R$ 12,30", -12.3),
+    ("(12,30)", -12.3),
+    ("12,30-", -12.3),
+    ("10.5", 10.5),
+])
+def test_converter_valor(texto, esperado):
+    assert ImportacaoService._converter_valor(texto) == pytest.approx(esperado)
+
+@pytest.mark.parametrize('texto', ["1,234,56", "1.5,00", "12,3.4", "(-5)", "abc", ""])
+def test_valores_invalidos_sao_recusados(texto):
+    assert ImportacaoService._converter_valor(texto) is None
+
+def test_separador_decimal_decide_os_valores_ambiguos():
+    assert ImportacaoService._converter_valor("1.000", '.') == pytest.approx(1.0)
+    assert ImportacaoService._converter_valor("1,000", ',') == pytest.approx(1.0)
+    assert ImportacaoService._converter_valor("1,000", '.') == pytest.approx(1000.0)
+    assert ImportacaoService._converter_valor("1.000", None) is None
+    # Sem ambiguidade o separador configurado não é usado
+    assert ImportacaoService._converter_valor("1.000,50", None) == pytest.approx(1000.5)
+
+def test_normalizar_valores_deixa_invalidos_como_nan():
+    valores = ImportacaoService._normalizar_valores(pd.Series(["1.000", "1,234,56", None]))
+    assert valores[0] == pytest.approx(1000.0)
+    assert math.isnan(valores[1]) and math.isnan(valores[2])
+
+def test_linhas_repetidas_no_extrato_sao_marcadas_entre_lotes(monkeypatch):
+    servico = ImportacaoService()
+    vistas = set()
+    dia = date(2024, 5, 10)
+
+    def lote(*descricoes):
+        return pd.DataFrame({'conta_id': [1] * len(descricoes), 'data_transacao': [dia] * len(descricoes),
+                             'centavos': [1230] * len(descricoes), 'tipo': ['D'] * len(descricoes),
+                             'descricao': list(descricoes)})
+
+    # Nada gravado no banco: só as repetições dentro do extrato contam
+    monkeypatch.setattr(DuplicidadeService, 'casar_lote',
+                        staticmethod(lambda cursor, schema, registros: [None] * len(registros)))
+
+    primeiro = lote("Padaria", "Padaria", "Mercado")
+    servico._verificar_duplicadas(None, 'financas_pessoais_dev', primeiro, DuplicidadeService.MARCAR, vistas)
+    segundo = lote("Mercado")
+    servico._verificar_duplicadas(None, 'financas_pessoais_dev', segundo, DuplicidadeService.MARCAR, vistas)
+
+    assert primeiro['repetida'].tolist() == [False, True, False]
+    assert segundo['repetida'].tolist() == [True]
+
+def test_importar_sem_verificacao_nao_marca_repetidas():
+    df = pd.DataFrame({'conta_id': [1, 1], 'data_transacao': [date(2024, 5, 10)] * 2,
+                       'centavos': [1230, 1230], 'tipo': ['D', 'D'], 'descricao': ["Padaria", "Padaria"]})
+    ImportacaoService()._verificar_duplicadas(None, 'financas_pessoais_dev', df, DuplicidadeService.IMPORTAR, set())
+    assert not df['repetida'].any()
+    assert df['duplicata_de'].isna().all()
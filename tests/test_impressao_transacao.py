@@ -0,0 +1,41 @@
+"""
+Testes da impressão digital usada na detecção de duplicatas.
+"""
+
+from datetime import date, datetime
+from types import SimpleNamespace
+
+from src.models.impressao_transacao import ImpressaoTransacao
+
+def test_normalizar_descricao_remove_acentos_numeros_e_pontuacao():
+    assert ImpressaoTransacao.normalizar_descricao("  Pão de Açúcar #1234 - parc. 2/3 ") == "PAO DE ACUCAR PARC"
+    assert ImpressaoTransacao.normalizar_descricao(None) == ""
+
+def test_mesma_compra_com_descricoes_diferentes_tem_a_mesma_impressao():
+    dia = date(2024, 5, 10)
+    assert (ImpressaoTransacao.calcular(1, dia, 25.9, 'D', "Padaria Sao Joao")
+            == ImpressaoTransacao.calcular(1, dia, '25.90', 'D', "PADARIA SÃO JOÃO 0042"))
+
+def test_conta_valor_e_tipo_mudam_a_impressao():
+    dia = date(2024, 5, 10)
+    base = ImpressaoTransacao.calcular(1, dia, 25.9, 'D', "Padaria")
+    assert base != ImpressaoTransacao.calcular(2, dia, 25.9, 'D', "Padaria")
+    assert base != ImpressaoTransacao.calcular(1, dia, 25.91, 'D', "Padaria")
+    assert base != ImpressaoTransacao.calcular(1, dia, 25.9, 'R', "Padaria")
+
+def test_impressao_cabe_em_bigint():
+    impressao = ImpressaoTransacao.calcular(1, date(2024, 5, 10), 1e9, 'D', "Teste")
+    assert -2 ** 63 <= impressao < 2 ** 63
+
+def test_vizinhas_incluem_a_faixa_da_transacao():
+    dia = date(2024, 5, 10)
+    vizinhas = ImpressaoTransacao.vizinhas(1, dia, 10, 'D', "Mercado")
+    assert len(vizinhas) == 3
+    assert vizinhas[1] == ImpressaoTransacao.calcular(1, dia, 10, 'D', "Mercado")
+
+def test_pernas_de_transferencia_tem_a_mesma_impressao():
+    origem = SimpleNamespace(conta_id=1, data_transacao=datetime(2024, 5, 10, 8, 30), valor=100,
+                             tipo='T', descricao="Reserva (Origem)")
+    destino = SimpleNamespace(conta_id=1, data_transacao=date(2024, 5, 10), valor=100,
+                              tipo='T', descricao="Reserva (Destino)")
+    assert ImpressaoTransacao.de_transacao(origem) == ImpressaoTransacao.de_transacao(destino)
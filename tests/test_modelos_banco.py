@@ -0,0 +1,79 @@
+"""
+Testes dos modelos contra o esquema de desenvolvimento.
+
+Cada teste roda dentro de uma transação desfeita ao final (fixture
+transacao_banco em conftest.py); nada do que os testes gravam fica no banco.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from src.models.categoria import Categoria
+from src.models.conta import Conta
+from src.models.meio_pagamento import MeioPagamento
+from src.models.transacao import Transacao
+
+pytestmark = pytest.mark.banco
+
+def test_categoria_salva_e_encontrada(categoria):
+    encontrada = Categoria.buscar_por_id(categoria.id)
+    assert encontrada.nome == categoria.nome
+    assert encontrada.tipo == 'D'
+    assert encontrada.ativo
+
+def test_subcategoria_aparece_na_hierarquia(categoria, nome_unico):
+    subcategoria = Categoria(nome=nome_unico("Subcategoria teste"), tipo='D',
+                             categoria_pai_id=categoria.id, nivel=2)
+    assert subcategoria.salvar()
+
+    assert [c.id for c in Categoria.obter_subcategorias(categoria.id)] == [subcategoria.id]
+    assert [c.id for c in Categoria.obter_caminho_hierarquico(subcategoria.id)] == [categoria.id, subcategoria.id]
+
+def test_categoria_excluida_sai_da_listagem_de_ativas(categoria):
+    assert categoria.excluir()
+
+    assert categoria.id not in [c.id for c in Categoria.listar_todas(tipo='D')]
+    assert not Categoria.buscar_por_id(categoria.id).ativo
+
+def test_meio_pagamento_ligado_a_conta(meio_pagamento, conta):
+    encontrado = MeioPagamento.buscar_por_id(meio_pagamento.id)
+    assert encontrado.conta_id == conta.id
+    assert encontrado.id in [m.id for m in MeioPagamento.listar_todos(conta_id=conta.id)]
+
+def test_transacao_atualiza_o_saldo_da_conta(conta, categoria, meio_pagamento):
+    transacao = Transacao(descricao="Mercado teste", valor=150.0, data_transacao=date.today(), tipo='D',
+                          categoria_id=categoria.id, conta_id=conta.id, meio_pagamento_id=meio_pagamento.id)
+    assert transacao.salvar()
+
+    encontrada = Transacao.buscar_por_id(transacao.id)
+    assert encontrada.valor == Decimal('150.00')
+    assert not encontrada.arquivada
+    assert Conta.buscar_por_id(conta.id).saldo_atual == Decimal('850.00')
+
+def test_transacao_excluida_devolve_o_saldo(conta, categoria):
+    transacao = Transacao(descricao="Farmácia teste", valor=40.0, data_transacao=date.today(), tipo='D',
+                          categoria_id=categoria.id, conta_id=conta.id)
+    assert transacao.salvar()
+    assert transacao.excluir()
+
+    assert Transacao.buscar_por_id(transacao.id) is None
+    assert Conta.buscar_por_id(conta.id).saldo_atual == Decimal('1000.00')
+
+def test_transacao_inexistente_nao_e_excluida(transacao_banco):
+    assert not Transacao(id=-1, descricao="Inexistente", valor=1, tipo='D').excluir()
+
+def test_pesquisa_encontra_transacoes_arquivadas(transacao_banco, conta, nome_unico):
+    descricao = nome_unico("Arquivada teste")
+    cursor = transacao_banco.get_cursor()
+    cursor.execute(f"SELECT ISNULL(MIN(id), 0) - 1 FROM {transacao_banco.schema}.transacoes_arquivo")
+    transacao_id = min(cursor.fetchone()[0], -1)
+    cursor.execute(f"""
+        INSERT INTO {transacao_banco.schema}.transacoes_arquivo (id, descricao, valor, data_transacao, tipo, conta_id)
+        VALUES (?, ?, 10, ?, 'D', ?)
+    """, (transacao_id, descricao, date(date.today().year - 2, 3, 1), conta.id))
+
+    assert [linha.id for linha in Transacao.pesquisar(descricao)] == [transacao_id]
+    # Período só do ano atual: o arquivo não é lido
+    assert Transacao.pesquisar(descricao, {'data_inicio': date(date.today().year, 1, 1)}) == []
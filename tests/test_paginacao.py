@@ -0,0 +1,35 @@
+"""
+Testes dos tokens de continuação da paginação de transações e do extrato.
+"""
+
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from src.models.extrato_conta import ExtratoConta
+from src.models.transacao import Transacao
+
+def test_token_de_transacoes_volta_a_mesma_posicao():
+    token = Transacao._codificar_continuacao(date(2024, 5, 10), 42, 'DESC')
+    assert Transacao._decodificar_continuacao(token, 'DESC') == (date(2024, 5, 10), 42)
+
+def test_token_de_transacoes_de_outra_ordenacao_e_recusado():
+    token = Transacao._codificar_continuacao(date(2024, 5, 10), 42, 'DESC')
+    with pytest.raises(ValueError):
+        Transacao._decodificar_continuacao(token, 'ASC')
+
+def test_token_invalido_e_recusado():
+    with pytest.raises(ValueError):
+        Transacao._decodificar_continuacao("nao-e-um-token", 'DESC')
+    with pytest.raises(ValueError):
+        ExtratoConta._decodificar_continuacao("nao-e-um-token", 1)
+
+def test_token_do_extrato_guarda_o_saldo_sem_perder_precisao():
+    token = ExtratoConta._codificar_continuacao(7, date(2024, 5, 10), 42, Decimal('1234.56'))
+    assert ExtratoConta._decodificar_continuacao(token, 7) == (date(2024, 5, 10), 42, Decimal('1234.56'))
+
+def test_token_do_extrato_de_outra_conta_e_recusado():
+    token = ExtratoConta._codificar_continuacao(7, date(2024, 5, 10), 42, Decimal('0'))
+    with pytest.raises(ValueError):
+        ExtratoConta._decodificar_continuacao(token, 8)
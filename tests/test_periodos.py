@@ -0,0 +1,64 @@
+"""
+Testes da divisão de períodos usada pelos resumos, pelo arquivo de transações e pelas faturas.
+"""
+
+from datetime import date
+
+from src.models.arquivo_transacoes import ArquivoTransacoes
+from src.models.fatura_cartao import FaturaCartao
+from src.models.resumo_mensal import ResumoMensal
+
+SCHEMA = 'financas_pessoais_dev'
+
+def test_periodo_de_meses_inteiros_nao_tem_trechos():
+    meses, trechos = ResumoMensal._dividir_periodo(date(2024, 1, 1), date(2024, 3, 31))
+    assert meses == (202401, 202403)
+    assert trechos == []
+
+def test_periodo_com_pontas_parciais():
+    meses, trechos = ResumoMensal._dividir_periodo(date(2024, 1, 15), date(2024, 4, 10))
+    assert meses == (202402, 202403)
+    assert trechos == [(date(2024, 1, 15), date(2024, 1, 31)), (date(2024, 4, 1), date(2024, 4, 10))]
+
+def test_periodo_dentro_de_um_mes_vira_um_trecho():
+    meses, trechos = ResumoMensal._dividir_periodo(date(2024, 2, 3), date(2024, 2, 20))
+    assert meses is None
+    assert trechos == [(date(2024, 2, 3), date(2024, 2, 20))]
+
+def test_meses_separados_em_anos_inteiros_e_pontas():
+    anos, faixas = ResumoMensal._dividir_meses(202211, 202503)
+    assert anos == (2023, 2024)
+    assert faixas == [(202211, 202212), (202501, 202503)]
+
+def test_meses_sem_ano_inteiro():
+    assert ResumoMensal._dividir_meses(202402, 202411) == (None, [(202402, 202411)])
+
+def test_consulta_periodo_usa_resumo_anual_mensal_e_transacoes():
+    sql, params = ResumoMensal.consulta_periodo(SCHEMA, date(2022, 12, 15), date(2024, 2, 29))
+    assert f"{SCHEMA}.resumo_anual WITH (NOEXPAND)" in sql
+    assert f"{SCHEMA}.resumo_mensal" in sql
+    assert f"{SCHEMA}.transacoes_arquivo" in sql
+    assert params == [2023, 2023, 202401, 202402, date(2022, 12, 15), date(2022, 12, 31)]
+
+def test_fonte_do_ano_corrente_nao_le_o_arquivo():
+    inicio = ArquivoTransacoes.inicio_ativo()
+    assert ArquivoTransacoes.fonte(SCHEMA, inicio) == f"{SCHEMA}.transacoes"
+    assert not ArquivoTransacoes.inclui_arquivo(inicio)
+
+def test_fonte_de_anos_anteriores_ou_sem_inicio_inclui_o_arquivo():
+    anterior = date(ArquivoTransacoes.inicio_ativo().year - 1, 6, 1)
+    assert ArquivoTransacoes.inclui_arquivo(anterior)
+    assert ArquivoTransacoes.inclui_arquivo(None)
+    fonte = ArquivoTransacoes.fonte(SCHEMA)
+    assert "UNION ALL" in fonte
+    assert "AS arquivada" in fonte
+
+def test_competencia_da_compra_depois_do_fechamento_vai_para_o_mes_seguinte():
+    assert FaturaCartao.competencia_da_compra(date(2024, 12, 20), 10) == (2025, 1)
+    assert FaturaCartao.competencia_da_compra(date(2024, 12, 10), 10) == (2024, 12)
+
+def test_periodo_e_vencimento_da_fatura():
+    fatura = FaturaCartao(ano=2024, mes=3, dia_fechamento=31, dia_vencimento=8)
+    # Fechamento no dia 31 é limitado ao último dia de cada mês
+    assert fatura.periodo == (date(2024, 3, 1), date(2024, 3, 31))
+    assert fatura.data_vencimento == date(2024, 4, 8)